@@ -0,0 +1,43 @@
+-- Registro de refrescos de vistas materializadas
+-- Permite exportar la antigüedad de cada vista en /metrics
+-- (forge_materialized_view_staleness_seconds).
+\c forge_db
+SET search_path TO app,cat,doc,inv,kpi,oem,svc,public;
+
+CREATE TABLE IF NOT EXISTS kpi.matview_refresh_log (
+    log_id BIGSERIAL PRIMARY KEY,
+    view_name VARCHAR(128) NOT NULL,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    duration_ms NUMERIC(12,2)
+);
+
+CREATE INDEX IF NOT EXISTS idx_matview_refresh_log_view
+    ON kpi.matview_refresh_log(view_name, refreshed_at DESC);
+
+CREATE OR REPLACE FUNCTION kpi.refresh_materialized_view(view_name TEXT)
+RETURNS VOID AS $$
+DECLARE
+    v_started TIMESTAMPTZ := clock_timestamp();
+BEGIN
+    EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY kpi.%I', view_name);
+    INSERT INTO kpi.matview_refresh_log (view_name, duration_ms)
+    VALUES ('kpi.' || view_name, EXTRACT(EPOCH FROM clock_timestamp() - v_started) * 1000);
+    RAISE NOTICE 'Vista materializada % refrescada', view_name;
+EXCEPTION
+    WHEN OTHERS THEN
+        RAISE EXCEPTION 'Error al refrescar vista %: %', view_name, SQLERRM;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION kpi.refresh_all_materialized_views()
+RETURNS VOID AS $$
+BEGIN
+    PERFORM kpi.refresh_materialized_view('inventory_abc_analysis');
+    PERFORM kpi.refresh_materialized_view('monthly_trends');
+
+    RAISE NOTICE 'Vistas materializadas refrescadas exitosamente';
+END;
+$$ LANGUAGE plpgsql;
+
+-- Conservar 90 días de historial
+DELETE FROM kpi.matview_refresh_log WHERE refreshed_at < NOW() - INTERVAL '90 days';
@@ -0,0 +1,19 @@
+-- Role-level settings for connections made through pgbouncer
+-- In transaction pooling mode pgbouncer does not forward the "options"
+-- startup parameter, so search_path must come from the role/database.
+-- Run once as a superuser (replace postgres with DB_USER if different).
+\c forge_db
+
+ALTER ROLE postgres IN DATABASE forge_db
+    SET search_path TO app,cat,doc,inv,kpi,oem,svc,public;
+
+-- app.user_id is set per transaction by the application
+-- (set_config('app.user_id', ..., true)); make sure no session-level
+-- default is configured that could be attributed to the wrong user.
+ALTER ROLE postgres IN DATABASE forge_db RESET app.user_id;
+
+-- Verify
+SELECT r.rolname, d.datname, s.setconfig
+FROM pg_db_role_setting s
+LEFT JOIN pg_roles r ON r.oid = s.setrole
+LEFT JOIN pg_database d ON d.oid = s.setdatabase;
@@ -45,6 +45,11 @@ if [ $RETRY_COUNT -eq $MAX_RETRIES ]; then
   echo "Continuando de todas formas..."
 fi
 
+# Los comandos de manage.py también escriben métricas si está definido
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 # Ejecutar migraciones
 echo "Ejecutando migraciones..."
 python manage.py migrate --noinput
@@ -67,5 +72,12 @@ else:
 EOF
 fi
 
+# Directorio de métricas Prometheus multiproceso: los workers deben empezar
+# con el directorio vacío
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 # Ejecutar comando principal
 exec "$@"
@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for ForgeDB.
+
+Scripts in this package are run by hand (``python -m benchmarks.<name>``)
+and print JSON results so runs can be compared between commits.
+"""
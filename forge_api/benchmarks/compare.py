@@ -0,0 +1,89 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+
+Entries are matched by ``name``. A regression is a metric (``p95_ms`` and
+``mean_ms`` by default) that grew by more than ``--threshold`` percent and by
+more than ``--min-delta-ms`` (so sub-millisecond noise on fast benchmarks is
+ignored). Exits with status 1 when any regression is found, so it can gate CI.
+"""
+import argparse
+import json
+import sys
+
+from .results import load
+
+DEFAULT_METRICS = ('p95_ms', 'mean_ms')
+
+
+def compare(baseline, candidate, metrics=DEFAULT_METRICS, threshold_pct=10.0, min_delta_ms=1.0):
+    """
+    Return one row per (benchmark entry, metric) present in both documents.
+
+    Each row has ``name``, ``metric``, ``baseline``, ``candidate``,
+    ``change_pct`` and ``status`` (``regression``, ``improvement`` or ``ok``).
+    """
+    base = {entry['name']: entry for entry in baseline.get('results', [])}
+    rows = []
+    for entry in candidate.get('results', []):
+        reference = base.get(entry['name'])
+        if reference is None:
+            continue
+        for metric in metrics:
+            before, after = reference.get(metric), entry.get(metric)
+            if before is None or after is None:
+                continue
+            delta = after - before
+            change_pct = (delta / before * 100.0) if before else 0.0
+            status = 'ok'
+            if abs(delta) >= min_delta_ms and abs(change_pct) > threshold_pct:
+                status = 'regression' if delta > 0 else 'improvement'
+            rows.append({
+                'name': entry['name'],
+                'metric': metric,
+                'baseline': before,
+                'candidate': after,
+                'change_pct': round(change_pct, 1),
+                'status': status,
+            })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Allowed growth in percent')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0)
+    parser.add_argument('--metric', action='append', dest='metrics',
+                        help=f'Metric to compare (repeatable, default: {", ".join(DEFAULT_METRICS)})')
+    parser.add_argument('--json', action='store_true', help='Print the comparison as JSON')
+    args = parser.parse_args(argv)
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    rows = compare(baseline, candidate, metrics=args.metrics or DEFAULT_METRICS,
+                   threshold_pct=args.threshold, min_delta_ms=args.min_delta_ms)
+    regressions = [row for row in rows if row['status'] == 'regression']
+
+    if args.json:
+        json.dump({
+            'baseline': baseline.get('meta', {}).get('commit'),
+            'candidate': candidate.get('meta', {}).get('commit'),
+            'rows': rows,
+            'regressions': len(regressions),
+        }, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        print(f"{baseline.get('meta', {}).get('commit')} -> {candidate.get('meta', {}).get('commit')}")
+        for row in rows:
+            marker = {'regression': '!!', 'improvement': '++'}.get(row['status'], '  ')
+            print(f"{marker} {row['name']:<45} {row['metric']:<8} "
+                  f"{row['baseline']:>10.2f} -> {row['candidate']:>10.2f}  ({row['change_pct']:+.1f}%)")
+        print(f'{len(regressions)} regression(s)')
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
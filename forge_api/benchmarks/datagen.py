@@ -0,0 +1,614 @@
+"""
+Synthetic data generator for benchmarks.
+
+Fills the cat/inv/oem schemas with deterministic data (same ``--seed`` and
+``--scale`` produce the same rows) using COPY in batches. At ``--scale 1``::
+
+    clients 10k, equipment 25k, technicians 200, taxonomy 12/96/960,
+    products 25k, stock ~50k, transactions 1M, OEM brands 40, OEM items 100k
+
+Usage::
+
+    python -m benchmarks.datagen --scale 1 --seed 42
+    python -m benchmarks.datagen --scale 0.01          # quick local dataset
+    python -m benchmarks.datagen --scale 1 --dry-run   # generate only, no DB
+    python -m benchmarks.datagen --purge
+
+Rows follow the DDL in database/part1.sql (not the Django models, whose
+columns drift from the real tables). Every generated code starts with ``BN``
+so ``--purge`` removes exactly the synthetic data.
+
+inv.transactions is loaded as history: the stock trigger and the stock audit
+trigger are disabled during the load and the purge (``--keep-triggers`` leaves
+them on) and inv.stock is written with the balance the transactions add up to.
+"""
+import argparse
+import io
+import json
+import os
+import random
+import string
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+PREFIX = 'BN'
+
+BASE_COUNTS = {
+    'technicians': 200,
+    'clients': 10_000,
+    'equipment': 25_000,
+    'warehouses': 12,
+    'taxonomy_systems': 12,
+    'taxonomy_subsystems': 96,
+    'taxonomy_groups': 960,
+    'oem_brands': 40,
+    'products': 25_000,
+    'transactions': 1_000_000,
+    'oem_catalog_items': 100_000,
+}
+
+# Lower bounds so small scales still exercise every relationship
+# (transfers need two warehouses, every subsystem needs a group...).
+MIN_COUNTS = {
+    'technicians': 2,
+    'warehouses': 2,
+    'taxonomy_systems': 2,
+    'taxonomy_subsystems': 4,
+    'taxonomy_groups': 8,
+    'oem_brands': 2,
+}
+
+UOM_CODES = [('BN-PZA', 'Pieza'), ('BN-JGO', 'Juego'), ('BN-LT', 'Litro'), ('BN-KG', 'Kilogramo')]
+SOURCE_CODES = [('BN-OEM', 'Original'), ('BN-AFT', 'Aftermarket'), ('BN-REM', 'Remanufacturado')]
+CONDITION_CODES = [('BN-NEW', 'Nuevo'), ('BN-USD', 'Usado'), ('BN-RMN', 'Reconstruido')]
+EQUIPMENT_TYPES = [
+    ('BN-AUTO', 'AUTOMOTRIZ', 'Automóvil'),
+    ('BN-PICKUP', 'AUTOMOTRIZ', 'Pickup'),
+    ('BN-TRUCK', 'AUTOMOTRIZ', 'Camión'),
+    ('BN-TRACTOR', 'AGRÍCOLA', 'Tractor'),
+    ('BN-GEN', 'INDUSTRIAL', 'Generador'),
+]
+
+SYSTEM_NAMES = [
+    'Motor', 'Frenos', 'Suspensión', 'Dirección', 'Transmisión', 'Eléctrico',
+    'Enfriamiento', 'Escape', 'Combustible', 'Carrocería', 'Climatización', 'Hidráulico',
+]
+SUBSYSTEM_NAMES = [
+    'Principal', 'Auxiliar', 'Control', 'Sellos', 'Soportes', 'Sensores',
+    'Mangueras', 'Accesorios',
+]
+PART_NAMES = [
+    'Filtro', 'Balata', 'Bomba', 'Sensor', 'Junta', 'Manguera', 'Banda', 'Bujía',
+    'Amortiguador', 'Rótula', 'Tensor', 'Válvula', 'Empaque', 'Relevador', 'Soporte',
+    'Termostato', 'Disco', 'Tambor', 'Cable', 'Polea',
+]
+BRANDS = [
+    'Toyota', 'Nissan', 'Ford', 'Chevrolet', 'Volkswagen', 'Honda', 'Mazda', 'Kia',
+    'Hyundai', 'Dodge', 'Jeep', 'RAM', 'Mitsubishi', 'Isuzu', 'Freightliner',
+    'International', 'Kenworth', 'John Deere', 'Caterpillar', 'Cummins',
+]
+MODELS = [
+    'Hilux', 'Tacoma', 'NP300', 'Versa', 'Ranger', 'F-150', 'Silverado', 'Aveo',
+    'Jetta', 'Amarok', 'Civic', 'CR-V', 'CX-5', 'Rio', 'Tucson', 'Ram 2500',
+    'Wrangler', 'L200', 'ELF', 'Cascadia', 'T680', '5075E', '320D',
+]
+FIRST_NAMES = [
+    'Juan', 'María', 'José', 'Guadalupe', 'Luis', 'Ana', 'Carlos', 'Laura', 'Miguel',
+    'Sofía', 'Jorge', 'Fernanda', 'Ricardo', 'Patricia', 'Alejandro', 'Daniela',
+]
+LAST_NAMES = [
+    'Hernández', 'García', 'Martínez', 'López', 'González', 'Rodríguez', 'Pérez',
+    'Sánchez', 'Ramírez', 'Cruz', 'Flores', 'Gómez', 'Morales', 'Vázquez', 'Reyes',
+]
+COMPANY_WORDS = ['Transportes', 'Logística', 'Constructora', 'Agrícola', 'Servicios', 'Distribuidora']
+COMPANY_SUFFIXES = ['SA de CV', 'S de RL', 'SAPI de CV']
+CITIES = [
+    ('Monterrey', 'Nuevo León'), ('Guadalajara', 'Jalisco'), ('Ciudad de México', 'CDMX'),
+    ('Puebla', 'Puebla'), ('Querétaro', 'Querétaro'), ('León', 'Guanajuato'),
+    ('Saltillo', 'Coahuila'), ('Hermosillo', 'Sonora'), ('Mérida', 'Yucatán'),
+]
+VIN_CHARS = 'ABCDEFGHJKLMNPRSTUVWXYZ0123456789'
+
+# Transaction mix: (txn_type, cumulative probability)
+TXN_MIX = [('IN', 0.35), ('OUT', 0.75), ('ADJUST', 0.83), ('TRANSFER', 0.93), ('COUNT', 1.0)]
+
+
+def set_history_triggers(execute, enabled):
+    """Toggle the user triggers of inv.transactions and inv.stock (stock update and audit)."""
+    action = 'ENABLE' if enabled else 'DISABLE'
+    for table in ('inv.transactions', 'inv.stock'):
+        execute(f'ALTER TABLE {table} {action} TRIGGER USER')
+
+
+def scaled_counts(scale):
+    counts = {}
+    for name, base in BASE_COUNTS.items():
+        counts[name] = max(MIN_COUNTS.get(name, 1), int(round(base * scale)))
+    counts['taxonomy_subsystems'] = max(counts['taxonomy_subsystems'], counts['taxonomy_systems'])
+    counts['taxonomy_groups'] = max(counts['taxonomy_groups'], counts['taxonomy_subsystems'])
+    return counts
+
+
+def copy_value(value):
+    """Format one value for COPY ... FROM STDIN (text format)."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (list, tuple)):
+        value = '{' + ','.join(f'"{item}"' for item in value) + '}'
+    elif isinstance(value, dict):
+        value = json.dumps(value)
+    elif isinstance(value, datetime):
+        value = value.isoformat(sep=' ')
+    else:
+        value = str(value)
+    return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def copy_lines(rows):
+    for row in rows:
+        yield '\t'.join(copy_value(value) for value in row) + '\n'
+
+
+class CopySink:
+    """Loads rows into PostgreSQL with COPY, ``batch_size`` rows at a time."""
+
+    def __init__(self, cursor, batch_size=50_000):
+        self.cursor = cursor
+        self.batch_size = batch_size
+
+    def copy(self, table, columns, rows):
+        statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+        total = 0
+        buffer, pending = io.StringIO(), 0
+        for line in copy_lines(rows):
+            buffer.write(line)
+            pending += 1
+            if pending >= self.batch_size:
+                total += self._flush(statement, buffer)
+                buffer, pending = io.StringIO(), 0
+        if pending:
+            total += self._flush(statement, buffer)
+        return total
+
+    def _flush(self, statement, buffer):
+        buffer.seek(0)
+        self.cursor.copy_expert(statement, buffer)
+        return self.cursor.rowcount
+
+    def execute(self, sql, params=None):
+        self.cursor.execute(sql, params)
+
+    def executemany(self, sql, rows):
+        self.cursor.executemany(sql, rows)
+
+    def fetch_ids(self, sql, expected):
+        self.cursor.execute(sql)
+        return [row[0] for row in self.cursor.fetchall()]
+
+
+class DryRunSink(CopySink):
+    """Formats every row like CopySink but sends nothing to the database."""
+
+    def __init__(self):
+        super().__init__(cursor=None)
+
+    def copy(self, table, columns, rows):
+        return sum(1 for _ in copy_lines(rows))
+
+    def execute(self, sql, params=None):
+        pass
+
+    def executemany(self, sql, rows):
+        pass
+
+    def fetch_ids(self, sql, expected):
+        return list(range(1, expected + 1))
+
+
+class DataGenerator:
+    """
+    Builds the synthetic dataset table by table. Each table draws from its
+    own ``random.Random`` seeded with ``(seed, table)``, so a table's rows do
+    not change when another table's count does.
+    """
+
+    def __init__(self, scale=1.0, seed=42, days=365, now=None):
+        self.scale = scale
+        self.seed = seed
+        self.days = days
+        self.counts = scaled_counts(scale)
+        self.now = (now or datetime.now()).replace(microsecond=0) - timedelta(minutes=1)
+        self.start = self.now - timedelta(days=days)
+        self.taxonomy_groups = []
+        self.warehouses = []
+        self.brands = []
+        self.products = []
+        self.stock_pairs = []
+        self.balances = {}
+        self.last_receipt = {}
+
+    def rng(self, table):
+        return random.Random(f'{self.seed}:{table}')
+
+    # -- reference data -------------------------------------------------
+
+    def taxonomy_systems(self):
+        for i in range(self.counts['taxonomy_systems']):
+            name = SYSTEM_NAMES[i % len(SYSTEM_NAMES)]
+            if i >= len(SYSTEM_NAMES):
+                name = f'{name} {i // len(SYSTEM_NAMES) + 1}'
+            yield (f'{PREFIX}{i + 1:02d}', 'AUTOMOTRIZ', name, i + 1)
+
+    def taxonomy_subsystems(self):
+        systems = [row[0] for row in self.taxonomy_systems()]
+        for i in range(self.counts['taxonomy_subsystems']):
+            system = systems[i % len(systems)]
+            position = i // len(systems)
+            name = SUBSYSTEM_NAMES[position % len(SUBSYSTEM_NAMES)]
+            yield (f'{system}-{position + 1:02d}', system, name, position + 1)
+
+    def taxonomy_group_rows(self):
+        rng = self.rng('taxonomy_groups')
+        subsystems = [(row[0], row[1]) for row in self.taxonomy_subsystems()]
+        self.taxonomy_groups = []
+        for i in range(self.counts['taxonomy_groups']):
+            subsystem, system = subsystems[i % len(subsystems)]
+            code = f'{subsystem}-{i // len(subsystems) + 1:03d}'
+            part = rng.choice(PART_NAMES)
+            name = f'{part} {rng.choice(SUBSYSTEM_NAMES).lower()}'
+            self.taxonomy_groups.append((code, name))
+            yield (code, subsystem, system, name, f'{part.lower()} {name.lower()}', UOM_CODES[0][0])
+
+    def technicians(self):
+        rng = self.rng('technicians')
+        for i in range(self.counts['technicians']):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield (
+                f'{PREFIX}-T{i + 1:05d}', first, last,
+                f'tec{i + 1}@bench.example', date(2015, 1, 1) + timedelta(days=rng.randrange(3000)),
+                Decimal(rng.randrange(250, 650)), 'ACTIVE',
+            )
+
+    def clients(self):
+        rng = self.rng('clients')
+        for i in range(self.counts['clients']):
+            client_type = rng.choices(['INDIVIDUAL', 'EMPRESA', 'GOVERNMENT'], weights=[60, 35, 5])[0]
+            if client_type == 'INDIVIDUAL':
+                name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}'
+            else:
+                name = f'{rng.choice(COMPANY_WORDS)} {rng.choice(LAST_NAMES)} {rng.choice(COMPANY_SUFFIXES)}'
+            city, state = rng.choice(CITIES)
+            tax_id = ''.join(rng.choice(string.ascii_uppercase) for _ in range(4)) + f'{rng.randrange(10**9):09d}'
+            yield (
+                f'{PREFIX}-C{i + 1:07d}', client_type, name, tax_id,
+                f'cliente{i + 1}@bench.example', f'55{rng.randrange(10**8):08d}',
+                city, state, 'México',
+                Decimal(rng.choice([0, 10_000, 50_000, 100_000, 250_000])), rng.choice([0, 15, 30, 60]),
+                rng.choices(['ACTIVE', 'INACTIVE'], weights=[95, 5])[0],
+            )
+
+    def equipment(self, client_ids, type_ids):
+        rng = self.rng('equipment')
+        for i in range(self.counts['equipment']):
+            year = rng.randrange(1995, self.now.year + 1)
+            yield (
+                f'{PREFIX}-E{i + 1:08d}', rng.choice(type_ids), rng.choice(BRANDS), rng.choice(MODELS),
+                year, ''.join(rng.choice(VIN_CHARS) for _ in range(17)),
+                f'{rng.choice(string.ascii_uppercase)}{rng.choice(string.ascii_uppercase)}{rng.choice(string.ascii_uppercase)}-{rng.randrange(1000):03d}',
+                rng.choice(client_ids), rng.randrange(0, 400_000),
+                rng.choices(['ACTIVO', 'INACTIVO', 'REPARACIÓN'], weights=[85, 10, 5])[0],
+            )
+
+    def warehouse_rows(self):
+        self.warehouses = []
+        for i in range(self.counts['warehouses']):
+            city, _ = CITIES[i % len(CITIES)]
+            code = f'{PREFIX}-W{i + 1:02d}'
+            self.warehouses.append(code)
+            yield (code, f'Almacén {city} {i + 1}', 'MAIN' if i == 0 else 'SATELLITE', 5000)
+
+    def oem_brand_rows(self):
+        self.brands = []
+        for i in range(self.counts['oem_brands']):
+            name = BRANDS[i % len(BRANDS)]
+            if i >= len(BRANDS):
+                name = f'{name} {i // len(BRANDS) + 1}'
+            code = f'{PREFIX}O{i + 1:03d}'
+            self.brands.append(code)
+            yield (code, name, 'México')
+
+    # -- inventory ------------------------------------------------------
+
+    def product_rows(self):
+        rng = self.rng('products')
+        self.products = []
+        for i in range(self.counts['products']):
+            group_code, group_name = rng.choice(self.taxonomy_groups)
+            brand = rng.choice(BRANDS)
+            sku = f'{PREFIX}-P{i + 1:07d}'
+            cost = Decimal(rng.randrange(2_000, 500_000)) / 100
+            min_stock = rng.randrange(0, 20)
+            self.products.append((sku, cost))
+            yield (
+                sku, group_code, f'{group_name} {brand} {rng.choice(MODELS)}', brand,
+                f'{rng.randrange(10**8):08d}', rng.choice(self.brands),
+                rng.choice(SOURCE_CODES)[0], rng.choice(CONDITION_CODES)[0], rng.choice(UOM_CODES)[0],
+                f'750{rng.randrange(10**10):010d}', min_stock, min_stock + rng.randrange(20, 200),
+                min_stock + rng.randrange(0, 10), rng.randrange(1, 30), cost, cost, cost,
+            )
+
+    def plan_stock(self):
+        """Pick the (sku, warehouse) pairs that carry stock: 1-3 per product."""
+        rng = self.rng('stock')
+        self.stock_pairs = []
+        for sku, cost in self.products:
+            for warehouse in rng.sample(self.warehouses, min(len(self.warehouses), rng.choice([1, 1, 2, 2, 3]))):
+                self.stock_pairs.append((sku, warehouse, cost))
+        self.balances = {(sku, warehouse): 0 for sku, warehouse, _ in self.stock_pairs}
+        self.last_receipt = {}
+
+    def transactions(self, technician_ids):
+        """
+        Movement history in chronological order. Quantities are positive and
+        the type gives the direction (as inv.update_stock_on_transaction
+        expects); outbound movements never take a balance below zero.
+        """
+        rng = self.rng('transactions')
+        by_sku = {}
+        for sku, warehouse, cost in self.stock_pairs:
+            by_sku.setdefault(sku, []).append(warehouse)
+        count = self.counts['transactions']
+        step = (self.now - self.start) / max(count, 1)
+        balances, last_receipt = self.balances, self.last_receipt
+
+        for i in range(count):
+            sku, warehouse, cost = self.stock_pairs[rng.randrange(len(self.stock_pairs))]
+            txn_date = self.start + step * i
+            draw = rng.random()
+            txn_type = next(name for name, limit in TXN_MIX if draw <= limit)
+            qty = rng.randrange(1, 25)
+            from_wh = to_wh = None
+            reference_type = None
+
+            if txn_type in ('OUT', 'ADJUST'):
+                if balances[(sku, warehouse)] < qty:
+                    txn_type = 'IN'
+            elif txn_type == 'TRANSFER':
+                targets = [wh for wh in by_sku[sku] if wh != warehouse]
+                if not targets or balances[(sku, warehouse)] < qty:
+                    txn_type = 'IN'
+
+            if txn_type == 'IN':
+                to_wh, reference_type = warehouse, 'PO'
+                balances[(sku, warehouse)] += qty
+                last_receipt[(sku, warehouse)] = txn_date.date()
+            elif txn_type in ('OUT', 'ADJUST'):
+                from_wh, reference_type = warehouse, 'WO' if txn_type == 'OUT' else 'ADJUSTMENT'
+                balances[(sku, warehouse)] -= qty
+            elif txn_type == 'TRANSFER':
+                from_wh, to_wh = warehouse, rng.choice(targets)
+                balances[(sku, warehouse)] -= qty
+                balances[(sku, to_wh)] += qty
+                reference_type = 'TRANSFER'
+            else:
+                to_wh, reference_type = warehouse, 'COUNT'
+
+            yield (
+                txn_type, txn_date, sku, qty, from_wh, to_wh, cost,
+                f'{PREFIX}-{reference_type}-{i + 1}', reference_type, rng.choice(technician_ids),
+            )
+
+    def stock_rows(self):
+        rng = self.rng('stock_rows')
+        for sku, warehouse, cost in self.stock_pairs:
+            on_hand = self.balances[(sku, warehouse)]
+            reserved = rng.randrange(0, on_hand + 1) if on_hand and rng.random() < 0.1 else 0
+            received = self.last_receipt.get((sku, warehouse), self.start.date())
+            yield (sku, warehouse, on_hand, reserved, cost, received, 'AVAILABLE')
+
+    def oem_catalog_items(self):
+        rng = self.rng('oem_catalog_items')
+        for i in range(self.counts['oem_catalog_items']):
+            group_code, group_name = rng.choice(self.taxonomy_groups)
+            list_price = Decimal(rng.randrange(1_000, 900_000)) / 100
+            yield (
+                rng.choice(self.brands), f'{PREFIX}{i + 1:09d}', 'FULL_12',
+                f'{group_name} {rng.choice(MODELS)}', group_code,
+                Decimal(rng.randrange(1, 50_000)) / 1000,
+                rng.sample(MODELS, rng.randrange(1, 4)),
+                [f'E{rng.randrange(100):02d}' for _ in range(rng.randrange(0, 3))],
+                list_price, (list_price * Decimal('0.8')).quantize(Decimal('0.01')),
+                'USD', rng.randrange(1, 60), rng.random() < 0.03,
+            )
+
+    # -- orchestration --------------------------------------------------
+
+    def load(self, sink, keep_triggers=False):
+        """Load every table through ``sink``; returns one entry per table."""
+        report = []
+
+        def step(name, func):
+            start = time.perf_counter()
+            rows = func()
+            report.append({'name': name, 'rows': rows, 'seconds': round(time.perf_counter() - start, 2)})
+
+        step('cat.reference_codes', lambda: self._load_reference_codes(sink))
+        step('cat.taxonomy_systems', lambda: sink.copy(
+            'cat.taxonomy_systems', ['system_code', 'category', 'name_es', 'sort_order'], self.taxonomy_systems()))
+        step('cat.taxonomy_subsystems', lambda: sink.copy(
+            'cat.taxonomy_subsystems', ['subsystem_code', 'system_code', 'name_es', 'sort_order'],
+            self.taxonomy_subsystems()))
+        step('cat.taxonomy_groups', lambda: sink.copy(
+            'cat.taxonomy_groups',
+            ['group_code', 'subsystem_code', 'system_code', 'name_es', 'keywords', 'typical_uom'],
+            self.taxonomy_group_rows()))
+        step('cat.technicians', lambda: sink.copy(
+            'cat.technicians',
+            ['employee_code', 'first_name', 'last_name', 'email', 'hire_date', 'hourly_rate', 'status'],
+            self.technicians()))
+        step('cat.clients', lambda: sink.copy(
+            'cat.clients',
+            ['client_code', 'type', 'name', 'tax_id', 'email', 'phone', 'city', 'state', 'country',
+             'credit_limit', 'payment_days', 'status'],
+            self.clients()))
+
+        client_ids = sink.fetch_ids(
+            f"SELECT client_id FROM cat.clients WHERE client_code LIKE '{PREFIX}-C%' ORDER BY client_id",
+            self.counts['clients'])
+        type_ids = sink.fetch_ids(
+            f"SELECT type_id FROM cat.equipment_types WHERE type_code LIKE '{PREFIX}-%' ORDER BY type_id",
+            len(EQUIPMENT_TYPES))
+        technician_ids = sink.fetch_ids(
+            f"SELECT technician_id FROM cat.technicians WHERE employee_code LIKE '{PREFIX}-T%' ORDER BY technician_id",
+            self.counts['technicians'])
+
+        step('cat.equipment', lambda: sink.copy(
+            'cat.equipment',
+            ['equipment_code', 'type_id', 'brand', 'model', 'year', 'vin', 'license_plate',
+             'client_id', 'current_mileage_hours', 'status'],
+            self.equipment(client_ids, type_ids)))
+        step('inv.warehouses', lambda: sink.copy(
+            'inv.warehouses', ['warehouse_code', 'name', 'type', 'capacity'], self.warehouse_rows()))
+        step('oem.brands', lambda: sink.copy(
+            'oem.brands', ['oem_code', 'name', 'country'], self.oem_brand_rows()))
+        step('inv.product_master', lambda: sink.copy(
+            'inv.product_master',
+            ['internal_sku', 'group_code', 'name', 'brand', 'oem_ref', 'oem_code', 'source_code',
+             'condition_code', 'uom_code', 'barcode', 'min_stock', 'max_stock', 'reorder_point',
+             'lead_time_days', 'standard_cost', 'avg_cost', 'last_purchase_cost'],
+            self.product_rows()))
+
+        self.plan_stock()
+        if not keep_triggers:
+            set_history_triggers(sink.execute, enabled=False)
+        step('inv.transactions', lambda: sink.copy(
+            'inv.transactions',
+            ['txn_type', 'txn_date', 'internal_sku', 'qty', 'from_warehouse', 'to_warehouse',
+             'unit_cost', 'reference_number', 'reference_type', 'performed_by'],
+            self.transactions(technician_ids)))
+        step('inv.stock', lambda: sink.copy(
+            'inv.stock',
+            ['internal_sku', 'warehouse_code', 'qty_on_hand', 'qty_reserved', 'unit_cost',
+             'last_receipt_date', 'status'],
+            self.stock_rows()))
+        if not keep_triggers:
+            set_history_triggers(sink.execute, enabled=True)
+
+        step('oem.catalog_items', lambda: sink.copy(
+            'oem.catalog_items',
+            ['oem_code', 'part_number', 'part_number_type', 'description_es', 'group_code',
+             'weight_kg', 'model_codes', 'engine_codes', 'list_price', 'net_price',
+             'currency_code', 'oem_lead_time_days', 'is_discontinued'],
+            self.oem_catalog_items()))
+        return report
+
+    def _load_reference_codes(self, sink):
+        for table, column in (('cat.uom_codes', 'uom_code'), ('cat.source_codes', 'source_code'),
+                              ('cat.condition_codes', 'condition_code')):
+            rows = {'cat.uom_codes': UOM_CODES, 'cat.source_codes': SOURCE_CODES,
+                    'cat.condition_codes': CONDITION_CODES}[table]
+            sink.executemany(
+                f'INSERT INTO {table} ({column}, name_es) VALUES (%s, %s) ON CONFLICT ({column}) DO NOTHING',
+                rows)
+        sink.executemany(
+            'INSERT INTO cat.equipment_types (type_code, category, name) VALUES (%s, %s, %s) '
+            'ON CONFLICT (type_code) DO NOTHING',
+            EQUIPMENT_TYPES)
+        return len(UOM_CODES) + len(SOURCE_CODES) + len(CONDITION_CODES) + len(EQUIPMENT_TYPES)
+
+
+# Child tables first so foreign keys never block the delete.
+PURGE_STATEMENTS = [
+    ('inv.transactions', f"DELETE FROM inv.transactions WHERE internal_sku LIKE '{PREFIX}-P%'"),
+    ('inv.stock', f"DELETE FROM inv.stock WHERE internal_sku LIKE '{PREFIX}-P%'"),
+    ('oem.catalog_items', f"DELETE FROM oem.catalog_items WHERE oem_code LIKE '{PREFIX}O%'"),
+    ('inv.product_master', f"DELETE FROM inv.product_master WHERE internal_sku LIKE '{PREFIX}-P%'"),
+    ('oem.brands', f"DELETE FROM oem.brands WHERE oem_code LIKE '{PREFIX}O%'"),
+    ('inv.warehouses', f"DELETE FROM inv.warehouses WHERE warehouse_code LIKE '{PREFIX}-W%'"),
+    ('cat.equipment', f"DELETE FROM cat.equipment WHERE equipment_code LIKE '{PREFIX}-E%'"),
+    ('cat.clients', f"DELETE FROM cat.clients WHERE client_code LIKE '{PREFIX}-C%'"),
+    ('cat.technicians', f"DELETE FROM cat.technicians WHERE employee_code LIKE '{PREFIX}-T%'"),
+    ('cat.taxonomy_groups', f"DELETE FROM cat.taxonomy_groups WHERE system_code LIKE '{PREFIX}%'"),
+    ('cat.taxonomy_subsystems', f"DELETE FROM cat.taxonomy_subsystems WHERE system_code LIKE '{PREFIX}%'"),
+    ('cat.taxonomy_systems', f"DELETE FROM cat.taxonomy_systems WHERE system_code LIKE '{PREFIX}%'"),
+    ('cat.equipment_types', f"DELETE FROM cat.equipment_types WHERE type_code LIKE '{PREFIX}-%'"),
+    ('cat.uom_codes', f"DELETE FROM cat.uom_codes WHERE uom_code LIKE '{PREFIX}-%'"),
+    ('cat.source_codes', f"DELETE FROM cat.source_codes WHERE source_code LIKE '{PREFIX}-%'"),
+    ('cat.condition_codes', f"DELETE FROM cat.condition_codes WHERE condition_code LIKE '{PREFIX}-%'"),
+]
+
+ANALYZE_TABLES = [
+    'cat.clients', 'cat.equipment', 'cat.technicians', 'cat.taxonomy_groups',
+    'inv.product_master', 'inv.stock', 'inv.transactions', 'oem.catalog_items',
+]
+
+
+def purge(cursor, keep_triggers=False):
+    report = []
+    if not keep_triggers:
+        set_history_triggers(cursor.execute, enabled=False)
+    for table, statement in PURGE_STATEMENTS:
+        start = time.perf_counter()
+        cursor.execute(statement)
+        report.append({'name': table, 'rows': cursor.rowcount, 'seconds': round(time.perf_counter() - start, 2)})
+    if not keep_triggers:
+        set_history_triggers(cursor.execute, enabled=True)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=1.0, help='1.0 = 1M transactions, 100k OEM items')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--days', type=int, default=365, help='Days of transaction history')
+    parser.add_argument('--batch-size', type=int, default=50_000, help='Rows per COPY')
+    parser.add_argument('--keep-triggers', action='store_true',
+                        help='Leave inv.transactions/inv.stock triggers enabled during load/purge')
+    parser.add_argument('--refresh-views', action='store_true',
+                        help='Refresh the kpi materialized views after loading')
+    parser.add_argument('--dry-run', action='store_true', help='Generate and format rows without a database')
+    parser.add_argument('--purge', action='store_true', help='Delete the synthetic data and exit')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    from .results import emit
+
+    generator = DataGenerator(scale=args.scale, seed=args.seed, days=args.days)
+    meta = {'scale': args.scale, 'seed': args.seed}
+
+    if args.dry_run:
+        report = generator.load(DryRunSink())
+        emit('datagen', 'dry-run', report, output=args.output, **meta)
+        return
+
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'forge_api.settings')
+    django.setup()
+
+    from django.db import connection, transaction
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if args.purge:
+            report = purge(cursor, keep_triggers=args.keep_triggers)
+            mode = 'purge'
+        else:
+            report = generator.load(CopySink(cursor, batch_size=args.batch_size),
+                                    keep_triggers=args.keep_triggers)
+            mode = 'load'
+
+    with connection.cursor() as cursor:
+        if not args.purge:
+            for table in ANALYZE_TABLES:
+                cursor.execute(f'ANALYZE {table}')
+            if args.refresh_views:
+                cursor.execute('SELECT kpi.refresh_all_materialized_views()')
+
+    emit('datagen', mode, report, output=args.output, **meta)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,622 @@
+"""
+Micro-benchmarks for serializers, JSON, search, the quote engine and stored procedures.
+
+    python -m benchmarks.micro                               # every group
+    python -m benchmarks.micro --group serializers --group quote --iterations 200
+    python -m benchmarks.micro --no-db --output bench-results/micro.json
+
+Groups:
+
+``serializers``  DRF serializers over in-memory model instances (no DB).
+``json``         Rendering and parsing the largest API payload, stock DRF vs orjson (no DB).
+``quote``        QuoteCalculationEngine totals and validation (no DB).
+``pdf``          Quote PDF with 500 lines, rendered and from cache (no DB).
+``forecast``     Batch demand forecast of 50k SKUs x 36 months (no DB).
+``rules``        Work-order writes with 50 active business rules.
+``audit``        Stock movements with no audit, full-row, diff and buffered audit.
+``search``       UnifiedSearchService and API list endpoints with ``?search=``.
+``procedures``   Read-only stored procedures through ``core.metrics.callproc``.
+
+``search``, ``procedures``, ``audit`` and the ``rules`` writes need a database loaded with
+``python -m benchmarks.datagen``; a benchmark that fails (missing function,
+schema drift) is reported with an ``error`` field instead of timings.
+"""
+import argparse
+import os
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from .results import emit, summarize
+
+SEARCH_TERMS = ['Filtro', 'Toyota', 'BN-P00001', 'Hilux', 'Bomba', 'Sensor', 'Ranger', 'BN00000042']
+
+
+class Benchmark:
+    def __init__(self, name, group, setup, requires_db):
+        self.name = name
+        self.group = group
+        self.setup = setup
+        self.requires_db = requires_db
+
+
+REGISTRY = []
+
+
+def benchmark(group, requires_db=False):
+    """
+    Register ``setup``; it returns the zero-argument callable to time, or
+    ``(callable, teardown)`` when it leaves something to clean up.
+    """
+    def register(setup):
+        REGISTRY.append(Benchmark(f'{group}.{setup.__name__}', group, setup, requires_db))
+        return setup
+    return register
+
+
+def cycle(values):
+    state = {'i': 0}
+
+    def next_value():
+        value = values[state['i'] % len(values)]
+        state['i'] += 1
+        return value
+    return next_value
+
+
+# -- serializers -------------------------------------------------------------
+
+@benchmark('serializers')
+def client_list_500():
+    from core.models import Client
+    from core.serializers import ClientSerializer
+
+    clients = [
+        Client(client_id=i, client_code=f'BN-C{i:07d}', type='EMPRESA', name=f'Cliente {i}',
+               email=f'cliente{i}@bench.example', city='Monterrey', credit_limit=Decimal('50000.00'),
+               credit_used=Decimal('1250.00'), payment_days=30, status='ACTIVE')
+        for i in range(500)
+    ]
+    return lambda: ClientSerializer(clients, many=True).data
+
+
+@benchmark('serializers')
+def product_list_500():
+    from core.models import ProductMaster
+    from core.serializers import ProductMasterSerializer
+
+    products = [
+        ProductMaster(internal_sku=f'BN-P{i:07d}', group_code='BN01-01-001', name=f'Filtro {i}',
+                      brand='Toyota', source_code='BN-OEM', condition_code='BN-NEW', uom_code='BN-PZA',
+                      standard_cost=Decimal('125.50'), avg_cost=Decimal('120.00'))
+        for i in range(500)
+    ]
+    return lambda: ProductMasterSerializer(products, many=True).data
+
+
+@benchmark('serializers')
+def oem_catalog_list_500():
+    from core.models import OEMBrand, OEMCatalogItem
+    from core.serializers import OEMCatalogItemSerializer
+
+    # oem_code is a to_field FK (SlugRelatedField): attach the brand so
+    # serializing does not query it.
+    brand = OEMBrand(oem_code='BNO001', name='Toyota')
+    items = []
+    for i in range(500):
+        item = OEMCatalogItem(catalog_id=i, part_number=f'BN{i:09d}', description_es=f'Balata {i}',
+                              model_codes=['Hilux', 'Tacoma'], engine_codes=['E01'],
+                              list_price=Decimal('899.00'), net_price=Decimal('719.20'))
+        item.oem_code = brand
+        item.group_code_id = 'BN01-01-001'
+        items.append(item)
+    return lambda: OEMCatalogItemSerializer(items, many=True).data
+
+
+# -- json --------------------------------------------------------------------
+
+def _oem_catalog_payload(count):
+    """A paginated OEM catalog response: the largest payload the API serves."""
+    from core.models import OEMBrand, OEMCatalogItem
+    from core.serializers import OEMCatalogItemSerializer
+
+    brand = OEMBrand(oem_code='BNO001', name='Toyota')
+    items = []
+    for i in range(count):
+        item = OEMCatalogItem(catalog_id=i, part_number=f'BN{i:09d}', description_es=f'Balata {i}',
+                              description_en=f'Brake pad {i}', model_codes=['Hilux', 'Tacoma', 'Fortuner'],
+                              engine_codes=['2GD-FTV', '1GR-FE'], vin_patterns=['MR0*', 'AHT*'],
+                              list_price=Decimal('899.00'), net_price=Decimal('719.20'))
+        item.oem_code = brand
+        item.group_code_id = 'BN01-01-001'
+        items.append(item)
+    return {'next': None, 'previous': None, 'results': OEMCatalogItemSerializer(items, many=True).data}
+
+
+def _render(renderer_class):
+    payload = _oem_catalog_payload(1000)
+    renderer = renderer_class()
+    return lambda: renderer.render(payload)
+
+
+def _parse(parser_class):
+    import io
+
+    from rest_framework.renderers import JSONRenderer
+
+    body = JSONRenderer().render(_oem_catalog_payload(1000))
+    parser = parser_class()
+    return lambda: parser.parse(io.BytesIO(body), 'application/json', {})
+
+
+@benchmark('json')
+def render_oem_catalog_1000_drf():
+    from rest_framework.renderers import JSONRenderer
+    return _render(JSONRenderer)
+
+
+@benchmark('json')
+def render_oem_catalog_1000_orjson():
+    from core.renderers import ORJSONRenderer
+    return _render(ORJSONRenderer)
+
+
+@benchmark('json')
+def parse_oem_catalog_1000_drf():
+    from rest_framework.parsers import JSONParser
+    return _parse(JSONParser)
+
+
+@benchmark('json')
+def parse_oem_catalog_1000_orjson():
+    from core.renderers import ORJSONParser
+    return _parse(ORJSONParser)
+
+
+# -- quote engine ------------------------------------------------------------
+
+def _quote_items(count):
+    return [
+        {'hours': Decimal('1.5') + i % 4, 'hourly_rate': Decimal('550.00'), 'quantity': 1 + i % 3,
+         'material_cost': Decimal('320.75') * (i % 5)}
+        for i in range(count)
+    ]
+
+
+@benchmark('quote')
+def totals_10_items():
+    from frontend.services.quote_calculation_engine import QuoteCalculationEngine
+
+    engine, items = QuoteCalculationEngine(), _quote_items(10)
+    return lambda: engine.calculate_quote_totals(items, discount_percent=Decimal('5'), tax_percent=Decimal('16'))
+
+
+@benchmark('quote')
+def totals_200_items():
+    from frontend.services.quote_calculation_engine import QuoteCalculationEngine
+
+    engine, items = QuoteCalculationEngine(), _quote_items(200)
+    return lambda: engine.calculate_quote_totals(items, discount_percent=Decimal('5'), tax_percent=Decimal('16'))
+
+
+@benchmark('quote')
+def validate_business_rules():
+    from frontend.services.quote_calculation_engine import QuoteCalculationEngine
+
+    engine = QuoteCalculationEngine()
+    totals = engine.calculate_quote_totals(_quote_items(10))
+    quote = dict(totals, items=_quote_items(10), valid_until=date.today() + timedelta(days=15))
+    return lambda: engine.validate_business_rules(quote)
+
+
+# -- PDF rendering -----------------------------------------------------------
+
+def _pdf_quote(count):
+    items = [
+        {'description': f'Servicio de mantenimiento preventivo {i} con revisión de frenos y fluidos',
+         'quantity': 1 + i % 3, 'hours': '1.50', 'hourly_rate': '550.00', 'line_total': f'{825 * (1 + i % 3)}.00'}
+        for i in range(count)
+    ]
+    return {'quote_id': 1, 'quote_number': 'QT-BENCH-0001', 'quote_date': '2026-01-15',
+            'updated_at': '2026-01-15T10:00:00Z', 'client': {'name': 'Cliente Benchmark'},
+            'items': items, 'subtotal': '1000.00', 'tax_percent': '16.00', 'tax_amount': '160.00',
+            'total': '1160.00', 'total_hours': '750.00', 'terms_and_conditions': 'Vigencia 15 días.'}
+
+
+@benchmark('pdf')
+def quote_pdf_500_lines():
+    from frontend.services.quote_pdf_generator import QuotePDFGenerator
+
+    generator, quote = QuotePDFGenerator(), _pdf_quote(500)
+    return lambda: generator.generate_pdf(quote)
+
+
+@benchmark('pdf')
+def quote_pdf_500_lines_cached():
+    from frontend.services.document_renderer import DocumentRenderer
+
+    renderer, quote = DocumentRenderer(), _pdf_quote(500)
+    renderer.render('quote', quote)
+    return lambda: renderer.render('quote', quote)
+
+
+# -- demand forecast ---------------------------------------------------------
+
+def _demand_matrix(skus, months):
+    """Smooth, seasonal and intermittent demand plus SKUs introduced late."""
+    import numpy as np
+    from core.forecasting import DemandMatrix, SEASON
+
+    rng = np.random.default_rng(41)
+    base = rng.gamma(2.0, 10.0, size=(skus, 1))
+    season = 1 + 0.4 * np.sin(2 * np.pi * np.arange(months) / SEASON) * (np.arange(skus) % 3 == 0)[:, None]
+    values = rng.poisson(base * season).astype(float)
+    intermittent = np.arange(skus) % 2 == 1
+    values[intermittent] *= rng.random((intermittent.sum(), months)) < 0.25
+    values[::7, :months // 2] = 0
+    return DemandMatrix(np.array([f'BN-P{i:07d}' for i in range(skus)], dtype=object), 2023 * 12, values)
+
+
+@benchmark('forecast')
+def forecast_50k_skus_36_months():
+    from core.forecasting import forecast
+
+    matrix = _demand_matrix(50_000, 36)
+    return lambda: forecast(matrix)
+
+
+# -- search ------------------------------------------------------------------
+
+def _unified_search(search_type):
+    from frontend.services.unified_search_service import UnifiedSearchService
+
+    service, term = UnifiedSearchService(), cycle(SEARCH_TERMS)
+    # A specific search_type is never cached, so every call hits the database.
+    return lambda: service.search(term(), search_type=search_type, limit=50)
+
+
+@benchmark('search', requires_db=True)
+def unified_products():
+    return _unified_search('products')
+
+
+@benchmark('search', requires_db=True)
+def unified_oem():
+    return _unified_search('oem')
+
+
+@benchmark('search', requires_db=True)
+def unified_equipment():
+    return _unified_search('equipment')
+
+
+def _api_list(viewset, params=None):
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    factory, view = APIRequestFactory(), viewset.as_view({'get': 'list'})
+    user = User(pk=0, username='bench', is_staff=True, is_superuser=True)
+    term = cycle(SEARCH_TERMS)
+
+    def call():
+        request = factory.get('/', dict(params or {}, search=term()))
+        force_authenticate(request, user=user)
+        response = view(request)
+        response.render()
+        if response.status_code != 200:
+            raise RuntimeError(f'HTTP {response.status_code}: {response.content[:200]!r}')
+    return call
+
+
+@benchmark('search', requires_db=True)
+def api_clients():
+    from core.views import ClientViewSet
+    return _api_list(ClientViewSet)
+
+
+@benchmark('search', requires_db=True)
+def api_equipment():
+    from core.views import EquipmentViewSet
+    return _api_list(EquipmentViewSet)
+
+
+@benchmark('search', requires_db=True)
+def api_oem_catalog_items():
+    from core.views import OEMCatalogItemViewSet
+    return _api_list(OEMCatalogItemViewSet)
+
+
+# -- stored procedures -------------------------------------------------------
+
+def _procedure(name, params):
+    from django.db import connection
+    from core.metrics import callproc
+
+    def call():
+        with connection.cursor() as cursor:
+            callproc(cursor, name, params() if callable(params) else params)
+            cursor.fetchall()
+    return call
+
+
+def _sample_skus():
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT internal_sku FROM inv.product_master WHERE internal_sku LIKE 'BN-P%' "
+                       "ORDER BY internal_sku LIMIT 20")
+        skus = [row[0] for row in cursor.fetchall()]
+    if not skus:
+        raise RuntimeError('No synthetic products; run python -m benchmarks.datagen first')
+    return cycle(skus)
+
+
+@benchmark('procedures', requires_db=True)
+def get_available_stock():
+    return _procedure('inv.get_available_stock', [None, None])
+
+
+@benchmark('procedures', requires_db=True)
+def calculate_inventory_age():
+    return _procedure('inv.calculate_inventory_age', [90])
+
+
+@benchmark('procedures', requires_db=True)
+def analyze_abc_inventory():
+    return _procedure('kpi.analyze_abc_inventory', [None, 0])
+
+
+@benchmark('procedures', requires_db=True)
+def forecast_demand_per_sku():
+    sku = _sample_skus()
+    return _procedure('kpi.forecast_demand', lambda: [sku(), 12, 3])
+
+
+@benchmark('procedures', requires_db=True)
+def get_system_stats():
+    return _procedure('app.get_system_stats', [])
+
+
+# -- business rules ------------------------------------------------------------
+
+BENCH_RULES = 50
+
+# (condition, action) cycled over the 50 rules; none match the inserted order.
+RULE_TEMPLATES = [
+    ("NEW.estimated_hours > {n}", 'BLOCK'),
+    ("NEW.technician_id IS NULL AND NEW.status = 'QA'", 'ALERT'),
+    ("NEW.discount_percent > 90 AND NEW.priority = 'BAJA'", 'WARN'),
+    ("NEW.mileage_out < NEW.mileage_in - {n}", 'LOG'),
+    ("EXISTS (SELECT 1 FROM cat.clients c WHERE c.client_id = NEW.client_id AND c.credit_limit < -{n})", 'ALERT'),
+]
+
+
+def _wo_insert(with_rules):
+    from django.db import connection, transaction
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('svc.work_orders') IS NOT NULL, "
+                       "to_regproc('app.compile_business_rules') IS NOT NULL")
+        has_table, has_compiler = cursor.fetchone()
+        if not has_table:
+            raise RuntimeError('svc.work_orders does not exist in this database')
+        if with_rules and not has_compiler:
+            raise RuntimeError('Business rule compiler missing; run python manage.py migrate')
+        cursor.execute("SELECT equipment_id, client_id FROM cat.equipment ORDER BY equipment_id LIMIT 1")
+        row = cursor.fetchone()
+        if row is None:
+            raise RuntimeError('No equipment; run python -m benchmarks.datagen first')
+        equipment_id, client_id = row
+
+    def remove_rules():
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM app.business_rules WHERE rule_code LIKE 'BENCH-%%'")
+
+    if with_rules:
+        remove_rules()
+        rows = []
+        for i in range(BENCH_RULES):
+            condition, action = RULE_TEMPLATES[i % len(RULE_TEMPLATES)]
+            rows.append((f'BENCH-{i:02d}', f'Benchmark {i}', condition.format(n=1000 + i), action,
+                         'work_orders', 'svc', 'ANY', 'LOW', i))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO app.business_rules (rule_code, rule_name, condition_text, condition_type, "
+                "action_type, action_text, applies_to_table, applies_to_schema, trigger_event, severity, "
+                "execution_order) SELECT r.code, r.name, r.cond, 'SQL', r.action, '-', r.tbl, r.schema, "
+                "r.event, r.severity, r.ord FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[], "
+                "%s::text[], %s::text[], %s::text[], %s::text[], %s::int[]) "
+                "AS r(code, name, cond, action, tbl, schema, event, severity, ord)",
+                [list(column) for column in zip(*rows)],
+            )
+
+    counter = cycle(range(100000))
+
+    def insert():
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO svc.work_orders (wo_number, equipment_id, client_id, service_type, status, "
+                    "estimated_hours, discount_percent) VALUES (%s, %s, %s, 'PREVENTIVO', 'DRAFT', 4, 0) "
+                    "RETURNING wo_id",
+                    [f'BN-BENCH-{counter()}', equipment_id, client_id],
+                )
+                cursor.execute("UPDATE svc.work_orders SET estimated_hours = 6 WHERE wo_id = %s", cursor.fetchone())
+            transaction.set_rollback(True)
+    return (insert, remove_rules) if with_rules else insert
+
+
+@benchmark('rules', requires_db=True)
+def wo_write_no_rules():
+    return _wo_insert(with_rules=False)
+
+
+@benchmark('rules', requires_db=True)
+def wo_write_50_sql_rules():
+    return _wo_insert(with_rules=True)
+
+
+@benchmark('rules')
+def evaluate_50_python_rules():
+    from core import business_rules
+    from core.models import BusinessRule, WorkOrder
+
+    conditions = [
+        ("python", "estimated_hours is not None and estimated_hours > {n}"),
+        ("python", "technician_id is None and status == 'QA'"),
+        ("regex", r"wo_number:^XX-\d{{{n}}}$"),
+        ("python", "discount_amount is not None and discount_amount > {n} * 10"),
+        ("regex", "customer_complaints:(?i)fraude{n}"),
+    ]
+    rules = []
+    for i in range(BENCH_RULES):
+        condition_type, condition = conditions[i % len(conditions)]
+        rules.append(business_rules.compile_rule(BusinessRule(
+            rule_code=f'BENCH-{i:02d}', rule_name=f'Benchmark {i}', condition_type=condition_type,
+            condition_text=condition.format(n=1000 + i), action_type='alert', trigger_event='any',
+        )))
+    order = WorkOrder(wo_id=1, wo_number='BN-WO0000001', equipment_id=1, client_id=1, service_type='REPAIR',
+                      status='DRAFT', priority='NORMAL', estimated_hours=Decimal('4.00'),
+                      discount_amount=Decimal('0.00'), customer_complaints='Ruido en el motor')
+    return lambda: business_rules.evaluate(rules, order, 'UPDATE')
+
+
+# -- audit -------------------------------------------------------------------
+
+# pg_temp copy of the old row-level app.audit_changes(), keyed by TG_ARGV[0]
+# instead of wo_id, to measure what full-row auditing used to cost.
+FULL_ROW_AUDIT = """
+CREATE OR REPLACE FUNCTION pg_temp.bench_full_row_audit() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO app.audit_logs (table_name, record_id, action, changed_by, old_values, new_values)
+    VALUES (TG_TABLE_NAME, (to_jsonb(COALESCE(NEW, OLD)) ->> TG_ARGV[0])::bigint, TG_OP,
+            NULLIF(current_setting('app.user_id', TRUE), '')::INT,
+            CASE WHEN TG_OP IN ('UPDATE', 'DELETE') THEN row_to_json(OLD) END,
+            CASE WHEN TG_OP IN ('INSERT', 'UPDATE') THEN row_to_json(NEW) END);
+    RETURN NULL;
+END;
+$$
+"""
+
+AUDIT_MODES = ('none', 'full_row', 'diff', 'buffered')
+
+
+def _stock_audit(mode, batch):
+    """Audit ``inv.stock`` as ``mode`` until teardown restores its configuration."""
+    from django.db import connection, transaction
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regproc('app.enable_audit') IS NOT NULL")
+        if not cursor.fetchone()[0]:
+            raise RuntimeError('Statement audit missing; run python manage.py migrate')
+        cursor.execute("SELECT ignore_columns, buffered FROM app.audited_tables WHERE table_name = 'inv.stock'::regclass")
+        previous = cursor.fetchone()
+        cursor.execute("SELECT s.stock_id, s.internal_sku, s.warehouse_code FROM inv.stock s "
+                       "WHERE s.qty_on_hand >= 10 ORDER BY s.stock_id LIMIT 100")
+        rows = cursor.fetchall()
+        if len(rows) < 100:
+            raise RuntimeError('Not enough stock; run python -m benchmarks.datagen first')
+
+        cursor.execute("SELECT app.disable_audit('inv.stock')")
+        if mode == 'full_row':
+            cursor.execute(FULL_ROW_AUDIT)
+            cursor.execute("CREATE TRIGGER bench_full_row_audit AFTER INSERT OR UPDATE OR DELETE ON inv.stock "
+                           "FOR EACH ROW EXECUTE FUNCTION pg_temp.bench_full_row_audit('stock_id')")
+        elif mode in ('diff', 'buffered'):
+            cursor.execute("SELECT app.enable_audit('inv.stock', %s, %s)",
+                           [previous[0] if previous else ['updated_at'], mode == 'buffered'])
+
+    def restore():
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER IF EXISTS bench_full_row_audit ON inv.stock")
+            if previous:
+                cursor.execute("SELECT app.enable_audit('inv.stock', %s, %s)", list(previous))
+            else:
+                cursor.execute("SELECT app.disable_audit('inv.stock')")
+
+    movements = cycle(rows)
+    stock_ids = [row[0] for row in rows]
+
+    def move_one():
+        # An OUT transaction; inv.update_stock_on_transaction() updates inv.stock
+        _, sku, warehouse = movements()
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("INSERT INTO inv.transactions (txn_type, internal_sku, qty, from_warehouse) "
+                               "VALUES ('OUT', %s, 1, %s)", [sku, warehouse])
+            transaction.set_rollback(True)
+
+    def reserve_batch():
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("UPDATE inv.stock SET qty_reserved = qty_reserved + 1, updated_at = NOW() "
+                               "WHERE stock_id = ANY(%s)", [stock_ids])
+            transaction.set_rollback(True)
+
+    return (reserve_batch if batch else move_one), restore
+
+
+def _register_audit_benchmarks():
+    for mode in AUDIT_MODES:
+        for batch, name in ((False, f'stock_movement_{mode}'), (True, f'stock_reserve_100_{mode}')):
+            def setup(mode=mode, batch=batch):
+                return _stock_audit(mode, batch)
+            setup.__name__ = name
+            benchmark('audit', requires_db=True)(setup)
+
+
+_register_audit_benchmarks()
+
+
+def run(entry, iterations, warmup):
+    teardown = None
+    try:
+        func = entry.setup()
+        if isinstance(func, tuple):
+            func, teardown = func
+        for _ in range(warmup):
+            func()
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+    except Exception as e:
+        return {'name': entry.name, 'group': entry.group, 'error': f'{type(e).__name__}: {e}'[:500]}
+    finally:
+        if teardown is not None:
+            teardown()
+    result = summarize(entry.name, samples)
+    result['group'] = entry.group
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--group', action='append', dest='groups',
+                        choices=sorted({entry.group for entry in REGISTRY}))
+    parser.add_argument('--filter', default='', help='Only benchmarks whose name contains this text')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--no-db', action='store_true', help='Skip benchmarks that need the database')
+    parser.add_argument('--output', help='Write the JSON result to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'forge_api.settings')
+    django.setup()
+
+    selected = [
+        entry for entry in REGISTRY
+        if (not args.groups or entry.group in args.groups)
+        and args.filter in entry.name
+        and not (args.no_db and entry.requires_db)
+    ]
+    results = [run(entry, args.iterations, args.warmup) for entry in selected]
+    emit('micro', ','.join(args.groups or ['all']), results, output=args.output,
+         iterations=args.iterations)
+
+
+if __name__ == '__main__':
+    main()
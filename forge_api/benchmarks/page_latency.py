@@ -0,0 +1,137 @@
+"""
+Page latency benchmark (p50/p95) for frontend pages.
+
+Two modes:
+
+``live``      Requests real pages from a running server, e.g. gunicorn with
+              sync workers vs gunicorn + uvicorn workers::
+
+                  python -m benchmarks.page_latency live \\
+                      --base-url http://localhost:8000 --sessionid <cookie> \\
+                      --path /inventory/stock/dashboard/ --requests 200 --concurrency 10
+
+``fanout``    Self-contained: simulates a backend with fixed latency and
+              compares serial vs ``asyncio.gather`` fan-out for a page shaped
+              like WarehouseAdvancedListView (1 list call + 2 calls per row)::
+
+                  python -m benchmarks.page_latency fanout --rows 20 --backend-ms 15
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from .results import emit, summarize
+
+
+async def run_live(args):
+    cookies = {'sessionid': args.sessionid} if args.sessionid else {}
+    samples = []
+    errors = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.base_url, cookies=cookies,
+                                 timeout=args.timeout, follow_redirects=False) as client:
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(args.path)
+                samples.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        for _ in range(args.warmup):
+            await client.get(args.path)
+        await asyncio.gather(*(one() for _ in range(args.requests)))
+
+    result = summarize(args.path, samples)
+    result.update({'concurrency': args.concurrency, 'non_200': errors})
+    return [result]
+
+
+async def run_fanout(args):
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'forge_api.settings')
+    django.setup()
+
+    from frontend.services.api_client import ForgeAPIClient
+    from frontend.services.async_api_client import AsyncForgeAPIClient
+
+    delay = args.backend_ms / 1000.0
+    rows = [{'warehouse_id': i, 'warehouse_code': f'W{i}'} for i in range(args.rows)]
+
+    async def backend(request):
+        await asyncio.sleep(delay)
+        if request.url.path.endswith('/warehouses/'):
+            return httpx.Response(200, json={'count': len(rows), 'results': rows})
+        return httpx.Response(200, json={'count': 1, 'results': []})
+
+    def make_client():
+        sync_client = ForgeAPIClient(base_url='http://backend.bench/api/v1/')
+        return AsyncForgeAPIClient(sync_client, transport=httpx.MockTransport(backend))
+
+    async def serial_page():
+        async with make_client() as client:
+            data = await client.get('warehouses/')
+            for row in data['results']:
+                await client.get('bins/', params={'warehouse_code': row['warehouse_code']})
+                await client.get('stock/', params={'warehouse': row['warehouse_id']})
+
+    async def gathered_page():
+        async with make_client() as client:
+            data = await client.get('warehouses/')
+            await client.gather(*(
+                client.gather(
+                    client.get('bins/', params={'warehouse_code': row['warehouse_code']}),
+                    client.get('stock/', params={'warehouse': row['warehouse_id']}),
+                )
+                for row in data['results']
+            ))
+
+    results = []
+    for name, page in (('serial', serial_page), ('gathered', gathered_page)):
+        samples = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            await page()
+            samples.append((time.perf_counter() - start) * 1000)
+        result = summarize(name, samples)
+        result.update({'rows': args.rows, 'backend_ms': args.backend_ms,
+                       'backend_calls': 1 + 2 * args.rows})
+        results.append(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='mode', required=True)
+
+    live = sub.add_parser('live', help='Benchmark a running server')
+    live.add_argument('--base-url', default='http://localhost:8000')
+    live.add_argument('--path', default='/inventory/stock/dashboard/')
+    live.add_argument('--sessionid', default='', help='Value of an authenticated sessionid cookie')
+    live.add_argument('--requests', type=int, default=100)
+    live.add_argument('--concurrency', type=int, default=10)
+    live.add_argument('--warmup', type=int, default=5)
+    live.add_argument('--timeout', type=float, default=30.0)
+
+    fanout = sub.add_parser('fanout', help='Serial vs gathered fan-out against a simulated backend')
+    fanout.add_argument('--rows', type=int, default=20)
+    fanout.add_argument('--backend-ms', type=float, default=15.0)
+    fanout.add_argument('--requests', type=int, default=20)
+
+    for command in (live, fanout):
+        command.add_argument('--output', help='Write the JSON result to this file instead of stdout')
+
+    args = parser.parse_args(argv)
+    runner = run_live if args.mode == 'live' else run_fanout
+    results = asyncio.run(runner(args))
+    emit('page_latency', args.mode, results, output=args.output)
+
+
+if __name__ == '__main__':
+    main()
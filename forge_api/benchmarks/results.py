@@ -0,0 +1,98 @@
+"""
+Shared helpers for benchmark results.
+
+Every benchmark prints (or writes with ``--output``) a JSON document::
+
+    {"benchmark": "micro", "mode": "...", "meta": {...}, "results": [...]}
+
+``meta`` records the git commit, host and versions so two files can be
+compared with ``python -m benchmarks.compare``. Each entry in ``results`` has
+a unique ``name`` plus timing fields in milliseconds (``p50_ms``, ``p95_ms``,
+``mean_ms``...).
+"""
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(name, samples_ms):
+    return {
+        'name': name,
+        'requests': len(samples_ms),
+        'p50_ms': round(percentile(samples_ms, 50), 2),
+        'p95_ms': round(percentile(samples_ms, 95), 2),
+        'p99_ms': round(percentile(samples_ms, 99), 2),
+        'mean_ms': round(statistics.fmean(samples_ms), 2) if samples_ms else 0.0,
+        'max_ms': round(max(samples_ms), 2) if samples_ms else 0.0,
+    }
+
+
+def git_commit():
+    """Short hash of HEAD (with ``-dirty`` for uncommitted changes), or None."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=10, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'],
+            capture_output=True, text=True, timeout=30, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return f'{commit}-dirty' if dirty else commit
+
+
+def metadata(**extra):
+    meta = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'host': platform.node(),
+        'python': platform.python_version(),
+    }
+    try:
+        import django
+        meta['django'] = django.get_version()
+    except ImportError:
+        pass
+    meta.update(extra)
+    return meta
+
+
+def emit(benchmark, mode, results, output=None, **meta):
+    """Write the result document to ``output`` (a path) or stdout."""
+    document = {
+        'benchmark': benchmark,
+        'mode': mode,
+        'meta': metadata(**meta),
+        'results': results,
+    }
+    if output:
+        directory = os.path.dirname(os.path.abspath(output))
+        os.makedirs(directory, exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as fh:
+            json.dump(document, fh, indent=2)
+            fh.write('\n')
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    return document
+
+
+def load(path):
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
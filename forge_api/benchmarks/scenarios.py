@@ -0,0 +1,197 @@
+"""
+Locust-style load scenarios for the hot pages.
+
+Simulated users are spawned at ``--spawn-rate`` per second up to ``--users``;
+each one loops until ``--duration`` expires, picking a task at random by
+weight and waiting a random think time between requests::
+
+    python -m benchmarks.scenarios list
+    python -m benchmarks.scenarios run --base-url http://localhost:8000 \\
+        --username admin --password secret --users 20 --spawn-rate 5 --duration 60
+    python -m benchmarks.scenarios run --scenario api --token <JWT access token>
+
+Paths may contain ``{term}`` (a search term) and ``{page}``. Every non-2xx
+response (including a redirect to the login page) counts as a failure.
+Results are one entry per task plus ``<scenario>.total``, in the JSON format
+read by ``python -m benchmarks.compare``.
+"""
+import argparse
+import asyncio
+import random
+import re
+import time
+
+import httpx
+
+from .results import emit, summarize
+
+SEARCH_TERMS = ['Filtro', 'Toyota', 'Hilux', 'Bomba', 'Sensor', 'Ranger', 'Balata', 'Juan', 'Transportes']
+
+
+class Task:
+    def __init__(self, name, path, weight=1):
+        self.name = name
+        self.path = path
+        self.weight = weight
+
+    def url(self, rng):
+        return self.path.format(term=rng.choice(SEARCH_TERMS), page=rng.randint(1, 5))
+
+
+SCENARIOS = {
+    # Pages users hit most often (frontend, session login).
+    'hot_pages': [
+        Task('dashboard', '/dashboard/', 10),
+        Task('dashboard_data', '/api/dashboard-data/', 10),
+        Task('clients', '/clients/?page={page}', 6),
+        Task('client_search', '/api/search-clients/?q={term}', 6),
+        Task('workorders', '/workorders/', 6),
+        Task('stock_dashboard', '/inventory/stock/dashboard/', 5),
+        Task('products', '/inventory/products/?search={term}', 4),
+        Task('unified_search', '/api/search/unified/?q={term}&limit=20', 4),
+        Task('equipment', '/equipment/?page={page}', 3),
+        Task('taxonomy_tree', '/catalog/taxonomy/', 2),
+        Task('oem_catalog', '/oem/catalog/', 2),
+    ],
+    # REST API list endpoints (JWT, --token).
+    'api': [
+        Task('clients', '/api/v1/clients/?search={term}', 5),
+        Task('equipment', '/api/v1/equipment/?page={page}', 4),
+        Task('stock', '/api/v1/stock/?page={page}', 4),
+        Task('transactions', '/api/v1/transactions/?page={page}', 3),
+        Task('work_orders', '/api/v1/work-orders/', 3),
+        Task('oem_catalog_items', '/api/v1/oem-catalog-items/?search={term}', 3),
+        Task('taxonomy_groups', '/api/v1/taxonomy-groups/', 2),
+    ],
+}
+
+
+async def login(client, username, password):
+    """Log in through the frontend form so the client carries a session cookie."""
+    response = await client.get('/login/')
+    token = client.cookies.get('csrftoken')
+    if not token:
+        match = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', response.text)
+        token = match.group(1) if match else ''
+    response = await client.post(
+        '/login/',
+        data={'username': username, 'password': password, 'csrfmiddlewaretoken': token},
+        headers={'Referer': str(client.base_url) + '/login/'},
+    )
+    if 'sessionid' not in client.cookies:
+        raise SystemExit(f'Login failed (HTTP {response.status_code})')
+
+
+class Stats:
+    def __init__(self):
+        self.samples = {}
+        self.failures = {}
+        self.errors = {}
+
+    def record(self, task, elapsed_ms, failure=None):
+        self.samples.setdefault(task, []).append(elapsed_ms)
+        if failure:
+            self.failures[task] = self.failures.get(task, 0) + 1
+            self.errors[failure] = self.errors.get(failure, 0) + 1
+
+
+async def user_loop(client, tasks, stats, deadline, seed, think_min, think_max):
+    rng = random.Random(seed)
+    weights = [task.weight for task in tasks]
+    while time.monotonic() < deadline:
+        task = rng.choices(tasks, weights=weights)[0]
+        start = time.perf_counter()
+        failure = None
+        try:
+            response = await client.get(task.url(rng))
+            if not 200 <= response.status_code < 300:
+                failure = f'HTTP {response.status_code}'
+        except httpx.HTTPError as e:
+            failure = type(e).__name__
+        stats.record(task.name, (time.perf_counter() - start) * 1000, failure)
+        await asyncio.sleep(rng.uniform(think_min, think_max))
+
+
+async def run_scenario(args):
+    tasks = SCENARIOS[args.scenario]
+    cookies = {'sessionid': args.sessionid} if args.sessionid else {}
+    headers = {'Authorization': f'Bearer {args.token}'} if args.token else {}
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    stats = Stats()
+
+    async with httpx.AsyncClient(base_url=args.base_url, cookies=cookies, headers=headers,
+                                 timeout=args.timeout, follow_redirects=False, limits=limits) as client:
+        if args.username:
+            await login(client, args.username, args.password)
+
+        started = time.monotonic()
+        deadline = started + args.duration
+        users = []
+        for i in range(args.users):
+            users.append(asyncio.create_task(user_loop(
+                client, tasks, stats, deadline, seed=args.seed + i,
+                think_min=args.think_min, think_max=args.think_max,
+            )))
+            if args.spawn_rate and i + 1 < args.users:
+                await asyncio.sleep(1.0 / args.spawn_rate)
+        await asyncio.gather(*users)
+        elapsed = time.monotonic() - started
+
+    results = []
+    for task in tasks:
+        samples = stats.samples.get(task.name, [])
+        result = summarize(f'{args.scenario}.{task.name}', samples)
+        result.update({
+            'failures': stats.failures.get(task.name, 0),
+            'rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        })
+        results.append(result)
+
+    all_samples = [sample for samples in stats.samples.values() for sample in samples]
+    total = summarize(f'{args.scenario}.total', all_samples)
+    total.update({
+        'failures': sum(stats.failures.values()),
+        'rps': round(len(all_samples) / elapsed, 2) if elapsed else 0.0,
+        'errors': stats.errors,
+    })
+    results.append(total)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list', help='Show the scenarios and their weighted tasks')
+
+    run = sub.add_parser('run', help='Run a scenario against a server')
+    run.add_argument('--scenario', choices=sorted(SCENARIOS), default='hot_pages')
+    run.add_argument('--base-url', default='http://localhost:8000')
+    run.add_argument('--username', default='', help='Log in through /login/ before starting')
+    run.add_argument('--password', default='')
+    run.add_argument('--sessionid', default='', help='Value of an authenticated sessionid cookie')
+    run.add_argument('--token', default='', help='JWT access token for the api scenario')
+    run.add_argument('--users', type=int, default=10)
+    run.add_argument('--spawn-rate', type=float, default=2.0, help='Users started per second')
+    run.add_argument('--duration', type=float, default=60.0, help='Seconds to run')
+    run.add_argument('--think-min', type=float, default=0.5)
+    run.add_argument('--think-max', type=float, default=2.0)
+    run.add_argument('--seed', type=int, default=42)
+    run.add_argument('--timeout', type=float, default=30.0)
+    run.add_argument('--output', help='Write the JSON result to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for name, tasks in SCENARIOS.items():
+            total = sum(task.weight for task in tasks)
+            print(name)
+            for task in tasks:
+                print(f'  {task.weight / total:>5.0%}  {task.name:<20} {task.path}')
+        return
+
+    results = asyncio.run(run_scenario(args))
+    emit('scenarios', args.scenario, results, output=args.output, users=args.users,
+         duration=args.duration, base_url=args.base_url)
+
+
+if __name__ == '__main__':
+    main()
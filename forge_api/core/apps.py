@@ -20,4 +20,8 @@ class CoreConfig(AppConfig):
         try:
             import core.signals  # noqa
         except ImportError:
-            pass
\ No newline at end of file
+            pass
+
+        # Connection setup (audit user wrapper, pool metrics)
+        import core.database  # noqa
+        import core.metrics  # noqa
\ No newline at end of file
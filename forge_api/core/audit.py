@@ -0,0 +1,188 @@
+"""
+Audit trail helpers.
+
+Audited tables (``app.audited_tables``, migration 0024) get statement-level
+triggers generated by ``app.enable_audit()``: one ``INSERT ... SELECT`` per
+statement over the transition tables, with only the changed columns for an
+UPDATE. Tables enabled with ``buffered = true`` write to the UNLOGGED
+``app.audit_buffer`` instead, and ``flush_buffer`` moves those records into
+``app.audit_logs`` in batches (``python manage.py flush_audit_buffer``).
+
+Searches match diff values with ``@>`` on the GIN ``jsonb_path_ops`` indexes
+and are bounded by ``changed_at`` so the planner prunes partitions
+(``search``). ``timeline`` pages through one record's history newest first
+with a keyset cursor, rebuilding the record after each change with the
+``app.audit_state`` aggregate (migration 0025).
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+DEFAULT_FLUSH_BATCH = 10000
+TIMELINE_PAGE_SIZE = 50
+MAX_TIMELINE_PAGE_SIZE = 200
+
+
+def flush_buffer(batch_size=DEFAULT_FLUSH_BATCH, max_batches=None):
+    """
+    Move buffered audit records to ``app.audit_logs``, one transaction per
+    batch, until the buffer is empty or ``max_batches`` ran. Returns the
+    number of records moved.
+    """
+    moved = batches = 0
+    with connection.cursor() as cursor:
+        while max_batches is None or batches < max_batches:
+            cursor.execute("SELECT app.flush_audit_buffer(%s)", [batch_size])
+            count = cursor.fetchone()[0]
+            moved += count
+            batches += 1
+            if count < batch_size:
+                break
+    return moved
+
+
+def audited_tables():
+    """``{table: {'pk_column', 'ignore_columns', 'buffered'}}`` for the audited tables."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT n.nspname || '.' || c.relname, t.pk_column, t.ignore_columns, t.buffered "
+            "FROM app.audited_tables t JOIN pg_class c ON c.oid = t.table_name "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace ORDER BY 1"
+        )
+        return {
+            table: {'pk_column': pk, 'ignore_columns': ignore, 'buffered': buffered}
+            for table, pk, ignore, buffered in cursor.fetchall()
+        }
+
+
+def parse_value_filter(raw):
+    """
+    ``{column: value}`` from a ``column:value`` query parameter, or from a
+    JSON object. The value is read as JSON when it parses (``qty_on_hand:5``,
+    ``is_active:true``) and as a string otherwise (``status:COMPLETED``).
+    """
+    raw = raw.strip()
+    if raw.startswith('{'):
+        try:
+            values = json.loads(raw)
+        except ValueError:
+            values = None
+        if not isinstance(values, dict) or not values:
+            raise ValueError(f'Filtro inválido: {raw}')
+        return values
+    column, sep, value = raw.partition(':')
+    if not sep or not column.strip():
+        raise ValueError(f'Filtro inválido, se espera columna:valor: {raw}')
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass
+    return {column.strip(): value}
+
+
+def search(queryset, old_values=(), new_values=(), values=(), since=None, until=None):
+    """
+    Narrow an AuditLog queryset to records whose diffs contain every
+    ``{column: value}`` of ``old_values`` / ``new_values`` (``values``: on
+    either side). Each one is a ``@>`` containment, which the jsonb_path_ops
+    indexes answer. Without ``since`` only the last AUDIT_SEARCH_DEFAULT_DAYS
+    days are searched, so older partitions are never read.
+    """
+    if since is None:
+        since = timezone.now() - timedelta(days=settings.AUDIT_SEARCH_DEFAULT_DAYS)
+    queryset = queryset.filter(changed_at__gte=since)
+    if until is not None:
+        queryset = queryset.filter(changed_at__lte=until)
+    for pair in old_values:
+        queryset = queryset.filter(old_values__contains=pair)
+    for pair in new_values:
+        queryset = queryset.filter(new_values__contains=pair)
+    for pair in values:
+        queryset = queryset.filter(Q(old_values__contains=pair) | Q(new_values__contains=pair))
+    return queryset
+
+
+def encode_cursor(changed_at, audit_id):
+    return base64.urlsafe_b64encode(f'{changed_at.isoformat()}|{audit_id}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """``(changed_at, audit_id)`` from ``encode_cursor``; ValueError if malformed."""
+    try:
+        changed_at, audit_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(changed_at), int(audit_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError('Cursor inválido') from e
+
+
+def changes(action, old_values, new_values):
+    """``{column: {'old', 'new'}}`` for one audit record; a missing side is NULL."""
+    old_values, new_values = old_values or {}, new_values or {}
+    if action == 'INSERT':
+        old_values = {}
+    elif action == 'DELETE':
+        new_values = {}
+    return {
+        column: {'old': old_values.get(column), 'new': new_values.get(column)}
+        for column in sorted(old_values.keys() | new_values.keys())
+        if old_values.get(column) != new_values.get(column)
+    }
+
+
+TIMELINE_SQL = """
+    SELECT audit_id, action, changed_by, changed_at, old_values, new_values, state
+    FROM (
+        SELECT audit_id, action, changed_by, changed_at, old_values, new_values,
+               app.audit_state(action, old_values, new_values) OVER (ORDER BY changed_at, audit_id) AS state
+        FROM app.audit_logs
+        WHERE table_name = %s AND record_id = %s {before}
+    ) history
+    ORDER BY changed_at DESC, audit_id DESC
+    LIMIT %s
+"""
+
+
+def timeline(table, record_id, cursor=None, limit=TIMELINE_PAGE_SIZE):
+    """
+    One page of a record's history, newest first, and the cursor of the next
+    page (None on the last one). Each entry has the changed columns and the
+    record's ``state`` after the change, folded from every earlier diff in
+    the same query; DELETE leaves it None. The history is read in index order
+    up to the cursor, and ``changed_at <=`` keeps later partitions out.
+    """
+    params = [table, record_id]
+    before = ''
+    if cursor:
+        changed_at, audit_id = decode_cursor(cursor)
+        before = 'AND changed_at <= %s AND (changed_at, audit_id) < (%s, %s)'
+        params += [changed_at, changed_at, audit_id]
+    params.append(limit + 1)
+    with connection.cursor() as db:
+        db.execute(TIMELINE_SQL.format(before=before), params)
+        rows = db.fetchall()
+    entries = [
+        {
+            'audit_id': audit_id,
+            'action': action,
+            'changed_by': changed_by,
+            'changed_at': changed_at,
+            'changes': changes(action, _json(old_values), _json(new_values)),
+            'state': _json(state),
+        }
+        for audit_id, action, changed_by, changed_at, old_values, new_values, state in rows[:limit]
+    ]
+    next_cursor = None
+    if len(rows) > limit:
+        last = entries[-1]
+        next_cursor = encode_cursor(last['changed_at'], last['audit_id'])
+    return entries, next_cursor
+
+
+def _json(value):
+    # Django turns off psycopg2's jsonb decoding, so raw queries return text.
+    return json.loads(value) if isinstance(value, str) else value
@@ -18,6 +18,26 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def get_technician_id(user):
+    """
+    ``technician_id`` of the active technician whose ``employee_code`` is
+    ``user``'s username (as TechnicianUser.get_technician), or None.
+
+    Auth users and technicians are different tables: columns that reference
+    ``cat.technicians`` (``created_by``, ``app.audit_logs.changed_by``) must
+    never receive ``user.pk``. The result is cached on the user object.
+    """
+    if user is None or not getattr(user, 'is_authenticated', False):
+        return None
+    if not hasattr(user, '_technician_id'):
+        from .models import Technician
+        user._technician_id = (
+            Technician.objects.filter(employee_code=user.get_username(), status='active')
+            .values_list('technician_id', flat=True).first()
+        )
+    return user._technician_id
+
+
 class TechnicianAuthBackend(BaseBackend):
     """
     Custom authentication backend that authenticates against the technicians table
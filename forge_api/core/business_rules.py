@@ -0,0 +1,262 @@
+"""
+Business-rule engine.
+
+``app.business_rules`` rows come in three condition types:
+
+* ``SQL``/``EXPRESSION`` rules are compiled by the database: migration 0023
+  generates one plpgsql trigger function per table (``app.br_<schema>_<table>``)
+  with every active rule inlined in execution order, and recompiles it in the
+  same transaction whenever a rule changes. They run on every write, ORM or
+  raw SQL, and nothing here evaluates them again.
+* ``PYTHON`` rules are expressions over the row's columns
+  (``estimated_hours > 40 and priority != 'URGENT'``). The parsed tree may
+  only hold the node types in ``ALLOWED_NODES`` and call ``SAFE_BUILTINS``
+  by name, and a product may not build a huge value (``MAX_MULTIPLIER``);
+  it is compiled once and evaluated with those builtins only.
+* ``REGEX`` rules are ``column:pattern`` and match when ``re.search`` finds
+  the pattern in the column's text.
+
+Python and regex rules run on ORM writes (``pre_save``/``pre_delete``, see
+``core.signals``) of the ``RULE_MODELS`` whose ``db_table`` is the rule's
+``applies_to_table``. Each worker keeps the compiled predicates grouped by
+table in an immutable ``Snapshot`` (``core.snapshots``). Its version is the
+``app.business_rules`` counter in ``app.table_versions`` (bumped by a
+statement trigger), checked at most once every ``VERSION_CHECK_INTERVAL``
+seconds; writes in the same process drop the snapshot right away.
+"""
+import ast
+import logging
+import re
+from collections import namedtuple
+from decimal import Decimal
+
+from django.db import DatabaseError
+from rest_framework.exceptions import ValidationError
+
+from .models import (
+    Alert, BusinessRule, Client, Equipment, Invoice, InvoiceItem, Payment, POItem, ProductMaster,
+    PurchaseOrder, Quote, QuoteItem, Stock, Transaction, WOItem, WorkOrder,
+)
+from .snapshots import SnapshotCache, tables_version
+
+logger = logging.getLogger(__name__)
+
+DJANGO_CONDITION_TYPES = ('PYTHON', 'REGEX')
+DATABASE_CONDITION_TYPES = ('SQL', 'EXPRESSION')
+BLOCKING_ACTIONS = ('BLOCK', 'VALIDATE')
+VERSION_CHECK_INTERVAL = 1.0
+
+SAFE_BUILTINS = {
+    'abs': abs, 'all': all, 'any': any, 'bool': bool, 'float': float, 'int': int,
+    'len': len, 'max': max, 'min': min, 'round': round, 'str': str, 'sum': sum,
+    'Decimal': Decimal,
+}
+
+# Expressions, comparisons and literals only: no attributes, subscripts,
+# lambdas or comprehensions, so a rule cannot reach an object's internals.
+ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Is, ast.IsNot, ast.In, ast.NotIn,
+    ast.IfExp, ast.Call, ast.Name, ast.Load, ast.Constant, ast.Tuple, ast.List, ast.Set,
+)
+
+# Rules run on every save, so ``**`` is not allowed and the integer literals
+# of a chain of products may multiply to at most this much: ``'x' * 10**10``
+# or ``[0] * 999 * 999 * 999`` would exhaust the worker. Sequence literals
+# cannot be repeated at all.
+MAX_MULTIPLIER = 10_000
+
+# Operational tables whose ORM writes run Python/regex rules. Catalogs are
+# left out so their deletes keep Django's fast path.
+RULE_MODELS = (
+    Client, Equipment, ProductMaster, Stock, Transaction, WorkOrder, WOItem, Invoice, InvoiceItem,
+    Payment, PurchaseOrder, POItem, Quote, QuoteItem,
+)
+RULE_TABLES = frozenset(model._meta.db_table for model in RULE_MODELS)
+
+CompiledRule = namedtuple('CompiledRule', [
+    'rule_code', 'rule_name', 'action_type', 'events', 'severity', 'stop_on_match', 'predicate',
+])
+Snapshot = namedtuple('Snapshot', ['version', 'rules', 'errors'])
+
+_cache = SnapshotCache()
+
+
+class BusinessRuleViolation(ValidationError):
+    """A BLOCK/VALIDATE rule matched; DRF answers it with a 400."""
+    default_code = 'business_rule_violation'
+
+    def __init__(self, rule):
+        super().__init__({'business_rule': [f"Regla de negocio violada: {rule.rule_name}"]},
+                         code=self.default_code)
+        self.rule_code = rule.rule_code
+
+
+def _multiplier(node):
+    """Product of the integer literals in a chain of ``*`` (other operands count as 1)."""
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
+        return _multiplier(node.left) * _multiplier(node.right)
+    if isinstance(node, ast.UnaryOp):
+        return _multiplier(node.operand)
+    if isinstance(node, ast.Constant) and isinstance(node.value, int):
+        return abs(node.value)
+    return 1
+
+
+def _check_python_condition(tree):
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise ValueError(f"{type(node).__name__} not allowed")
+        if isinstance(node, ast.Name) and node.id.startswith('_'):
+            raise ValueError(f"name not allowed: {node.id}")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in SAFE_BUILTINS):
+            raise ValueError(f"only {', '.join(sorted(SAFE_BUILTINS))} can be called")
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
+            for operand in (node.left, node.right):
+                if isinstance(operand, (ast.List, ast.Tuple, ast.Set)) or (
+                        isinstance(operand, ast.Constant) and isinstance(operand.value, (str, bytes))):
+                    raise ValueError("sequences cannot be repeated")
+            if _multiplier(node) > MAX_MULTIPLIER:
+                raise ValueError(f"integer factors above {MAX_MULTIPLIER} not allowed")
+
+
+def _python_predicate(rule_code, text):
+    tree = ast.parse(text.strip(), mode='eval')
+    _check_python_condition(tree)
+    code = compile(tree, f'<business rule {rule_code}>', 'eval')
+    namespace = {'__builtins__': SAFE_BUILTINS}
+
+    def predicate(row):
+        return bool(eval(code, namespace, row))
+    return predicate
+
+
+def _regex_predicate(text):
+    column, separator, pattern = text.partition(':')
+    column = column.strip()
+    if not separator or not column.isidentifier():
+        raise ValueError("expected 'column:pattern'")
+    regex = re.compile(pattern)
+
+    def predicate(row):
+        value = row.get(column)
+        return value is not None and regex.search(str(value)) is not None
+    return predicate
+
+
+def compile_rule(rule):
+    """
+    Compile a Python or regex ``BusinessRule`` into a ``CompiledRule``.
+
+    Raises ``ValueError`` (or ``SyntaxError``/``re.error``) when the
+    condition cannot be compiled or the action needs SQL.
+    """
+    condition_type = (rule.condition_type or '').upper()
+    action_type = (rule.action_type or '').upper()
+    if condition_type == 'PYTHON':
+        predicate = _python_predicate(rule.rule_code, rule.condition_text)
+    elif condition_type == 'REGEX':
+        predicate = _regex_predicate(rule.condition_text)
+    else:
+        raise ValueError(f"{rule.condition_type} rules are compiled by the database")
+    if action_type == 'AUTO_CORRECT':
+        raise ValueError("AUTO_CORRECT needs a SQL rule")
+    event = (rule.trigger_event or 'ANY').upper()
+    events = ('INSERT', 'UPDATE', 'DELETE') if event == 'ANY' else (event,)
+    return CompiledRule(rule.rule_code, rule.rule_name, action_type, events,
+                        (rule.severity or 'MEDIUM').upper(), rule.stop_on_match, predicate)
+
+
+def current_version():
+    return tables_version([BusinessRule])
+
+
+def build_snapshot(version):
+    """Compile every active Python/regex rule, grouped by table."""
+    rules, errors = {}, []
+    queryset = (BusinessRule.objects
+                .filter(is_active=True, condition_type__iregex=r'^(python|regex)$')
+                .exclude(applies_to_table__isnull=True)
+                .order_by('execution_order', 'rule_code'))
+    try:
+        active = list(queryset)
+    except DatabaseError as e:
+        logger.error(f"Error loading business rules: {e}")
+        active = []
+    for rule in active:
+        try:
+            compiled = compile_rule(rule)
+        except (ValueError, SyntaxError, re.error) as e:
+            logger.error(f"Business rule {rule.rule_code} skipped: {e}")
+            errors.append((rule.rule_code, str(e)))
+            continue
+        if rule.applies_to_table not in RULE_TABLES:
+            logger.warning(f"Business rule {rule.rule_code}: {rule.applies_to_table} has no rule signals")
+        rules.setdefault(rule.applies_to_table, []).append(compiled)
+    return Snapshot(version, {table: tuple(compiled) for table, compiled in rules.items()}, tuple(errors))
+
+
+def get_snapshot():
+    return _cache.get(current_version, build_snapshot, VERSION_CHECK_INTERVAL)
+
+
+def invalidate():
+    """Drop this process' compiled rules (other workers follow the version row)."""
+    _cache.invalidate()
+
+
+def rules_for(model):
+    """Compiled Python/regex rules for a model's table, in execution order."""
+    if model is BusinessRule:
+        return ()
+    return get_snapshot().rules.get(model._meta.db_table, ())
+
+
+def row_values(instance):
+    return {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+
+
+def evaluate(rules, instance, event):
+    """
+    Run ``rules`` against ``instance`` for ``event`` (INSERT/UPDATE/DELETE).
+
+    BLOCK/VALIDATE raise ``BusinessRuleViolation``; LOG and WARN go to the
+    logger. Matched ALERT rules are returned so the caller can record them
+    once the row has a primary key.
+    """
+    row = None
+    alerts = []
+    for rule in rules:
+        if event not in rule.events:
+            continue
+        if row is None:
+            row = row_values(instance)
+        try:
+            matched = rule.predicate(row)
+        except Exception as e:
+            logger.error(f"Business rule {rule.rule_code} failed on {instance._meta.db_table}: {e}")
+            continue
+        if not matched:
+            continue
+        if rule.action_type in BLOCKING_ACTIONS:
+            raise BusinessRuleViolation(rule)
+        if rule.action_type == 'ALERT':
+            alerts.append(rule)
+        elif rule.action_type == 'WARN':
+            logger.warning(f"Business rule {rule.rule_code}: {rule.rule_name} ({instance._meta.db_table} {instance.pk})")
+        else:
+            logger.info(f"Business rule {rule.rule_code}: {rule.rule_name} ({instance._meta.db_table} {instance.pk})")
+        if rule.stop_on_match:
+            break
+    return alerts
+
+
+def create_alerts(rules, instance):
+    pk = instance.pk if isinstance(instance.pk, int) else None
+    Alert.objects.bulk_create([
+        Alert(alert_type='SYSTEM_ERROR', title='Regla de negocio', message=rule.rule_name,
+              ref_entity=instance._meta.db_table, ref_id=pk, ref_code=rule.rule_code,
+              severity=rule.severity, status='NEW')
+        for rule in rules
+    ])
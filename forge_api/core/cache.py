@@ -0,0 +1,33 @@
+"""
+Cache backends for ForgeDB.
+
+InstrumentedLocMemCache counts hits and misses per cache alias for the
+/metrics endpoint. Set OPTIONS['METRICS_ALIAS'] to the alias name used in
+CACHES; it defaults to LOCATION.
+"""
+from django.core.cache.backends.locmem import LocMemCache
+
+from .metrics import CACHE_LOOKUPS
+
+_MISSING = object()
+
+
+class InstrumentedLocMemCache(LocMemCache):
+
+    def __init__(self, name, params):
+        params = dict(params)
+        options = dict(params.get('OPTIONS', {}))
+        alias = options.pop('METRICS_ALIAS', name)
+        params['OPTIONS'] = options
+        super().__init__(name, params)
+        self._hits = CACHE_LOOKUPS.labels(alias, 'hit')
+        self._misses = CACHE_LOOKUPS.labels(alias, 'miss')
+
+    def get(self, key, default=None, version=None):
+        # get_many(), get_or_set() and aget() all go through get()
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            self._misses.inc()
+            return default
+        self._hits.inc()
+        return value
@@ -0,0 +1,311 @@
+"""
+Conditional GET (ETag / Last-Modified / 304) for DRF viewsets.
+
+``ConditionalGetMixin`` computes a validator for ``list`` and ``retrieve``
+before the page query and the serializer run. A matching ``If-None-Match``
+gets ``304 Not Modified`` with no serialization at all.
+
+The validator covers every table the response reads:
+
+* tables in the SQL of the filtered queryset (joins, filters on related
+  fields and subquery annotations such as ``subsystems_count``);
+* models reached by the serializer (dotted ``source``, nested serializers,
+  slug/string related fields, many-to-many).
+
+A ``SerializerMethodField`` or a property ``source`` may read anything, so
+such serializers only get validators when the viewset lists the models they
+read in ``conditional_models``.
+
+Each table contributes a cheap value:
+
+* tables with a change counter in ``app.table_versions`` (migration 0018,
+  bumped by statement-level triggers on catalog tables) -> their version;
+  these also give an exact ``Last-Modified``;
+* otherwise ``max(updated_at)`` and ``count(*)``, over the filtered queryset
+  for the main model and over the whole table for related ones.
+
+A response that reads a table with neither a counter nor ``updated_at`` is
+served without validators.
+"""
+import hashlib
+import logging
+import re
+
+from django.apps import apps
+from django.db import DatabaseError, connection
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField, RelatedField
+
+from .pagination import KeysetPagination
+
+logger = logging.getLogger(__name__)
+
+VERSION_TABLE = 'app.table_versions'
+
+_TABLE_RE = re.compile(r'(?:FROM|JOIN)\s+("[^"]+"(?:\."[^"]+")?)')
+
+# Model db_table -> "schema.table" as recorded by the triggers.
+_qualified_names = {}
+# (serializer class, annotation names) -> (models, complete).
+_serializer_models = {}
+_models_by_table = None
+
+
+def _model_for_table(quoted_name):
+    global _models_by_table
+    if _models_by_table is None:
+        _models_by_table = {
+            connection.ops.quote_name(model._meta.db_table): model for model in apps.get_models()
+        }
+    return _models_by_table.get(quoted_name)
+
+
+def queryset_models(queryset):
+    """Models whose tables appear in the SQL of ``queryset``."""
+    try:
+        sql = str(queryset.query)
+    except Exception:  # EmptyResultSet and friends: nothing is read
+        return {queryset.model}
+    models = {queryset.model}
+    for quoted_name in _TABLE_RE.findall(sql):
+        model = _model_for_table(quoted_name)
+        if model is not None:
+            models.add(model)
+    return models
+
+
+def _source_models(model, source):
+    """Related models crossed by a dotted ``source``; None if not a field path."""
+    found = set()
+    for attr in source.split('.'):
+        if model is None:
+            return found
+        try:
+            field = model._meta.get_field(attr)
+        except Exception:
+            if attr.startswith('get_') and attr.endswith('_display'):
+                return found
+            return None
+        if field.is_relation:
+            model = field.related_model
+            found.add(model)
+        else:
+            model = None
+    return found
+
+
+def serializer_models(serializer_class, annotations=frozenset()):
+    """
+    ``(models, complete)``: models read while serializing, and whether that
+    set is complete. Method fields and non-field sources (properties) make
+    it incomplete. ``annotations`` are queryset annotation names, which are
+    covered by the queryset SQL.
+    """
+    key = (serializer_class, annotations)
+    if key not in _serializer_models:
+        try:
+            models = set()
+            complete = _collect_serializer_models(serializer_class(), annotations, models)
+        except Exception as e:
+            logger.debug(f"Cannot inspect {serializer_class.__name__}: {e}")
+            models, complete = set(), False
+        models.discard(None)
+        _serializer_models[key] = (frozenset(models), complete)
+    return _serializer_models[key]
+
+
+def _collect_serializer_models(serializer, annotations, models):
+    meta = getattr(serializer, 'Meta', None)
+    model = getattr(meta, 'model', None)
+    models.add(model)
+    complete = True
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            complete = False
+            continue
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        if isinstance(field, serializers.BaseSerializer):
+            complete = _collect_serializer_models(field, frozenset(), models) and complete
+            continue
+        source = field.source
+        if source == '*' or source in annotations:
+            continue
+        if model is None:
+            complete = False
+            continue
+        if isinstance(field, PrimaryKeyRelatedField):
+            # The last hop only reads the foreign key column.
+            source = source.rpartition('.')[0]
+        crossed = _source_models(model, source) if source else set()
+        if crossed is None:
+            complete = False
+            continue
+        if isinstance(field, RelatedField) and not isinstance(field, PrimaryKeyRelatedField) \
+                and field.queryset is not None:
+            crossed.add(field.queryset.model)
+        models |= crossed
+    return complete
+
+
+def _qualified(models):
+    missing = {m._meta.db_table for m in models if m._meta.db_table not in _qualified_names}
+    if missing:
+        quoted = {connection.ops.quote_name(name): name for name in missing}
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT t.name, n.nspname || '.' || c.relname
+                FROM unnest(%s::text[]) AS t(name)
+                JOIN pg_class c ON c.oid = to_regclass(t.name)
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                """,
+                [list(quoted)],
+            )
+            resolved = dict(cursor.fetchall())
+        for quoted_name, name in quoted.items():
+            _qualified_names[name] = resolved.get(quoted_name)
+    return {m: _qualified_names[m._meta.db_table] for m in models if _qualified_names.get(m._meta.db_table)}
+
+
+def table_versions(models):
+    """``{model: (version, updated_at)}`` for the models with a change counter."""
+    try:
+        names = _qualified(models)
+        if not names:
+            return {}
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT table_name, version, updated_at FROM {VERSION_TABLE} WHERE table_name = ANY(%s)',
+                [list(names.values())],
+            )
+            rows = {name: (version, updated_at) for name, version, updated_at in cursor.fetchall()}
+    except DatabaseError as e:
+        logger.debug(f"Table versions unavailable: {e}")
+        return {}
+    return {model: rows[name] for model, name in names.items() if name in rows}
+
+
+def _updated_at_field(model):
+    try:
+        return model._meta.get_field('updated_at')
+    except Exception:
+        return None
+
+
+def compute_validators(queryset, extra_models=()):
+    """
+    Return ``(etag_seed, last_modified)`` for a response built from
+    ``queryset`` plus ``extra_models`` (read by the serializer), or
+    ``(None, None)`` if some table cannot be validated.
+    """
+    primary = queryset.model
+    models = queryset_models(queryset) | set(extra_models)
+    versions = table_versions(models)
+
+    parts = []
+    exact_last_modified = True
+    last_modified = None
+    for model in sorted(models, key=lambda m: m._meta.label):
+        if model in versions:
+            version, updated_at = versions[model]
+            parts.append(f'{model._meta.label}:v{version}')
+            if updated_at and (last_modified is None or updated_at > last_modified):
+                last_modified = updated_at
+            continue
+        field = _updated_at_field(model)
+        if field is None:
+            return None, None
+        exact_last_modified = False
+        source = queryset if model is primary else model._default_manager.all()
+        aggregate = source.order_by().aggregate(newest=Max(field.name), rows=Count('pk'))
+        parts.append(f"{model._meta.label}:{aggregate['newest']}:{aggregate['rows']}")
+    if not exact_last_modified:
+        # max(updated_at) does not move on DELETE; only the ETag is reliable.
+        last_modified = None
+    return '|'.join(parts), last_modified
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified validators and 304 responses for ``list`` and
+    ``retrieve``. Put it before the DRF base class::
+
+        class ClientViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+            ...
+
+    When the serializer has method fields or properties, list the models
+    they read in ``conditional_models`` (an empty tuple if they only use the
+    row itself); otherwise no validators are sent. ``conditional_actions``
+    limits which actions compute validators. By default it is only
+    ``retrieve`` under ``KeysetPagination``: a ``list`` validator over a
+    table without a counter costs one ``COUNT``, the query keyset pages
+    exist to avoid.
+    """
+    conditional_actions = None
+    conditional_models = None
+
+    def get_conditional_actions(self):
+        if self.conditional_actions is not None:
+            return self.conditional_actions
+        if self.pagination_class and issubclass(self.pagination_class, KeysetPagination):
+            return ('retrieve',)
+        return ('list', 'retrieve')
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(request, self.filter_queryset(self.get_queryset()),
+                                 super().list, args, kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return self._conditional(request, queryset, super().retrieve, args, kwargs)
+
+    def _conditional(self, request, queryset, handler, args, kwargs):
+        etag, last_modified = (None, None)
+        if self.action in self.get_conditional_actions():
+            etag, last_modified = self.get_validators(request, queryset)
+        if etag:
+            not_modified = get_conditional_response(
+                request, etag=etag,
+                last_modified=int(last_modified.timestamp()) if last_modified else None,
+            )
+            if not_modified is not None:
+                return self._set_validators(not_modified, etag, last_modified)
+        response = handler(request, *args, **kwargs)
+        if etag and 200 <= response.status_code < 300:
+            self._set_validators(response, etag, last_modified)
+        return response
+
+    @staticmethod
+    def _set_validators(response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def get_validators(self, request, queryset):
+        """Return ``(etag, last_modified)``; ``(None, None)`` disables 304s."""
+        models, complete = serializer_models(self.get_serializer_class(),
+                                             frozenset(queryset.query.annotations))
+        if not complete and self.conditional_models is None:
+            return None, None
+        try:
+            seed, last_modified = compute_validators(queryset, models | set(self.conditional_models or ()))
+        except DatabaseError as e:
+            logger.warning(f"Conditional GET validators failed for {type(self).__name__}: {e}")
+            return None, None
+        if seed is None:
+            return None, None
+        seed = '|'.join([
+            seed, request.get_full_path(), str(getattr(request.user, 'pk', '')),
+            getattr(request, 'accepted_media_type', '') or '', self.action or '',
+        ])
+        return '"%s"' % hashlib.sha1(seed.encode('utf-8')).hexdigest()[:24], last_modified
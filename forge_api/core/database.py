@@ -0,0 +1,171 @@
+"""
+Database connection management for ForgeDB.
+
+Two deployment modes are supported, selected with the DB_POOLER setting:
+
+``''`` (direct)
+    Django connects straight to PostgreSQL. ``search_path`` is sent as a
+    startup option and connections are kept for CONN_MAX_AGE seconds.
+
+``'pgbouncer'``
+    Django connects to pgbouncer in transaction pooling mode. Server
+    connections are shared between clients transaction by transaction, so
+    no session state may be set: ``search_path`` comes from the role
+    (database/pgbouncer_setup.sql) and ``app.user_id`` is set with
+    ``set_config(..., true)``, which only lasts until the end of the
+    current transaction.
+
+In both modes ``app.user_id`` (read by the audit triggers) is scoped to the
+transaction of each write, so it can never leak between requests that end up
+on the same server connection.
+"""
+import contextvars
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+_current_request = contextvars.ContextVar('forge_db_request', default=None)
+
+
+class PoolMetrics:
+    """Process-local counters for database connection usage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {
+            'connections_opened': 0,
+            'audit_scoped_writes': 0,
+        }
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self):
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+
+pool_metrics = PoolMetrics()
+
+
+def set_current_request(request):
+    """Bind the request whose user is recorded by the audit triggers.
+
+    Returns a token for reset_current_request().
+    """
+    return _current_request.set(request)
+
+
+def reset_current_request(token):
+    _current_request.reset(token)
+
+
+def get_audit_user_id():
+    """Return the technician id of the current request's user, if any.
+
+    ``app.audit_logs.changed_by`` references ``cat.technicians``, so the
+    auth user is mapped to its technician (core.authentication
+    .get_technician_id); users without one are not recorded. ``request.user``
+    is read lazily, at write time, so that users authenticated by DRF (JWT)
+    inside the view are also picked up.
+    """
+    request = _current_request.get()
+    if request is None:
+        return None
+    from .authentication import get_technician_id
+    return get_technician_id(getattr(request, 'user', None))
+
+
+def is_write_statement(sql):
+    return sql.lstrip()[:6].upper() in WRITE_STATEMENTS
+
+
+def audit_user_wrapper(execute, sql, params, many, context):
+    """
+    Execute wrapper that sets ``app.user_id`` for the transaction of a write.
+
+    Outside an atomic block the write and the ``set_config`` call are wrapped
+    in a transaction together; inside one, ``set_config`` runs in the
+    already-open transaction.
+    """
+    if not is_write_statement(sql):
+        return execute(sql, params, many, context)
+    user_id = get_audit_user_id()
+    if user_id is None:
+        return execute(sql, params, many, context)
+
+    db = context['connection']
+
+    def scoped_execute():
+        context['cursor'].execute(
+            "SELECT set_config('app.user_id', %s, true)", [str(user_id)]
+        )
+        pool_metrics.increment('audit_scoped_writes')
+        return execute(sql, params, many, context)
+
+    if db.in_atomic_block:
+        return scoped_execute()
+    with transaction.atomic(using=db.alias):
+        return scoped_execute()
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    """Count new server connections and install the audit execute wrapper."""
+    pool_metrics.increment('connections_opened')
+    if audit_user_wrapper not in connection.execute_wrappers:
+        # Insert first: connection.execute_wrapper() pops the last wrapper on
+        # exit, and the connection may be opened inside such a block.
+        connection.execute_wrappers.insert(0, audit_user_wrapper)
+
+
+def get_pool_status(using='default'):
+    """
+    Connection usage for health checks and monitoring.
+
+    Server-side numbers come from ``pg_stat_activity``; behind pgbouncer they
+    describe the pooler's server connections rather than Django clients.
+    """
+    db = connections[using]
+    with db.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                current_setting('max_connections')::int,
+                COUNT(*),
+                COUNT(*) FILTER (WHERE state = 'active'),
+                COUNT(*) FILTER (WHERE state = 'idle'),
+                COUNT(*) FILTER (WHERE state = 'idle in transaction')
+            FROM pg_stat_activity
+            WHERE backend_type = 'client backend'
+            """
+        )
+        max_connections, total, active, idle, idle_in_transaction = cursor.fetchone()
+    status = {
+        'pooler': getattr(settings, 'DB_POOLER', '') or 'direct',
+        'conn_max_age': db.settings_dict.get('CONN_MAX_AGE'),
+        'process': pool_metrics.snapshot(),
+    }
+    status['server'] = {
+        'max_connections': max_connections,
+        'connections': total,
+        'active': active,
+        'idle': idle,
+        'idle_in_transaction': idle_in_transaction,
+        'usage_pct': round(total * 100.0 / max_connections, 1) if max_connections else 0.0,
+    }
+    return status
@@ -0,0 +1,108 @@
+"""
+Work order statistics per client, technician or equipment.
+
+``work_order_stats`` answers the detail pages' counters with a single
+``GROUP BY status`` over ``work_orders`` filtered on the indexed
+``client_id`` / ``technician_id`` / ``equipment_id`` column, instead of
+fetching a page of work orders and counting it in Python (which undercounts
+past the first page). The invoiced total comes from a correlated subquery on
+``invoices.wo_id`` inside the same statement.
+
+``annotate_client_summary`` adds the list-view counters as correlated
+subqueries, so a page of clients is still one query.
+"""
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, DurationField, ExpressionWrapper, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Equipment, Invoice, WorkOrder
+
+# entity -> work_orders column
+ENTITY_FIELDS = {
+    'client': 'client_id',
+    'technician': 'technician_id',
+    'equipment': 'equipment_id',
+}
+
+DONE_STATUSES = ('COMPLETED', 'INVOICED')
+CLOSED_STATUSES = DONE_STATUSES + ('CANCELLED',)
+
+FINISHED_AT = Coalesce('actual_completion_date', 'closed_at')
+CYCLE_TIME = ExpressionWrapper(FINISHED_AT - Coalesce('reception_date', 'created_at'), output_field=DurationField())
+
+
+def stats_queryset(entity, pk):
+    """One row per status: ``count``, ``invoiced``, ``last_service``, ``cycle_total``, ``cycle_count``."""
+    invoiced = (
+        Invoice.objects.filter(wo_id=OuterRef('wo_id')).exclude(status='cancelled')
+        .order_by().values('wo_id').annotate(total=Sum('total_amount')).values('total')
+    )
+    return (
+        WorkOrder.objects.filter(**{ENTITY_FIELDS[entity]: pk})
+        .order_by().values('status')
+        .annotate(
+            count=Count('wo_id'),
+            invoiced=Sum(Subquery(invoiced, output_field=DecimalField(max_digits=14, decimal_places=2))),
+            last_service=Max(FINISHED_AT),
+            cycle_total=Sum(CYCLE_TIME),
+            cycle_count=Count(CYCLE_TIME),
+        )
+    )
+
+
+def summarize(rows):
+    """Fold the per-status rows of ``stats_queryset`` into the stats payload."""
+    by_status = {code: 0 for code, _ in WorkOrder.STATUS_CHOICES}
+    total = 0
+    invoiced = Decimal('0.00')
+    last_service = None
+    cycle_total, cycle_count = None, 0
+
+    for row in rows:
+        status, count = row['status'], row['count']
+        total += count
+        if status is not None:
+            by_status[status] = by_status.get(status, 0) + count
+        invoiced += row['invoiced'] or 0
+        if status not in DONE_STATUSES:
+            continue
+        if row['last_service'] and (last_service is None or row['last_service'] > last_service):
+            last_service = row['last_service']
+        if row['cycle_count']:
+            cycle_total = row['cycle_total'] if cycle_total is None else cycle_total + row['cycle_total']
+            cycle_count += row['cycle_count']
+
+    completed = sum(by_status.get(code, 0) for code in DONE_STATUSES)
+    return {
+        'total': total,
+        'by_status': by_status,
+        'open': total - completed - by_status.get('CANCELLED', 0),
+        'completed': completed,
+        'completion_rate': round(completed / total * 100, 1) if total else 0,
+        'total_invoiced': invoiced,
+        'last_service_date': last_service,
+        'avg_cycle_hours': round(cycle_total.total_seconds() / cycle_count / 3600, 2) if cycle_count else None,
+    }
+
+
+def work_order_stats(entity, pk):
+    """Stats for the work orders of one client, technician or equipment."""
+    if entity not in ENTITY_FIELDS:
+        raise ValueError(f"Unknown entity: {entity}")
+    return summarize(stats_queryset(entity, pk))
+
+
+def annotate_client_summary(queryset):
+    """Annotate ``equipment_count``, ``open_work_orders`` and ``last_service_date`` on a Client queryset."""
+    work_orders = WorkOrder.objects.filter(client_id=OuterRef('client_id')).order_by().values('client_id')
+    equipment = Equipment.objects.filter(client_id=OuterRef('client_id')).order_by().values('client_id')
+    return queryset.annotate(
+        equipment_count=Coalesce(Subquery(equipment.annotate(n=Count('equipment_id')).values('n')), 0),
+        open_work_orders=Coalesce(
+            Subquery(work_orders.exclude(status__in=CLOSED_STATUSES).annotate(n=Count('wo_id')).values('n')), 0
+        ),
+        last_service_date=Subquery(
+            work_orders.filter(status__in=DONE_STATUSES).annotate(last=Max(FINISHED_AT)).values('last')
+        ),
+    )
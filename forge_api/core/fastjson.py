@@ -0,0 +1,73 @@
+"""
+Fast JSON encoding and decoding for the API renderer/parser and the
+frontend API clients.
+
+Uses orjson when it is installed and the standard library otherwise.
+``dumps`` matches DRF's ``JSONRenderer`` output:
+
+* compact separators and UTF-8 (``UNICODE_JSON``);
+* datetimes in ISO 8601 with microseconds, ``Z`` for UTC;
+* Decimal, UUID, lazy strings, querysets and other types through DRF's
+  ``JSONEncoder.default``;
+* U+2028/U+2029 escaped so the output is a JavaScript subset.
+
+Where orjson cannot encode a value (integers wider than 64 bits, nesting
+deeper than 254 levels) the standard library is used for that call.
+
+Two inputs DRF rejects are encoded instead, because spotting them would
+mean walking the whole payload in Python before every call:
+
+* ``NaN`` and infinities become ``null`` (DRF raises ``ValueError``);
+* a plain ``Enum`` member becomes its value (DRF raises ``TypeError``).
+  ``TextChoices``/``IntegerChoices`` members come out the same either way.
+"""
+import json
+
+from rest_framework.utils import encoders
+from rest_framework.utils.json import strict_constant
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+_encoder = encoders.JSONEncoder()
+
+if ORJSON_AVAILABLE:
+    DUMPS_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _stdlib_dumps(data, indent=None):
+    separators = (',', ': ') if indent else (',', ':')
+    return json.dumps(data, cls=encoders.JSONEncoder, indent=indent, ensure_ascii=False,
+                      allow_nan=False, separators=separators).encode()
+
+
+def dumps(data, indent=None):
+    """``data`` as UTF-8 JSON bytes; ``indent`` pretty-prints."""
+    if ORJSON_AVAILABLE and indent is None:
+        try:
+            raw = orjson.dumps(data, default=_encoder.default, option=DUMPS_OPTIONS)
+        except orjson.JSONEncodeError:
+            raw = _stdlib_dumps(data)
+    else:
+        raw = _stdlib_dumps(data, indent)
+    if b'\xe2\x80\xa8' in raw or b'\xe2\x80\xa9' in raw:
+        raw = raw.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return raw
+
+
+def loads(data):
+    """
+    Decode JSON ``bytes`` or ``str``. Raises ``ValueError`` on invalid input,
+    including ``NaN``/``Infinity`` (as DRF's strict parser does).
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Not UTF-8, or invalid: let the standard library decide and word the error.
+            pass
+    return json.loads(data, parse_constant=strict_constant)
@@ -0,0 +1,207 @@
+"""
+Sparse fieldsets (``?fields=`` / ``?omit=``) for DRF viewsets.
+
+``SparseFieldsetMixin`` lets ``list`` and ``retrieve`` return a subset of
+the serializer's fields::
+
+    GET /api/v1/products/?fields=internal_sku,name
+    GET /api/v1/oem-catalog-items/?omit=vin_patterns,model_codes,description_en
+
+The dropped fields are removed from the serializer (their method fields
+and nested serializers never run) and their columns from the query: model
+columns no kept field reads are deferred, and ``select_related`` /
+``prefetch_related`` paths no kept field crosses are dropped.
+
+Columns are found from each field's ``source``. Method fields and
+properties may read anything, so a serializer declares what they read in
+``Meta.field_sources``::
+
+    field_sources = {'client': ('client_id',), 'is_below_minimum': ('qty_available', 'product')}
+
+When a kept field reads something undeclared, the serializer is still
+pruned but the query is left as it was.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def _names(request, param):
+    raw = request.query_params.get(param, '')
+    return [name.strip() for name in raw.split(',') if name.strip()]
+
+
+def selected_fields(request, available):
+    """
+    The field names to keep out of ``available`` (in order), or None when
+    the request asks for every field. Unknown names are a 400.
+    """
+    fields, omit = _names(request, FIELDS_PARAM), _names(request, OMIT_PARAM)
+    if not fields and not omit:
+        return None
+    unknown = [name for name in fields + omit if name not in available]
+    if unknown:
+        raise ValidationError({FIELDS_PARAM: [
+            f"Unknown field(s): {', '.join(unknown)}. Valid: {', '.join(available)}"
+        ]})
+    keep = [name for name in available if (not fields or name in fields) and name not in omit]
+    if not keep:
+        raise ValidationError({FIELDS_PARAM: ['At least one field must be kept']})
+    return keep
+
+
+def prune_serializer(serializer, keep):
+    """Drop the fields of ``serializer`` (or of its child, for ``many=True``) not in ``keep``."""
+    target = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+    for name in list(target.fields):
+        if name not in keep:
+            del target.fields[name]
+    return serializer
+
+
+def _readable_fields(serializer):
+    return [name for name, field in serializer.fields.items() if not field.write_only]
+
+
+def _source_paths(model, field_name, field, declared, annotations):
+    """
+    Model paths (``'qty_on_hand'``, ``'product__name'``) read by one
+    serializer field, or None when they cannot be known.
+    """
+    if field_name in declared:
+        return [path.replace('.', '__') for path in declared[field_name]]
+    if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+        return None
+    if field.source in annotations:
+        return []
+    path, current = [], model
+    for attr in field.source.split('.'):
+        if current is None:
+            break
+        try:
+            model_field = current._meta.get_field(attr)
+        except FieldDoesNotExist:
+            if attr.startswith('get_') and attr.endswith('_display') and path == [] and current is model:
+                return [attr[len('get_'):-len('_display')]]
+            if attr == 'pk' and not path:
+                return []
+            return None
+        path.append(model_field.name)
+        current = model_field.related_model if model_field.is_relation else None
+    return ['__'.join(path)]
+
+
+def read_paths(serializer, annotations=()):
+    """
+    Model paths read by the fields of ``serializer`` (the list child for
+    ``many=True``), or None when some field reads something undeclared.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    model = serializer.Meta.model
+    declared = getattr(serializer.Meta, 'field_sources', {})
+    paths = set()
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        field_paths = _source_paths(model, name, field, declared, annotations)
+        if field_paths is None:
+            return None
+        paths.update(field_paths)
+    return paths
+
+
+def _flatten(tree, prefix=''):
+    """``select_related`` dict -> leaf paths (``{'a': {'b': {}}}`` -> ``['a__b']``)."""
+    paths = []
+    for name, children in tree.items():
+        path = f'{prefix}{name}'
+        paths.extend(_flatten(children, f'{path}__') if children else [path])
+    return paths
+
+
+def _lookup_path(lookup):
+    return getattr(lookup, 'prefetch_through', lookup)
+
+
+def prune_queryset(queryset, paths):
+    """
+    Defer the columns of ``queryset.model`` no path in ``paths`` reads and
+    drop the joins and prefetches none of them crosses. The primary key
+    and the ordering columns stay loaded.
+    """
+    opts = queryset.model._meta
+    heads = {path.split('__', 1)[0] for path in paths}
+    for term in queryset.query.order_by or opts.ordering:
+        if isinstance(term, str):
+            heads.add(term.lstrip('-').split('__', 1)[0])
+    needed = set()
+    for head in heads:
+        try:
+            # Accepts attnames too: 'client_id' -> 'client'.
+            needed.add(opts.pk.name if head == 'pk' else opts.get_field(head).name)
+        except FieldDoesNotExist:
+            needed.add(head)
+
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        kept = [path for path in _flatten(select_related) if path.split('__', 1)[0] in needed]
+        queryset = queryset.select_related(None)
+        if kept:
+            queryset = queryset.select_related(*kept)
+    elif select_related:
+        # select_related() without arguments follows every non-null FK.
+        needed.update(f.name for f in opts.concrete_fields if f.is_relation and not f.null)
+
+    lookups = queryset._prefetch_related_lookups
+    kept_lookups = [lookup for lookup in lookups if _lookup_path(lookup).split('__', 1)[0] in needed]
+    if len(kept_lookups) != len(lookups):
+        queryset = queryset.prefetch_related(None).prefetch_related(*kept_lookups)
+
+    deferred = [f.name for f in opts.concrete_fields if not f.primary_key and f.name not in needed]
+    return queryset.defer(*deferred) if deferred else queryset
+
+
+class SparseFieldsetMixin:
+    """
+    ``?fields=a,b`` / ``?omit=c`` on ``list`` and ``retrieve``. Put it
+    first in the bases::
+
+        class StockViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
+            ...
+
+    Write actions always get the full serializer. In ``defer_unread_actions``
+    the query is trimmed to what the serializer reads even without
+    ``?fields=`` (for lightweight list serializers).
+    """
+    sparse_actions = ('list', 'retrieve')
+    defer_unread_actions = ()
+
+    def sparse_fields(self):
+        """The kept field names for this request, or None for all of them."""
+        request = getattr(self, 'request', None)
+        if request is None or self.action not in self.sparse_actions:
+            return None
+        if not hasattr(self, '_sparse_fields'):
+            serializer = self.get_serializer_class()(context=self.get_serializer_context())
+            self._sparse_fields = selected_fields(request, _readable_fields(serializer))
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        keep = self.sparse_fields()
+        return prune_serializer(serializer, keep) if keep is not None else serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        keep = self.sparse_fields()
+        if keep is None and self.action not in self.defer_unread_actions:
+            return queryset
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        if keep is not None:
+            prune_serializer(serializer, keep)
+        paths = read_paths(serializer, frozenset(queryset.query.annotations))
+        return queryset if paths is None else prune_queryset(queryset, paths)
@@ -0,0 +1,153 @@
+"""
+Lightweight ``(id, label)`` lookups for remote select widgets.
+
+Each lookup orders by an upper-cased, ``C``-collated key plus the primary key
+and pages with a keyset cursor, so page N costs the same as page 1. Prefix
+search is a range on the same expressions (``key >= 'FOO' AND key <
+'FOO\\U0010FFFF'``), which the expression indexes of migration
+``0019_lookup_indexes`` serve directly.
+"""
+import base64
+import binascii
+import json
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce, Collate, Upper
+
+from .models import Client, Equipment, ProductMaster, Technician
+
+# ``search[0]`` is also the sort key. ``label`` is a format string over
+# ``fields``; ``filters`` are exact-match query parameters.
+Lookup = namedtuple('Lookup', 'model search label fields filters')
+
+LOOKUPS = {
+    'clients': Lookup(
+        Client, ('name', 'client_code'), '{name} ({client_code})',
+        ('name', 'client_code'), ('status', 'type'),
+    ),
+    'equipment': Lookup(
+        Equipment, ('equipment_code', 'license_plate'), '{equipment_code} - {brand} {model}',
+        ('equipment_code', 'brand', 'model'), ('client_id', 'status'),
+    ),
+    'products': Lookup(
+        ProductMaster, ('name', 'internal_sku'), '{internal_sku} - {name}',
+        ('internal_sku', 'name'), ('is_active', 'group_code'),
+    ),
+    'technicians': Lookup(
+        Technician, ('last_name', 'employee_code'), '{first_name} {last_name} ({employee_code})',
+        ('first_name', 'last_name', 'employee_code'), ('is_active', 'status'),
+    ),
+}
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# Greater than any character, so ``prefix + _MAX_CHAR`` bounds every string
+# starting with ``prefix`` in byte (C collation) order.
+_MAX_CHAR = '\U0010FFFF'
+
+
+class InvalidLookup(ValueError):
+    """Unknown lookup or malformed parameter."""
+
+
+def sort_key(field):
+    """The expression lookups sort and search on (matched by the indexes)."""
+    return Collate(Coalesce(Upper(F(field)), Value('')), 'C')
+
+
+def encode_cursor(key, pk):
+    raw = json.dumps([key, pk], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        value = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise InvalidLookup('Cursor inválido')
+    if not (isinstance(value, list) and len(value) == 2 and isinstance(value[0], str)):
+        raise InvalidLookup('Cursor inválido')
+    return tuple(value)
+
+
+def _parse_pk(lookup, value):
+    """``value`` as the lookup's primary key; a bad id is an ``InvalidLookup``, not a 500."""
+    try:
+        pk = None if isinstance(value, bool) else lookup.model._meta.pk.to_python(value)
+    except ValidationError:
+        pk = None
+    if pk is None:
+        raise InvalidLookup('Id inválido')
+    return pk
+
+
+def _label(lookup, row):
+    return lookup.label.format(**{f: ('' if row[f] is None else row[f]) for f in lookup.fields}).strip()
+
+
+def _parse_limit(limit):
+    try:
+        limit = int(limit) if limit not in (None, '') else DEFAULT_LIMIT
+    except (TypeError, ValueError):
+        raise InvalidLookup('limit debe ser un número')
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def search(kind, q='', after=None, limit=None, filters=None):
+    """
+    One page of ``kind``: ``{'results': [{'id', 'label'}], 'next': cursor}``.
+
+    ``q`` is a case-insensitive prefix of any ``search`` field; ``after`` is
+    the ``next`` cursor of the previous page.
+    """
+    lookup = LOOKUPS.get(kind)
+    if lookup is None:
+        raise InvalidLookup(f'Lookup desconocido: {kind}')
+    limit = _parse_limit(limit)
+    pk_name = lookup.model._meta.pk.attname
+
+    queryset = lookup.model._default_manager.annotate(_key=sort_key(lookup.search[0]))
+    for name, value in (filters or {}).items():
+        if name in lookup.filters and value not in (None, ''):
+            if value in ('true', 'false'):
+                value = value == 'true'
+            try:
+                queryset = queryset.filter(**{name: value})
+            except (TypeError, ValueError):
+                raise InvalidLookup(f'Valor inválido para {name}')
+
+    q = (q or '').strip().upper()
+    if q:
+        prefix = Q()
+        for i, field in enumerate(lookup.search):
+            alias = f'_search{i}'
+            queryset = queryset.alias(**{alias: sort_key(field)})
+            prefix |= Q(**{f'{alias}__gte': q, f'{alias}__lt': q + _MAX_CHAR})
+        queryset = queryset.filter(prefix)
+
+    if after:
+        key, pk = decode_cursor(after)
+        pk = _parse_pk(lookup, pk)
+        queryset = queryset.filter(Q(_key__gt=key) | Q(_key=key, **{f'{pk_name}__gt': pk}))
+
+    rows = list(queryset.order_by('_key', pk_name).values(pk_name, '_key', *lookup.fields)[:limit + 1])
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'results': [{'id': row[pk_name], 'label': _label(lookup, row)} for row in rows],
+        'next': encode_cursor(rows[-1]['_key'], rows[-1][pk_name]) if more else None,
+    }
+
+
+def labels(kind, ids):
+    """``[{'id', 'label'}]`` for the given primary keys (selected values)."""
+    lookup = LOOKUPS.get(kind)
+    if lookup is None:
+        raise InvalidLookup(f'Lookup desconocido: {kind}')
+    pk_name = lookup.model._meta.pk.attname
+    ids = [_parse_pk(lookup, value) for value in ids]
+    rows = lookup.model._default_manager.filter(**{f'{pk_name}__in': ids}).values(pk_name, *lookup.fields)
+    return [{'id': row[pk_name], 'label': _label(lookup, row)} for row in rows]
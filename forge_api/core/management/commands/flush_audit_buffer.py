@@ -0,0 +1,45 @@
+"""
+Pasa los registros de auditoría de app.audit_buffer a app.audit_logs por
+lotes (ver core/audit.py). Sólo hace falta para las tablas auditadas con
+buffered = true. Una pasada vacía el buffer; con --loop queda corriendo como
+escritor asíncrono:
+
+    python manage.py flush_audit_buffer
+    python manage.py flush_audit_buffer --loop 5 --batch 20000
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import audit
+
+
+class Command(BaseCommand):
+    help = "Move buffered audit records into app.audit_logs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=audit.DEFAULT_FLUSH_BATCH,
+                            help="Records per transaction")
+        parser.add_argument('--loop', type=float, metavar='SECONDS',
+                            help="Keep running, flushing every SECONDS")
+
+    def handle(self, *args, **options):
+        if options['batch'] < 1:
+            raise CommandError("--batch must be positive")
+        if options['loop'] is not None and options['loop'] <= 0:
+            raise CommandError("--loop must be positive")
+
+        while True:
+            started = time.perf_counter()
+            moved = audit.flush_buffer(options['batch'])
+            if moved or options['loop'] is None:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{moved} audit record(s) flushed in {time.perf_counter() - started:.2f}s"
+                ))
+            if options['loop'] is None:
+                return
+            try:
+                time.sleep(options['loop'])
+            except KeyboardInterrupt:
+                return
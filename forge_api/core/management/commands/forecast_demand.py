@@ -0,0 +1,43 @@
+"""
+Recalcula el pronóstico de demanda de todos los SKU en un lote y reemplaza
+kpi.demand_forecasts (ver core/forecasting.py). Pensado para cron, una vez
+al mes o al cerrar el mes:
+
+    python manage.py forecast_demand
+    python manage.py forecast_demand --history 24 --horizon 3
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import forecasting
+
+
+class Command(BaseCommand):
+    help = "Forecast monthly demand for every SKU and store it in kpi.demand_forecasts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--history', type=int, default=forecasting.DEFAULT_HISTORY_MONTHS,
+                            help="Complete months of history to use")
+        parser.add_argument('--horizon', type=int, default=forecasting.DEFAULT_HORIZON,
+                            help=f"Months to forecast (the API serves up to {forecasting.DEFAULT_HORIZON})")
+        parser.add_argument('--end', help="First month not used as history (YYYY-MM, default: current month)")
+
+    def handle(self, *args, **options):
+        if options['history'] < 2 or options['horizon'] < 1:
+            raise CommandError("--history must be at least 2 and --horizon at least 1")
+        end = None
+        if options['end']:
+            try:
+                year, month = options['end'].split('-')
+                end = date(int(year), int(month), 1)
+            except ValueError:
+                raise CommandError("--end must be YYYY-MM")
+
+        stats = forecasting.run(options['history'], options['horizon'], end)
+        methods = ', '.join(f"{name}: {count}" for name, count in sorted(stats['methods'].items()))
+        seconds = ', '.join(f"{name} {value:.2f}s" for name, value in stats['seconds'].items())
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['skus']} SKU(s) forecast {stats['horizon']} month(s) ahead ({methods}); {seconds}"
+        ))
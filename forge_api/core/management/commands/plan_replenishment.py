@@ -0,0 +1,38 @@
+"""
+Calcula stock de seguridad, punto de reorden y lote económico para todos los
+pares (almacén, SKU) y crea las órdenes de compra en borrador por proveedor
+y almacén (ver core/replenishment.py). Pensado para cron, cada noche y
+después de forecast_demand:
+
+    python manage.py plan_replenishment --dry-run
+    python manage.py plan_replenishment --warehouse ALM01 --service-level 0.98
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import replenishment
+
+
+class Command(BaseCommand):
+    help = "Plan replenishment for every (warehouse, SKU) pair and create draft purchase orders"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--warehouse', help="Only this warehouse code")
+        parser.add_argument('--service-level', type=float, help="Target service level (default: settings)")
+        parser.add_argument('--dry-run', action='store_true', help="Report suggestions without creating orders")
+
+    def handle(self, *args, **options):
+        service_level = options['service_level']
+        if service_level is not None and not 0.5 <= service_level < 1:
+            raise CommandError("--service-level must be between 0.5 and 1")
+
+        started = time.perf_counter()
+        result = replenishment.run(options['warehouse'], service_level, dry_run=options['dry_run'])
+        suggestions = result['suggestions']
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['pairs']} pair(s) planned, {len(suggestions)} to reorder "
+            f"({result['unassigned']} without supplier), {len(result['orders'])} draft order(s) created "
+            f"in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,192 @@
+"""
+Prometheus metrics for ForgeDB.
+
+Process metrics (request latency, cache lookups, SSE connections, stored
+procedure durations) are prometheus_client objects updated inline. With
+several gunicorn workers set PROMETHEUS_MULTIPROC_DIR to an empty, writable
+directory: every worker then writes its samples there and the /metrics view
+merges them with MultiProcessCollector (see docs/METRICS.md).
+
+Database metrics (connection usage, materialized view staleness) are read at
+scrape time by DatabaseCollector and cached for DB_METRICS_TTL seconds so
+frequent scrapes do not add load.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from .database import get_pool_status
+
+logger = logging.getLogger(__name__)
+
+DB_METRICS_TTL = 15  # seconds
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+REQUEST_LATENCY = Histogram(
+    'forge_http_request_duration_seconds', 'Request latency by route',
+    ['method', 'route'], buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    'forge_http_requests', 'Requests by route and status class',
+    ['method', 'route', 'status'],
+)
+REQUEST_DB_TIME = Histogram(
+    'forge_http_request_db_duration_seconds', 'Database time per request by route',
+    ['method', 'route'], buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    'forge_http_request_db_queries', 'Database queries per request by route',
+    ['method', 'route'], buckets=QUERY_COUNT_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    'forge_cache_lookups', 'Cache lookups by cache alias and result',
+    ['alias', 'result'],
+)
+SSE_CONNECTIONS = Gauge(
+    'forge_sse_connections', 'Open Server-Sent Events streams',
+    ['stream'], multiprocess_mode='livesum',
+)
+DB_CONNECTIONS_OPENED = Counter(
+    'forge_db_connections_opened', 'Database connections opened by Django',
+)
+PROCEDURE_DURATION = Histogram(
+    'forge_stored_procedure_duration_seconds', 'Stored procedure call duration',
+    ['procedure', 'outcome'], buckets=LATENCY_BUCKETS,
+)
+
+
+def observe_request(method, route, status_code, wall_ms, db_ms, queries):
+    REQUEST_LATENCY.labels(method, route).observe(wall_ms / 1000.0)
+    REQUESTS.labels(method, route, f'{status_code // 100}xx').inc()
+    REQUEST_DB_TIME.labels(method, route).observe(db_ms / 1000.0)
+    REQUEST_QUERIES.labels(method, route).observe(queries)
+
+
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    DB_CONNECTIONS_OPENED.inc()
+
+
+@contextmanager
+def track_sse_stream(stream):
+    """Count an open SSE stream for as long as the block runs."""
+    gauge = SSE_CONNECTIONS.labels(stream)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+def callproc(cursor, procedure, params):
+    """``cursor.callproc`` that records the call duration per procedure."""
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        result = cursor.callproc(procedure, params)
+        outcome = 'ok'
+        return result
+    finally:
+        PROCEDURE_DURATION.labels(procedure, outcome).observe(time.perf_counter() - start)
+
+
+def get_matview_staleness():
+    """
+    Seconds since each materialized view was last refreshed, from
+    kpi.matview_refresh_log (database/matview_refresh_log.sql). Views never
+    refreshed through kpi.refresh_* are reported as NULL.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('kpi.matview_refresh_log') IS NOT NULL")
+        if not cursor.fetchone()[0]:
+            return {}
+        cursor.execute(
+            """
+            SELECT m.schemaname || '.' || m.matviewname,
+                   EXTRACT(EPOCH FROM now() - MAX(l.refreshed_at))
+            FROM pg_matviews m
+            LEFT JOIN kpi.matview_refresh_log l
+                   ON l.view_name = m.schemaname || '.' || m.matviewname
+            GROUP BY 1
+            """
+        )
+        return {name: float(age) if age is not None else None for name, age in cursor.fetchall()}
+
+
+class DatabaseCollector:
+    """Scrape-time gauges for connection usage and materialized views."""
+
+    def __init__(self, ttl=DB_METRICS_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._cached_at = 0.0
+        self._cached = None
+
+    def _read(self):
+        with self._lock:
+            if self._cached is None or time.monotonic() - self._cached_at >= self.ttl:
+                data = {'up': 1, 'pool': None, 'matviews': {}}
+                try:
+                    data['pool'] = get_pool_status()
+                    data['matviews'] = get_matview_staleness()
+                except Exception as e:
+                    logger.warning(f"Database metrics unavailable: {e}")
+                    data['up'] = 0
+                self._cached = data
+                self._cached_at = time.monotonic()
+            return self._cached
+
+    def collect(self):
+        data = self._read()
+        yield GaugeMetricFamily('forge_db_up', 'Whether the database answered the metrics query', value=data['up'])
+
+        pool = data['pool']
+        if pool:
+            server = pool['server']
+            yield GaugeMetricFamily(
+                'forge_db_max_connections', 'PostgreSQL max_connections', value=server['max_connections'],
+            )
+            connections = GaugeMetricFamily(
+                'forge_db_connections', 'PostgreSQL client connections by state', labels=['state'],
+            )
+            for state in ('active', 'idle', 'idle_in_transaction'):
+                connections.add_metric([state], server[state])
+            yield connections
+            yield GaugeMetricFamily(
+                'forge_db_connections_usage_ratio', 'Client connections / max_connections',
+                value=server['usage_pct'] / 100.0,
+            )
+
+        staleness = GaugeMetricFamily(
+            'forge_materialized_view_staleness_seconds',
+            'Seconds since the materialized view was last refreshed', labels=['view'],
+        )
+        for view, age in sorted(data['matviews'].items()):
+            staleness.add_metric([view], float('nan') if age is None else age)
+        yield staleness
+
+
+database_registry = CollectorRegistry(auto_describe=False)
+database_registry.register(DatabaseCollector())
+
+
+def render_metrics():
+    """Exposition text for every worker's metrics plus database gauges."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry) + generate_latest(database_registry)
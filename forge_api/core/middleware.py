@@ -0,0 +1,86 @@
+"""
+Core middleware for ForgeDB API
+"""
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from .database import reset_current_request, set_current_request
+from .metrics import observe_request
+from .profiling import QueryRecorder, endpoint_key, profiler
+
+
+class AuditUserMiddleware:
+    """
+    Make the current request's user available to the database layer.
+
+    The audit triggers read ``app.user_id``; core.database sets it per
+    transaction for every write issued while this request is being served.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = set_current_request(request)
+        try:
+            return self.get_response(request)
+        finally:
+            reset_current_request(token)
+
+
+class QueryProfilerMiddleware:
+    """
+    Record wall time, DB queries/time, render time and response size per
+    endpoint (see core.profiling) and feed the Prometheus request metrics.
+    Place it first in MIDDLEWARE so the wall time covers the whole
+    middleware stack.
+    """
+
+    SKIP_PREFIXES = ('/static/', '/media/', '/favicon.ico')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'REQUEST_PROFILER_ENABLED', True)
+        self.n_plus_one_threshold = getattr(settings, 'REQUEST_PROFILER_N_PLUS_ONE_THRESHOLD', 5)
+
+    def __call__(self, request):
+        if not self.enabled or request.path.startswith(self.SKIP_PREFIXES):
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        key = endpoint_key(request)
+        method, route = key.split(' ', 1)
+        observe_request(method, route, response.status_code, wall_ms, recorder.duration_ms, recorder.count)
+        profiler.record(key, {
+            'status': response.status_code,
+            'wall_ms': wall_ms,
+            'db_ms': recorder.duration_ms,
+            'queries': recorder.count,
+            'render_ms': getattr(request, '_profiler_render_ms', None),
+            'response_bytes': self._response_size(response),
+            'repeated_queries': recorder.repeated_queries(self.n_plus_one_threshold),
+        })
+        return response
+
+    def process_template_response(self, request, response):
+        """Time template/renderer output (DRF responses render here too)."""
+        start = time.perf_counter()
+
+        def rendered(response):
+            request._profiler_render_ms = (time.perf_counter() - start) * 1000
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def _response_size(response):
+        if getattr(response, 'streaming', False):
+            return int(response.get('Content-Length') or 0)
+        return len(response.content)
@@ -0,0 +1,79 @@
+# Versión de los catálogos de referencia (app.reference_data_version) y
+# triggers que la incrementan en cada escritura. Ver core/reference_data.py.
+
+from django.db import migrations
+
+# Tablas del bundle de referencia; las que no existan se omiten.
+CATALOG_TABLES = [
+    'cat.equipment_types', 'cat.categories',
+    'cat.fuel_codes', 'cat.aspiration_codes', 'cat.transmission_codes', 'cat.drivetrain_codes',
+    'cat.color_codes', 'cat.position_codes', 'cat.finish_codes', 'cat.source_codes',
+    'cat.condition_codes', 'cat.uom_codes', 'cat.currencies',
+    'cat.product_category', 'cat.product_type',
+    'cat.taxonomy_systems', 'cat.taxonomy_subsystems', 'cat.taxonomy_groups',
+    'oem.brand_types', 'oem.brands', 'oem_brands',
+]
+
+TRIGGER_NAME = 'trg_reference_data_version'
+
+
+def existing_tables(cursor):
+    tables = []
+    for name in CATALOG_TABLES:
+        cursor.execute("SELECT to_regclass(%s)::text;", [name])
+        regclass = cursor.fetchone()[0]
+        if regclass and regclass not in tables:
+            tables.append(regclass)
+    return tables
+
+
+def create_version_table(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS app.reference_data_version (
+                id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+                version BIGINT NOT NULL DEFAULT 1,
+                updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        cursor.execute("""
+            INSERT INTO app.reference_data_version (id, version) VALUES (1, 1)
+            ON CONFLICT (id) DO NOTHING;
+        """)
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION app.bump_reference_data_version()
+            RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                UPDATE app.reference_data_version
+                   SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+                 WHERE id = 1;
+                RETURN NULL;
+            END;
+            $$;
+        """)
+        for table in existing_tables(cursor):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_NAME} ON {table};")
+            cursor.execute(f"""
+                CREATE TRIGGER {TRIGGER_NAME}
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+                FOR EACH STATEMENT EXECUTE FUNCTION app.bump_reference_data_version();
+            """)
+
+
+def drop_version_table(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for table in existing_tables(cursor):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_NAME} ON {table};")
+        cursor.execute("DROP FUNCTION IF EXISTS app.bump_reference_data_version();")
+        cursor.execute("DROP TABLE IF EXISTS app.reference_data_version;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_product_category_and_product_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_version_table, drop_version_table),
+    ]
@@ -0,0 +1,95 @@
+# Contador de cambios por tabla (app.table_versions) para validadores ETag /
+# Last-Modified (core/conditional.py) y la versión del bundle de referencia.
+# Sustituye a app.reference_data_version (0017): un contador por tabla evita
+# que escrituras en catálogos distintos compitan por la misma fila.
+
+from importlib import import_module
+
+from django.db import migrations
+
+# Catálogos con contador; las tablas que no existan se omiten.
+TRACKED_TABLES = [
+    'cat.equipment_types', 'cat.categories',
+    'cat.fuel_codes', 'cat.aspiration_codes', 'cat.transmission_codes', 'cat.drivetrain_codes',
+    'cat.color_codes', 'cat.position_codes', 'cat.finish_codes', 'cat.source_codes',
+    'cat.condition_codes', 'cat.uom_codes', 'cat.currencies',
+    'cat.product_category', 'cat.product_type',
+    'cat.taxonomy_systems', 'cat.taxonomy_subsystems', 'cat.taxonomy_groups',
+    'oem.brand_types', 'oem.brands', 'oem_brands',
+]
+
+OLD_TRIGGER = 'trg_reference_data_version'
+TRIGGER_NAME = 'trg_table_version'
+
+
+def existing_tables(cursor):
+    """Nombres schema.tabla de las tablas de TRACKED_TABLES que existen."""
+    tables = []
+    for name in TRACKED_TABLES:
+        cursor.execute("""
+            SELECT n.nspname || '.' || c.relname
+            FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.oid = to_regclass(%s);
+        """, [name])
+        row = cursor.fetchone()
+        if row and row[0] not in tables:
+            tables.append(row[0])
+    return tables
+
+
+def create_table_versions(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS app.table_versions (
+                table_name VARCHAR(128) PRIMARY KEY,
+                version BIGINT NOT NULL DEFAULT 1,
+                updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION app.bump_table_version()
+            RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                INSERT INTO app.table_versions AS tv (table_name, version, updated_at)
+                VALUES (TG_TABLE_SCHEMA || '.' || TG_TABLE_NAME, 1, CURRENT_TIMESTAMP)
+                ON CONFLICT (table_name) DO UPDATE
+                    SET version = tv.version + 1, updated_at = CURRENT_TIMESTAMP;
+                RETURN NULL;
+            END;
+            $$;
+        """)
+        for table in existing_tables(cursor):
+            cursor.execute(
+                "INSERT INTO app.table_versions (table_name) VALUES (%s) ON CONFLICT (table_name) DO NOTHING;",
+                [table],
+            )
+            cursor.execute(f"DROP TRIGGER IF EXISTS {OLD_TRIGGER} ON {table};")
+            cursor.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_NAME} ON {table};")
+            cursor.execute(f"""
+                CREATE TRIGGER {TRIGGER_NAME}
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+                FOR EACH STATEMENT EXECUTE FUNCTION app.bump_table_version();
+            """)
+        cursor.execute("DROP FUNCTION IF EXISTS app.bump_reference_data_version();")
+        cursor.execute("DROP TABLE IF EXISTS app.reference_data_version;")
+
+
+def drop_table_versions(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for table in existing_tables(cursor):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_NAME} ON {table};")
+        cursor.execute("DROP FUNCTION IF EXISTS app.bump_table_version();")
+        cursor.execute("DROP TABLE IF EXISTS app.table_versions;")
+    # Volver al contador único de 0017.
+    import_module('core.migrations.0017_reference_data_version').create_version_table(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_reference_data_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_table_versions, drop_table_versions),
+    ]
@@ -0,0 +1,58 @@
+# Índices de expresión para los lookups de selects remotos (core/lookups.py).
+# La expresión debe coincidir con lookups.sort_key():
+#   COALESCE(UPPER(campo), '') COLLATE "C"
+# El primer campo de cada tabla es la clave de orden (con la PK para el
+# keyset); el resto sólo se usan en la búsqueda por prefijo.
+
+from django.db import migrations
+
+LOOKUP_INDEXES = [
+    # (tabla, clave primaria, campos de búsqueda)
+    ('clients', 'client_id', ['name', 'client_code']),
+    ('equipment', 'equipment_id', ['equipment_code', 'license_plate']),
+    ('product_master', 'internal_sku', ['name', 'internal_sku']),
+    ('technicians', 'technician_id', ['last_name', 'employee_code']),
+]
+
+
+def index_name(table, field):
+    return f'idx_lookup_{table}_{field}'
+
+
+def create_lookup_indexes(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for table, pk, fields in LOOKUP_INDEXES:
+            cursor.execute("SELECT to_regclass(%s)::text;", [table])
+            regclass = cursor.fetchone()[0]
+            if not regclass:
+                continue
+            for position, field in enumerate(fields):
+                columns = f"""(COALESCE(UPPER({field}), '') COLLATE "C")"""
+                if position == 0:
+                    columns += f', {pk}'
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index_name(table, field)} ON {regclass} ({columns});"
+                )
+
+
+def drop_lookup_indexes(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for table, pk, fields in LOOKUP_INDEXES:
+            cursor.execute("SELECT n.nspname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                           "WHERE c.oid = to_regclass(%s);", [table])
+            row = cursor.fetchone()
+            if not row:
+                continue
+            for field in fields:
+                cursor.execute(f"DROP INDEX IF EXISTS {row[0]}.{index_name(table, field)};")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_table_versions'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_lookup_indexes, drop_lookup_indexes),
+    ]
@@ -0,0 +1,134 @@
+# Tabla de cierre de la taxonomía (sistema -> subsistema -> grupo) para
+# core/taxonomy.py: una fila (ancestro, descendiente, profundidad) por cada
+# par de nodos en la misma rama, incluida la fila del nodo consigo mismo
+# (profundidad 0). Los descendientes de un nodo y la detección de ciclos son
+# una consulta sobre la clave primaria o el índice de descendientes.
+#
+# La taxonomía es pequeña (~1 000 nodos), así que los triggers reconstruyen
+# la tabla completa con un solo INSERT ... SELECT por sentencia que inserta,
+# borra o cambia un código o un padre; renombrar o activar nodos no la toca.
+
+from django.db import migrations
+
+TAXONOMY_TABLES = ['taxonomy_systems', 'taxonomy_subsystems', 'taxonomy_groups']
+
+# Columnas cuyo cambio mueve nodos en el árbol
+KEY_COLUMNS = {
+    'taxonomy_systems': 'system_code',
+    'taxonomy_subsystems': 'subsystem_code, system_code',
+    'taxonomy_groups': 'group_code, subsystem_code',
+}
+
+TRIGGER_NAME = 'trg_taxonomy_closure'
+TRIGGER_UPDATE_NAME = 'trg_taxonomy_closure_update'
+
+
+def resolve_tables(cursor):
+    """{tabla: schema.tabla} de las tablas de taxonomía que existen."""
+    resolved = {}
+    for table in TAXONOMY_TABLES:
+        cursor.execute("""
+            SELECT n.nspname || '.' || c.relname
+            FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.oid = to_regclass(%s);
+        """, [table])
+        row = cursor.fetchone()
+        if row:
+            resolved[table] = row[0]
+    return resolved
+
+
+def create_closure(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        tables = resolve_tables(cursor)
+        if len(tables) < len(TAXONOMY_TABLES):
+            return
+        schema = tables['taxonomy_systems'].split('.')[0]
+        closure = f'{schema}.taxonomy_closure'
+        systems, subsystems, groups = (tables[name] for name in TAXONOMY_TABLES)
+
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {closure} (
+                ancestor_type VARCHAR(10) NOT NULL,
+                ancestor_code VARCHAR(20) NOT NULL,
+                descendant_type VARCHAR(10) NOT NULL,
+                descendant_code VARCHAR(20) NOT NULL,
+                depth SMALLINT NOT NULL,
+                PRIMARY KEY (ancestor_type, ancestor_code, descendant_type, descendant_code)
+            );
+        """)
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_taxonomy_closure_descendant
+            ON {closure} (descendant_type, descendant_code, depth);
+        """)
+        # El LOCK serializa reconstrucciones concurrentes: la segunda espera a
+        # que la primera confirme y su DELETE ya ve las filas insertadas.
+        cursor.execute(f"""
+            CREATE OR REPLACE FUNCTION {schema}.refresh_taxonomy_closure()
+            RETURNS void LANGUAGE plpgsql AS $$
+            BEGIN
+                LOCK TABLE {closure} IN SHARE ROW EXCLUSIVE MODE;
+                DELETE FROM {closure};
+                INSERT INTO {closure} (ancestor_type, ancestor_code, descendant_type, descendant_code, depth)
+                SELECT 'system', system_code, 'system', system_code, 0 FROM {systems}
+                UNION ALL
+                SELECT 'subsystem', subsystem_code, 'subsystem', subsystem_code, 0 FROM {subsystems}
+                UNION ALL
+                SELECT 'system', system_code, 'subsystem', subsystem_code, 1 FROM {subsystems}
+                UNION ALL
+                SELECT 'group', group_code, 'group', group_code, 0 FROM {groups}
+                UNION ALL
+                SELECT 'subsystem', subsystem_code, 'group', group_code, 1 FROM {groups}
+                UNION ALL
+                SELECT 'system', s.system_code, 'group', g.group_code, 2
+                FROM {groups} g JOIN {subsystems} s ON s.subsystem_code = g.subsystem_code;
+            END;
+            $$;
+        """)
+        cursor.execute(f"""
+            CREATE OR REPLACE FUNCTION {schema}.rebuild_taxonomy_closure()
+            RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                PERFORM {schema}.refresh_taxonomy_closure();
+                RETURN NULL;
+            END;
+            $$;
+        """)
+        for name, table in tables.items():
+            cursor.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_NAME} ON {table};")
+            cursor.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_UPDATE_NAME} ON {table};")
+            cursor.execute(f"""
+                CREATE TRIGGER {TRIGGER_NAME}
+                AFTER INSERT OR DELETE OR TRUNCATE ON {table}
+                FOR EACH STATEMENT EXECUTE FUNCTION {schema}.rebuild_taxonomy_closure();
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER {TRIGGER_UPDATE_NAME}
+                AFTER UPDATE OF {KEY_COLUMNS[name]} ON {table}
+                FOR EACH STATEMENT EXECUTE FUNCTION {schema}.rebuild_taxonomy_closure();
+            """)
+        cursor.execute(f"SELECT {schema}.refresh_taxonomy_closure();")
+
+
+def drop_closure(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        tables = resolve_tables(cursor)
+        for table in tables.values():
+            cursor.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_NAME} ON {table};")
+            cursor.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_UPDATE_NAME} ON {table};")
+        if 'taxonomy_systems' in tables:
+            schema = tables['taxonomy_systems'].split('.')[0]
+            cursor.execute(f"DROP FUNCTION IF EXISTS {schema}.rebuild_taxonomy_closure();")
+            cursor.execute(f"DROP FUNCTION IF EXISTS {schema}.refresh_taxonomy_closure();")
+            cursor.execute(f"DROP TABLE IF EXISTS {schema}.taxonomy_closure;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_closure, drop_closure),
+    ]
@@ -0,0 +1,58 @@
+# Índices parciales sobre las columnas que referencian códigos de referencia
+# (core/reference_codes.py). Sin ellos, cada renombrado o conteo de uso y
+# cada DELETE de un código (verificación de la FK) recorre la tabla completa.
+# Son parciales (IS NOT NULL) porque la mayoría de los equipos no tiene
+# todos los códigos informados.
+
+from django.db import migrations
+
+REFERENCE_INDEXES = [
+    # (tabla, columna)
+    ('equipment', 'fuel_code'),
+    ('equipment', 'aspiration_code'),
+    ('equipment', 'transmission_code'),
+    ('equipment', 'drivetrain_code'),
+    ('equipment', 'color'),
+    ('product_master', 'color_code'),
+    ('product_master', 'condition_code'),
+]
+
+
+def index_name(table, column):
+    return f'idx_refcode_{table}_{column}'
+
+
+def create_reference_indexes(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for table, column in REFERENCE_INDEXES:
+            cursor.execute("SELECT n.nspname || '.' || c.relname FROM pg_class c "
+                           "JOIN pg_namespace n ON n.oid = c.relnamespace WHERE c.oid = to_regclass(%s);", [table])
+            row = cursor.fetchone()
+            if not row:
+                continue
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {index_name(table, column)} ON {row[0]} ({column}) "
+                f"WHERE {column} IS NOT NULL;"
+            )
+
+
+def drop_reference_indexes(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for table, column in REFERENCE_INDEXES:
+            cursor.execute("SELECT n.nspname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                           "WHERE c.oid = to_regclass(%s);", [table])
+            row = cursor.fetchone()
+            if not row:
+                continue
+            cursor.execute(f"DROP INDEX IF EXISTS {row[0]}.{index_name(table, column)};")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_taxonomy_closure'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_reference_indexes, drop_reference_indexes),
+    ]
@@ -0,0 +1,42 @@
+# Tabla de pronósticos de demanda (core/forecasting.py). El comando
+# `forecast_demand` la reemplaza completa en cada corrida y el endpoint
+# analytics/demand-forecast/ la lee en lugar de recalcular por SKU. Una fila
+# por SKU y mes pronosticado.
+
+from django.db import migrations
+
+CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS kpi.demand_forecasts (
+    internal_sku VARCHAR(50) NOT NULL,
+    month DATE NOT NULL,
+    method VARCHAR(10) NOT NULL,
+    pattern VARCHAR(12) NOT NULL,
+    forecast_qty NUMERIC(14, 2) NOT NULL,
+    forecast_std NUMERIC(14, 2) NOT NULL,
+    historical_avg NUMERIC(14, 2) NOT NULL,
+    generated_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (internal_sku, month)
+);
+"""
+
+
+def create_forecast_table(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("CREATE SCHEMA IF NOT EXISTS kpi;")
+        cursor.execute(CREATE_SQL)
+
+
+def drop_forecast_table(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS kpi.demand_forecasts;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_reference_code_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_forecast_table, drop_forecast_table),
+    ]
@@ -0,0 +1,252 @@
+# Reglas de negocio compiladas (core/business_rules.py).
+#
+# app.validate_business_rules() recorría en cada escritura de una OT todas
+# las reglas activas de la tabla y ejecutaba un SELECT dinámico por regla
+# (un plan nuevo por regla y por fila). Además buscaba la fila por
+# "<tabla>_id" (work_orders_id no existe) y las condiciones con NEW.* no se
+# pueden evaluar en SQL dinámico.
+#
+# app.compile_business_rules() genera una función plpgsql por tabla
+# (app.br_<schema>_<tabla>) con las reglas SQL activas en orden de ejecución,
+# como SQL estático: plpgsql prepara cada condición una vez por sesión. Un
+# trigger por sentencia sobre app.business_rules vuelve a compilar en la
+# misma transacción en que cambian las reglas y rechaza el cambio si alguna
+# condición no compila. Las reglas python/regex se evalúan en Django.
+
+import logging
+
+from django.db import migrations
+
+logger = logging.getLogger(__name__)
+
+COMPILER_SQL = r"""
+CREATE OR REPLACE FUNCTION app.compile_business_rules()
+RETURNS TABLE (rule_code VARCHAR, error TEXT)
+LANGUAGE plpgsql AS $compiler$
+DECLARE
+    tbl RECORD;
+    rule RECORD;
+    fn_name TEXT;
+    qualified TEXT;
+    pk_column TEXT;
+    body TEXT;
+    condition TEXT;
+    action TEXT;
+    events TEXT;
+    compiled TEXT[] := '{}';
+    old_fn RECORD;
+BEGIN
+    FOR tbl IN
+        SELECT DISTINCT c.oid::regclass AS relid, n.nspname AS schema_name, c.relname AS table_name
+        FROM app.business_rules br
+        JOIN pg_class c ON c.oid = to_regclass(COALESCE(br.applies_to_schema || '.', '') || br.applies_to_table)
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE br.is_active AND upper(br.condition_type) IN ('SQL', 'EXPRESSION')
+    LOOP
+        fn_name := format('app.%I', 'br_' || tbl.schema_name || '_' || tbl.table_name);
+        qualified := format('%I.%I', tbl.schema_name, tbl.table_name);
+        SELECT a.attname INTO pk_column
+        FROM pg_index i JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+        WHERE i.indrelid = tbl.relid AND i.indisprimary AND i.indnatts = 1
+          AND a.atttypid IN ('int2'::regtype, 'int4'::regtype, 'int8'::regtype);
+
+        body := format(E'DECLARE\n    r %s%%ROWTYPE;\nBEGIN\n' ||
+                       E'    IF TG_OP = ''DELETE'' THEN r := OLD; ELSE r := NEW; END IF;\n', qualified);
+        FOR rule IN
+            SELECT br.* FROM app.business_rules br
+            WHERE br.is_active AND upper(br.condition_type) IN ('SQL', 'EXPRESSION')
+              AND to_regclass(COALESCE(br.applies_to_schema || '.', '') || br.applies_to_table) = tbl.relid
+            ORDER BY br.execution_order, br.rule_code
+        LOOP
+            -- Una condición que sólo usa NEW./OLD. queda como expresión plpgsql
+            -- (sin consulta por fila); si nombra columnas sueltas se evalúa
+            -- con un SELECT sobre la fila.
+            BEGIN
+                EXECUTE format('EXPLAIN SELECT (%s)::boolean',
+                               regexp_replace(rule.condition_text, '\m(NEW|OLD)\.', format('(NULL::%s).', qualified), 'gi'));
+                condition := regexp_replace(rule.condition_text, '\mNEW\.', 'r.', 'gi');
+            EXCEPTION WHEN OTHERS THEN
+                BEGIN
+                    EXECUTE format('EXPLAIN SELECT (%s)::boolean FROM (SELECT (NULL::%s).*) AS %I',
+                                   regexp_replace(rule.condition_text, '\m(NEW|OLD)\.', tbl.table_name || '.', 'gi'),
+                                   qualified, tbl.table_name);
+                    condition := format('SELECT (%s)::boolean FROM (SELECT r.*) AS %I',
+                                        regexp_replace(rule.condition_text, '\mNEW\.', tbl.table_name || '.', 'gi'),
+                                        tbl.table_name);
+                EXCEPTION WHEN OTHERS THEN
+                    rule_code := rule.rule_code;
+                    error := SQLERRM;
+                    RETURN NEXT;
+                    CONTINUE;
+                END;
+            END;
+
+            events := CASE upper(COALESCE(rule.trigger_event, 'ANY'))
+                WHEN 'INSERT' THEN '''INSERT'''
+                WHEN 'UPDATE' THEN '''UPDATE'''
+                WHEN 'DELETE' THEN '''DELETE'''
+                ELSE '''INSERT'', ''UPDATE'', ''DELETE''' END;
+            action := CASE upper(rule.action_type)
+                WHEN 'BLOCK' THEN format(E'        RAISE EXCEPTION ''Regla de negocio violada: %%'', %L\n' ||
+                                         E'            USING ERRCODE = ''check_violation'', HINT = %L;\n',
+                                         rule.rule_name, rule.rule_code)
+                WHEN 'VALIDATE' THEN format(E'        RAISE EXCEPTION ''Regla de negocio violada: %%'', %L\n' ||
+                                            E'            USING ERRCODE = ''check_violation'', HINT = %L;\n',
+                                            rule.rule_name, rule.rule_code)
+                WHEN 'ALERT' THEN format(E'        INSERT INTO app.alerts (alert_type, title, message, ref_entity, ref_id, ref_code, severity)\n' ||
+                                         E'        VALUES (''SYSTEM_ERROR'', ''Regla de negocio'', %L, TG_TABLE_NAME, %s, %L, %L);\n',
+                                         rule.rule_name, COALESCE('r.' || quote_ident(pk_column), 'NULL'),
+                                         rule.rule_code, upper(COALESCE(rule.severity, 'MEDIUM')))
+                WHEN 'AUTO_CORRECT' THEN format(E'        %s\n        IF TG_OP <> ''DELETE'' THEN r := NEW; END IF;\n',
+                                                rtrim(rule.action_text, E'; \n') || ';')
+                WHEN 'WARN' THEN format(E'        RAISE WARNING ''Regla de negocio %%: %%'', %L, %L;\n', rule.rule_code, rule.rule_name)
+                ELSE format(E'        RAISE LOG ''Regla de negocio %%: %%'', %L, %L;\n', rule.rule_code, rule.rule_name)
+            END;
+            body := body || format(E'    -- %s\n    IF TG_OP IN (%s) AND (%s) THEN\n%s%s    END IF;\n',
+                                   rule.rule_code, events, condition, action,
+                                   CASE WHEN rule.stop_on_match
+                                        THEN E'        IF TG_OP = ''DELETE'' THEN RETURN OLD; END IF;\n        RETURN NEW;\n'
+                                        ELSE '' END);
+        END LOOP;
+        body := body || E'    IF TG_OP = ''DELETE'' THEN RETURN OLD; END IF;\n    RETURN NEW;\nEND;\n';
+
+        BEGIN
+            EXECUTE format('CREATE OR REPLACE FUNCTION %s() RETURNS trigger LANGUAGE plpgsql AS %L', fn_name, body);
+        EXCEPTION WHEN OTHERS THEN
+            rule_code := NULL;
+            error := format('%s: %s', qualified, SQLERRM);
+            RETURN NEXT;
+            CONTINUE;
+        END;
+        EXECUTE format('COMMENT ON FUNCTION %s() IS %L', fn_name, 'app.compile_business_rules');
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_business_rules ON %s', qualified);
+        EXECUTE format('CREATE TRIGGER trg_business_rules BEFORE INSERT OR UPDATE OR DELETE ON %s '
+                       'FOR EACH ROW EXECUTE FUNCTION %s()', qualified, fn_name);
+        compiled := compiled || fn_name;
+    END LOOP;
+
+    -- Tablas que ya no tienen reglas SQL activas
+    FOR old_fn IN
+        SELECT format('app.%I', p.proname) AS fn_name
+        FROM pg_proc p JOIN pg_namespace n ON n.oid = p.pronamespace
+        WHERE n.nspname = 'app' AND obj_description(p.oid, 'pg_proc') = 'app.compile_business_rules'
+    LOOP
+        IF NOT old_fn.fn_name = ANY(compiled) THEN
+            EXECUTE format('DROP FUNCTION %s() CASCADE', old_fn.fn_name);
+        END IF;
+    END LOOP;
+END;
+$compiler$;
+
+CREATE OR REPLACE FUNCTION app.recompile_business_rules()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    failure RECORD;
+BEGIN
+    FOR failure IN SELECT * FROM app.compile_business_rules() LOOP
+        RAISE EXCEPTION 'Regla de negocio %: la condición no compila: %',
+            COALESCE(failure.rule_code, '-'), failure.error
+            USING ERRCODE = 'invalid_parameter_value';
+    END LOOP;
+    RETURN NULL;
+END;
+$$;
+"""
+
+# Acepta también los valores del modelo Django (python/regex, minúsculas).
+CONSTRAINTS = [
+    ('business_rules_condition_type_check',
+     "upper(condition_type) IN ('SQL', 'EXPRESSION', 'FUNCTION', 'PYTHON', 'REGEX')"),
+    ('business_rules_action_type_check',
+     "upper(action_type) IN ('VALIDATE', 'ALERT', 'AUTO_CORRECT', 'LOG', 'BLOCK', 'WARN')"),
+    ('business_rules_trigger_event_check',
+     "upper(trigger_event) IN ('INSERT', 'UPDATE', 'DELETE', 'ANY', 'SELECT')"),
+    ('business_rules_severity_check',
+     "upper(severity) IN ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')"),
+]
+
+
+def business_rules_table(cursor):
+    cursor.execute("SELECT to_regclass('app.business_rules') IS NOT NULL;")
+    return cursor.fetchone()[0]
+
+
+def create_rule_compiler(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        if not business_rules_table(cursor):
+            return
+        for name, check in CONSTRAINTS:
+            cursor.execute(f"ALTER TABLE app.business_rules DROP CONSTRAINT IF EXISTS {name};")
+            cursor.execute(f"ALTER TABLE app.business_rules ADD CONSTRAINT {name} CHECK ({check});")
+        cursor.execute(COMPILER_SQL)
+
+        # Reemplaza el trigger genérico en las OT
+        cursor.execute("SELECT to_regclass('svc.work_orders') IS NOT NULL;")
+        if cursor.fetchone()[0]:
+            cursor.execute("DROP TRIGGER IF EXISTS trg_validate_wo_rules ON svc.work_orders;")
+
+        # Reglas inválidas existentes se omiten y quedan en el log
+        cursor.execute("SELECT * FROM app.compile_business_rules();")
+        for rule_code, error in cursor.fetchall():
+            logger.warning("Regla %s omitida: %s", rule_code or '-', error)
+
+        cursor.execute("DROP TRIGGER IF EXISTS trg_recompile_business_rules ON app.business_rules;")
+        cursor.execute("""
+            CREATE TRIGGER trg_recompile_business_rules
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON app.business_rules
+            FOR EACH STATEMENT EXECUTE FUNCTION app.recompile_business_rules();
+        """)
+
+        # Contador para la caché de reglas python/regex en Django (ver 0018)
+        cursor.execute("SELECT to_regproc('app.bump_table_version') IS NOT NULL;")
+        if cursor.fetchone()[0]:
+            cursor.execute("""
+                INSERT INTO app.table_versions (table_name) VALUES ('app.business_rules')
+                ON CONFLICT (table_name) DO NOTHING;
+            """)
+            cursor.execute("DROP TRIGGER IF EXISTS trg_table_version ON app.business_rules;")
+            cursor.execute("""
+                CREATE TRIGGER trg_table_version
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON app.business_rules
+                FOR EACH STATEMENT EXECUTE FUNCTION app.bump_table_version();
+            """)
+
+
+def drop_rule_compiler(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        if not business_rules_table(cursor):
+            return
+        cursor.execute("DROP TRIGGER IF EXISTS trg_table_version ON app.business_rules;")
+        cursor.execute("DELETE FROM app.table_versions WHERE table_name = 'app.business_rules';")
+        cursor.execute("DROP TRIGGER IF EXISTS trg_recompile_business_rules ON app.business_rules;")
+        cursor.execute("""
+            SELECT format('app.%I', p.proname)
+            FROM pg_proc p JOIN pg_namespace n ON n.oid = p.pronamespace
+            WHERE n.nspname = 'app' AND obj_description(p.oid, 'pg_proc') = 'app.compile_business_rules';
+        """)
+        for (function,) in cursor.fetchall():
+            cursor.execute(f"DROP FUNCTION IF EXISTS {function}() CASCADE;")
+        cursor.execute("DROP FUNCTION IF EXISTS app.recompile_business_rules();")
+        cursor.execute("DROP FUNCTION IF EXISTS app.compile_business_rules();")
+        cursor.execute("""
+            SELECT to_regclass('svc.work_orders') IS NOT NULL
+               AND to_regproc('app.validate_business_rules') IS NOT NULL;
+        """)
+        if cursor.fetchone()[0]:
+            cursor.execute("""
+                CREATE TRIGGER trg_validate_wo_rules
+                BEFORE INSERT OR UPDATE ON svc.work_orders
+                FOR EACH ROW EXECUTE FUNCTION app.validate_business_rules();
+            """)
+        # Las restricciones ampliadas se mantienen: aceptan todos los valores anteriores.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_demand_forecasts'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_rule_compiler, drop_rule_compiler),
+    ]
@@ -0,0 +1,250 @@
+# Auditoría por sentencia con tablas de transición (ver docs/AUDIT.md).
+#
+# app.audit_changes() era un trigger por fila sobre OT, facturas y stock que
+# guardaba row_to_json(OLD) y row_to_json(NEW) completos en cada cambio
+# (duplicaba la escritura de inv.stock) y leía NEW.wo_id en todas las tablas,
+# así que cualquier movimiento de stock fallaba.
+#
+# app.enable_audit() genera para cada tabla una función que corre una vez por
+# sentencia y escribe con un solo INSERT ... SELECT sobre las filas de
+# transición:
+#   - INSERT: la fila nueva sin columnas nulas.
+#   - UPDATE: sólo las columnas que cambiaron (old_values/new_values); las
+#     columnas ignoradas (updated_at) y las generadas no cuentan y una fila
+#     sin cambios no genera registro.
+#   - DELETE: la fila borrada sin columnas nulas.
+# Con buffered = true los registros van a app.audit_buffer (UNLOGGED, sólo
+# con la clave primaria) y `python manage.py flush_audit_buffer` los pasa a
+# app.audit_logs por lotes.
+
+from django.db import migrations
+
+AUDIT_SQL = r"""
+CREATE TABLE IF NOT EXISTS app.audited_tables (
+    table_name REGCLASS PRIMARY KEY,
+    pk_column NAME NOT NULL,
+    ignore_columns TEXT[] NOT NULL DEFAULT '{updated_at}',
+    buffered BOOLEAN NOT NULL DEFAULT FALSE,
+    enabled_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE UNLOGGED TABLE IF NOT EXISTS app.audit_buffer (
+    buffer_id BIGSERIAL PRIMARY KEY,
+    table_name VARCHAR(50) NOT NULL,
+    record_id BIGINT NOT NULL,
+    action VARCHAR(10) NOT NULL,
+    changed_by INT,
+    changed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    old_values JSONB,
+    new_values JSONB
+);
+
+-- Genera app.audit_<schema>_<tabla>() con SQL estático para la tabla: cada
+-- columna se compara con su tipo (sin pasar la fila entera a JSON) y plpgsql
+-- guarda el plan de cada sentencia.
+CREATE OR REPLACE FUNCTION app.enable_audit(
+    p_table REGCLASS,
+    p_ignore_columns TEXT[] DEFAULT '{updated_at}',
+    p_buffered BOOLEAN DEFAULT FALSE
+) RETURNS VOID LANGUAGE plpgsql AS $$
+DECLARE
+    pk NAME;
+    rel_schema NAME;
+    rel_name NAME;
+    fn_name TEXT;
+    target TEXT := CASE WHEN p_buffered THEN 'app.audit_buffer' ELSE 'app.audit_logs' END;
+    changed_sql TEXT;
+    old_sql TEXT;
+    new_sql TEXT;
+    op TEXT;
+BEGIN
+    -- record_id es la primera columna entera de la clave primaria
+    -- (inv.stock usa (stock_id, last_receipt_date))
+    SELECT a.attname INTO pk
+    FROM pg_index i
+    CROSS JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, position)
+    JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+    WHERE i.indrelid = p_table AND i.indisprimary
+      AND a.atttypid IN ('int2'::regtype, 'int4'::regtype, 'int8'::regtype)
+    ORDER BY k.position
+    LIMIT 1;
+    IF pk IS NULL THEN
+        RAISE EXCEPTION 'La auditoría necesita una columna entera en la clave primaria: %', p_table
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+    SELECT n.nspname, c.relname INTO rel_schema, rel_name
+    FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace WHERE c.oid = p_table;
+    fn_name := format('app.%I', 'audit_' || rel_schema || '_' || rel_name);
+
+    -- Columnas comparadas: ni generadas (se derivan de otras) ni ignoradas.
+    -- Los tipos sin operador = (json, point...) se comparan como texto.
+    -- jsonb_build_object admite 100 argumentos: bloques de 40 columnas.
+    WITH cols AS (
+        SELECT a.attname AS col,
+               CASE WHEN EXISTS (SELECT 1 FROM pg_operator op
+                                 WHERE op.oprname = '=' AND op.oprleft = a.atttypid AND op.oprright = a.atttypid)
+                    THEN format('o.%1$I IS DISTINCT FROM n.%1$I', a.attname)
+                    ELSE format('o.%1$I::text IS DISTINCT FROM n.%1$I::text', a.attname) END AS differs,
+               (row_number() OVER (ORDER BY a.attnum) - 1) / 40 AS chunk
+        FROM pg_attribute a
+        WHERE a.attrelid = p_table AND a.attnum > 0 AND NOT a.attisdropped AND a.attgenerated = ''
+          AND a.attname <> ALL (COALESCE(p_ignore_columns, '{}'))
+    ), chunks AS (
+        SELECT chunk,
+               string_agg(differs, ' OR ') AS changed,
+               string_agg(format('%L, CASE WHEN %s THEN to_jsonb(o.%I) END', col, differs, col), ', ') AS old_args,
+               string_agg(format('%L, CASE WHEN %s THEN to_jsonb(n.%I) END', col, differs, col), ', ') AS new_args
+        FROM cols GROUP BY chunk
+    )
+    SELECT string_agg(chunks.changed, ' OR ' ORDER BY chunk),
+           string_agg(format('jsonb_build_object(%s)', old_args), ' || ' ORDER BY chunk),
+           string_agg(format('jsonb_build_object(%s)', new_args), ' || ' ORDER BY chunk)
+    INTO changed_sql, old_sql, new_sql
+    FROM chunks;
+
+    EXECUTE format($fn$
+CREATE OR REPLACE FUNCTION %1$s() RETURNS trigger LANGUAGE plpgsql AS $body$
+DECLARE
+    -- changed_by apunta a cat.technicians: un id que no es de un técnico queda en NULL
+    user_id INT := (SELECT t.technician_id FROM cat.technicians t
+                    WHERE t.technician_id = NULLIF(current_setting('app.user_id', TRUE), '')::INT);
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO %2$s (table_name, record_id, action, changed_by, new_values)
+        SELECT %3$L, n.%4$I, 'INSERT', user_id, jsonb_strip_nulls(to_jsonb(n)) FROM new_rows n;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO %2$s (table_name, record_id, action, changed_by, old_values)
+        SELECT %3$L, o.%4$I, 'DELETE', user_id, jsonb_strip_nulls(to_jsonb(o)) FROM old_rows o;
+    ELSE
+        INSERT INTO %2$s (table_name, record_id, action, changed_by, old_values, new_values)
+        SELECT %3$L, n.%4$I, 'UPDATE', user_id, jsonb_strip_nulls(%5$s), jsonb_strip_nulls(%6$s)
+        FROM old_rows o JOIN new_rows n ON n.%4$I = o.%4$I
+        WHERE %7$s;
+    END IF;
+    RETURN NULL;
+END;
+$body$
+$fn$, fn_name, target, rel_name, pk, old_sql, new_sql, changed_sql);
+    EXECUTE format('COMMENT ON FUNCTION %s() IS %L', fn_name, 'app.enable_audit');
+
+    INSERT INTO app.audited_tables (table_name, pk_column, ignore_columns, buffered)
+    VALUES (p_table, pk, COALESCE(p_ignore_columns, '{}'), p_buffered)
+    ON CONFLICT (table_name) DO UPDATE
+        SET pk_column = EXCLUDED.pk_column, ignore_columns = EXCLUDED.ignore_columns,
+            buffered = EXCLUDED.buffered, enabled_at = NOW();
+
+    -- Triggers por fila de app.audit_changes()
+    EXECUTE format('DROP TRIGGER IF EXISTS trg_audit_wo ON %s', p_table);
+    EXECUTE format('DROP TRIGGER IF EXISTS trg_audit_invoice ON %s', p_table);
+    EXECUTE format('DROP TRIGGER IF EXISTS trg_audit_stock ON %s', p_table);
+
+    -- Un trigger por operación: las tablas de transición no admiten varias
+    FOREACH op IN ARRAY ARRAY['INSERT', 'UPDATE', 'DELETE'] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %s', 'trg_audit_' || lower(op), p_table);
+        EXECUTE format('CREATE TRIGGER %I AFTER %s ON %s REFERENCING %s '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION %s()',
+                       'trg_audit_' || lower(op), op, p_table,
+                       CASE op WHEN 'INSERT' THEN 'NEW TABLE AS new_rows'
+                               WHEN 'DELETE' THEN 'OLD TABLE AS old_rows'
+                               ELSE 'OLD TABLE AS old_rows NEW TABLE AS new_rows' END,
+                       fn_name);
+    END LOOP;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION app.disable_audit(p_table REGCLASS)
+RETURNS VOID LANGUAGE plpgsql AS $$
+DECLARE
+    fn_name TEXT;
+BEGIN
+    SELECT format('app.%I', 'audit_' || n.nspname || '_' || c.relname) INTO fn_name
+    FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace WHERE c.oid = p_table;
+    EXECUTE format('DROP TRIGGER IF EXISTS trg_audit_insert ON %s', p_table);
+    EXECUTE format('DROP TRIGGER IF EXISTS trg_audit_update ON %s', p_table);
+    EXECUTE format('DROP TRIGGER IF EXISTS trg_audit_delete ON %s', p_table);
+    EXECUTE format('DROP FUNCTION IF EXISTS %s()', fn_name);
+    DELETE FROM app.audited_tables WHERE table_name = p_table;
+END;
+$$;
+
+-- Pasa hasta p_limit registros del buffer a app.audit_logs; devuelve cuántos.
+-- SKIP LOCKED permite varios procesos de vaciado a la vez. Un changed_by que
+-- no está en cat.technicians (clave foránea de audit_logs) queda en NULL para
+-- que un registro no bloquee el buffer.
+CREATE OR REPLACE FUNCTION app.flush_audit_buffer(p_limit INT DEFAULT 10000)
+RETURNS INT LANGUAGE plpgsql AS $$
+DECLARE
+    moved INT;
+BEGIN
+    WITH batch AS (
+        DELETE FROM app.audit_buffer
+        WHERE buffer_id IN (
+            SELECT buffer_id FROM app.audit_buffer ORDER BY buffer_id LIMIT p_limit FOR UPDATE SKIP LOCKED
+        )
+        RETURNING *
+    )
+    INSERT INTO app.audit_logs (table_name, record_id, action, changed_by, changed_at, old_values, new_values)
+    SELECT b.table_name, b.record_id, b.action, t.technician_id, b.changed_at, b.old_values, b.new_values
+    FROM batch b LEFT JOIN cat.technicians t ON t.technician_id = b.changed_by
+    ORDER BY b.buffer_id;
+    GET DIAGNOSTICS moved = ROW_COUNT;
+    RETURN moved;
+END;
+$$;
+"""
+
+AUDITED_TABLES = ['svc.work_orders', 'svc.invoices', 'inv.stock']
+
+LEGACY_TRIGGERS = {
+    'svc.work_orders': 'trg_audit_wo',
+    'svc.invoices': 'trg_audit_invoice',
+    'inv.stock': 'trg_audit_stock',
+}
+
+
+def create_statement_audit(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('app.audit_logs') IS NOT NULL;")
+        if not cursor.fetchone()[0]:
+            return
+        cursor.execute(AUDIT_SQL)
+        for table in AUDITED_TABLES:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL;", [table])
+            if cursor.fetchone()[0]:
+                cursor.execute("SELECT app.enable_audit(%s);", [table])
+
+
+def drop_statement_audit(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('app.audited_tables') IS NOT NULL;")
+        if not cursor.fetchone()[0]:
+            return
+        cursor.execute("SELECT app.flush_audit_buffer(NULL);")
+        cursor.execute("SELECT table_name::text FROM app.audited_tables;")
+        for (table,) in cursor.fetchall():
+            cursor.execute("SELECT app.disable_audit(%s);", [table])
+        for table, trigger in LEGACY_TRIGGERS.items():
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL;", [table])
+            if cursor.fetchone()[0]:
+                cursor.execute(f"""
+                    CREATE TRIGGER {trigger} AFTER INSERT OR UPDATE OR DELETE ON {table}
+                    FOR EACH ROW EXECUTE FUNCTION app.audit_changes();
+                """)
+        cursor.execute("""
+            DROP FUNCTION IF EXISTS app.flush_audit_buffer(INT);
+            DROP FUNCTION IF EXISTS app.disable_audit(REGCLASS);
+            DROP FUNCTION IF EXISTS app.enable_audit(REGCLASS, TEXT[], BOOLEAN);
+            DROP TABLE IF EXISTS app.audit_buffer;
+            DROP TABLE IF EXISTS app.audited_tables;
+        """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_compiled_business_rules'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_statement_audit, drop_statement_audit),
+    ]
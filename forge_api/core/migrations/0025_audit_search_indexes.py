@@ -0,0 +1,69 @@
+# Búsqueda en la auditoría e historial por registro (ver docs/AUDIT.md).
+#
+# La búsqueda de la API convertía old_values/new_values a texto y corría ILIKE
+# sobre todas las particiones de app.audit_logs. Ahora filtra con @> sobre
+# índices GIN jsonb_path_ops, siempre acotada por changed_at para que sólo se
+# lean las particiones del rango.
+#
+# El historial de un registro recorre (table_name, record_id, changed_at,
+# audit_id) en orden, que reemplaza a idx_audit_logs_table, y reconstruye el
+# estado del registro con el agregado app.audit_state(), que aplica cada
+# diferencia sobre el estado anterior.
+
+from django.db import migrations
+
+SEARCH_SQL = r"""
+CREATE INDEX IF NOT EXISTS idx_audit_logs_old_values ON app.audit_logs USING GIN (old_values jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_new_values ON app.audit_logs USING GIN (new_values jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_record_history ON app.audit_logs (table_name, record_id, changed_at, audit_id);
+DROP INDEX IF EXISTS app.idx_audit_logs_table;
+
+-- Estado del registro después de un cambio: INSERT parte de la fila nueva,
+-- DELETE lo deja en NULL y UPDATE quita las columnas que pasaron a NULL (están
+-- en old_values pero no en new_values) y aplica las nuevas.
+CREATE OR REPLACE FUNCTION app.audit_apply_diff(state JSONB, action TEXT, old_values JSONB, new_values JSONB)
+RETURNS JSONB LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE action
+        WHEN 'INSERT' THEN new_values
+        WHEN 'DELETE' THEN NULL
+        ELSE (COALESCE(state, '{}') - ARRAY(
+                  SELECT jsonb_object_keys(COALESCE(old_values, '{}'))
+                  EXCEPT SELECT jsonb_object_keys(COALESCE(new_values, '{}'))))
+             || COALESCE(new_values, '{}')
+    END
+$$;
+
+CREATE OR REPLACE AGGREGATE app.audit_state(TEXT, JSONB, JSONB) (
+    SFUNC = app.audit_apply_diff,
+    STYPE = JSONB
+);
+"""
+
+DROP_SEARCH_SQL = r"""
+DROP AGGREGATE IF EXISTS app.audit_state(TEXT, JSONB, JSONB);
+DROP FUNCTION IF EXISTS app.audit_apply_diff(JSONB, TEXT, JSONB, JSONB);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_table ON app.audit_logs (table_name, record_id);
+DROP INDEX IF EXISTS app.idx_audit_logs_record_history;
+DROP INDEX IF EXISTS app.idx_audit_logs_new_values;
+DROP INDEX IF EXISTS app.idx_audit_logs_old_values;
+"""
+
+
+def run_if_audit_logs(sql):
+    def run(apps, schema_editor):
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('app.audit_logs') IS NOT NULL;")
+            if cursor.fetchone()[0]:
+                cursor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_statement_audit'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_if_audit_logs(SEARCH_SQL), run_if_audit_logs(DROP_SEARCH_SQL)),
+    ]
@@ -0,0 +1,63 @@
+# Índices para la paginación por clave (core/pagination.KeysetPagination).
+# Cada página filtra por el orden por defecto de la vista más la PK como
+# desempate y lee page_size + 1 filas; con un índice (orden, PK) Postgres
+# salta directamente al cursor en lugar de ordenar la tabla completa. El
+# mismo índice sirve para el orden descendente (recorrido hacia atrás).
+# Se omiten las tablas o columnas que no existan en la base.
+
+from django.db import migrations
+
+KEYSET_INDEXES = [
+    # (tabla, columnas: orden por defecto de la vista y PK)
+    ('clients', ['created_at', 'client_id']),
+    ('equipment', ['created_at', 'equipment_id']),
+    ('stock', ['updated_at', 'stock_id']),
+    ('work_orders', ['created_at', 'wo_id']),
+    ('invoices', ['issue_date', 'invoice_id']),
+    ('transactions', ['transaction_date', 'transaction_id']),
+    ('audit_logs', ['changed_at', 'audit_id']),
+    ('oem.equivalences', ['oem_code', 'oem_part_number', 'equivalence_id']),
+]
+
+
+def index_name(table):
+    return f"idx_keyset_{table.rsplit('.', 1)[-1]}"
+
+
+def create_keyset_indexes(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for table, columns in KEYSET_INDEXES:
+            cursor.execute("SELECT n.nspname || '.' || c.relname FROM pg_class c "
+                           "JOIN pg_namespace n ON n.oid = c.relnamespace WHERE c.oid = to_regclass(%s);", [table])
+            row = cursor.fetchone()
+            if not row:
+                continue
+            cursor.execute("SELECT count(*) FROM pg_attribute WHERE attrelid = to_regclass(%s) "
+                           "AND attname = ANY(%s) AND NOT attisdropped;", [table, columns])
+            if cursor.fetchone()[0] != len(columns):
+                continue
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {index_name(table)} ON {row[0]} ({', '.join(columns)});"
+            )
+
+
+def drop_keyset_indexes(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for table, columns in KEYSET_INDEXES:
+            cursor.execute("SELECT n.nspname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                           "WHERE c.oid = to_regclass(%s);", [table])
+            row = cursor.fetchone()
+            if not row:
+                continue
+            cursor.execute(f"DROP INDEX IF EXISTS {row[0]}.{index_name(table)};")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_audit_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_keyset_indexes, drop_keyset_indexes),
+    ]
@@ -0,0 +1,32 @@
+# La función de auditoría que genera app.enable_audit() (0024) escribía
+# changed_by directamente desde app.user_id. Si el id no era de un técnico
+# (cat.technicians, clave foránea de app.audit_logs) la escritura auditada
+# fallaba; sólo app.flush_audit_buffer lo pasaba a NULL. Se vuelve a crear
+# app.enable_audit con la comprobación y se regeneran las funciones de las
+# tablas ya auditadas, con su configuración actual.
+
+from importlib import import_module
+
+from django.db import migrations
+
+
+def regenerate_audit_functions(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('app.audited_tables') IS NOT NULL;")
+        if not cursor.fetchone()[0]:
+            return
+        cursor.execute(import_module('core.migrations.0024_statement_audit').AUDIT_SQL)
+        cursor.execute("SELECT table_name::text, ignore_columns, buffered FROM app.audited_tables;")
+        for table, ignore_columns, buffered in cursor.fetchall():
+            cursor.execute("SELECT app.enable_audit(%s, %s, %s);", [table, ignore_columns, buffered])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(regenerate_audit_functions, migrations.RunPython.noop),
+    ]
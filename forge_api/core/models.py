@@ -1913,14 +1913,11 @@ class Quote(models.Model):
         return f"{self.quote_number} - {self.client.name if self.client else 'N/A'}"
     
     def calculate_totals(self):
-        """Calculate quote totals from items"""
-        items = self.items.all()
-        self.subtotal = sum(item.line_total for item in items)
-        self.discount_amount = self.subtotal * (self.discount_percent / 100)
-        after_discount = self.subtotal - self.discount_amount
-        self.tax_amount = after_discount * (self.tax_percent / 100)
-        self.total = after_discount + self.tax_amount
-        self.total_hours = sum(item.hours * item.quantity for item in items)
+        """Calculate quote totals from items (see core.quotes.calculate_totals)"""
+        from .quotes import calculate_totals
+        totals = calculate_totals(self.items.all(), self.discount_percent, tax_percent=self.tax_percent)
+        for field, value in totals.items():
+            setattr(self, field, value)
         self.save()
     
     def generate_quote_number(self):
@@ -1969,7 +1966,8 @@ class QuoteItem(models.Model):
     
     def save(self, *args, **kwargs):
         """Calculate line total before saving"""
-        self.line_total = self.hours * self.hourly_rate * self.quantity
+        from .quotes import line_total
+        self.line_total = line_total(self.hours, self.hourly_rate, self.quantity)
         super().save(*args, **kwargs)
 
 
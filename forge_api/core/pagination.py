@@ -4,9 +4,24 @@ Custom pagination classes for ForgeDB API.
 Provides optimized pagination for large datasets with cursor-based pagination
 and enhanced page number pagination.
 """
-from rest_framework.pagination import PageNumberPagination, CursorPagination
-from rest_framework.response import Response
+import base64
+import json
+import logging
+import operator
 from collections import OrderedDict
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import reduce
+from uuid import UUID
+
+from django.db import DatabaseError
+from django.db.models import BooleanField, CharField, DateTimeField, Expression, F, Q, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+logger = logging.getLogger(__name__)
 
 
 class OptimizedPageNumberPagination(PageNumberPagination):
@@ -82,3 +97,248 @@ class SmallResultsSetPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 50
+
+
+def _cursor_value(value):
+    # Full precision: DjangoJSONEncoder cuts datetimes to milliseconds, which
+    # would skip or repeat rows whose timestamps differ in the microseconds.
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination with arbitrary multi-column ordering.
+
+    The ordering comes from the view's OrderingFilter (``?ordering=`` or the
+    view's ``ordering``) plus the primary key as a tiebreak. A page is the
+    next ``page_size`` rows after the cursor row, found with a row comparison
+    ``(a, b) > (x, y)`` or, for mixed directions and NULLs,
+    ``(a > x) OR (a = x AND b > y) OR ...`` plus a bound on the first column
+    the index can seek to, so deep pages cost the same as the first one.
+    Columns may mix directions and hold NULLs (sorted as Postgres does:
+    larger than any value).
+
+    ``count`` is the planner's estimate unless the result is small
+    (< ``exact_count_threshold``) or ``?count=exact`` is given;
+    ``count_is_estimate`` says which. Requests with ``?page=`` keep the
+    page-number behaviour (COUNT + OFFSET) for existing clients.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    exact_count_threshold = 1000
+    legacy_pagination_class = PageNumberPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.legacy = None
+        if request.query_params.get(self.legacy_pagination_class.page_query_param):
+            self.legacy = self.legacy_pagination_class()
+            return self.legacy.paginate_queryset(queryset, request, view)
+
+        self.page_size = self.get_page_size(request)
+        self.terms = self.get_terms(queryset, request, view)
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['r'])
+        self.count, self.count_is_estimate = self.get_count(queryset, request)
+
+        terms = [(name, desc != reverse, nullable) for name, desc, nullable in self.terms]
+        queryset = queryset.order_by(*[('-' if desc else '') + name for name, desc, _ in terms])
+        if cursor:
+            queryset = queryset.filter(_after(terms, cursor['v'], queryset.model))
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_position = self.previous_position = None
+        if rows:
+            if has_more or reverse:
+                self.next_position = (self.position(rows[-1]), False)
+            if cursor and not reverse or has_more and reverse:
+                self.previous_position = (self.position(rows[0]), True)
+        elif cursor:
+            # Past either end: offer the way back.
+            self.previous_position = None if reverse else (cursor['v'], True)
+            self.next_position = (cursor['v'], False) if reverse else None
+        return rows
+
+    def get_paginated_response(self, data):
+        if self.legacy:
+            return self.legacy.get_paginated_response(data)
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('count_is_estimate', self.count_is_estimate),
+            ('next', self.get_link(self.next_position)),
+            ('previous', self.get_link(self.previous_position)),
+            ('page_size', self.page_size),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'count': {'type': 'integer'},
+                'count_is_estimate': {'type': 'boolean'},
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'page_size': {'type': 'integer'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def get_terms(self, queryset, request, view):
+        """``[(attname, descending, nullable)]`` for the ordering plus the pk."""
+        ordering = None
+        for backend in getattr(view, 'filter_backends', ()):
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+        opts = queryset.model._meta
+        terms, seen = [], set()
+        for term in ordering:
+            name = term.lstrip('-')
+            field = opts.pk if name == 'pk' else opts.get_field(name)
+            if field.attname in seen:
+                continue
+            seen.add(field.attname)
+            # A foreign key sorts by its own column, not the related model's ordering.
+            terms.append((field.attname, term.startswith('-'), field.null))
+            if field.primary_key or field.unique and not field.null:
+                return terms
+        terms.append((opts.pk.attname, bool(terms) and terms[-1][1], False))
+        return terms
+
+    def get_count(self, queryset, request):
+        if request.query_params.get(self.count_query_param) == 'exact':
+            return queryset.count(), False
+        try:
+            plan = json.loads(queryset.order_by().explain(format='json'))
+            estimate = int(plan[0]['Plan']['Plan Rows'])
+        except (DatabaseError, ValueError, KeyError, IndexError) as e:
+            logger.warning(f"Row estimate failed for {queryset.model.__name__}: {e}")
+            estimate = None
+        if estimate is None or estimate < self.exact_count_threshold:
+            return queryset.count(), False
+        return estimate, True
+
+    def position(self, instance):
+        return [_cursor_value(getattr(instance, name)) for name, _, _ in self.terms]
+
+    def decode_cursor(self, request):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(raw.encode()).decode())
+            if len(cursor['v']) != len(self.terms):
+                raise ValueError
+            return {'v': cursor['v'], 'r': bool(cursor.get('r'))}
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound('Cursor inválido')
+
+    def get_link(self, position):
+        if position is None:
+            return None
+        values, reverse = position
+        raw = json.dumps({'v': values, 'r': int(reverse)}, separators=(',', ':'))
+        url = remove_query_param(self.request.build_absolute_uri(), 'page')
+        return replace_query_param(url, self.cursor_query_param,
+                                   base64.urlsafe_b64encode(raw.encode()).decode())
+
+
+def _literal(field, value):
+    """The cursor value as a query parameter for ``field``."""
+    if isinstance(field, DateTimeField):
+        # As DateTimeField, a naive value (TIMESTAMP columns without time zone
+        # read back naive) would become aware in TIME_ZONE and compare shifted,
+        # and a TIMESTAMPTZ parameter keeps the index off a TIMESTAMP column.
+        # Untyped, Postgres reads it as the column's own type.
+        return Value(value, output_field=CharField())
+    return Value(value, output_field=field)
+
+
+class _RowAfter(Expression):
+    """``(a, b, ...) > (x, y, ...)`` (``<`` when descending): one index seek even on ties."""
+    conditional = True
+    output_field = BooleanField()
+
+    def __init__(self, columns, values, descending):
+        super().__init__()
+        self.columns, self.values, self.descending = list(columns), list(values), descending
+
+    def get_source_expressions(self):
+        return self.columns + self.values
+
+    def set_source_expressions(self, exprs):
+        self.columns, self.values = exprs[:len(self.columns)], exprs[len(self.columns):]
+
+    def as_sql(self, compiler, connection):
+        sql, params = [], []
+        for expression in self.get_source_expressions():
+            part, part_params = compiler.compile(expression)
+            sql.append(part)
+            params.extend(part_params)
+        half = len(self.columns)
+        operator_sql = '<' if self.descending else '>'
+        return f"({', '.join(sql[:half])}) {operator_sql} ({', '.join(sql[half:])})", params
+
+
+def _beyond(name, desc, nullable, value):
+    """Rows strictly after ``value`` in this column (NULL sorts last ascending), or None."""
+    if value is None:
+        return Q(**{f'{name}__isnull': False}) if desc else None
+    if desc:
+        return Q(**{f'{name}__lt': value})
+    after = Q(**{f'{name}__gt': value})
+    return after | Q(**{f'{name}__isnull': True}) if nullable else after
+
+
+def _after(terms, values, model):
+    """
+    The rows after ``values``. With one direction and no NULL that could
+    sort after the cursor, a row comparison; otherwise
+    ``(a > x) OR (a = x AND b > y) OR ...`` ANDed with a range on the first
+    column so the index can seek there.
+    """
+    fields = {field.attname: field for field in model._meta.concrete_fields}
+    params = [None if value is None else _literal(fields[name], value)
+              for (name, _, _), value in zip(terms, values)]
+    if len({desc for _, desc, _ in terms}) == 1 and None not in values and (
+            terms[0][1] or not any(nullable for _, _, nullable in terms)):
+        return _RowAfter([F(name) for name, _, _ in terms], params, terms[0][1])
+    clauses, equal = [], Q()
+    for (name, desc, nullable), value in zip(terms, params):
+        beyond = _beyond(name, desc, nullable, value)
+        if beyond is not None:
+            clauses.append(equal & beyond)
+        equal &= Q(**{f'{name}__isnull': True}) if value is None else Q(**{name: value})
+    if not clauses:
+        return Q(pk__in=[])
+    after = reduce(operator.or_, clauses)
+    name, desc, nullable = terms[0]
+    value = params[0]
+    if value is None:
+        bound = None if desc else Q(**{f'{name}__isnull': True})
+    elif desc:
+        bound = Q(**{f'{name}__lte': value})
+    else:
+        bound = None if nullable else Q(**{f'{name}__gte': value})
+    return after & bound if bound is not None else after
@@ -0,0 +1,393 @@
+"""
+Per-request profiling for ForgeDB.
+
+QueryProfilerMiddleware (core.middleware) records, for every request, the
+wall time, number and duration of database queries, template/renderer time
+and response size. Samples are aggregated per endpoint (URL route + method)
+into log-linear histograms, so percentiles stay accurate to a few percent
+with a fixed, small memory footprint.
+
+Each worker keeps its own ProfileRegistry and periodically publishes a
+snapshot to the cache; report() merges the snapshots of every live worker.
+With the default LocMem cache only the current worker is visible; configure
+a shared cache backend (Redis/Memcached) to see all of them.
+"""
+import math
+import os
+import re
+import socket
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import caches
+
+WORKERS_CACHE_KEY = 'request_profiler:workers'
+WORKER_CACHE_KEY = 'request_profiler:worker:{}'
+
+# Sub-buckets per power of two: 2**6 keeps the bucket width within ~1.6% of
+# the recorded value.
+SUB_BUCKET_BITS = 6
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+MAX_N_PLUS_ONE_PER_ENDPOINT = 20
+
+_DRF_GROUP_RE = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+_IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+_NUMBER_RE = re.compile(r'\b\d+\b')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_SPACE_RE = re.compile(r'\s+')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class Histogram:
+    """
+    HDR-style latency histogram.
+
+    Values (milliseconds) are stored in microseconds and bucketed by power of
+    two with SUB_BUCKET_COUNT linear sub-buckets each. Buckets are kept in a
+    dict so histograms serialize to JSON and merge by adding counts.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def bucket_index(value_us):
+        if value_us < SUB_BUCKET_COUNT:
+            return value_us
+        shift = value_us.bit_length() - SUB_BUCKET_BITS
+        return (shift << SUB_BUCKET_BITS) + (value_us >> shift)
+
+    @staticmethod
+    def bucket_value(index):
+        """Midpoint of a bucket, in milliseconds."""
+        shift, sub_bucket = divmod(index, SUB_BUCKET_COUNT)
+        low = sub_bucket << shift
+        width = 1 << shift
+        return (low + (width - 1) / 2.0) / 1000.0
+
+    def record(self, value_ms):
+        value_ms = max(0.0, value_ms)
+        index = self.bucket_index(int(value_ms * 1000))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value_ms
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, pct):
+        if not self.count:
+            return 0.0
+        rank = max(1, int(math.ceil(pct / 100.0 * self.count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self.bucket_value(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self):
+        return {
+            'counts': {str(k): v for k, v in self.counts.items()},
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.counts = {int(k): v for k, v in data.get('counts', {}).items()}
+        histogram.count = data.get('count', 0)
+        histogram.total = data.get('total', 0.0)
+        histogram.min = data.get('min')
+        histogram.max = data.get('max')
+        return histogram
+
+
+class EndpointProfile:
+    """Aggregated samples for one endpoint."""
+
+    def __init__(self):
+        self.requests = 0
+        self.status_codes = Counter()
+        self.wall = Histogram()
+        self.db = Histogram()
+        self.render = Histogram()
+        self.queries_total = 0
+        self.queries_max = 0
+        self.bytes_total = 0
+        self.n_plus_one = {}
+
+    def record(self, sample):
+        self.requests += 1
+        self.status_codes[str(sample['status'])] += 1
+        self.wall.record(sample['wall_ms'])
+        self.db.record(sample['db_ms'])
+        if sample.get('render_ms') is not None:
+            self.render.record(sample['render_ms'])
+        self.queries_total += sample['queries']
+        self.queries_max = max(self.queries_max, sample['queries'])
+        self.bytes_total += sample['response_bytes']
+        for fingerprint, repeats in sample.get('repeated_queries', {}).items():
+            self._record_n_plus_one(fingerprint, repeats, 1)
+
+    def _record_n_plus_one(self, fingerprint, max_repeats, requests):
+        entry = self.n_plus_one.get(fingerprint)
+        if entry is None:
+            if len(self.n_plus_one) >= MAX_N_PLUS_ONE_PER_ENDPOINT:
+                return
+            entry = self.n_plus_one[fingerprint] = {'max_repeats': 0, 'requests': 0}
+        entry['max_repeats'] = max(entry['max_repeats'], max_repeats)
+        entry['requests'] += requests
+
+    def merge(self, other):
+        self.requests += other.requests
+        self.status_codes.update(other.status_codes)
+        self.wall.merge(other.wall)
+        self.db.merge(other.db)
+        self.render.merge(other.render)
+        self.queries_total += other.queries_total
+        self.queries_max = max(self.queries_max, other.queries_max)
+        self.bytes_total += other.bytes_total
+        for fingerprint, entry in other.n_plus_one.items():
+            self._record_n_plus_one(fingerprint, entry['max_repeats'], entry['requests'])
+
+    @property
+    def failed(self):
+        return sum(count for code, count in self.status_codes.items() if int(code) >= 400)
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'status_codes': dict(self.status_codes),
+            'wall': self.wall.to_dict(),
+            'db': self.db.to_dict(),
+            'render': self.render.to_dict(),
+            'queries_total': self.queries_total,
+            'queries_max': self.queries_max,
+            'bytes_total': self.bytes_total,
+            'n_plus_one': self.n_plus_one,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        profile = cls()
+        profile.requests = data['requests']
+        profile.status_codes = Counter(data['status_codes'])
+        profile.wall = Histogram.from_dict(data['wall'])
+        profile.db = Histogram.from_dict(data['db'])
+        profile.render = Histogram.from_dict(data['render'])
+        profile.queries_total = data['queries_total']
+        profile.queries_max = data['queries_max']
+        profile.bytes_total = data['bytes_total']
+        profile.n_plus_one = {k: dict(v) for k, v in data['n_plus_one'].items()}
+        return profile
+
+    def summary(self):
+        requests = self.requests or 1
+        return {
+            'requests': self.requests,
+            'errors': self.failed,
+            'error_rate': round(self.failed * 100.0 / requests, 2),
+            'avg_response_time': round(self.wall.mean, 2),
+            'p50_response_time': round(self.wall.percentile(50), 2),
+            'p95_response_time': round(self.wall.percentile(95), 2),
+            'p99_response_time': round(self.wall.percentile(99), 2),
+            'avg_db_time': round(self.db.mean, 2),
+            'p95_db_time': round(self.db.percentile(95), 2),
+            'avg_render_time': round(self.render.mean, 2),
+            'avg_queries': round(self.queries_total / requests, 1),
+            'max_queries': self.queries_max,
+            'avg_response_bytes': int(self.bytes_total / requests),
+        }
+
+
+def fingerprint_sql(sql):
+    """Normalize a SQL statement so repetitions with different values match."""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+def endpoint_key(request):
+    """``METHOD /route/`` using the URL pattern, so ids don't split endpoints."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return f'{request.method} <unresolved>'
+    route = _DRF_GROUP_RE.sub(r'<\1>', match.route or '').replace('^', '').replace('$', '')
+    return f'{request.method} /{route}'
+
+
+class QueryRecorder:
+    """Execute wrapper that counts and times the queries of one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration_ms = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration_ms += (time.perf_counter() - start) * 1000
+            self.count += 1
+            self.fingerprints[fingerprint_sql(sql)] += 1
+
+    def repeated_queries(self, threshold):
+        """Statements run at least ``threshold`` times: likely N+1 queries."""
+        return {sql: n for sql, n in self.fingerprints.items() if n >= threshold}
+
+
+class ProfileRegistry:
+    """Per-worker endpoint profiles, published to the cache for merging."""
+
+    def __init__(self, worker_id=None):
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self.started_at = datetime.now()
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._last_flush = 0.0
+
+    def record(self, key, sample):
+        with self._lock:
+            profile = self._endpoints.get(key)
+            if profile is None:
+                profile = self._endpoints[key] = EndpointProfile()
+            profile.record(sample)
+        interval = _setting('REQUEST_PROFILER_FLUSH_INTERVAL', 10)
+        if time.monotonic() - self._last_flush >= interval:
+            self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'started_at': self.started_at.isoformat(),
+                'endpoints': {key: profile.to_dict() for key, profile in self._endpoints.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+            self.started_at = datetime.now()
+
+    def _cache(self):
+        return caches[_setting('REQUEST_PROFILER_CACHE', 'default')]
+
+    def flush(self):
+        """Publish this worker's snapshot so other workers can merge it."""
+        self._last_flush = time.monotonic()
+        ttl = _setting('REQUEST_PROFILER_WORKER_TTL', 3600)
+        cache = self._cache()
+        cache.set(WORKER_CACHE_KEY.format(self.worker_id), self.snapshot(), ttl)
+        workers = cache.get(WORKERS_CACHE_KEY) or {}
+        now = time.time()
+        workers = {w: seen for w, seen in workers.items() if now - seen < ttl}
+        workers[self.worker_id] = now
+        cache.set(WORKERS_CACHE_KEY, workers, ttl)
+
+    def collect(self):
+        """Merge the published snapshots of all live workers."""
+        self.flush()
+        cache = self._cache()
+        workers = cache.get(WORKERS_CACHE_KEY) or {}
+        snapshots = cache.get_many([WORKER_CACHE_KEY.format(w) for w in workers])
+        merged = {}
+        started = []
+        for snapshot in snapshots.values():
+            started.append(snapshot['started_at'])
+            for key, data in snapshot['endpoints'].items():
+                profile = EndpointProfile.from_dict(data)
+                if key in merged:
+                    merged[key].merge(profile)
+                else:
+                    merged[key] = profile
+        return {
+            'workers': len(snapshots),
+            'since': min(started) if started else self.started_at.isoformat(),
+            'endpoints': merged,
+        }
+
+    def report(self, top=10):
+        """
+        Aggregate report across workers: totals, percentiles, per-endpoint
+        summaries, slowest endpoints and N+1 offenders.
+        """
+        collected = self.collect()
+        endpoints = collected['endpoints']
+
+        overall = EndpointProfile()
+        for profile in endpoints.values():
+            overall.merge(profile)
+
+        summaries = {key: profile.summary() for key, profile in endpoints.items()}
+        slowest = sorted(summaries.items(), key=lambda item: item[1]['p95_response_time'], reverse=True)
+
+        offenders = []
+        for key, profile in endpoints.items():
+            for fingerprint, entry in profile.n_plus_one.items():
+                offenders.append({
+                    'endpoint': key,
+                    'query': fingerprint[:300],
+                    'max_repeats': entry['max_repeats'],
+                    'requests': entry['requests'],
+                })
+        offenders.sort(key=lambda o: (o['max_repeats'] * o['requests'], o['max_repeats']), reverse=True)
+
+        total = overall.requests
+        return {
+            'time_range': {
+                'start': collected['since'],
+                'end': datetime.now().isoformat(),
+            },
+            'workers': collected['workers'],
+            'total_requests': total,
+            'successful_requests': total - overall.failed,
+            'failed_requests': overall.failed,
+            'error_rate': round(overall.failed * 100.0 / total, 2) if total else 0.0,
+            'average_response_time': round(overall.wall.mean, 2),
+            'p50_response_time': round(overall.wall.percentile(50), 2),
+            'p95_response_time': round(overall.wall.percentile(95), 2),
+            'p99_response_time': round(overall.wall.percentile(99), 2),
+            'fastest_response': round(overall.wall.min or 0.0, 2),
+            'slowest_response': round(overall.wall.max or 0.0, 2),
+            'average_db_time': round(overall.db.mean, 2),
+            'average_queries': round(overall.queries_total / total, 1) if total else 0.0,
+            'endpoints': summaries,
+            'slowest_endpoints': [dict(endpoint=key, **summary) for key, summary in slowest[:top]],
+            'error_types': {
+                code: count for code, count in sorted(overall.status_codes.items()) if int(code) >= 400
+            },
+            'n_plus_one': offenders[:top],
+        }
+
+
+profiler = ProfileRegistry()
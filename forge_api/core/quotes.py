@@ -0,0 +1,172 @@
+"""
+Quote totals and transactional quote operations.
+
+The Decimal rules are the ones of
+``frontend.services.quote_calculation_engine.QuoteCalculationEngine``: each
+line is ``round(hours * hourly_rate) * quantity``, the discount (percent or
+fixed amount, never above the subtotal) comes off the subtotal and tax is
+charged on what is left, every step rounded half-up to cents. Totals are
+computed once per save, here, instead of by every client.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+
+from .models import Quote, QuoteItem, WOService, WorkOrder
+
+CENTS = Decimal('0.01')
+ZERO = Decimal('0.00')
+DEFAULT_TAX_PERCENT = Decimal('16.00')
+DEFAULT_HOURLY_RATE = Decimal('500.00')
+
+# Fields copied from a quote line to the work order service it becomes.
+ITEM_FIELDS = ('flat_rate_id', 'service_code', 'description', 'quantity', 'hours', 'hourly_rate', 'notes')
+
+
+class QuoteConversionError(ValueError):
+    """The quote cannot be converted to a work order."""
+
+
+def _decimal(value, default=ZERO):
+    if value is None or value == '':
+        return default
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _money(value):
+    return value.quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def line_total(hours, hourly_rate=None, quantity=1):
+    """Labor total of one quote line."""
+    hours = _decimal(hours)
+    hourly_rate = _decimal(hourly_rate, DEFAULT_HOURLY_RATE)
+    if hours <= 0 or hourly_rate <= 0:
+        return ZERO
+    return _money(_money(hours * hourly_rate) * _decimal(quantity, Decimal('1')))
+
+
+def calculate_totals(items, discount_percent=None, discount_amount=None, tax_percent=None):
+    """
+    Totals of a quote from its lines (dicts or ``QuoteItem`` instances with
+    ``hours``, ``hourly_rate`` and ``quantity``).
+
+    Returns the values stored on ``Quote``: subtotal, discount_percent,
+    discount_amount, tax_percent, tax_amount, total and total_hours.
+    """
+    subtotal = ZERO
+    total_hours = ZERO
+    for item in items:
+        get = item.get if isinstance(item, dict) else lambda name, default=None: getattr(item, name, default)
+        quantity = _decimal(get('quantity', 1), Decimal('1'))
+        subtotal += line_total(get('hours', 0), get('hourly_rate'), quantity)
+        total_hours += _decimal(get('hours', 0)) * quantity
+    subtotal = _money(subtotal)
+
+    discount_percent = _decimal(discount_percent)
+    discount = ZERO
+    if discount_percent > 0:
+        discount = _money(subtotal * discount_percent / 100)
+    if discount_amount is not None and _decimal(discount_amount) > 0:
+        discount = _money(_decimal(discount_amount))
+    discount = min(discount, subtotal)
+    after_discount = _money(subtotal - discount)
+
+    tax_percent = _decimal(tax_percent, DEFAULT_TAX_PERCENT)
+    tax_amount = _money(after_discount * tax_percent / 100)
+
+    return {
+        'subtotal': subtotal,
+        'discount_percent': discount_percent,
+        'discount_amount': discount,
+        'tax_percent': tax_percent,
+        'tax_amount': tax_amount,
+        'total': _money(after_discount + tax_amount),
+        'total_hours': total_hours,
+    }
+
+
+def build_items(quote, items):
+    """Unsaved ``QuoteItem`` rows for ``quote`` with their line totals set."""
+    rows = []
+    for item in items:
+        row = QuoteItem(quote=quote, **item)
+        row.line_total = line_total(row.hours, row.hourly_rate, row.quantity)
+        rows.append(row)
+    return rows
+
+
+@transaction.atomic
+def create_quote(data, items, discount_amount=None, created_by=None):
+    """
+    Create a quote and all of its lines in one transaction.
+
+    ``data`` holds ``Quote`` fields and ``items`` ``QuoteItem`` fields
+    (without ``quote``). Lines go in with a single ``bulk_create`` and the
+    totals are computed once from them.
+    """
+    quote = Quote(created_by=created_by, **data)
+    quote.generate_quote_number()
+    rows = build_items(quote, items)
+    for field, value in calculate_totals(
+        rows, quote.discount_percent, discount_amount, quote.tax_percent
+    ).items():
+        setattr(quote, field, value)
+    quote.save()
+    QuoteItem.objects.bulk_create(rows)
+    return quote
+
+
+@transaction.atomic
+def convert_to_work_order(quote_id, service_type='REPAIR', created_by=None):
+    """
+    Turn a quote into a work order with one service per quote line and mark
+    the quote as converted, all or nothing.
+
+    The quote row is locked, so two concurrent conversions cannot both
+    create a work order.
+    """
+    quote = Quote.objects.select_for_update().get(pk=quote_id)
+    if quote.status == 'CONVERTED' or quote.converted_to_wo_id:
+        raise QuoteConversionError("Quote has already been converted to a work order")
+    items = list(QuoteItem.objects.filter(quote_id=quote.pk).values(*ITEM_FIELDS))
+    if not items:
+        raise QuoteConversionError("Quote has no items")
+    if quote.equipment_id is None:
+        raise QuoteConversionError("Quote has no equipment")
+
+    work_order = WorkOrder.objects.create(
+        client_id=quote.client_id,
+        equipment_id=quote.equipment_id,
+        service_type=service_type,
+        status='DRAFT',
+        customer_complaints=quote.notes,
+        notes=f"Creada desde la cotización {quote.quote_number}",
+        estimated_hours=quote.total_hours,
+        labor_cost=quote.subtotal,
+        discount_amount=quote.discount_amount,
+        quoted_price=quote.total,
+        created_by=created_by,
+    )
+    # wo_number is assigned by the trg_generate_wo_number trigger.
+    work_order.refresh_from_db(fields=['wo_number'])
+
+    WOService.objects.bulk_create(
+        WOService(
+            wo=work_order,
+            flat_rate_id=item['flat_rate_id'],
+            service_code=item['service_code'],
+            description=item['description'],
+            flat_hours=item['hours'],
+            estimated_hours=item['hours'] * item['quantity'],
+            hourly_rate=item['hourly_rate'],
+            completion_status='PENDING',
+            notes=item['notes'],
+        )
+        for item in items
+    )
+
+    quote.status = 'CONVERTED'
+    quote.converted_to_wo = work_order
+    quote.save(update_fields=['status', 'converted_to_wo', 'updated_at'])
+    return work_order
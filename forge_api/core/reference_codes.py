@@ -0,0 +1,149 @@
+"""
+Reference code usage and renames (fuel, aspiration, transmission, drivetrain,
+color and condition codes).
+
+``usage_counts`` answers "how many rows use these codes?" for a whole category
+with one ``UNION ALL`` of grouped counts over the referencing columns.
+
+``rename_code`` changes a code and every reference to it in one transaction:
+the referencing foreign keys are ``NO ACTION`` and not deferrable, so the new
+code row is inserted first, each referencing table is moved over with a single
+``UPDATE ... WHERE column = old`` and the old row is deleted last. The
+update sets ``updated_at`` itself (``QuerySet.update`` skips ``auto_now``):
+``equipment`` and ``product_master`` have no version counter, so their ETags
+(core.conditional) only move with ``max(updated_at)``.
+"""
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models.functions import Now
+from django.forms.models import model_to_dict
+
+from .models import (
+    AspirationCode, ColorCode, ConditionCode, DrivetrainCode, Equipment, FuelCode, ProductMaster,
+    TransmissionCode,
+)
+
+CodeTable = namedtuple('CodeTable', ['model', 'code_field', 'references', 'uppercase'], defaults=(True,))
+
+# category -> code table and the (model, column) pairs pointing at its codes.
+# Color codes are the makers' paint codes (unique per brand) and keep the
+# case they are written in; the other categories are uppercase.
+CODE_TABLES = {
+    'fuel': CodeTable(FuelCode, 'fuel_code', [(Equipment, 'fuel_code')]),
+    'aspiration': CodeTable(AspirationCode, 'aspiration_code', [(Equipment, 'aspiration_code')]),
+    'transmission': CodeTable(TransmissionCode, 'transmission_code', [(Equipment, 'transmission_code')]),
+    'drivetrain': CodeTable(DrivetrainCode, 'drivetrain_code', [(Equipment, 'drivetrain_code')]),
+    'color': CodeTable(ColorCode, 'color_code', [(Equipment, 'color'), (ProductMaster, 'color_code')],
+                       uppercase=False),
+    'condition': CodeTable(ConditionCode, 'condition_code', [(ProductMaster, 'condition_code')]),
+}
+
+
+class ReferenceCodeError(ValueError):
+    """Unknown category, missing code or a rename onto an existing code."""
+
+
+def get_table(category):
+    try:
+        return CODE_TABLES[category]
+    except KeyError:
+        raise ReferenceCodeError(f"Unknown reference code category: {category}")
+
+
+def normalize_code(category, code):
+    """``code`` as stored for ``category``: stripped, and uppercased unless the category keeps case."""
+    code = str(code or '').strip()
+    return code.upper() if get_table(category).uppercase else code
+
+
+def clean_fields(category, data):
+    """
+    The editable, non-key columns of the category's code table found in
+    ``data``, cleaned by their model fields. Raises ``ReferenceCodeError``
+    listing every invalid value.
+    """
+    table = get_table(category)
+    cleaned, errors = {}, []
+    for field in table.model._meta.concrete_fields:
+        if (field.name not in data or not field.editable or field.primary_key or field.is_relation
+                or field.name == table.code_field):
+            continue
+        try:
+            cleaned[field.name] = field.clean(data[field.name], None)
+        except ValidationError as e:
+            errors.append(f"{field.name}: {' '.join(e.messages)}")
+    if errors:
+        raise ReferenceCodeError('; '.join(errors))
+    return cleaned
+
+
+def reference_name(model, column):
+    """``table.column`` label used in usage and rename results."""
+    return f'{model._meta.db_table}.{column}'
+
+
+def usage_counts(category, codes=None):
+    """
+    ``{code: {'table.column': count}}`` for the codes in use.
+
+    With ``codes`` only those codes are counted; without, every code of the
+    category that appears in a referencing column.
+    """
+    table = get_table(category)
+    parts, params = [], []
+    for model, column in table.references:
+        condition = f'{column} = ANY(%s)' if codes is not None else f'{column} IS NOT NULL'
+        parts.append(
+            f"SELECT {column}, %s, COUNT(*) FROM {model._meta.db_table} WHERE {condition} GROUP BY {column}"
+        )
+        params.append(reference_name(model, column))
+        if codes is not None:
+            params.append(list(codes))
+    counts = {}
+    with connection.cursor() as cursor:
+        cursor.execute(' UNION ALL '.join(parts), params)
+        for code, reference, count in cursor.fetchall():
+            counts.setdefault(code, {})[reference] = count
+    return counts
+
+
+def rename_code(category, old_code, new_code, **fields):
+    """
+    Rename ``old_code`` to ``new_code`` and move every reference to it.
+
+    ``fields`` (e.g. ``name_es``) are applied to the renamed row. Returns
+    ``{'category', 'old_code', 'new_code', 'updated': {'table.column': rows}}``.
+    """
+    table = get_table(category)
+    model, code_field = table.model, table.code_field
+    if not new_code:
+        raise ReferenceCodeError("New code is required")
+    with transaction.atomic():
+        try:
+            row = model.objects.select_for_update().get(**{code_field: old_code})
+        except model.DoesNotExist:
+            raise ReferenceCodeError(f"Code '{old_code}' does not exist")
+        if new_code == old_code:
+            if fields:
+                model.objects.filter(pk=row.pk).update(**fields)
+            return {'category': category, 'old_code': old_code, 'new_code': new_code, 'updated': {}}
+        if model.objects.filter(**{code_field: new_code}).exists():
+            raise ReferenceCodeError(f"Code '{new_code}' already exists")
+
+        values = model_to_dict(row, exclude=[model._meta.pk.name] if model._meta.pk.name != code_field else [])
+        values.update(fields, **{code_field: new_code})
+        model.objects.create(**values)
+
+        updated = {}
+        for ref_model, column in table.references:
+            changes = {column: new_code}
+            if any(field.name == 'updated_at' for field in ref_model._meta.concrete_fields):
+                changes['updated_at'] = Now()
+            updated[reference_name(ref_model, column)] = ref_model.objects.filter(
+                **{column: old_code}
+            ).update(**changes)
+
+        model.objects.filter(pk=row.pk).delete()
+    return {'category': category, 'old_code': old_code, 'new_code': new_code, 'updated': updated}
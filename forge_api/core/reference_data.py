@@ -0,0 +1,137 @@
+"""
+Reference-data bundle: every small catalog in one versioned document.
+
+Catalog tables (fuel/aspiration/... codes, currencies, equipment types,
+brand types, product categories and types, OEM brands and the taxonomy) are
+read together into an immutable ``Snapshot`` that each worker keeps in
+memory. The JSON body and its ETag are computed once per snapshot, so
+serving the bundle is a dictionary lookup.
+
+Freshness comes from the per-table change counters in ``app.table_versions``
+(migration 0018): statement-level triggers on every catalog table bump their
+row, so any write - ORM, admin, raw SQL or another worker - increases it.
+The bundle version is the sum of the catalog counters. Before serving, a
+worker reads those rows (one indexed query) and rebuilds its snapshot only
+when the sum changed. Writes in the same process also drop the snapshot
+right away through ``post_save``/``post_delete`` (see ``core.signals``).
+
+If the counters do not exist yet the snapshot is rebuilt every
+``SNAPSHOT_TTL`` seconds instead and the ETag is a content hash (see
+``core.snapshots``).
+"""
+import hashlib
+import json
+import logging
+from collections import namedtuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError
+from django.db.models import F
+
+from .models import (
+    AspirationCode, BrandType, Category, ColorCode, ConditionCode, Currency, DrivetrainCode,
+    EquipmentType, FinishCode, FuelCode, OEMBrand, PositionCode, ProductCategory,
+    ProductType, SourceCode, TaxonomyGroup, TaxonomySubsystem, TaxonomySystem,
+    TransmissionCode, UOMCode,
+)
+from .snapshots import SnapshotCache, tables_version
+
+logger = logging.getLogger(__name__)
+
+Catalog = namedtuple('Catalog', ['model', 'fields', 'extra'])
+
+_NAMES = ('name_es', 'name_en')
+
+# Bundle key -> model and the columns shipped for it. ``extra`` holds
+# annotations (joined columns) added to ``values()``.
+CATALOGS = {
+    'equipment_types': Catalog(
+        EquipmentType,
+        ('type_id', 'type_code', 'category', 'name', 'icon', 'color', 'is_active'),
+        {'category_name': F('category__name')},
+    ),
+    'fuel_codes': Catalog(FuelCode, ('fuel_code',) + _NAMES + ('is_alternative',), None),
+    'aspiration_codes': Catalog(AspirationCode, ('aspiration_code',) + _NAMES, None),
+    'transmission_codes': Catalog(TransmissionCode, ('transmission_code',) + _NAMES, None),
+    'drivetrain_codes': Catalog(DrivetrainCode, ('drivetrain_code',) + _NAMES, None),
+    'color_codes': Catalog(
+        ColorCode,
+        ('color_id', 'color_code', 'brand') + _NAMES + ('hex_code', 'paint_type', 'is_metallic', 'sort_order'),
+        None,
+    ),
+    'position_codes': Catalog(PositionCode, ('position_code',) + _NAMES + ('category', 'sort_order'), None),
+    'finish_codes': Catalog(FinishCode, ('finish_code',) + _NAMES + ('requires_color', 'sort_order'), None),
+    'source_codes': Catalog(SourceCode, ('source_code',) + _NAMES + ('quality_level', 'sort_order'), None),
+    'condition_codes': Catalog(ConditionCode, ('condition_code',) + _NAMES + ('requires_core', 'sort_order'), None),
+    'uom_codes': Catalog(UOMCode, ('uom_code',) + _NAMES + ('is_fractional', 'category'), None),
+    'currencies': Catalog(
+        Currency,
+        ('currency_code', 'name', 'symbol', 'exchange_rate', 'decimals', 'is_active', 'is_base_currency'),
+        None,
+    ),
+    'brand_types': Catalog(BrandType, ('code',) + _NAMES + ('display_order', 'is_active'), None),
+    'product_categories': Catalog(ProductCategory, ('code',) + _NAMES + ('display_order', 'is_active'), None),
+    'product_types': Catalog(ProductType, ('code',) + _NAMES + ('display_order', 'is_active'), None),
+    'oem_brands': Catalog(
+        OEMBrand,
+        ('brand_id', 'oem_code', 'name', 'brand_type', 'country', 'is_active', 'display_order'),
+        None,
+    ),
+    'taxonomy_systems': Catalog(
+        TaxonomySystem, ('system_code', 'category') + _NAMES + ('icon', 'sort_order', 'is_active'), None,
+    ),
+    'taxonomy_subsystems': Catalog(
+        TaxonomySubsystem, ('subsystem_code', 'system_code') + _NAMES + ('sort_order',), None,
+    ),
+    'taxonomy_groups': Catalog(
+        TaxonomyGroup, ('group_code', 'subsystem_code', 'system_code') + _NAMES + ('is_active',), None,
+    ),
+}
+
+# Writes to these models invalidate the snapshot; Category is joined into
+# equipment_types.category_name.
+CATALOG_MODELS = tuple(catalog.model for catalog in CATALOGS.values()) + (Category,)
+
+Snapshot = namedtuple('Snapshot', ['version', 'etag', 'body'])
+
+_cache = SnapshotCache()
+
+
+def current_version():
+    """Sum of the committed catalog counters, or None when there are none."""
+    return tables_version(CATALOG_MODELS)
+
+
+def load_catalogs():
+    """Read every catalog; a catalog whose table fails to load is sent empty."""
+    data = {}
+    for key, catalog in CATALOGS.items():
+        queryset = catalog.model.objects.all()
+        if not catalog.model._meta.ordering:
+            queryset = queryset.order_by('pk')
+        try:
+            data[key] = list(queryset.values(*catalog.fields, **(catalog.extra or {})))
+        except DatabaseError as e:
+            logger.error(f"Error loading reference catalog {key}: {e}")
+            data[key] = []
+    return data
+
+
+def build_snapshot(version):
+    payload = {'version': version, 'catalogs': load_catalogs()}
+    body = json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':')).encode('utf-8')
+    if version is None:
+        etag = '"ref-h%s"' % hashlib.sha1(body).hexdigest()[:16]
+    else:
+        etag = f'"ref-{version}"'
+    return Snapshot(version, etag, body)
+
+
+def get_snapshot():
+    """Return the current snapshot, rebuilding it if the catalogs changed."""
+    return _cache.get(current_version, build_snapshot)
+
+
+def invalidate():
+    """Drop this process' snapshot (other workers follow the table versions)."""
+    _cache.invalidate()
@@ -0,0 +1,49 @@
+"""
+orjson-backed JSON renderer and parser for DRF (see core.fastjson).
+
+Drop-in replacements for ``JSONRenderer`` / ``JSONParser`` with the same
+output; enabled in ``REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES']`` and
+``DEFAULT_PARSER_CLASSES``. Without orjson they behave like the stock
+classes.
+"""
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from . import fastjson
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` through orjson. Pretty-printed output
+    (``Accept: application/json; indent=4``) and non-default JSON settings
+    (``COMPACT_JSON``, ``UNICODE_JSON``, ``STRICT_JSON``) use the stock
+    renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+        return fastjson.dumps(data)
+
+
+class ORJSONParser(JSONParser):
+    """``JSONParser`` through orjson for UTF-8 bodies."""
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return fastjson.loads(body)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,267 @@
+"""
+Replenishment planning for every (warehouse, SKU) pair in one pass.
+
+``load_positions`` reads everything the plan needs with one statement:
+
+- stock position per warehouse and SKU (available and on order);
+- monthly demand from ``kpi.demand_forecasts`` (core.forecasting), split
+  across warehouses by their share of the last year's ``OUT`` quantities;
+- the preferred active supplier per SKU (``inv.supplier_skus``) with its
+  cost, minimum order and lead time;
+- the OEM lead time of the catalog item behind the product.
+
+``plan`` then computes, as NumPy arrays over all pairs:
+
+- lead time: the supplier's (SKU mapping, else the supplier's average), else
+  the product's, never shorter than the OEM lead time;
+- safety stock ``z * sigma_daily * sqrt(lead time)``;
+- reorder point ``daily demand * lead time + safety stock``;
+- economic order quantity ``sqrt(2 * annual demand * order cost / holding cost)``.
+
+The product's own ``safety_stock``/``reorder_point``/``min_stock`` act as
+floors. A pair whose position (available + on order) is at or below its
+reorder point orders whole EOQs until it is above it, rounded up to the
+supplier minimum and the package quantity and capped at ``max_stock``.
+
+``create_purchase_orders`` groups the suggestions into one draft
+``PurchaseOrder`` per supplier and warehouse with ``bulk_create``, replacing
+the drafts of the previous run.
+"""
+import math
+from collections import namedtuple
+from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from statistics import NormalDist
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .forecasting import FORECAST_TABLE
+from .models import POItem, PurchaseOrder
+
+DAYS_PER_MONTH = 365.25 / 12
+DEFAULT_LEAD_TIME_DAYS = 7
+USAGE_WINDOW_DAYS = 365
+AUTO_PO_PREFIX = 'AR-'  # drafts created (and replaced) by the planner
+
+POSITION_COLUMNS = [
+    'warehouse_code', 'internal_sku', 'available', 'on_order', 'warehouse_usage', 'sku_usage', 'warehouses',
+    'monthly_demand', 'monthly_std', 'min_stock', 'max_stock', 'reorder_point', 'safety_stock',
+    'product_lead_time', 'package_qty', 'product_cost', 'supplier_id', 'supplier_sku_id', 'supplier_cost',
+    'supplier_lead_time', 'min_order_qty', 'oem_lead_time',
+]
+
+Suggestion = namedtuple('Suggestion', [
+    'warehouse_code', 'internal_sku', 'supplier_id', 'supplier_sku_id', 'position', 'daily_demand',
+    'lead_time_days', 'safety_stock', 'reorder_point', 'eoq', 'order_qty', 'unit_price',
+])
+
+SUPPLIER_CTE = """
+, supplier AS (
+    SELECT DISTINCT ON (ss.internal_sku)
+           ss.internal_sku, ss.supplier_id, ss.supplier_sku_id, ss.unit_cost,
+           COALESCE(ss.lead_time_days, s.delivery_time_avg) AS lead_time_days, ss.min_order_qty
+    FROM inv.supplier_skus ss JOIN cat.suppliers s ON s.supplier_id = ss.supplier_id
+    WHERE ss.is_active AND s.is_active
+    ORDER BY ss.internal_sku, ss.is_preferred DESC, s.is_preferred DESC, ss.unit_cost NULLS LAST, ss.supplier_id
+)
+"""
+SUPPLIER_COLUMNS = 'sup.supplier_id, sup.supplier_sku_id, sup.unit_cost, sup.lead_time_days, sup.min_order_qty'
+NO_SUPPLIER_COLUMNS = 'NULL::int, NULL::int, NULL::numeric, NULL::int, NULL::int'
+
+# The warehouse shares are computed over every warehouse before the optional
+# warehouse filter is applied.
+POSITIONS_SQL = """
+WITH usage AS (
+    SELECT from_warehouse AS warehouse_code, internal_sku, SUM(ABS(qty)) AS qty
+    FROM inv.transactions
+    WHERE txn_type = 'OUT' AND txn_date >= %s
+    GROUP BY from_warehouse, internal_sku
+), pos AS (
+    SELECT s.warehouse_code, s.internal_sku, s.available, s.on_order, COALESCE(usage.qty, 0) AS usage,
+           SUM(COALESCE(usage.qty, 0)) OVER w AS sku_usage, COUNT(*) OVER w AS warehouses
+    FROM (
+        SELECT warehouse_code, internal_sku, SUM(COALESCE(qty_available, 0)) AS available,
+               SUM(COALESCE(qty_on_order, 0)) AS on_order
+        FROM inv.stock
+        GROUP BY warehouse_code, internal_sku
+    ) s
+    LEFT JOIN usage ON usage.warehouse_code = s.warehouse_code AND usage.internal_sku = s.internal_sku
+    WINDOW w AS (PARTITION BY s.internal_sku)
+), fc AS (
+    SELECT internal_sku, AVG(forecast_qty) AS monthly, MIN(forecast_std) AS std
+    FROM {forecast_table}
+    GROUP BY internal_sku
+){supplier_cte}
+SELECT pos.warehouse_code, pos.internal_sku, pos.available, pos.on_order, pos.usage, pos.sku_usage, pos.warehouses,
+       fc.monthly, fc.std, pm.min_stock, pm.max_stock, pm.reorder_point, pm.safety_stock,
+       pm.lead_time_days, pm.package_qty, COALESCE(pm.last_purchase_cost, pm.avg_cost, pm.standard_cost),
+       {supplier_columns},
+       (SELECT MAX(ci.oem_lead_time_days) FROM oem.catalog_items ci
+        WHERE ci.oem_code = pm.oem_code AND ci.part_number = pm.oem_ref)
+FROM pos
+JOIN inv.product_master pm ON pm.internal_sku = pos.internal_sku AND pm.is_active
+LEFT JOIN fc ON fc.internal_sku = pos.internal_sku
+{supplier_join}
+{warehouse_filter}
+ORDER BY pos.warehouse_code, pos.internal_sku
+"""
+
+
+def _has_supplier_skus(cursor):
+    cursor.execute("SELECT to_regclass('inv.supplier_skus') IS NOT NULL")
+    return cursor.fetchone()[0]
+
+
+def load_positions(warehouse_code=None, today=None):
+    """
+    ``{column: numpy array}`` with one entry per (warehouse, SKU) in
+    ``inv.stock`` (see ``POSITION_COLUMNS``). Unknown numbers are NaN.
+    """
+    since = (today or timezone.localdate()) - timedelta(days=USAGE_WINDOW_DAYS)
+    params = [since]
+    warehouse_filter = ''
+    if warehouse_code:
+        warehouse_filter = 'WHERE pos.warehouse_code = %s'
+        params.append(warehouse_code)
+    with connection.cursor() as cursor:
+        suppliers = _has_supplier_skus(cursor)
+        cursor.execute(POSITIONS_SQL.format(
+            warehouse_filter=warehouse_filter,
+            forecast_table=FORECAST_TABLE,
+            supplier_cte=SUPPLIER_CTE if suppliers else '',
+            supplier_columns=SUPPLIER_COLUMNS if suppliers else NO_SUPPLIER_COLUMNS,
+            supplier_join='LEFT JOIN supplier sup ON sup.internal_sku = pos.internal_sku' if suppliers else '',
+        ), params)
+        rows = cursor.fetchall()
+    columns = list(zip(*rows)) if rows else [()] * len(POSITION_COLUMNS)
+    positions = {}
+    for name, values in zip(POSITION_COLUMNS, columns):
+        if name in ('warehouse_code', 'internal_sku'):
+            positions[name] = np.array(values, dtype=object)
+        else:
+            positions[name] = np.array([np.nan if v is None else float(v) for v in values], dtype=float)
+    return positions
+
+
+def _filled(values, default):
+    return np.where(np.isnan(values), default, values)
+
+
+def plan(positions, service_level=None, order_cost=None, holding_rate=None):
+    """``Suggestion`` list, one per pair that needs ordering."""
+    service_level = service_level or settings.REPLENISHMENT_SERVICE_LEVEL
+    order_cost = settings.REPLENISHMENT_ORDER_COST if order_cost is None else order_cost
+    holding_rate = holding_rate or settings.REPLENISHMENT_HOLDING_RATE
+    z = NormalDist().inv_cdf(service_level)
+
+    sku_usage = positions['sku_usage']
+    share = np.where(sku_usage > 0, positions['warehouse_usage'] / np.where(sku_usage > 0, sku_usage, 1),
+                     1 / positions['warehouses'])
+    daily = _filled(positions['monthly_demand'], 0.0) * share / DAYS_PER_MONTH
+    sigma = _filled(positions['monthly_std'], 0.0) * share / math.sqrt(DAYS_PER_MONTH)
+
+    lead_time = _filled(positions['supplier_lead_time'], _filled(positions['product_lead_time'], DEFAULT_LEAD_TIME_DAYS))
+    lead_time = np.maximum(lead_time, _filled(positions['oem_lead_time'], 0.0))
+    lead_time = np.maximum(lead_time, 1.0)
+
+    safety = np.maximum(z * sigma * np.sqrt(lead_time), _filled(positions['safety_stock'], 0.0))
+    reorder_point = np.maximum(daily * lead_time + safety, _filled(positions['reorder_point'], 0.0))
+    reorder_point = np.ceil(np.maximum(reorder_point, _filled(positions['min_stock'], 0.0)))
+
+    unit_price = _filled(positions['supplier_cost'], np.nan)
+    unit_price = np.where(np.isnan(unit_price) | (unit_price <= 0), _filled(positions['product_cost'], 0.0), unit_price)
+    annual = daily * 365.25
+    holding = holding_rate * unit_price
+    eoq = np.sqrt(2 * annual * order_cost / np.where(holding > 0, holding, 1))
+    # Without a cost the EOQ is undefined: order a month of demand.
+    eoq = np.where(holding > 0, eoq, daily * DAYS_PER_MONTH)
+    eoq = np.maximum(np.ceil(eoq), 1)
+
+    position = positions['available'] + positions['on_order']
+    needed = position <= reorder_point
+    order = np.ceil((reorder_point - position + 1) / eoq) * eoq
+    order = np.maximum(order, _filled(positions['min_order_qty'], 1.0))
+    package = np.maximum(_filled(positions['package_qty'], 1.0), 1)
+    order = np.ceil(order / package) * package
+    max_stock = _filled(positions['max_stock'], 0.0)
+    capped = (max_stock > reorder_point) & (position + order > max_stock)
+    order = np.where(capped, np.maximum(np.floor((max_stock - position) / package) * package, package), order)
+
+    suggestions = []
+    supplier_ids, supplier_sku_ids = positions['supplier_id'], positions['supplier_sku_id']
+    for i in np.flatnonzero(needed):
+        suggestions.append(Suggestion(
+            positions['warehouse_code'][i], positions['internal_sku'][i],
+            None if np.isnan(supplier_ids[i]) else int(supplier_ids[i]),
+            None if np.isnan(supplier_sku_ids[i]) else int(supplier_sku_ids[i]),
+            int(position[i]), round(float(daily[i]), 3), int(lead_time[i]), int(math.ceil(safety[i])),
+            int(reorder_point[i]), int(eoq[i]), int(order[i]),
+            Decimal(str(unit_price[i])).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP),
+        ))
+    return suggestions
+
+
+def draft_notes(warehouse_code):
+    return f'Reposición automática - almacén {warehouse_code}'
+
+
+def create_purchase_orders(suggestions, created_by=None, today=None):
+    """
+    Draft purchase orders, one per (supplier, warehouse), for the suggestions
+    with a supplier. Previous planner drafts of the suggestions' warehouses
+    are deleted first. Returns the created orders.
+    """
+    today = today or timezone.localdate()
+    groups = {}
+    for suggestion in suggestions:
+        if suggestion.supplier_id is not None:
+            groups.setdefault((suggestion.supplier_id, suggestion.warehouse_code), []).append(suggestion)
+    stamp = timezone.now().strftime('%Y%m%d%H%M%S')
+    orders, lines = [], []
+    for number, ((supplier_id, warehouse_code), group) in enumerate(sorted(groups.items()), 1):
+        lead_time = max(s.lead_time_days for s in group)
+        orders.append(PurchaseOrder(
+            po_number=f'{AUTO_PO_PREFIX}{stamp}-{number:04d}',
+            supplier_id=supplier_id,
+            order_date=today,
+            expected_delivery_date=today + timedelta(days=lead_time),
+            status='DRAFT',
+            subtotal=sum(s.unit_price * s.order_qty for s in group),
+            created_by_id=created_by,
+            notes=draft_notes(warehouse_code),
+        ))
+        lines.append(group)
+    with transaction.atomic():
+        # The order has no destination column: the warehouse is in the notes.
+        drafts = PurchaseOrder.objects.filter(
+            status='DRAFT', po_number__startswith=AUTO_PO_PREFIX,
+            notes__in=sorted({draft_notes(s.warehouse_code) for s in suggestions}),
+        )
+        POItem.objects.filter(po__in=drafts).delete()
+        drafts.delete()
+        orders = PurchaseOrder.objects.bulk_create(orders)
+        POItem.objects.bulk_create([
+            POItem(
+                po=order, internal_sku=s.internal_sku, supplier_sku_id=s.supplier_sku_id,
+                quantity=s.order_qty, unit_price=s.unit_price,
+                notes=f'PR {s.reorder_point}, SS {s.safety_stock}, EOQ {s.eoq}, posición {s.position}',
+            )
+            for order, group in zip(orders, lines) for s in group
+        ])
+    return orders
+
+
+def run(warehouse_code=None, service_level=None, dry_run=True, created_by=None):
+    """Plan every pair and, unless ``dry_run``, create the draft orders."""
+    positions = load_positions(warehouse_code)
+    suggestions = plan(positions, service_level)
+    orders = [] if dry_run else create_purchase_orders(suggestions, created_by)
+    return {
+        'pairs': len(positions['internal_sku']),
+        'suggestions': suggestions,
+        'unassigned': sum(1 for s in suggestions if s.supplier_id is None),
+        'orders': orders,
+    }
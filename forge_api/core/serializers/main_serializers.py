@@ -6,12 +6,14 @@ This module contains DRF serializers for all models in the ForgeDB system.
 Serializers are organized by schema and include proper validation and business logic.
 """
 
+import re
 from rest_framework import serializers
 from decimal import Decimal
 from datetime import date, datetime
 from django.core.exceptions import ValidationError
 from django.db import transaction
 
+from ..business_rules import DJANGO_CONDITION_TYPES, compile_rule
 from ..models import (
     Alert, BusinessRule, AuditLog, Technician, Client, Equipment,
     Warehouse, ProductMaster, Stock, Transaction, WorkOrder, Invoice, Document,
@@ -95,6 +97,23 @@ class BusinessRuleSerializer(serializers.ModelSerializer):
             )
         return value
 
+    def validate(self, data):
+        """Compile Python/regex conditions up front; SQL ones are checked by the database"""
+        rule = BusinessRule(**{**self._current_values(), **data})
+        if (rule.condition_type or '').upper() in DJANGO_CONDITION_TYPES:
+            try:
+                compile_rule(rule)
+            except (ValueError, SyntaxError, re.error) as e:
+                raise serializers.ValidationError({'condition_text': [str(e)]})
+        return data
+
+    def _current_values(self):
+        if self.instance is None:
+            return {}
+        return {field: getattr(self.instance, field)
+                for field in ('rule_code', 'rule_name', 'condition_text', 'condition_type',
+                              'action_type', 'trigger_event', 'severity', 'stop_on_match')}
+
 
 class AuditLogSerializer(serializers.ModelSerializer):
     """Serializer for AuditLog model - read-only for security"""
@@ -132,6 +151,7 @@ class TechnicianSerializer(serializers.ModelSerializer):
             'status', 'is_active', 'notes', 'created_at', 'updated_at'
         ]
         read_only_fields = ['technician_id', 'created_at', 'updated_at', 'jobs_completed']
+        field_sources = {'full_name': ('first_name', 'last_name')}
 
     def to_internal_value(self, data):
         """Handle string input for ArrayField items (specialization, certifications)"""
@@ -298,6 +318,7 @@ class ClientSerializer(serializers.ModelSerializer):
             'status', 'created_by', 'created_at', 'updated_at', 'notes'
         ]
         read_only_fields = ['client_id', 'uuid', 'created_at', 'updated_at', 'credit_used', 'created_by']
+        field_sources = {'available_credit': ('credit_limit', 'credit_used')}
 
     def validate_client_code(self, value):
         """Validate client code format"""
@@ -393,6 +414,7 @@ class EquipmentSerializer(serializers.ModelSerializer):
             'custom_fields', 'metadata', 'created_by', 'created_at', 'updated_at', 'notes'
         ]
         read_only_fields = ['equipment_id', 'uuid', 'client', 'mileage', 'warranty_expiry', 'created_at', 'updated_at', 'created_by']
+        field_sources = {'client': ('client_id',)}
     
     def get_client(self, obj):
         """Get client representation"""
@@ -624,6 +646,10 @@ class StockSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'stock_id', 'last_movement_date', 'created_at', 'updated_at'
         ]
+        field_sources = {
+            'is_below_minimum': ('qty_available', 'product'),
+            'needs_reorder': ('qty_available', 'product'),
+        }
 
     def validate_qty_on_hand(self, value):
         """Validate quantity on hand"""
@@ -722,6 +748,11 @@ class WorkOrderSerializer(serializers.ModelSerializer):
             'created_by', 'created_at', 'updated_at'
         ]
         read_only_fields = ['wo_id', 'client', 'equipment', 'assigned_technician', 'created_at', 'updated_at', 'created_by']
+        field_sources = {
+            'client': ('client_id',),
+            'equipment': ('equipment_id',),
+            'assigned_technician': ('technician_id',),
+        }
     
     def get_client(self, obj):
         """Get client representation"""
@@ -844,6 +875,11 @@ class InvoiceSerializer(serializers.ModelSerializer):
             'invoice_id', 'client', 'work_order', 'invoice_date', 'is_overdue',
             'created_at', 'updated_at'
         ]
+        field_sources = {
+            'client': ('client_id',),
+            'work_order': ('wo_id',),
+            'is_overdue': ('due_date', 'status'),
+        }
     
     def get_client(self, obj):
         """Get client representation"""
@@ -1110,6 +1146,7 @@ class CategorySerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'equipment_type_count'
         ]
         read_only_fields = ['category_id', 'created_at', 'updated_at']
+        field_sources = {'equipment_type_count': ()}
     
     def get_equipment_type_count(self, obj):
         """Get count of equipment types in this category"""
@@ -1800,8 +1837,18 @@ class QuoteItemSerializer(serializers.ModelSerializer):
 
 
 class QuoteSerializer(serializers.ModelSerializer):
-    """Serializer for Quote model"""
+    """
+    Serializer for Quote model.
+
+    ``work_order`` and ``invoice`` are only present when the view passes
+    them in the ``expand`` context; they read queryset annotations (see
+    QuoteViewSet.EXPANSIONS), never extra queries.
+    """
     items = QuoteItemSerializer(many=True, read_only=True)
+    work_order = serializers.JSONField(read_only=True)
+    invoice = serializers.JSONField(read_only=True)
+
+    EXPANDABLE_FIELDS = ('work_order', 'invoice')
     
     class Meta:
         model = Quote
@@ -1810,12 +1857,20 @@ class QuoteSerializer(serializers.ModelSerializer):
             'quote_date', 'valid_until', 'subtotal', 'discount_percent',
             'discount_amount', 'tax_percent', 'tax_amount', 'total',
             'total_hours', 'currency_code', 'notes', 'terms_and_conditions',
-            'created_by', 'converted_to_wo', 'created_at', 'updated_at', 'items'
+            'created_by', 'converted_to_wo', 'created_at', 'updated_at', 'items',
+            'work_order', 'invoice'
         ]
         read_only_fields = [
             'quote_id', 'quote_number', 'subtotal', 'discount_amount',
             'tax_amount', 'total', 'total_hours', 'created_at', 'updated_at'
         ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        expand = self.context.get('expand', ())
+        for field_name in self.EXPANDABLE_FIELDS:
+            if field_name not in expand:
+                self.fields.pop(field_name, None)
     
     def create(self, validated_data):
         """Override create to generate quote number"""
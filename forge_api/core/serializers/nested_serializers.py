@@ -13,13 +13,15 @@ from django.db.models import Sum, Avg, Count
 
 from ..models import (
     Alert, BusinessRule, AuditLog, Technician, Client, Equipment,
-    Warehouse, ProductMaster, Stock, Transaction, WorkOrder, Invoice, Document
+    Warehouse, ProductMaster, Stock, Transaction, WorkOrder, Invoice, Document,
+    QuoteItem
 )
 from .main_serializers import (
     TechnicianSerializer, ClientSerializer, EquipmentSerializer,
     WarehouseSerializer, ProductMasterSerializer, WorkOrderSerializer,
-    InvoiceSerializer, DocumentSerializer
+    InvoiceSerializer, DocumentSerializer, QuoteSerializer
 )
+from ..entity_stats import work_order_stats
 
 
 # =============================================================================
@@ -30,27 +32,38 @@ class ClientDetailSerializer(ClientSerializer):
     """Detailed client serializer with related equipment and work orders"""
     equipment_list = EquipmentSerializer(source='equipment_set', many=True, read_only=True)
     recent_work_orders = serializers.SerializerMethodField()
+    work_order_stats = serializers.SerializerMethodField()
     total_work_orders = serializers.SerializerMethodField()
     total_invoiced = serializers.SerializerMethodField()
     
     class Meta(ClientSerializer.Meta):
         fields = ClientSerializer.Meta.fields + [
-            'equipment_list', 'recent_work_orders', 'total_work_orders', 'total_invoiced'
+            'equipment_list', 'recent_work_orders', 'work_order_stats',
+            'total_work_orders', 'total_invoiced'
         ]
 
+    def _stats(self, obj):
+        """Work order stats for this client, computed once per object"""
+        if not hasattr(obj, '_work_order_stats'):
+            obj._work_order_stats = work_order_stats('client', obj.client_id)
+        return obj._work_order_stats
+
     def get_recent_work_orders(self, obj):
         """Get recent work orders for this client"""
-        recent_wos = obj.workorder_set.order_by('-created_at')[:5]
+        recent_wos = WorkOrder.objects.filter(client_id=obj.client_id).order_by('-created_at')[:5]
         return WorkOrderSerializer(recent_wos, many=True, context=self.context).data
 
+    def get_work_order_stats(self, obj):
+        """Status histogram, last service and average cycle time"""
+        return self._stats(obj)
+
     def get_total_work_orders(self, obj):
         """Get total count of work orders for this client"""
-        return obj.workorder_set.count()
+        return self._stats(obj)['total']
 
     def get_total_invoiced(self, obj):
-        """Get total amount invoiced to this client"""
-        total = obj.invoice_set.aggregate(total=Sum('total_amount'))['total']
-        return total or Decimal('0.00')
+        """Get total amount invoiced for this client's work orders"""
+        return self._stats(obj)['total_invoiced']
 
 
 class EquipmentDetailSerializer(EquipmentSerializer):
@@ -65,19 +78,24 @@ class EquipmentDetailSerializer(EquipmentSerializer):
             'client_info', 'service_history', 'total_services', 'last_service_date'
         ]
 
+    def _stats(self, obj):
+        """Work order stats for this equipment, computed once per object"""
+        if not hasattr(obj, '_work_order_stats'):
+            obj._work_order_stats = work_order_stats('equipment', obj.equipment_id)
+        return obj._work_order_stats
+
     def get_service_history(self, obj):
         """Get recent service history for this equipment"""
-        recent_services = obj.workorder_set.order_by('-created_at')[:10]
+        recent_services = WorkOrder.objects.filter(equipment_id=obj.equipment_id).order_by('-created_at')[:10]
         return WorkOrderSerializer(recent_services, many=True, context=self.context).data
 
     def get_total_services(self, obj):
         """Get total count of services for this equipment"""
-        return obj.workorder_set.count()
+        return self._stats(obj)['total']
 
     def get_last_service_date(self, obj):
-        """Get date of last service"""
-        last_service = obj.workorder_set.order_by('-created_at').first()
-        return last_service.created_at if last_service else None
+        """Get date of last completed service"""
+        return self._stats(obj)['last_service_date']
 
 
 class WorkOrderDetailSerializer(WorkOrderSerializer):
@@ -206,10 +224,15 @@ class DashboardStatsSerializer(serializers.Serializer):
 
 
 class ClientSummarySerializer(serializers.ModelSerializer):
-    """Summary serializer for client list views"""
-    equipment_count = serializers.SerializerMethodField()
-    open_work_orders = serializers.SerializerMethodField()
-    last_service_date = serializers.SerializerMethodField()
+    """
+    Summary serializer for client list views.
+
+    Reads the counters annotated by ``core.entity_stats.annotate_client_summary``
+    so the whole list is one query.
+    """
+    equipment_count = serializers.IntegerField(read_only=True)
+    open_work_orders = serializers.IntegerField(read_only=True)
+    last_service_date = serializers.DateTimeField(read_only=True)
     
     class Meta:
         model = Client
@@ -218,19 +241,6 @@ class ClientSummarySerializer(serializers.ModelSerializer):
             'status', 'equipment_count', 'open_work_orders', 'last_service_date'
         ]
 
-    def get_equipment_count(self, obj):
-        """Get count of equipment for this client"""
-        return obj.equipment_set.count()
-
-    def get_open_work_orders(self, obj):
-        """Get count of open work orders for this client"""
-        return obj.workorder_set.exclude(status__in=['completed', 'cancelled']).count()
-
-    def get_last_service_date(self, obj):
-        """Get date of last service for this client"""
-        last_wo = obj.workorder_set.order_by('-created_at').first()
-        return last_wo.created_at if last_wo else None
-
 
 class TechnicianSummarySerializer(serializers.ModelSerializer):
     """Summary serializer for technician list views"""
@@ -341,6 +351,47 @@ class BulkStockUpdateSerializer(serializers.Serializer):
         return value
 
 
+class QuoteLineSerializer(serializers.ModelSerializer):
+    """Quote item as nested in a quote; line_total is computed server-side"""
+
+    class Meta:
+        model = QuoteItem
+        fields = [
+            'flat_rate', 'service_code', 'description', 'quantity',
+            'hours', 'hourly_rate', 'line_total', 'notes'
+        ]
+        read_only_fields = ['line_total']
+
+
+class QuoteWithItemsSerializer(QuoteSerializer):
+    """Create a quote and its items in one request (see core.quotes.create_quote)"""
+    items = QuoteLineSerializer(many=True, allow_empty=False, max_length=500)
+    discount_amount = serializers.DecimalField(
+        max_digits=12, decimal_places=2, required=False, allow_null=True, min_value=Decimal('0')
+    )
+
+    class Meta(QuoteSerializer.Meta):
+        read_only_fields = [
+            field for field in QuoteSerializer.Meta.read_only_fields
+            if field != 'discount_amount'
+        ] + ['created_by', 'converted_to_wo']
+
+    def create(self, validated_data):
+        from ..quotes import create_quote
+        items = validated_data.pop('items')
+        discount_amount = validated_data.pop('discount_amount', None)
+        return create_quote(validated_data, items, discount_amount=discount_amount,
+                            created_by=validated_data.pop('created_by', None))
+
+
+class QuoteConversionSerializer(serializers.Serializer):
+    """Options for converting a quote to a work order"""
+    service_type = serializers.ChoiceField(
+        choices=WorkOrder.SERVICE_TYPE_CHOICES,
+        default='REPAIR'
+    )
+
+
 # =============================================================================
 # Search and Filter Serializers
 # =============================================================================
@@ -1,11 +1,13 @@
 """
 Signal handlers for cache invalidation
 """
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete
 from django.dispatch import receiver
 from django.core.cache import cache
 from django.urls import reverse
-from .models import Supplier, PurchaseOrder
+from django.db import transaction
+from .models import BusinessRule, Supplier, PurchaseOrder
+from . import business_rules, reference_data, taxonomy
 
 
 @receiver([post_save, post_delete], sender=Supplier)
@@ -96,4 +98,66 @@ def invalidate_purchase_order_cache(sender, instance, **kwargs):
         # Log error but don't break the save operation
         import logging
         logger = logging.getLogger(__name__)
-        logger.warning(f"Failed to invalidate purchase order cache: {e}")
\ No newline at end of file
+        logger.warning(f"Failed to invalidate purchase order cache: {e}")
+
+
+def invalidate_reference_bundle(sender, **kwargs):
+    """
+    Drop this worker's reference-data snapshot after a catalog write commits.
+    Other workers notice the catalogs' bumped counters in app.table_versions.
+    """
+    transaction.on_commit(reference_data.invalidate)
+
+
+def invalidate_taxonomy_tree(sender, **kwargs):
+    """Drop this worker's taxonomy tree snapshot after a taxonomy write commits."""
+    transaction.on_commit(taxonomy.invalidate)
+
+
+for model in reference_data.CATALOG_MODELS:
+    post_save.connect(invalidate_reference_bundle, sender=model)
+    post_delete.connect(invalidate_reference_bundle, sender=model)
+
+for model in taxonomy.TREE_MODELS:
+    post_save.connect(invalidate_taxonomy_tree, sender=model)
+    post_delete.connect(invalidate_taxonomy_tree, sender=model)
+
+
+@receiver([post_save, post_delete], sender=BusinessRule)
+def invalidate_business_rules(sender, **kwargs):
+    """Drop this worker's compiled Python/regex rules after a rule write commits."""
+    transaction.on_commit(business_rules.invalidate)
+
+
+def apply_business_rules(sender, instance, raw=False, **kwargs):
+    """
+    Evaluate the Python/regex business rules of the saved model's table.
+    BLOCK/VALIDATE rules abort the save; ALERT rules are recorded in post_save.
+    """
+    if raw:
+        return
+    rules = business_rules.rules_for(sender)
+    if rules:
+        event = 'INSERT' if instance._state.adding else 'UPDATE'
+        instance._business_rule_alerts = business_rules.evaluate(rules, instance, event)
+
+
+def record_business_rule_alerts(sender, instance, **kwargs):
+    alerts = instance.__dict__.pop('_business_rule_alerts', None)
+    if alerts:
+        business_rules.create_alerts(alerts, instance)
+
+
+def apply_business_rules_on_delete(sender, instance, **kwargs):
+    rules = business_rules.rules_for(sender)
+    if rules:
+        alerts = business_rules.evaluate(rules, instance, 'DELETE')
+        if alerts:
+            business_rules.create_alerts(alerts, instance)
+
+
+# Per model, so the other models keep Collector.can_fast_delete and skip the lookup.
+for model in business_rules.RULE_MODELS:
+    pre_save.connect(apply_business_rules, sender=model)
+    post_save.connect(record_business_rule_alerts, sender=model)
+    pre_delete.connect(apply_business_rules_on_delete, sender=model)
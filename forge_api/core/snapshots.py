@@ -0,0 +1,84 @@
+"""
+Per-worker snapshots of data derived from a few tables.
+
+The reference-data bundle (``core.reference_data``), the taxonomy tree
+(``core.taxonomy``) and the compiled business rules (``core.business_rules``)
+each keep an immutable snapshot in memory, tagged with a version: the sum of
+their tables' change counters in ``app.table_versions`` (migration 0018,
+``tables_version``). ``SnapshotCache.get`` reads the version and rebuilds
+the snapshot only when it changed; other workers follow the same counters,
+and writes in this process drop the snapshot right away
+(``SnapshotCache.invalidate`` from ``core.signals``).
+
+Without the counters the version is ``None``: a snapshot is then rebuilt
+every ``SNAPSHOT_TTL`` seconds and callers usually tag it with a content
+hash.
+"""
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+from .conditional import table_versions
+
+_Entry = namedtuple('_Entry', ['snapshot', 'version', 'built_at', 'checked_at'])
+
+
+def tables_version(models):
+    """Sum of the committed change counters of ``models``, or None when there are none."""
+    versions = table_versions(models)
+    if not versions:
+        return None
+    return sum(version for version, _ in versions.values())
+
+
+def snapshot_ttl():
+    return getattr(settings, 'SNAPSHOT_TTL', 300)
+
+
+class SnapshotCache:
+    """
+    One snapshot per process, rebuilt when its version changes.
+
+    The version is read before building, so a snapshot may hold data newer
+    than its version but never older; the next check sees a higher version
+    and rebuilds.
+    """
+
+    def __init__(self):
+        self._entry = None
+        self._lock = threading.Lock()
+
+    def get(self, current_version, build, check_interval=0):
+        """
+        The snapshot, rebuilt with ``build(version)`` when
+        ``current_version()`` differs from the one it was built for. With
+        ``check_interval`` the version is read at most once per that many
+        seconds.
+        """
+        entry = self._entry
+        now = time.monotonic()
+        if entry is not None and now - entry.checked_at < check_interval:
+            return entry.snapshot
+        version = current_version()
+        if entry is not None and self._is_fresh(entry, version, now):
+            if check_interval:
+                self._entry = entry._replace(checked_at=now)
+            return entry.snapshot
+        with self._lock:
+            entry = self._entry
+            if entry is None or not self._is_fresh(entry, version, now):
+                entry = _Entry(build(version), version, now, now)
+                self._entry = entry
+            return entry.snapshot
+
+    @staticmethod
+    def _is_fresh(entry, version, now):
+        if version is None:
+            return entry.version is None and now - entry.built_at < snapshot_ttl()
+        return entry.version == version
+
+    def invalidate(self):
+        """Drop this process' snapshot (other workers follow the table versions)."""
+        self._entry = None
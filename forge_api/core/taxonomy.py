@@ -0,0 +1,324 @@
+"""
+Taxonomy tree service: systems -> subsystems -> groups.
+
+The whole tree is served as one pre-serialized JSON document kept in a
+per-worker snapshot, like the reference-data bundle (``core.reference_data``):
+the version is the sum of the three taxonomy tables' counters in
+``app.table_versions``, read with one indexed query, and the tree is rebuilt
+(three queries) only when it changes. Each snapshot holds two bodies, the
+full tree and the active-only tree shown by the taxonomy page.
+
+Ancestor/descendant questions go to the closure table ``taxonomy_closure``
+(migration 0020), which triggers on the taxonomy tables keep in sync: the
+descendants of a node are one range scan on its primary key and "would this
+parent create a cycle?" is one primary-key lookup. Without the table (the
+migration was not applied) both fall back to the foreign keys.
+
+Bulk activate/deactivate/delete work on a list of codes with one UPDATE or
+DELETE, and the dependencies of every node in the list come from a single
+grouped query; each returns an outcome per requested code.
+"""
+import hashlib
+import json
+from collections import namedtuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from .models import (
+    FlatRateStandard, OEMCatalogItem, ProductMaster, TaxonomyGroup, TaxonomySubsystem, TaxonomySystem,
+)
+from .snapshots import SnapshotCache, tables_version
+
+NODE_MODELS = {
+    'system': TaxonomySystem,
+    'subsystem': TaxonomySubsystem,
+    'group': TaxonomyGroup,
+}
+TREE_MODELS = tuple(NODE_MODELS.values())
+
+# node type -> type of its parent
+PARENT_TYPES = {'subsystem': 'system', 'group': 'subsystem'}
+
+CLOSURE_TABLE = 'taxonomy_closure'
+
+# Column of taxonomy_groups holding each level's code
+GROUP_COLUMNS = {'system': 'system_code', 'subsystem': 'subsystem_code', 'group': 'group_code'}
+
+# Dependency kind -> model referencing taxonomy groups through ``group_code``
+GROUP_REFERENCES = {
+    'products': ProductMaster,
+    'catalog_items': OEMCatalogItem,
+    'flat_rates': FlatRateStandard,
+}
+
+BULK_MAX_CODES = 1000
+
+SYSTEM_FIELDS = ('system_code', 'category', 'name_es', 'name_en', 'icon', 'scope', 'sort_order', 'is_active')
+SUBSYSTEM_FIELDS = ('subsystem_code', 'system_code', 'name_es', 'name_en', 'icon', 'notes', 'sort_order')
+GROUP_FIELDS = (
+    'group_code', 'subsystem_code', 'system_code', 'name_es', 'name_en', 'description',
+    'requires_position', 'requires_color', 'requires_finish', 'requires_side', 'typical_uom', 'is_active',
+)
+
+TreeSnapshot = namedtuple('TreeSnapshot', ['version', 'etag', 'body', 'active_body'])
+
+Node = namedtuple('Node', ['type', 'code', 'depth'])
+
+_cache = SnapshotCache()
+_closure_available = None
+
+
+class InvalidNode(ValueError):
+    """Unknown node type or a parent of the wrong level."""
+
+
+def current_version():
+    """Sum of the taxonomy tables' counters, or None when there are none."""
+    return tables_version(TREE_MODELS)
+
+
+def load_tree(active_only=False):
+    """Nested ``systems[].subsystems[].groups[]`` plus node counts."""
+    systems = TaxonomySystem.objects.all()
+    groups = TaxonomyGroup.objects.order_by('subsystem_code', 'name_es', 'group_code')
+    if active_only:
+        systems = systems.filter(is_active=True)
+        groups = groups.filter(is_active=True)
+    systems = [dict(row, subsystems=[]) for row in systems.values(*SYSTEM_FIELDS)]
+    by_system = {system['system_code']: system for system in systems}
+
+    subsystems = {}
+    for row in TaxonomySubsystem.objects.order_by('system_code', 'sort_order', 'subsystem_code').values(*SUBSYSTEM_FIELDS):
+        system = by_system.get(row['system_code'])
+        if system is not None:
+            subsystem = dict(row, groups=[])
+            system['subsystems'].append(subsystem)
+            subsystems[row['subsystem_code']] = subsystem
+
+    group_count = 0
+    for row in groups.values(*GROUP_FIELDS):
+        subsystem = subsystems.get(row['subsystem_code'])
+        if subsystem is not None:
+            subsystem['groups'].append(row)
+            group_count += 1
+
+    return {
+        'systems': systems,
+        'stats': {
+            'systems_count': len(systems),
+            'subsystems_count': len(subsystems),
+            'groups_count': group_count,
+            'total_nodes': len(systems) + len(subsystems) + group_count,
+        },
+    }
+
+
+def _dumps(payload):
+    return json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':')).encode('utf-8')
+
+
+def build_snapshot(version):
+    body = _dumps({'version': version, **load_tree()})
+    active_body = _dumps({'version': version, **load_tree(active_only=True)})
+    if version is None:
+        etag = '"tax-h%s"' % hashlib.sha1(body).hexdigest()[:16]
+    else:
+        etag = f'"tax-{version}"'
+    return TreeSnapshot(version, etag, body, active_body)
+
+
+def get_snapshot():
+    """Current tree snapshot, rebuilt when the taxonomy tables changed."""
+    return _cache.get(current_version, build_snapshot)
+
+
+def invalidate():
+    """Drop this process' snapshot (other workers follow the table versions)."""
+    _cache.invalidate()
+
+
+def _check_type(node_type):
+    if node_type not in NODE_MODELS:
+        raise InvalidNode(f"Unknown taxonomy node type: {node_type}")
+
+
+def has_closure():
+    """Whether the closure table exists (checked once per process)."""
+    global _closure_available
+    if _closure_available is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [CLOSURE_TABLE])
+            _closure_available = cursor.fetchone()[0]
+    return _closure_available
+
+
+def descendants(node_type, code):
+    """Every node below ``(node_type, code)``, nearest first."""
+    _check_type(node_type)
+    if not has_closure():
+        return _descendants_from_foreign_keys(node_type, code)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT descendant_type, descendant_code, depth FROM {CLOSURE_TABLE}
+            WHERE ancestor_type = %s AND ancestor_code = %s AND depth > 0
+            ORDER BY depth, descendant_type, descendant_code
+            """,
+            [node_type, code],
+        )
+        return [Node(*row) for row in cursor.fetchall()]
+
+
+def _descendants_from_foreign_keys(node_type, code):
+    nodes = []
+    if node_type == 'system':
+        nodes += [Node('subsystem', c, 1) for c in TaxonomySubsystem.objects.filter(
+            system_code=code).order_by('subsystem_code').values_list('subsystem_code', flat=True)]
+        groups = TaxonomyGroup.objects.filter(subsystem_code__system_code=code)
+        depth = 2
+    elif node_type == 'subsystem':
+        groups = TaxonomyGroup.objects.filter(subsystem_code=code)
+        depth = 1
+    else:
+        return nodes
+    nodes += [Node('group', c, depth) for c in groups.order_by('group_code').values_list('group_code', flat=True)]
+    return nodes
+
+
+def is_descendant(node_type, code, other_type, other_code):
+    """Whether ``(other_type, other_code)`` is ``(node_type, code)`` or below it."""
+    _check_type(node_type)
+    _check_type(other_type)
+    if not has_closure():
+        return (other_type, other_code) == (node_type, code) or (other_type, other_code) in {
+            (node.type, node.code) for node in _descendants_from_foreign_keys(node_type, code)
+        }
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT EXISTS (
+                SELECT 1 FROM {CLOSURE_TABLE}
+                WHERE ancestor_type = %s AND ancestor_code = %s
+                  AND descendant_type = %s AND descendant_code = %s
+            )
+            """,
+            [node_type, code, other_type, other_code],
+        )
+        return cursor.fetchone()[0]
+
+
+def check_parent(node_type, code, parent_code):
+    """
+    Error message if ``parent_code`` cannot be the parent of the node, else None.
+
+    The parent must be a node of the level above and must not sit inside
+    the node's own subtree.
+    """
+    _check_type(node_type)
+    parent_type = PARENT_TYPES.get(node_type)
+    if parent_type is None:
+        raise InvalidNode(f"A {node_type} has no parent")
+    if not NODE_MODELS[parent_type].objects.filter(pk=parent_code).exists():
+        return f"Parent {parent_type} '{parent_code}' does not exist"
+    if is_descendant(node_type, code, parent_type, parent_code):
+        return "Circular reference: the proposed parent is a descendant of this node"
+    return None
+
+
+def clean_codes(node_type, codes):
+    """Stripped, de-duplicated codes; InvalidNode when empty or too many."""
+    _check_type(node_type)
+    codes = list(dict.fromkeys(str(code).strip() for code in codes if str(code).strip()))
+    if not codes:
+        raise InvalidNode("No codes given")
+    if len(codes) > BULK_MAX_CODES:
+        raise InvalidNode(f"At most {BULK_MAX_CODES} codes per request")
+    return codes
+
+
+def dependency_counts(node_type, codes):
+    """
+    ``{code: {kind: count}}`` for the nodes that have dependencies.
+
+    Kinds are ``subsystems`` and ``groups`` below the node plus the rows of
+    ``GROUP_REFERENCES`` pointing at any group under it, all counted in one
+    ``UNION ALL`` statement grouped by node.
+    """
+    _check_type(node_type)
+    groups = TaxonomyGroup._meta.db_table
+    parts, params = [], [list(codes)]
+    if node_type == 'system':
+        parts.append(
+            f"SELECT system_code, 'subsystems', COUNT(*) FROM {TaxonomySubsystem._meta.db_table} "
+            "WHERE system_code = ANY(%s) GROUP BY system_code"
+        )
+        params.append(list(codes))
+    if node_type != 'group':
+        parts.append("SELECT code, 'groups', COUNT(*) FROM nodes GROUP BY code")
+    for kind, model in GROUP_REFERENCES.items():
+        parts.append(
+            f"SELECT n.code, '{kind}', COUNT(*) FROM nodes n "
+            f"JOIN {model._meta.db_table} r ON r.group_code = n.group_code GROUP BY n.code"
+        )
+    sql = (
+        f"WITH nodes AS (SELECT {GROUP_COLUMNS[node_type]} AS code, group_code FROM {groups} "
+        f"WHERE {GROUP_COLUMNS[node_type]} = ANY(%s)) "
+        + " UNION ALL ".join(parts)
+    )
+    counts = {}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for code, kind, count in cursor.fetchall():
+            counts.setdefault(code, {})[kind] = count
+    return counts
+
+
+def bulk_set_active(node_type, codes, active):
+    """
+    Set ``is_active`` on every listed node with one UPDATE.
+
+    Returns ``[{'code', 'status'}]`` in request order, status being
+    ``updated``, ``unchanged`` or ``not_found``.
+    """
+    codes = clean_codes(node_type, codes)
+    model = NODE_MODELS[node_type]
+    if not any(field.name == 'is_active' for field in model._meta.fields):
+        raise InvalidNode(f"A {node_type} has no active flag")
+    with transaction.atomic():
+        current = dict(model.objects.select_for_update().filter(pk__in=codes).values_list('pk', 'is_active'))
+        changed = [code for code, is_active in current.items() if is_active != active]
+        if changed:
+            model.objects.filter(pk__in=changed).update(is_active=active)
+    changed = set(changed)
+    return [
+        {'code': code, 'status': 'not_found' if code not in current else 'updated' if code in changed else 'unchanged'}
+        for code in codes
+    ]
+
+
+def bulk_delete(node_type, codes):
+    """
+    Delete the listed nodes that have no dependencies, in one DELETE.
+
+    Returns ``[{'code', 'status', 'dependencies'}]`` in request order, status
+    being ``deleted``, ``blocked`` (with the dependency counts) or
+    ``not_found``.
+    """
+    codes = clean_codes(node_type, codes)
+    model = NODE_MODELS[node_type]
+    with transaction.atomic():
+        existing = set(model.objects.select_for_update().filter(pk__in=codes).values_list('pk', flat=True))
+        blocked = dependency_counts(node_type, existing) if existing else {}
+        deletable = existing - set(blocked)
+        if deletable:
+            model.objects.filter(pk__in=deletable).delete()
+    results = []
+    for code in codes:
+        if code not in existing:
+            results.append({'code': code, 'status': 'not_found', 'dependencies': {}})
+        elif code in blocked:
+            results.append({'code': code, 'status': 'blocked', 'dependencies': blocked[code]})
+        else:
+            results.append({'code': code, 'status': 'deleted', 'dependencies': {}})
+    return results
@@ -0,0 +1,131 @@
+"""
+Tests for the audit helpers (core/audit.py): buffer flushing, the
+flush_audit_buffer command, diff search and record timelines.
+"""
+from datetime import datetime
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import audit
+from core.models import AuditLog
+from core.views import AuditLogViewSet
+
+
+def cursor_returning(*counts, rows=None):
+    cursor = Mock()
+    cursor.fetchone.side_effect = [(count,) for count in counts]
+    cursor.fetchall.return_value = rows
+    connection = Mock()
+    connection.cursor.return_value.__enter__ = Mock(return_value=cursor)
+    connection.cursor.return_value.__exit__ = Mock(return_value=False)
+    return connection, cursor
+
+
+class FlushBufferTests(SimpleTestCase):
+
+    def test_flushes_until_a_partial_batch(self):
+        connection, cursor = cursor_returning(100, 100, 30)
+        with patch.object(audit, 'connection', connection):
+            self.assertEqual(audit.flush_buffer(100), 230)
+        self.assertEqual(cursor.execute.call_count, 3)
+        cursor.execute.assert_called_with("SELECT app.flush_audit_buffer(%s)", [100])
+
+    def test_max_batches(self):
+        connection, cursor = cursor_returning(100, 100, 100)
+        with patch.object(audit, 'connection', connection):
+            self.assertEqual(audit.flush_buffer(100, max_batches=2), 200)
+
+
+class FlushCommandTests(SimpleTestCase):
+
+    def test_single_pass(self):
+        out = StringIO()
+        with patch.object(audit, 'flush_buffer', return_value=42) as flush:
+            call_command('flush_audit_buffer', '--batch', '500', stdout=out)
+        flush.assert_called_once_with(500)
+        self.assertIn('42 audit record(s) flushed', out.getvalue())
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(CommandError):
+            call_command('flush_audit_buffer', '--batch', '0')
+        with self.assertRaises(CommandError):
+            call_command('flush_audit_buffer', '--loop', '-1')
+
+
+class SearchTests(SimpleTestCase):
+
+    def test_parse_value_filter(self):
+        self.assertEqual(audit.parse_value_filter('status:COMPLETED'), {'status': 'COMPLETED'})
+        self.assertEqual(audit.parse_value_filter('qty_on_hand:5'), {'qty_on_hand': 5})
+        self.assertEqual(audit.parse_value_filter('{"bin": "B2", "is_active": true}'), {'bin': 'B2', 'is_active': True})
+        for raw in ('status', ':x', '{"bin"', '[1]'):
+            with self.assertRaises(ValueError):
+                audit.parse_value_filter(raw)
+
+    def test_containment_bounded_by_date(self):
+        sql = str(audit.search(AuditLog.objects.all(), new_values=[{'status': 'DONE'}],
+                               values=[{'bin': 'B2'}]).query)
+        self.assertIn('"changed_at" >=', sql)
+        self.assertIn('"new_values" @>', sql)
+        self.assertIn('"old_values" @>', sql)
+        self.assertNotIn('LIKE', sql)
+
+    def test_list_search_uses_containment(self):
+        request = APIRequestFactory().get('/api/v1/audit-logs/', {'values': 'status:DONE', 'changed_at__gte': '2026-01-01'})
+        view = AuditLogViewSet(request=Request(request), action='list', format_kwarg=None)
+        with patch.object(audit, 'search', wraps=audit.search) as search:
+            view.get_queryset()
+        self.assertEqual(search.call_args.kwargs['values'], [{'status': 'DONE'}])
+        self.assertEqual(search.call_args.kwargs['since'].date().isoformat(), '2026-01-01')
+
+
+class TimelineTests(SimpleTestCase):
+
+    def test_changes(self):
+        self.assertEqual(audit.changes('UPDATE', {'qty': 10, 'bin': 'A1'}, {'qty': 7}),
+                         {'bin': {'old': 'A1', 'new': None}, 'qty': {'old': 10, 'new': 7}})
+        self.assertEqual(audit.changes('DELETE', {'qty': 7}, None), {'qty': {'old': 7, 'new': None}})
+
+    def test_cursor_round_trip(self):
+        changed_at = datetime(2026, 1, 4, 10, 30)
+        self.assertEqual(audit.decode_cursor(audit.encode_cursor(changed_at, 42)), (changed_at, 42))
+        with self.assertRaises(ValueError):
+            audit.decode_cursor('not-a-cursor')
+
+    def test_page_and_next_cursor(self):
+        rows = [
+            (3, 'UPDATE', None, datetime(2026, 1, 4), '{"qty": 7}', '{"qty": 5}', '{"qty": 5}'),
+            (2, 'UPDATE', None, datetime(2026, 1, 3), '{"qty": 10}', '{"qty": 7}', '{"qty": 7}'),
+            (1, 'INSERT', None, datetime(2026, 1, 2), None, '{"qty": 10}', '{"qty": 10}'),
+        ]
+        connection, cursor = cursor_returning(rows=rows)
+        with patch.object(audit, 'connection', connection):
+            entries, next_cursor = audit.timeline('stock', 9, limit=2)
+        self.assertEqual([e['audit_id'] for e in entries], [3, 2])
+        self.assertEqual(entries[1]['state'], {'qty': 7})
+        self.assertEqual(audit.decode_cursor(next_cursor), (datetime(2026, 1, 3), 2))
+        self.assertEqual(cursor.execute.call_args.args[1], ['stock', 9, 3])
+
+        with patch.object(audit, 'connection', connection):
+            audit.timeline('stock', 9, next_cursor, limit=2)
+        sql, params = cursor.execute.call_args.args
+        self.assertIn('(changed_at, audit_id) <', sql)
+        self.assertEqual(params, ['stock', 9, datetime(2026, 1, 3), datetime(2026, 1, 3), 2, 3])
+
+    def test_timeline_view(self):
+        request = APIRequestFactory().get('/api/v1/audit-logs/timeline/stock/9/', {'cursor': 'bad'})
+        force_authenticate(request, user=User(pk=1, username='tester', is_staff=True))
+        view = AuditLogViewSet.as_view({'get': 'timeline'})
+        self.assertEqual(view(request, table='stock', record_id='9').status_code, 400)
+
+        request = APIRequestFactory().get('/api/v1/audit-logs/timeline/stock/9/')
+        force_authenticate(request, user=User(pk=1, username='tester', is_staff=True))
+        with patch.object(audit, 'timeline', return_value=([], 'abc')):
+            response = view(request, table='stock', record_id='9')
+        self.assertEqual(response.data['next'], 'http://testserver/api/v1/audit-logs/timeline/stock/9/?cursor=abc')
@@ -0,0 +1,73 @@
+"""
+Tests for the benchmark suite helpers (benchmarks/)
+"""
+from django.test import SimpleTestCase
+
+from benchmarks.compare import compare
+from benchmarks.datagen import DataGenerator, DryRunSink, copy_value, scaled_counts
+from benchmarks.results import percentile, summarize
+
+
+class ResultsTest(SimpleTestCase):
+    def test_percentile_nearest_rank(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 95), 95)
+        self.assertEqual(percentile(samples, 100), 100)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_summarize_fields(self):
+        result = summarize('x', [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(result['name'], 'x')
+        self.assertEqual(result['requests'], 4)
+        self.assertEqual(result['mean_ms'], 2.5)
+        self.assertEqual(result['max_ms'], 4.0)
+
+
+class CompareTest(SimpleTestCase):
+    def doc(self, **p95):
+        return {'results': [{'name': name, 'p95_ms': value, 'mean_ms': value} for name, value in p95.items()]}
+
+    def test_flags_regressions_and_improvements(self):
+        rows = compare(self.doc(a=100.0, b=100.0, c=100.0), self.doc(a=150.0, b=50.0, c=105.0),
+                       metrics=('p95_ms',), threshold_pct=10)
+        status = {row['name']: row['status'] for row in rows}
+        self.assertEqual(status, {'a': 'regression', 'b': 'improvement', 'c': 'ok'})
+
+    def test_ignores_small_absolute_changes_and_unmatched_names(self):
+        rows = compare(self.doc(fast=0.2), self.doc(fast=0.6, new=10.0), metrics=('p95_ms',),
+                       threshold_pct=10, min_delta_ms=1.0)
+        self.assertEqual([(row['name'], row['status']) for row in rows], [('fast', 'ok')])
+
+
+class DataGeneratorTest(SimpleTestCase):
+    def load(self, seed=7):
+        generator = DataGenerator(scale=0.002, seed=seed)
+        report = generator.load(DryRunSink())
+        return generator, {entry['name']: entry['rows'] for entry in report}
+
+    def test_scaled_counts_respect_minimums(self):
+        counts = scaled_counts(0.0001)
+        self.assertEqual(counts['transactions'], 100)
+        self.assertGreaterEqual(counts['warehouses'], 2)
+        self.assertGreaterEqual(counts['taxonomy_groups'], counts['taxonomy_subsystems'])
+        self.assertEqual(scaled_counts(1)['transactions'], 1_000_000)
+        self.assertEqual(scaled_counts(1)['oem_catalog_items'], 100_000)
+
+    def test_same_seed_same_rows(self):
+        first, _ = self.load(seed=7)
+        second, _ = self.load(seed=7)
+        self.assertEqual(first.products, second.products)
+        self.assertEqual(first.balances, second.balances)
+
+    def test_stock_matches_transaction_history(self):
+        generator, rows = self.load()
+        self.assertEqual(rows['inv.transactions'], scaled_counts(0.002)['transactions'])
+        self.assertEqual(rows['inv.stock'], len(generator.stock_pairs))
+        self.assertTrue(all(balance >= 0 for balance in generator.balances.values()))
+
+    def test_copy_value_escaping(self):
+        self.assertEqual(copy_value(None), '\\N')
+        self.assertEqual(copy_value(True), 't')
+        self.assertEqual(copy_value(['A', 'B 2']), '{"A","B 2"}')
+        self.assertEqual(copy_value('a\tb\nc\\'), 'a\\tb\\nc\\\\')
@@ -0,0 +1,168 @@
+"""
+Tests for the business-rule engine (core/business_rules.py): compiled
+Python/regex predicates, the per-worker snapshot and rule validation.
+"""
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.db.models.signals import pre_delete, pre_save
+from django.test import SimpleTestCase
+
+from core import business_rules
+from core.models import BusinessRule, WorkOrder
+from core.serializers import BusinessRuleSerializer
+
+
+def rule(code, condition, condition_type='python', action='alert', event=None, **extra):
+    return BusinessRule(rule_code=code, rule_name=f'Rule {code}', condition_text=condition,
+                        condition_type=condition_type, action_type=action, action_text='-',
+                        applies_to_table='work_orders', trigger_event=event, **extra)
+
+
+def work_order(**overrides):
+    values = dict(wo_id=7, wo_number='WO-0007', equipment_id=1, client_id=1, service_type='REPAIR',
+                  status='IN_PROGRESS', estimated_hours=Decimal('12.00'), technician_id=None)
+    values.update(overrides)
+    return WorkOrder(**values)
+
+
+class CompileRuleTests(SimpleTestCase):
+
+    def test_python_condition_sees_the_row(self):
+        compiled = business_rules.compile_rule(rule('R1', "technician_id is None and status == 'IN_PROGRESS'"))
+        self.assertTrue(compiled.predicate({'technician_id': None, 'status': 'IN_PROGRESS'}))
+        self.assertFalse(compiled.predicate({'technician_id': 3, 'status': 'IN_PROGRESS'}))
+        self.assertEqual((compiled.action_type, compiled.severity), ('ALERT', 'MEDIUM'))
+        self.assertEqual(compiled.events, ('INSERT', 'UPDATE', 'DELETE'))
+
+    def test_python_condition_has_no_import_or_dunder_access(self):
+        for condition in ("status.__class__",
+                          "open('/etc/passwd')",
+                          "__import__('subprocess')",
+                          "[c for c in ().__class__.__base__.__subclasses__() if c.__name__ == 'Popen']",
+                          "(lambda: __builtins__)()",
+                          "min.__self__",
+                          "status[0]",
+                          "_hidden > 1"):
+            with self.subTest(condition=condition), self.assertRaises(ValueError):
+                business_rules.compile_rule(rule('R1', condition))
+
+    def test_python_condition_cannot_build_huge_values(self):
+        for condition in ("10 ** 10 ** 10 > 0",
+                          "len('x' * 10000000000) > 0",
+                          "len([0] * 999 * 999 * 999) > 0",
+                          "len(wo_number * 99999) > 0",
+                          "len(wo_number * 100 * 100 * 100) > 0"):
+            with self.subTest(condition=condition), self.assertRaises(ValueError):
+                business_rules.compile_rule(rule('R1', condition))
+        compiled = business_rules.compile_rule(rule('R1', "estimated_hours * 100 * 1.5 > 6000"))
+        self.assertTrue(compiled.predicate({'estimated_hours': 41}))
+
+    def test_python_condition_may_call_safe_builtins(self):
+        compiled = business_rules.compile_rule(
+            rule('R1', "abs(discount_amount or 0) > 10 and len(str(wo_number)) in (10, 12)"))
+        self.assertTrue(compiled.predicate({'discount_amount': Decimal('-20'), 'wo_number': 'WO-0000001'}))
+        self.assertFalse(compiled.predicate({'discount_amount': None, 'wo_number': 'WO-0000001'}))
+
+    def test_regex_condition(self):
+        compiled = business_rules.compile_rule(rule('R1', r'wo_number:^WO-\d{4}$', condition_type='regex'))
+        self.assertTrue(compiled.predicate({'wo_number': 'WO-0007'}))
+        self.assertFalse(compiled.predicate({'wo_number': None}))
+        with self.assertRaises(ValueError):
+            business_rules.compile_rule(rule('R1', 'no column', condition_type='regex'))
+
+    def test_sql_and_auto_correct_are_left_to_the_database(self):
+        with self.assertRaises(ValueError):
+            business_rules.compile_rule(rule('R1', 'NEW.status IS NULL', condition_type='SQL'))
+        with self.assertRaises(ValueError):
+            business_rules.compile_rule(rule('R1', 'True', action='AUTO_CORRECT'))
+
+
+class EvaluateTests(SimpleTestCase):
+
+    def compiled(self, *rules):
+        return [business_rules.compile_rule(r) for r in rules]
+
+    def test_block_raises_violation(self):
+        rules = self.compiled(rule('R1', 'estimated_hours > 10', action='block'))
+        with self.assertRaises(business_rules.BusinessRuleViolation) as raised:
+            business_rules.evaluate(rules, work_order(), 'UPDATE')
+        self.assertEqual(raised.exception.rule_code, 'R1')
+        self.assertEqual(raised.exception.status_code, 400)
+
+    def test_alerts_returned_and_event_filter(self):
+        rules = self.compiled(
+            rule('R1', 'technician_id is None'),
+            rule('R2', 'True', event='insert'),
+            rule('R3', 'estimated_hours > 100'),
+        )
+        alerts = business_rules.evaluate(rules, work_order(), 'UPDATE')
+        self.assertEqual([a.rule_code for a in alerts], ['R1'])
+
+    def test_stop_on_match_and_failing_rule(self):
+        rules = self.compiled(
+            rule('R1', 'missing_column > 1'),
+            rule('R2', 'True', action='log', stop_on_match=True),
+            rule('R3', 'True', action='block'),
+        )
+        with self.assertLogs('core.business_rules', 'INFO') as logs:
+            self.assertEqual(business_rules.evaluate(rules, work_order(), 'INSERT'), [])
+        self.assertIn('R1 failed', logs.output[0])
+        self.assertIn('Business rule R2', logs.output[1])
+
+
+class SnapshotTests(SimpleTestCase):
+
+    def setUp(self):
+        business_rules.invalidate()
+        self.addCleanup(business_rules.invalidate)
+
+    def test_rebuilt_only_when_version_changes(self):
+        built = business_rules.Snapshot(5, {'work_orders': ('compiled',)}, ())
+        with patch.object(business_rules, 'current_version', side_effect=[5, 5, 6]) as version, \
+                patch.object(business_rules, 'build_snapshot', return_value=built) as build, \
+                patch.object(business_rules, 'VERSION_CHECK_INTERVAL', 0):
+            self.assertEqual(business_rules.rules_for(WorkOrder), ('compiled',))
+            business_rules.rules_for(WorkOrder)
+            business_rules.rules_for(WorkOrder)
+        self.assertEqual(version.call_count, 3)
+        self.assertEqual([c.args for c in build.call_args_list], [(5,), (6,)])
+
+    def test_version_checked_once_per_interval(self):
+        built = business_rules.Snapshot(5, {}, ())
+        with patch.object(business_rules, 'current_version', return_value=5) as version, \
+                patch.object(business_rules, 'build_snapshot', return_value=built), \
+                patch.object(business_rules, 'VERSION_CHECK_INTERVAL', 60):
+            for _ in range(3):
+                self.assertEqual(business_rules.rules_for(WorkOrder), ())
+        self.assertEqual(version.call_count, 1)
+
+    def test_rule_signals_are_scoped_to_rule_models(self):
+        for model in business_rules.RULE_MODELS:
+            self.assertTrue(pre_save.has_listeners(model))
+            self.assertTrue(pre_delete.has_listeners(model))
+        self.assertIn('work_orders', business_rules.RULE_TABLES)
+        self.assertFalse(pre_delete.has_listeners(BusinessRule))
+
+    def test_business_rule_model_is_never_checked(self):
+        with patch.object(business_rules, 'get_snapshot') as snapshot:
+            self.assertEqual(business_rules.rules_for(BusinessRule), ())
+        snapshot.assert_not_called()
+
+
+class BusinessRuleSerializerTests(SimpleTestCase):
+
+    def data(self, **overrides):
+        data = {'rule_code': 'r-1', 'rule_name': 'Rule', 'condition_text': 'estimated_hours > 10',
+                'condition_type': 'python', 'action_type': 'block', 'action_text': '-',
+                'applies_to_table': 'work_orders', 'execution_order': 1}
+        data.update(overrides)
+        return data
+
+    def test_python_condition_compiled_on_validation(self):
+        with patch.object(BusinessRule.objects, 'filter') as unique:
+            unique.return_value.exists.return_value = False
+            self.assertTrue(BusinessRuleSerializer(data=self.data()).is_valid())
+            serializer = BusinessRuleSerializer(data=self.data(condition_text='estimated_hours >'))
+            self.assertFalse(serializer.is_valid())
+        self.assertIn('condition_text', serializer.errors)
@@ -0,0 +1,154 @@
+"""
+Tests for conditional GET support (core/conditional.py) and the frontend
+client revalidation.
+"""
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import conditional
+from core.models import Client, Equipment, FuelCode, TaxonomySubsystem, TaxonomySystem
+from core.pagination import KeysetPagination
+from core.serializers import (
+    EquipmentSerializer, FuelCodeSerializer, TaxonomySubsystemListSerializer,
+)
+from frontend.services.api_client import ForgeAPIClient
+
+UPDATED = datetime(2026, 1, 5, 10, 30, tzinfo=timezone.utc)
+
+
+class SerializerModelsTests(SimpleTestCase):
+
+    def test_plain_serializer_is_complete(self):
+        models, complete = conditional.serializer_models(FuelCodeSerializer)
+        self.assertTrue(complete)
+        self.assertEqual(models, {FuelCode})
+
+    def test_method_field_makes_it_incomplete(self):
+        models, complete = conditional.serializer_models(EquipmentSerializer)
+        self.assertFalse(complete)
+        self.assertIn(Equipment, models)
+
+    def test_queryset_annotations_are_known_sources(self):
+        _, without = conditional.serializer_models(TaxonomySubsystemListSerializer)
+        _, with_annotation = conditional.serializer_models(
+            TaxonomySubsystemListSerializer, frozenset({'groups_count'}))
+        self.assertFalse(without)
+        self.assertTrue(with_annotation)
+
+    def test_queryset_models_include_joined_tables(self):
+        queryset = TaxonomySubsystem.objects.select_related('system_code')
+        self.assertEqual(conditional.queryset_models(queryset), {TaxonomySubsystem, TaxonomySystem})
+
+
+class ComputeValidatorsTests(SimpleTestCase):
+
+    def test_counter_tables_give_exact_last_modified(self):
+        with patch.object(conditional, 'table_versions', return_value={FuelCode: (4, UPDATED)}):
+            seed, last_modified = conditional.compute_validators(FuelCode.objects.all())
+        self.assertEqual(seed, 'core.FuelCode:v4')
+        self.assertEqual(last_modified, UPDATED)
+
+    def test_table_without_counter_or_updated_at_disables_validators(self):
+        with patch.object(conditional, 'table_versions', return_value={FuelCode: (4, UPDATED)}), \
+                patch.object(conditional, '_updated_at_field', return_value=None):
+            result = conditional.compute_validators(FuelCode.objects.all(), extra_models=[Client])
+        self.assertEqual(result, (None, None))
+
+
+class FuelCodeTestViewSet(conditional.ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = FuelCode.objects.all()
+    serializer_class = FuelCodeSerializer
+
+    def filter_queryset(self, queryset):
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(request, self.get_queryset(),
+                                 lambda request: Response([{'fuel_code': 'GAS'}]), args, kwargs)
+
+
+class ConditionalGetMixinTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = patch.object(conditional, 'compute_validators', return_value=('core.FuelCode:v4', UPDATED))
+        self.compute_validators = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.factory = APIRequestFactory()
+        self.user = User(pk=1, username='tester')
+        self.view = FuelCodeTestViewSet.as_view({'get': 'list'})
+
+    def get(self, **headers):
+        request = self.factory.get('/api/v1/fuel-codes/', **headers)
+        force_authenticate(request, user=self.user)
+        return self.view(request)
+
+    def test_sets_validators(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertEqual(response['Last-Modified'], 'Mon, 05 Jan 2026 10:30:00 GMT')
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+    def test_matching_etag_returns_304(self):
+        etag = self.get()['ETag']
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_changed_data_returns_200(self):
+        etag = self.get()['ETag']
+        self.compute_validators.return_value = ('core.FuelCode:v5', UPDATED)
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_no_validators_without_seed(self):
+        self.compute_validators.return_value = (None, None)
+        response = self.get(HTTP_IF_NONE_MATCH='"anything"')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_keyset_pagination_validates_only_retrieve(self):
+        self.assertEqual(FuelCodeTestViewSet().get_conditional_actions(), ('list', 'retrieve'))
+        viewset = FuelCodeTestViewSet()
+        viewset.pagination_class = KeysetPagination
+        self.assertEqual(viewset.get_conditional_actions(), ('retrieve',))
+        viewset.conditional_actions = ('list',)
+        self.assertEqual(viewset.get_conditional_actions(), ('list',))
+
+
+class ClientRevalidationTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client_api = ForgeAPIClient.__new__(ForgeAPIClient)
+        self.client_api.base_url = 'http://api.test/api/v1/'
+        self.client_api.timeout = 5
+        self.client_api.max_retries = 3
+        self.client_api.validator_timeout = 60
+        self.client_api.session = Mock()
+        self.client_api._set_auth_headers = Mock()
+
+    def respond(self, status_code, body=b'', headers=None):
+        response = Mock(status_code=status_code, content=body, headers=headers or {}, url='')
+        response.json.return_value = {'results': [1]}
+        return response
+
+    def test_revalidates_and_reuses_body_on_304(self):
+        self.client_api.session.request.side_effect = [
+            self.respond(200, b'{"results": [1]}', {'ETag': '"abc"'}),
+            self.respond(304),
+        ]
+        first = self.client_api._make_request('GET', 'fuel-codes/')
+        second = self.client_api._make_request('GET', 'fuel-codes/')
+
+        self.assertEqual(second, first)
+        headers = self.client_api.session.request.call_args.kwargs['headers']
+        self.assertEqual(headers, {'If-None-Match': '"abc"'})
+        self.assertEqual(self.client_api.session.request.call_count, 2)
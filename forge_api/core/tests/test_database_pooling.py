@@ -0,0 +1,110 @@
+"""
+Tests for the connection pooling helpers in core.database.
+"""
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase
+
+from core.database import (
+    audit_user_wrapper, pool_metrics, reset_current_request, set_current_request,
+)
+from core.views.health_views import _pool_check
+
+
+def make_context(in_atomic_block=True):
+    connection = Mock(in_atomic_block=in_atomic_block, alias='default')
+    return {'connection': connection, 'cursor': Mock()}
+
+
+class AuditUserWrapperTests(SimpleTestCase):
+    """app.user_id is only ever set transaction-locally, and only for writes."""
+
+    def setUp(self):
+        pool_metrics.reset()
+        request = Mock()
+        request.user = Mock(is_authenticated=True, pk=7, _technician_id=42)
+        self.token = set_current_request(request)
+        self.execute = Mock(return_value='done')
+
+    def tearDown(self):
+        reset_current_request(self.token)
+
+    def test_write_sets_user_for_transaction(self):
+        context = make_context()
+        result = audit_user_wrapper(self.execute, 'UPDATE app.clients SET name = %s', ['x'], False, context)
+
+        self.assertEqual(result, 'done')
+        context['cursor'].execute.assert_called_once_with(
+            "SELECT set_config('app.user_id', %s, true)", ['42']
+        )
+        self.execute.assert_called_once()
+        self.assertEqual(pool_metrics.snapshot()['audit_scoped_writes'], 1)
+
+    def test_autocommit_write_is_wrapped_in_transaction(self):
+        context = make_context(in_atomic_block=False)
+        with patch('core.database.transaction.atomic') as atomic:
+            audit_user_wrapper(self.execute, '  insert into app.clients VALUES (1)', None, False, context)
+
+        atomic.assert_called_once_with(using='default')
+        context['cursor'].execute.assert_called_once()
+
+    def test_reads_are_not_touched(self):
+        context = make_context()
+        audit_user_wrapper(self.execute, 'SELECT * FROM app.clients', None, False, context)
+
+        context['cursor'].execute.assert_not_called()
+        self.execute.assert_called_once()
+
+    def test_user_without_technician_does_not_set_user(self):
+        request = Mock()
+        request.user = Mock(is_authenticated=True, pk=7, _technician_id=None)
+        token = set_current_request(request)
+        try:
+            context = make_context()
+            audit_user_wrapper(self.execute, 'UPDATE app.clients SET name = %s', ['x'], False, context)
+        finally:
+            reset_current_request(token)
+
+        context['cursor'].execute.assert_not_called()
+        self.execute.assert_called_once()
+
+    def test_anonymous_request_does_not_set_user(self):
+        request = Mock()
+        request.user = Mock(is_authenticated=False)
+        token = set_current_request(request)
+        try:
+            context = make_context()
+            audit_user_wrapper(self.execute, 'DELETE FROM app.clients', None, False, context)
+        finally:
+            reset_current_request(token)
+
+        context['cursor'].execute.assert_not_called()
+
+
+class PoolHealthCheckTests(SimpleTestCase):
+
+    def _status(self, connections, max_connections=100):
+        return {
+            'pooler': 'pgbouncer',
+            'conn_max_age': 600,
+            'process': {},
+            'server': {
+                'max_connections': max_connections,
+                'connections': connections,
+                'usage_pct': connections * 100.0 / max_connections,
+            },
+        }
+
+    def test_normal_usage_is_healthy(self):
+        with patch('core.views.health_views.get_pool_status', return_value=self._status(20)):
+            self.assertEqual(_pool_check()['status'], 'healthy')
+
+    def test_near_max_connections_is_degraded(self):
+        with patch('core.views.health_views.get_pool_status', return_value=self._status(95)):
+            check = _pool_check()
+        self.assertEqual(check['status'], 'degraded')
+        self.assertEqual(check['message'], '95/100 server connections in use')
+
+    def test_query_failure_is_unhealthy(self):
+        with patch('core.views.health_views.get_pool_status', side_effect=Exception('timeout')):
+            self.assertEqual(_pool_check()['status'], 'unhealthy')
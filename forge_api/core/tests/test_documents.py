@@ -0,0 +1,136 @@
+"""
+Tests for cached quote/invoice PDF rendering and zip batches.
+"""
+import zipfile
+from unittest.mock import Mock, patch
+
+from django.core.cache import caches
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from frontend.services.api_client import ForgeAPIClient
+from frontend.services.document_renderer import APIDocumentSource, DocumentRenderer
+from frontend.views.document_views import DocumentBatchPDFView
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'documents-tests'}}
+
+
+def make_quote(lines=3, quote_id=1, updated_at='2026-01-01T10:00:00Z'):
+    return {
+        'quote_id': quote_id,
+        'quote_number': f'COT-{quote_id:05d}',
+        'quote_date': '2026-01-01',
+        'valid_until': '2026-01-31',
+        'updated_at': updated_at,
+        'client': {'name': 'Cliente', 'address': 'Calle 1', 'phone': '555', 'email': 'c@example.com'},
+        'items': [
+            {'description': f'Servicio {i}', 'hours': '1.50', 'hourly_rate': '500.00',
+             'quantity': 1, 'line_total': '750.00'}
+            for i in range(lines)
+        ],
+        'subtotal': '2250.00', 'tax_amount': '360.00', 'total': '2610.00',
+    }
+
+
+def make_invoice(invoice_id=7, updated_at='2026-01-02T10:00:00Z'):
+    return {
+        'invoice_id': invoice_id,
+        'invoice_number': f'FAC-{invoice_id:05d}',
+        'issue_date': '2026-01-02',
+        'due_date': '2026-02-01',
+        'status': 'sent',
+        'updated_at': updated_at,
+        'client': {'name': 'Cliente'},
+        'items': [{'description': 'Filtro', 'quantity': '2', 'unit_price': '100.00', 'discount_pct': '0'}],
+        'subtotal': '200.00', 'tax_amount': '32.00', 'total_amount': '232.00', 'balance_due': '232.00',
+    }
+
+
+@override_settings(CACHES=LOCMEM)
+class DocumentRendererTests(SimpleTestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.renderer = DocumentRenderer()
+
+    def test_renders_long_quote(self):
+        pdf = self.renderer.render('quote', make_quote(lines=500))
+        self.assertTrue(pdf.startswith(b'%PDF'))
+
+    def test_renders_invoice(self):
+        pdf = self.renderer.render('invoice', make_invoice())
+        self.assertTrue(pdf.startswith(b'%PDF'))
+
+    def test_cache_key_follows_the_rendered_data(self):
+        first = DocumentRenderer.cache_key('quote', make_quote())
+        self.assertEqual(first, DocumentRenderer.cache_key('quote', make_quote()))
+        self.assertNotEqual(first, DocumentRenderer.cache_key('quote', make_quote(updated_at='2026-01-05T00:00:00Z')))
+        edited_item = make_quote()
+        edited_item['items'][1]['hours'] = '2.00'
+        self.assertNotEqual(first, DocumentRenderer.cache_key('quote', edited_item))
+        renamed_client = make_quote()
+        renamed_client['client']['name'] = 'Cliente Nuevo'
+        self.assertNotEqual(first, DocumentRenderer.cache_key('quote', renamed_client))
+        self.assertIsNone(DocumentRenderer.cache_key('quote', dict(make_quote(), quote_id=None)))
+
+    def test_cache_hit_skips_rendering(self):
+        with patch.object(DocumentRenderer.generator('quote'), 'generate_pdf',
+                          wraps=DocumentRenderer.generator('quote').generate_pdf) as generate:
+            first = self.renderer.render('quote', make_quote(), Mock())
+            second = self.renderer.render('quote', make_quote(), Mock())
+        self.assertEqual(first, second)
+        generate.assert_called_once()
+
+    def test_completed_data_is_part_of_the_key(self):
+        """An invoice item edited after the PDF was cached does not bump the invoice's updated_at."""
+        quantities = ['2', '3']
+        source = Mock()
+        source.complete.side_effect = lambda kind, document: document['items'][0].update(quantity=quantities.pop(0))
+        with patch.object(DocumentRenderer.generator('invoice'), 'generate_pdf',
+                          wraps=DocumentRenderer.generator('invoice').generate_pdf) as generate:
+            self.renderer.render('invoice', make_invoice(), source)
+            self.renderer.render('invoice', make_invoice(), source)
+        self.assertEqual(generate.call_count, 2)
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            DocumentRenderer.generator('order')
+
+    def test_render_zip(self):
+        source = Mock()
+        source.get.side_effect = lambda kind, doc_id: make_quote(quote_id=doc_id)
+        archive = self.renderer.render_zip('quote', [1, 2, 3], source)
+        with zipfile.ZipFile(archive) as zf:
+            self.assertEqual(zf.namelist(), [f'cotizacion_COT-0000{i}.pdf' for i in (1, 2, 3)])
+
+    def test_render_zip_limit(self):
+        with self.assertRaises(ValueError):
+            self.renderer.render_zip('quote', [1, 2, 3], Mock(), limit=2)
+
+
+class APIDocumentSourceTests(SimpleTestCase):
+
+    def test_invoice_items_follow_pages(self):
+        client = ForgeAPIClient.__new__(ForgeAPIClient)
+        client.get = Mock(side_effect=[
+            {'results': [{'invoice_item_id': 1}], 'next': 'page=2'},
+            {'results': [{'invoice_item_id': 2}], 'next': None},
+        ])
+        invoice = {'invoice_id': 7}
+        APIDocumentSource(client).complete('invoice', invoice)
+        self.assertEqual([item['invoice_item_id'] for item in invoice['items']], [1, 2])
+        self.assertEqual(client.get.call_args_list[1].kwargs['params'], {'invoice': 7, 'page': 2})
+
+
+class DocumentBatchViewTests(SimpleTestCase):
+
+    def post(self, kind, data):
+        request = RequestFactory().post('/', data)
+        request.user = Mock(is_authenticated=True)
+        return DocumentBatchPDFView.as_view()(request, kind=kind)
+
+    def test_rejects_unknown_kind(self):
+        self.assertEqual(self.post('order', {'ids': '1'}).status_code, 404)
+
+    def test_rejects_missing_or_invalid_ids(self):
+        self.assertEqual(self.post('quote', {}).status_code, 400)
+        self.assertEqual(self.post('quote', {'ids': '1,x'}).status_code, 400)
@@ -0,0 +1,123 @@
+"""
+Tests for per-client/technician/equipment work order stats.
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.entity_stats import annotate_client_summary, stats_queryset, summarize, work_order_stats
+from core.models import Client
+from core.views.client_views import ClientViewSet
+from frontend.mixins import APIClientMixin
+from frontend.services.api_client import APIException
+
+NOW = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+def row(status, count, invoiced=None, last_service=None, hours=None, cycles=0):
+    return {
+        'status': status, 'count': count, 'invoiced': invoiced, 'last_service': last_service,
+        'cycle_total': timedelta(hours=hours) if hours is not None else None, 'cycle_count': cycles,
+    }
+
+
+class SummarizeTests(SimpleTestCase):
+
+    def test_folds_status_rows(self):
+        stats = summarize([
+            row('COMPLETED', 3, Decimal('300.00'), NOW - timedelta(days=2), hours=30, cycles=3),
+            row('INVOICED', 1, Decimal('50.50'), NOW, hours=2, cycles=1),
+            row('IN_PROGRESS', 2),
+            row('CANCELLED', 1, last_service=NOW + timedelta(days=1), hours=100, cycles=1),
+            row(None, 1),
+        ])
+        self.assertEqual(stats['total'], 8)
+        self.assertEqual(stats['by_status']['COMPLETED'], 3)
+        self.assertEqual(stats['by_status']['DRAFT'], 0)
+        self.assertEqual(stats['completed'], 4)
+        self.assertEqual(stats['open'], 3)
+        self.assertEqual(stats['completion_rate'], 50.0)
+        self.assertEqual(stats['total_invoiced'], Decimal('350.50'))
+        # Cancelled work orders are not services
+        self.assertEqual(stats['last_service_date'], NOW)
+        self.assertEqual(stats['avg_cycle_hours'], 8.0)
+
+    def test_empty(self):
+        stats = summarize([])
+        self.assertEqual((stats['total'], stats['completion_rate']), (0, 0))
+        self.assertEqual(stats['total_invoiced'], Decimal('0.00'))
+        self.assertIsNone(stats['avg_cycle_hours'])
+
+
+class StatsQueryTests(SimpleTestCase):
+
+    def test_single_grouped_query_on_entity_column(self):
+        for entity, column in [('client', 'client_id'), ('technician', 'technician_id'), ('equipment', 'equipment_id')]:
+            sql = str(stats_queryset(entity, 7).query)
+            self.assertIn(f'"work_orders"."{column}" = 7', sql)
+            self.assertTrue(sql.endswith('GROUP BY "work_orders"."status"'))
+            self.assertIn('FROM "invoices"', sql)
+
+    def test_unknown_entity(self):
+        with self.assertRaises(ValueError):
+            work_order_stats('warehouse', 1)
+
+    def test_client_summary_annotations(self):
+        queryset = annotate_client_summary(Client.objects.all())
+        self.assertTrue({'equipment_count', 'open_work_orders', 'last_service_date'} <= set(queryset.query.annotations))
+
+    def test_client_summary_endpoint_serializes_the_annotations(self):
+        client = Client(client_id=7, client_code='CL-7', name='Transportes Uno', type='company',
+                        email='flota@example.com', phone='555', status='active')
+        client.equipment_count, client.open_work_orders, client.last_service_date = 4, 2, NOW
+        pages = []
+
+        def paginate(view, queryset):
+            pages.append(queryset)
+            return [client]
+
+        request = APIRequestFactory().get('/api/v1/clients/summary/')
+        force_authenticate(request, user=User(pk=1, username='tester'))
+        with patch.object(ClientViewSet, 'paginate_queryset', paginate), \
+                patch.object(ClientViewSet, 'get_paginated_response', lambda view, data: Response(data)):
+            response = ClientViewSet.as_view({'get': 'summary'})(request)
+
+        self.assertEqual(response.status_code, 200)
+        [queryset] = pages
+        self.assertTrue({'equipment_count', 'open_work_orders', 'last_service_date'} <= set(queryset.query.annotations))
+        [data] = response.data
+        self.assertEqual((data['client_code'], data['equipment_count'], data['open_work_orders']), ('CL-7', 4, 2))
+        self.assertEqual(data['last_service_date'], '2026-03-01T06:00:00-06:00')  # TIME_ZONE is America/Mexico_City
+
+    def test_stats_routes(self):
+        self.assertEqual(reverse('core:client-stats', args=[1]), '/api/v1/clients/1/stats/')
+        self.assertEqual(reverse('core:client-summary'), '/api/v1/clients/summary/')
+        self.assertEqual(reverse('core:technician-stats', args=[1]), '/api/v1/technicians/1/stats/')
+        self.assertEqual(reverse('core:equipment-stats', args=[1]), '/api/v1/equipment/1/stats/')
+
+
+class FrontendStatsTests(SimpleTestCase):
+
+    def test_maps_api_stats(self):
+        api_client = Mock()
+        api_client.get_work_order_stats.return_value = {
+            'total': 10, 'completed': 4, 'open': 5, 'completion_rate': 40.0,
+            'by_status': {'IN_PROGRESS': 2, 'DRAFT': 3}, 'total_invoiced': '100.00',
+            'last_service_date': '2026-03-01T12:00:00Z', 'avg_cycle_hours': 6.5,
+        }
+        stats = APIClientMixin().get_workorder_stats(api_client, 'client', 3)
+        api_client.get_work_order_stats.assert_called_once_with('client', 3)
+        self.assertEqual((stats['in_progress'], stats['pending']), (2, 3))
+        self.assertEqual(stats['last_service_date'], NOW)
+
+    def test_api_error_gives_empty_stats(self):
+        api_client = Mock()
+        api_client.get_work_order_stats.side_effect = APIException("boom", status_code=500)
+        stats = APIClientMixin().get_workorder_stats(api_client, 'equipment', 3)
+        self.assertEqual(stats['total'], 0)
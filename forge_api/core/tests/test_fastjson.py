@@ -0,0 +1,122 @@
+"""
+Tests for the orjson-backed JSON encoding (core/fastjson.py) and the DRF
+renderer/parser built on it (core/renderers.py).
+"""
+import enum
+import io
+import unittest
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from django.db import models
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core import fastjson
+from core.renderers import ORJSONParser, ORJSONRenderer
+from frontend.services.api_client import LogBody
+
+
+class RendererParityTests(SimpleTestCase):
+    """ORJSONRenderer must produce exactly what DRF's JSONRenderer does."""
+
+    def assertSameOutput(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_scalars_and_containers(self):
+        self.assertSameOutput({'a': [1, 2.5, None, True, 'ñandú'], 'b': {'c': ''}, 'd': []})
+
+    def test_datetimes(self):
+        self.assertSameOutput({
+            'utc': datetime(2026, 3, 1, 12, 30, 5, 123456, tzinfo=timezone.utc),
+            'offset': datetime(2026, 3, 1, 12, 30, tzinfo=timezone(timedelta(hours=-6))),
+            'naive': datetime(2026, 3, 1, 12, 30, 5),
+            'date': date(2026, 3, 1),
+            'time': time(8, 15),
+        })
+
+    def test_decimal_uuid_and_lazy_strings(self):
+        self.assertSameOutput({
+            'price': Decimal('899.00'),
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'label': gettext_lazy('Active'),
+            'delta': timedelta(hours=1, minutes=30),
+        })
+
+    def test_line_separators_are_escaped(self):
+        self.assertSameOutput({'note': 'l\u00ednea\u2028otra\u2029fin'})
+
+    def test_integer_wider_than_64_bits(self):
+        self.assertSameOutput({'big': 2 ** 70})
+
+    def test_non_string_keys(self):
+        self.assertEqual(fastjson.loads(ORJSONRenderer().render({1: 'a'})), {'1': 'a'})
+
+    def test_choices_enums(self):
+        class Priority(models.TextChoices):
+            HIGH = 'HIGH', 'Alta'
+
+        class Level(models.IntegerChoices):
+            ONE = 1, 'Uno'
+
+        self.assertSameOutput({'priority': Priority.HIGH, 'level': Level.ONE})
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_indent_uses_stock_renderer(self):
+        data = {'a': [1, 2]}
+        media_type = 'application/json; indent=2'
+        self.assertEqual(ORJSONRenderer().render(data, media_type),
+                         JSONRenderer().render(data, media_type))
+
+
+
+@unittest.skipUnless(fastjson.ORJSON_AVAILABLE, "orjson not installed")
+class DocumentedDivergenceTests(SimpleTestCase):
+    """Inputs DRF rejects and orjson encodes (see core/fastjson.py)."""
+
+    def test_non_finite_floats_become_null(self):
+        self.assertEqual(fastjson.dumps([float('nan'), float('inf'), -float('inf')]), b'[null,null,null]')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render([float('nan')])
+
+    def test_plain_enum_becomes_its_value(self):
+        class Color(enum.Enum):
+            RED = 'red'
+
+        self.assertEqual(fastjson.dumps({'color': Color.RED}), b'{"color":"red"}')
+        with self.assertRaises(TypeError):
+            JSONRenderer().render({'color': Color.RED})
+
+class ParserTests(SimpleTestCase):
+
+    def parse(self, body):
+        return ORJSONParser().parse(io.BytesIO(body), 'application/json', {})
+
+    def test_parses_like_stock_parser(self):
+        body = '{"name": "Balata", "qty": 3, "price": 1.5, "tags": ["ñ"]}'.encode()
+        self.assertEqual(self.parse(body),
+                         JSONParser().parse(io.BytesIO(body), 'application/json', {}))
+
+    def test_invalid_body_is_parse_error(self):
+        with self.assertRaises(ParseError):
+            self.parse(b'{"name": ')
+
+    def test_nan_is_rejected(self):
+        with self.assertRaises(ParseError):
+            self.parse(b'{"qty": NaN}')
+
+
+class LogBodyTests(SimpleTestCase):
+
+    def test_short_body_is_logged_whole(self):
+        self.assertEqual(str(LogBody({'a': 1})), '{"a":1}')
+
+    def test_long_body_is_cut(self):
+        text = str(LogBody(b'x' * 50, limit=10))
+        self.assertEqual(text, 'x' * 10 + '... (50 bytes)')
@@ -0,0 +1,107 @@
+"""
+Tests for sparse fieldsets (core/fieldsets.py): ?fields= / ?omit= pruning
+of serializers and querysets.
+"""
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from core.fieldsets import prune_queryset, read_paths, selected_fields
+from core.models import Stock, WorkOrder
+from core.serializers import (
+    ClientDetailSerializer, ClientSerializer, StockSerializer, TaxonomyGroupListSerializer,
+)
+from core.views import ClientViewSet, TaxonomyGroupViewSet
+
+
+def api_request(**params):
+    return Request(RequestFactory().get('/api/v1/clients/', params))
+
+
+def select_sql(queryset):
+    return str(queryset.query).split(' WHERE ')[0]
+
+
+class SelectedFieldsTests(SimpleTestCase):
+    available = ['client_id', 'name', 'email', 'notes']
+
+    def test_no_params_keeps_everything(self):
+        self.assertIsNone(selected_fields(api_request(), self.available))
+
+    def test_fields_and_omit(self):
+        self.assertEqual(selected_fields(api_request(fields='name, client_id'), self.available),
+                         ['client_id', 'name'])
+        self.assertEqual(selected_fields(api_request(omit='notes'), self.available),
+                         ['client_id', 'name', 'email'])
+        self.assertEqual(selected_fields(api_request(fields='name,notes', omit='notes'), self.available),
+                         ['name'])
+
+    def test_unknown_or_empty_selection_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            selected_fields(api_request(fields='name,nope'), self.available)
+        with self.assertRaises(ValidationError):
+            selected_fields(api_request(fields='name', omit='name'), self.available)
+
+
+class ReadPathsTests(SimpleTestCase):
+
+    def test_declared_property_sources(self):
+        serializer = ClientSerializer()
+        for name in list(serializer.fields):
+            if name not in ('name', 'available_credit'):
+                del serializer.fields[name]
+        self.assertEqual(read_paths(serializer), {'name', 'credit_limit', 'credit_used'})
+
+    def test_undeclared_method_field_is_unknown(self):
+        self.assertIsNone(read_paths(ClientDetailSerializer()))
+
+    def test_dotted_source_crosses_relation(self):
+        paths = read_paths(TaxonomyGroupListSerializer())
+        self.assertIn('system_code__name_es', paths)
+        self.assertNotIn('description', paths)
+
+
+class PruneQuerysetTests(SimpleTestCase):
+
+    def test_unread_columns_and_joins_are_dropped(self):
+        queryset = Stock.objects.select_related('warehouse', 'product').order_by('-updated_at')
+        sql = select_sql(prune_queryset(queryset, {'qty_on_hand'}))
+        self.assertNotIn('JOIN', sql)
+        self.assertIn('"stock"."qty_on_hand"', sql)
+        self.assertIn('"stock"."updated_at"', sql)  # ordering column stays
+        self.assertNotIn('"stock"."notes"', sql)
+
+    def test_join_kept_when_read(self):
+        queryset = Stock.objects.select_related('warehouse', 'product').order_by('-updated_at')
+        paths = read_paths(StockSerializer())
+        sql = select_sql(prune_queryset(queryset, paths))
+        self.assertIn('JOIN', sql)
+
+    def test_unused_prefetch_is_dropped(self):
+        queryset = WorkOrder.objects.prefetch_related('invoiceitem_set', 'transaction_set')
+        pruned = prune_queryset(queryset, {'wo_number', 'client_id'})
+        self.assertEqual(pruned._prefetch_related_lookups, ())
+        self.assertIn('"work_orders"."client_id"', select_sql(pruned))
+
+
+class SparseFieldsetMixinTests(SimpleTestCase):
+
+    def view(self, view_class, action, **params):
+        view = view_class()
+        view.request, view.action, view.format_kwarg, view.kwargs = api_request(**params), action, None, {}
+        return view
+
+    def test_list_serializer_is_pruned(self):
+        serializer = self.view(ClientViewSet, 'list', fields='client_id,name').get_serializer([], many=True)
+        self.assertEqual(list(serializer.child.fields), ['client_id', 'name'])
+
+    def test_write_actions_keep_every_field(self):
+        serializer = self.view(ClientViewSet, 'create', fields='name').get_serializer()
+        self.assertIn('email', serializer.fields)
+
+    def test_lightweight_list_serializer_defers_unread_columns(self):
+        view = self.view(TaxonomyGroupViewSet, 'list')
+        view.filter_backends = []
+        sql = select_sql(view.filter_queryset(view.get_queryset()))
+        self.assertIn('"taxonomy_groups"."name_es"', sql)
+        self.assertNotIn('"taxonomy_groups"."keywords"', sql)
@@ -0,0 +1,159 @@
+"""
+Tests for the batch demand forecast (core/forecasting.py) and the endpoint
+that reads it.
+"""
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import forecasting
+from core.views.analytics_stored_procedures_views import demand_forecasting
+
+
+def mock_connection(rows):
+    cursor = Mock()
+    cursor.fetchall.return_value = rows
+    connection = Mock()
+    connection.cursor.return_value.__enter__ = Mock(return_value=cursor)
+    connection.cursor.return_value.__exit__ = Mock(return_value=False)
+    return connection, cursor
+
+
+def matrix(rows, first_month=2024 * 12):
+    values = np.array(rows, dtype=float)
+    skus = np.array([f'SKU{i}' for i in range(len(values))], dtype=object)
+    return forecasting.DemandMatrix(skus, first_month, values)
+
+
+class LoadDemandTests(SimpleTestCase):
+
+    def test_one_grouped_query_into_a_dense_matrix(self):
+        connection, cursor = mock_connection([('B', 0, Decimal('4')), ('A', 2, Decimal('5')), ('B', 2, Decimal('1'))])
+        with patch.object(forecasting, 'connection', connection):
+            demand = forecasting.load_demand(3, end=date(2026, 10, 19))
+        cursor.execute.assert_called_once()
+        sql, params = cursor.execute.call_args[0]
+        self.assertIn("txn_type = 'OUT'", sql)
+        self.assertIn('GROUP BY', sql)
+        self.assertEqual(params[1:], [date(2026, 7, 1), date(2026, 10, 1)])
+        self.assertEqual(list(demand.skus), ['A', 'B'])
+        self.assertEqual(demand.values.tolist(), [[0, 0, 5], [4, 0, 1]])
+        self.assertEqual(forecasting.month_from_index(demand.first_month), date(2026, 7, 1))
+
+    def test_no_demand(self):
+        demand = forecasting.build_matrix([], 2026 * 12, 36)
+        self.assertEqual(demand.values.shape, (0, 36))
+
+
+class ModelTests(SimpleTestCase):
+
+    def test_ses_of_constant_demand(self):
+        values = np.full((2, 12), 10.0)
+        level, rmse = forecasting.ses(values, np.zeros(2, dtype=int))
+        self.assertEqual(level.tolist(), [10.0, 10.0])
+        self.assertEqual(rmse.tolist(), [0.0, 0.0])
+
+    def test_months_before_first_sale_are_ignored(self):
+        values = np.array([[0, 0, 0, 0, 10, 10, 10, 10.0]])
+        start = forecasting._history_start(values)
+        self.assertEqual(start.tolist(), [4])
+        level, rmse = forecasting.ses(values, start)
+        self.assertEqual(level.tolist(), [10.0])
+        adi, _ = forecasting.classify(values, start)
+        self.assertEqual(adi.tolist(), [1.0])
+
+    def test_tsb_decays_after_demand_stops(self):
+        values = np.array([[6, 0, 6, 0, 6, 0, 0, 0, 0, 0, 0, 0.0]])
+        start = np.zeros(1, dtype=int)
+        forecast, _ = forecasting.tsb(values, start)
+        still, _ = forecasting.tsb(values[:, :6], start)
+        self.assertLess(forecast[0], still[0])
+        self.assertGreater(forecast[0], 0)
+
+    def test_seasonal_indices_average_one(self):
+        months = np.arange(36)
+        values = (20 + 10 * np.sin(2 * np.pi * months / 12))[None, :]
+        indices = forecasting.seasonal_indices(values, np.zeros(1, dtype=int), 2024 * 12)
+        self.assertAlmostEqual(indices.mean(), 1.0)
+        self.assertGreater(indices[0, 3], 1.4)
+        self.assertLess(indices[0, 9], 0.6)
+
+
+class ForecastTests(SimpleTestCase):
+
+    def test_method_per_demand_pattern(self):
+        months = np.arange(36)
+        result = forecasting.forecast(matrix([
+            np.full(36, 15.0),
+            20 + 10 * np.sin(2 * np.pi * months / 12),
+            np.where(months % 4 == 0, 8.0, 0.0),
+        ]), horizon=3)
+        self.assertEqual(result.method.tolist(), ['ses', 'seasonal', 'tsb'])
+        self.assertEqual(result.pattern.tolist(), ['smooth', 'smooth', 'intermittent'])
+        self.assertEqual(result.mean.shape, (3, 3))
+        np.testing.assert_allclose(result.mean[0], 15.0)
+        # next months are January-March, around the seasonal peak in April
+        self.assertTrue((result.mean[1] > 20).all())
+        self.assertAlmostEqual(result.mean[2, 0], 2.0, delta=0.5)
+        self.assertTrue((np.diff(result.std, axis=1) >= 0).all())
+
+    def test_short_history_is_not_seasonal(self):
+        months = np.arange(18)
+        result = forecasting.forecast(matrix([20 + 10 * np.sin(2 * np.pi * months / 12)]))
+        self.assertEqual(result.method.tolist(), ['ses'])
+
+    def test_save_replaces_the_table_with_one_copy(self):
+        demand = matrix([[1, 2, 3.0]], first_month=2026 * 12 + 6)
+        result = forecasting.forecast(demand, horizon=2)
+        connection, cursor = mock_connection([])
+        with patch.object(forecasting, 'connection', connection), patch.object(forecasting, 'transaction'):
+            forecasting.save_forecasts(demand, result)
+        statements = [call[0][0] for call in cursor.execute.call_args_list]
+        self.assertEqual(statements, ['DELETE FROM kpi.demand_forecasts'])
+        cursor.copy_expert.assert_called_once()
+        lines = cursor.copy_expert.call_args[0][1].getvalue().splitlines()
+        self.assertEqual([line.split('\t')[4] for line in lines], ['2026-10-01', '2026-11-01'])
+
+
+class DemandForecastViewTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User(pk=1, username='tester', is_staff=True, is_superuser=True)
+
+    def get(self, **params):
+        request = self.factory.get('/api/v1/analytics/demand-forecast/', params)
+        force_authenticate(request, user=self.user)
+        return demand_forecasting(request)
+
+    def row(self, sku, demand, std, available):
+        return {'internal_sku': sku, 'product_name': sku, 'date_start': date(2026, 10, 1),
+                'date_end': date(2026, 12, 1), 'demand': Decimal(demand), 'std': Decimal(std),
+                'method': 'ses', 'pattern': 'smooth', 'historical_avg': Decimal('10'),
+                'generated_at': None, 'available': available}
+
+    def test_reorder_recommendation(self):
+        rows = [self.row('A', '100', '10', 90), self.row('B', '100', '10', 105), self.row('C', '100', '10', 120)]
+        with patch.object(forecasting, 'read_forecasts', return_value=rows) as read:
+            response = self.get(confidence_level='0.9', product_category='BN01-01-001')
+        read.assert_called_once_with(3, group_code='BN01-01-001', sku=None, limit=100)
+        self.assertEqual([r['reorder_recommendation'] for r in response.data], ['YES', 'CONSIDER', 'NO'])
+        self.assertEqual(response.data[0]['upper_bound'], 116.45)
+        self.assertEqual(response.data[0]['lower_bound'], 83.55)
+
+    def test_reorder_point_is_one_sided(self):
+        # Between the reorder point (one-sided 90 %) and the upper bound (two-sided 90 %).
+        with patch.object(forecasting, 'read_forecasts', return_value=[self.row('A', '100', '10', 115)]):
+            result, = self.get(confidence_level='0.9').data
+        self.assertEqual((result['reorder_point'], result['upper_bound']), (112.82, 116.45))
+        self.assertEqual(result['reorder_recommendation'], 'NO')
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.get(forecast_horizon_months='12').status_code, 400)
+        self.assertEqual(self.get(confidence_level='1.5').status_code, 400)
+        self.assertEqual(self.get(limit='many').status_code, 400)
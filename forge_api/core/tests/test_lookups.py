@@ -0,0 +1,95 @@
+"""
+Tests for the (id, label) lookups used by remote select widgets.
+"""
+import base64
+from unittest.mock import Mock, patch
+
+from django import forms
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import lookups
+from core.views.lookup_views import LookupView
+from frontend.forms.widgets import RemoteSelect, load_remote_selection
+from frontend.services.api_client import APIException
+
+
+class CursorTests(SimpleTestCase):
+
+    def test_round_trip(self):
+        cursor = lookups.encode_cursor('AGRÍCOLA CRUZ', 853)
+        self.assertEqual(lookups.decode_cursor(cursor), ('AGRÍCOLA CRUZ', 853))
+
+    def test_malformed_cursor(self):
+        malformed_tuples = [base64.urlsafe_b64encode(raw).decode()
+                            for raw in (b'["A",1,2]', b'["A"]', b'{"A":1}', b'7')]
+        for cursor in ('not-base64!', lookups.encode_cursor(1, 2)[:-4], 'WzEsMl0=', *malformed_tuples):
+            with self.assertRaises(lookups.InvalidLookup):
+                lookups.decode_cursor(cursor)
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(lookups._parse_limit(None), lookups.DEFAULT_LIMIT)
+        self.assertEqual(lookups._parse_limit('500'), lookups.MAX_LIMIT)
+        self.assertEqual(lookups._parse_limit('0'), 1)
+        with self.assertRaises(lookups.InvalidLookup):
+            lookups._parse_limit('abc')
+
+    def test_label_skips_nulls(self):
+        row = {'equipment_code': 'EQ-1', 'brand': 'Ford', 'model': None}
+        self.assertEqual(lookups._label(lookups.LOOKUPS['equipment'], row), 'EQ-1 - Ford')
+
+
+class LookupViewTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User(pk=1, username='tester')
+
+    def get(self, kind, **params):
+        request = self.factory.get(f'/api/v1/lookups/{kind}/', params)
+        force_authenticate(request, user=self.user)
+        return LookupView.as_view()(request, kind=kind)
+
+    def test_passes_filters_and_cursor(self):
+        page = {'results': [{'id': 1, 'label': 'EQ-1 - Ford Ranger'}], 'next': None}
+        with patch.object(lookups, 'search', return_value=page) as search:
+            response = self.get('equipment', q='eq', after='abc', client_id='7')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, page)
+        search.assert_called_once_with('equipment', q='eq', after='abc', limit=None,
+                                       filters={'client_id': '7'})
+
+    def test_unknown_kind_is_404(self):
+        self.assertEqual(self.get('invoices').status_code, 404)
+
+    def test_invalid_parameter_is_400(self):
+        self.assertEqual(self.get('clients', after='bogus!').status_code, 400)
+
+    def test_non_integer_ids_are_400(self):
+        self.assertEqual(self.get('clients', ids='7,abc').status_code, 400)
+        self.assertEqual(self.get('clients', after=lookups.encode_cursor('ACME', 'abc')).status_code, 400)
+
+
+class RemoteSelectTests(SimpleTestCase):
+
+    class Form(forms.Form):
+        client_id = forms.IntegerField(widget=RemoteSelect('clients', empty_label='Seleccione'))
+
+    def test_renders_only_selected_option(self):
+        api_client = Mock()
+        api_client.lookup_labels.return_value = [{'id': 5, 'label': 'Acme (C-5)'}]
+        form = self.Form(initial={'client_id': 5})
+        load_remote_selection(form, 'client_id', api_client)
+
+        html = str(form['client_id'])
+        self.assertIn('data-remote-select="/api/lookups/clients/"', html)
+        self.assertIn('<option value="5" selected>Acme (C-5)</option>', html)
+        api_client.lookup_labels.assert_called_once_with('clients', [5])
+
+    def test_keeps_value_when_label_lookup_fails(self):
+        api_client = Mock()
+        api_client.lookup_labels.side_effect = APIException('down', 503)
+        form = self.Form({'client_id': '9'})
+        load_remote_selection(form, 'client_id', api_client)
+        self.assertEqual(form.fields['client_id'].widget.choices, [('', 'Seleccione'), ('9', '9')])
@@ -0,0 +1,85 @@
+"""
+Tests for the Prometheus metrics endpoint and instrumentation.
+"""
+from unittest.mock import Mock, patch
+
+from django.core.cache import caches
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from prometheus_client import REGISTRY
+
+from core.metrics import DatabaseCollector, callproc, track_sse_stream
+from core.views.health_views import MetricsView
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class InstrumentationTests(SimpleTestCase):
+
+    def test_cache_hits_and_misses_are_counted_per_alias(self):
+        cache = caches['api_responses']
+        cache.clear()
+        hits = sample('forge_cache_lookups_total', alias='api_responses', result='hit')
+        misses = sample('forge_cache_lookups_total', alias='api_responses', result='miss')
+
+        cache.set('k', 'v')
+        self.assertEqual(cache.get('k'), 'v')
+        self.assertIsNone(cache.get('missing'))
+        self.assertEqual(cache.get_many(['k', 'other']), {'k': 'v'})
+
+        self.assertEqual(sample('forge_cache_lookups_total', alias='api_responses', result='hit'), hits + 2)
+        self.assertEqual(sample('forge_cache_lookups_total', alias='api_responses', result='miss'), misses + 2)
+
+    def test_stored_procedure_duration_recorded_with_outcome(self):
+        name = 'inv.test_procedure'
+        cursor = Mock()
+        callproc(cursor, name, [1])
+        cursor.callproc.side_effect = RuntimeError('boom')
+        with self.assertRaises(RuntimeError):
+            callproc(cursor, name, [1])
+
+        self.assertEqual(sample('forge_stored_procedure_duration_seconds_count', procedure=name, outcome='ok'), 1)
+        self.assertEqual(sample('forge_stored_procedure_duration_seconds_count', procedure=name, outcome='error'), 1)
+
+    def test_sse_gauge_tracks_open_streams(self):
+        with track_sse_stream('test_stream'):
+            self.assertEqual(sample('forge_sse_connections', stream='test_stream'), 1)
+        self.assertEqual(sample('forge_sse_connections', stream='test_stream'), 0)
+
+    def test_database_collector_caches_reads(self):
+        status = {'server': {'max_connections': 100, 'active': 1, 'idle': 2,
+                             'idle_in_transaction': 0, 'usage_pct': 3.0}}
+        collector = DatabaseCollector(ttl=60)
+        with patch('core.metrics.get_pool_status', return_value=status) as pool, \
+                patch('core.metrics.get_matview_staleness', return_value={'kpi.monthly_trends': 120.0}):
+            first = {m.name: m for m in collector.collect()}
+            list(collector.collect())
+
+        self.assertEqual(pool.call_count, 1)
+        self.assertEqual(first['forge_db_up'].samples[0].value, 1)
+        self.assertEqual(first['forge_materialized_view_staleness_seconds'].samples[0].value, 120.0)
+
+
+class MetricsViewTests(SimpleTestCase):
+
+    @override_settings(DEBUG=True, METRICS_TOKEN='')
+    def test_exposition_format(self):
+        response = MetricsView.as_view()(RequestFactory().get('/metrics'))
+        body = response.content.decode()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn('forge_http_request_duration_seconds', body)
+        self.assertIn('forge_db_up', body)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token_required_when_configured(self):
+        factory = RequestFactory()
+        self.assertEqual(MetricsView.as_view()(factory.get('/metrics')).status_code, 401)
+        response = MetricsView.as_view()(factory.get('/metrics', HTTP_AUTHORIZATION='Bearer secret'))
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(DEBUG=False, METRICS_TOKEN='')
+    def test_forbidden_without_token_in_production(self):
+        self.assertEqual(MetricsView.as_view()(RequestFactory().get('/metrics')).status_code, 403)
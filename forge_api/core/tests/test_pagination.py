@@ -0,0 +1,182 @@
+"""
+Tests for keyset pagination (core/pagination.KeysetPagination) and the
+frontend cursor navigation.
+"""
+import base64
+import json
+from datetime import datetime, timezone
+from unittest.mock import Mock
+from urllib.parse import parse_qs, urlparse
+
+from django.template import Context
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+
+from core.models import Client, Equipment, Stock
+from core.pagination import KeysetPagination, _after, _cursor_value
+from core.views import ClientViewSet, EquipmentViewSet
+from frontend.mixins import CursorPaginationMixin
+from frontend.templatetags.navigation_tags import render_cursor_pagination
+
+
+def api_request(path='/api/v1/clients/', **params):
+    return Request(RequestFactory().get(path, params))
+
+
+def where(model, terms, values):
+    queryset = model.objects.filter(_after(terms, values, model)).order_by()
+    sql, params = queryset.query.sql_with_params()
+    return sql.split(' WHERE ', 1)[1].replace('(%s)', '%s'), params
+
+
+def encode(values, reverse=False):
+    raw = json.dumps({'v': values, 'r': int(reverse)})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+class TermsTests(SimpleTestCase):
+
+    def terms(self, view_class, **params):
+        view = view_class()
+        return KeysetPagination().get_terms(view_class.queryset, api_request(**params), view)
+
+    def test_default_ordering_gets_pk_tiebreak_in_same_direction(self):
+        self.assertEqual(self.terms(ClientViewSet),
+                         [('created_at', True, Client._meta.get_field('created_at').null),
+                          ('client_id', True, False)])
+
+    def test_unique_column_needs_no_tiebreak(self):
+        queryset = ClientViewSet.queryset.order_by('-client_code')
+        self.assertEqual(KeysetPagination().get_terms(queryset, api_request(), Mock(filter_backends=[])),
+                         [('client_code', True, False)])
+
+    def test_mixed_directions_follow_ordering_param(self):
+        terms = self.terms(EquipmentViewSet, ordering='-year,brand')
+        self.assertEqual([(name, desc) for name, desc, _ in terms],
+                         [('year', True), ('brand', False), ('equipment_id', False)])
+
+
+class AfterTests(SimpleTestCase):
+
+    def test_single_direction_uses_row_comparison(self):
+        sql, params = where(Client, [('created_at', True, False), ('client_id', True, False)],
+                            ['2026-01-05T10:30:00.123456', 42])
+        self.assertEqual(sql, '("clients"."created_at", "clients"."client_id") < (%s, %s)')
+        # Datetimes stay untyped so Postgres reads them as the column's type.
+        self.assertEqual(params, ('2026-01-05T10:30:00.123456', 42))
+
+    def test_ascending_nullable_column_falls_back_to_or_expansion(self):
+        sql, _ = where(Equipment, [('license_plate', False, True), ('equipment_id', False, False)], ['ABC', 7])
+        self.assertIn('"equipment"."license_plate" > %s', sql)
+        self.assertIn('"equipment"."license_plate" IS NULL', sql)
+        self.assertNotIn('(%s, %s)', sql)
+
+    def test_mixed_directions_bound_first_column(self):
+        sql, params = where(Equipment, [('year', True, False), ('brand', False, False), ('equipment_id', False, False)],
+                            [2020, 'Ford', 9])
+        self.assertIn('"equipment"."year" < %s', sql)
+        self.assertIn('"equipment"."brand" > %s', sql)
+        self.assertTrue(sql.endswith('AND "equipment"."year" <= %s)'))
+        self.assertEqual(params[-1], 2020)
+
+    def test_null_cursor_value_after_descending_is_not_null(self):
+        sql, _ = where(Equipment, [('year', True, True), ('equipment_id', True, False)], [None, 9])
+        self.assertIn('"equipment"."year" IS NOT NULL', sql)
+        self.assertIn('"equipment"."equipment_id" < %s', sql)
+
+    def test_null_cursor_value_ascending_stays_among_nulls(self):
+        sql, _ = where(Equipment, [('year', False, True), ('equipment_id', False, False)], [None, 9])
+        self.assertIn('"equipment"."year" IS NULL', sql)
+        self.assertIn('"equipment"."equipment_id" > %s', sql)
+
+
+class CursorTests(SimpleTestCase):
+
+    def paginator(self, **params):
+        paginator = KeysetPagination()
+        paginator.terms = [('updated_at', True, False), ('stock_id', True, False)]
+        paginator.request = api_request('/api/v1/stock/', **params)
+        return paginator
+
+    def test_cursor_value_keeps_microseconds_and_naive_datetimes(self):
+        self.assertEqual(_cursor_value(datetime(2026, 1, 5, 10, 30, 0, 123456)), '2026-01-05T10:30:00.123456')
+        self.assertEqual(_cursor_value(datetime(2026, 1, 5, 10, 30, tzinfo=timezone.utc)),
+                         '2026-01-05T10:30:00+00:00')
+
+    def test_link_round_trips(self):
+        paginator = self.paginator(page=3, page_size=50)
+        link = paginator.get_link((['2026-01-05T10:30:00', 7], True))
+        self.assertNotIn('page=3', link)
+        self.assertIn('page_size=50', link)
+        cursor = parse_qs(urlparse(link).query)['cursor'][0]
+        decoded = self.paginator(cursor=cursor).decode_cursor(api_request(cursor=cursor))
+        self.assertEqual(decoded, {'v': ['2026-01-05T10:30:00', 7], 'r': True})
+
+    def test_invalid_cursor_is_not_found(self):
+        paginator = self.paginator()
+        for raw in ('nope', encode([1]), base64.urlsafe_b64encode(b'[1, 2]').decode()):
+            with self.assertRaises(NotFound):
+                paginator.decode_cursor(api_request(cursor=raw))
+
+    def test_page_size_is_capped(self):
+        paginator = KeysetPagination()
+        self.assertEqual(paginator.get_page_size(api_request(page_size=500)), 100)
+        self.assertEqual(paginator.get_page_size(api_request(page_size=0)), 20)
+        self.assertEqual(paginator.get_page_size(api_request(page_size='x')), 20)
+
+
+class CountTests(SimpleTestCase):
+
+    def queryset(self, estimate, exact=12345):
+        queryset = Mock(model=Stock)
+        queryset.count.return_value = exact
+        queryset.order_by.return_value.explain.return_value = json.dumps([{'Plan': {'Plan Rows': estimate}}])
+        return queryset
+
+    def test_large_result_uses_planner_estimate(self):
+        queryset = self.queryset(50000)
+        self.assertEqual(KeysetPagination().get_count(queryset, api_request()), (50000, True))
+        queryset.count.assert_not_called()
+
+    def test_small_estimate_counts_exactly(self):
+        self.assertEqual(KeysetPagination().get_count(self.queryset(200, exact=180), api_request()), (180, False))
+
+    def test_exact_count_on_request(self):
+        queryset = self.queryset(50000)
+        self.assertEqual(KeysetPagination().get_count(queryset, api_request(count='exact')), (12345, False))
+
+
+class FrontendCursorTests(SimpleTestCase):
+
+    def view(self, **params):
+        view = CursorPaginationMixin()
+        view.request = RequestFactory().get('/clients/', params)
+        return view
+
+    def test_api_links_become_view_cursors(self):
+        data = {
+            'count': 5000, 'count_is_estimate': True, 'results': [{}] * 20,
+            'next': 'http://api/api/v1/clients/?cursor=NEXT&page_size=20',
+            'previous': 'http://api/api/v1/clients/?cursor=PREV&page_size=20',
+        }
+        pagination = self.view(cursor='CUR')._cursor_pagination(data)
+        self.assertEqual(pagination['next_cursor'], 'NEXT')
+        self.assertEqual(pagination['previous_cursor'], 'PREV')
+        self.assertTrue(pagination['count_is_estimate'])
+        self.assertEqual(pagination['shown'], 20)
+        self.assertFalse(pagination['is_first'])
+
+    def test_template_tag_keeps_filters_and_drops_page(self):
+        request = RequestFactory().get('/clients/', {'search': 'ana', 'page': 4, 'cursor': 'OLD'})
+        context = render_cursor_pagination(Context({'request': request}), {
+            'has_next': True, 'next_cursor': 'NEXT', 'has_previous': False, 'previous_cursor': None,
+        })
+        self.assertEqual(context['next_url'], '?search=ana&cursor=NEXT')
+        self.assertEqual(context['first_url'], '?search=ana')
+        self.assertIsNone(context['previous_url'])
+
+    def test_page_size_is_clamped(self):
+        self.assertEqual(self.view(page_size=500)._get_page_size(20), 100)
+        self.assertEqual(self.view(page_size='x')._get_page_size(20), 20)
+        self.assertEqual(self.view()._get_page_size(20), 20)
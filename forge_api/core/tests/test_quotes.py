@@ -0,0 +1,134 @@
+"""
+Tests for server-side quote totals, quote conversion and ?expand=.
+"""
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import quotes
+from core.conditional import queryset_models, serializer_models
+from core.models import Quote, QuoteItem, WorkOrder
+from core.serializers import QuoteSerializer
+from core.views.service_views import QuoteViewSet
+from frontend.services.quote_calculation_engine import QuoteCalculationEngine
+
+
+class QuoteTotalsTests(SimpleTestCase):
+
+    ITEMS = [
+        {'hours': '1.35', 'hourly_rate': '487.33', 'quantity': 3},
+        {'hours': Decimal('0.25'), 'hourly_rate': Decimal('500'), 'quantity': 1},
+        {'hours': 2, 'quantity': 2},
+        {'hours': 0, 'hourly_rate': '500', 'quantity': 4},
+    ]
+
+    def test_matches_calculation_engine(self):
+        engine = QuoteCalculationEngine()
+        cases = [
+            {},
+            {'discount_percent': Decimal('7.5')},
+            {'discount_percent': Decimal('10'), 'tax_percent': Decimal('8')},
+            {'discount_amount': Decimal('99999')},
+        ]
+        for options in cases:
+            with self.subTest(**options):
+                expected = engine.calculate_quote_totals(self.ITEMS, **options)
+                totals = quotes.calculate_totals(self.ITEMS, **options)
+                for field in ('subtotal', 'discount_amount', 'tax_percent', 'tax_amount', 'total', 'total_hours'):
+                    self.assertEqual(totals[field], expected[field], field)
+
+    def test_line_total_rounds_before_quantity(self):
+        # round(1.35 * 487.33) = 657.90, times 3
+        self.assertEqual(quotes.line_total('1.35', '487.33', 3), Decimal('1973.70'))
+        self.assertEqual(quotes.line_total(0, '500', 2), Decimal('0.00'))
+
+    def test_totals_from_quote_items(self):
+        rows = quotes.build_items(Quote(), [
+            {'description': 'A', 'hours': Decimal('1.5'), 'hourly_rate': Decimal('400'), 'quantity': 2},
+            {'description': 'B', 'hours': Decimal('1'), 'quantity': 1},
+        ])
+        self.assertEqual([row.line_total for row in rows], [Decimal('1200.00'), Decimal('500.00')])
+        totals = quotes.calculate_totals(rows, discount_percent=Decimal('10'))
+        self.assertEqual(totals['subtotal'], Decimal('1700.00'))
+        self.assertEqual(totals['total'], Decimal('1774.80'))
+        self.assertEqual(totals['total_hours'], Decimal('4.0'))
+        self.assertIsInstance(rows[0], QuoteItem)
+
+
+class QuoteConvertViewTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User(pk=1, username='tester')
+        self.user._technician_id = 42  # a different id from the auth user's pk
+        self.view = QuoteViewSet.as_view({'post': 'convert_to_work_order'})
+
+    def post(self, data=None):
+        request = self.factory.post('/api/v1/quotes/7/convert-to-work-order/', data or {}, format='json')
+        force_authenticate(request, user=self.user)
+        return self.view(request, pk=7)
+
+    def test_already_converted_is_409(self):
+        with patch.object(QuoteViewSet, 'get_object', return_value=Mock(pk=7)), \
+                patch('core.views.service_views.convert_to_work_order',
+                      side_effect=quotes.QuoteConversionError('Quote has no items')):
+            response = self.post()
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data, {'error': 'Quote has no items'})
+
+    def test_work_order_is_credited_to_the_technician(self):
+        with patch.object(QuoteViewSet, 'get_object', return_value=Mock(pk=7)), \
+                patch('core.views.service_views.convert_to_work_order',
+                      side_effect=quotes.QuoteConversionError('Quote has no items')) as convert:
+            self.post()
+        convert.assert_called_once_with(7, service_type='REPAIR', created_by=42)
+
+    def test_invalid_service_type_is_400(self):
+        with patch.object(QuoteViewSet, 'get_object', return_value=Mock(pk=7)), \
+                patch('core.views.service_views.convert_to_work_order') as convert:
+            response = self.post({'service_type': 'TOWING'})
+        self.assertEqual(response.status_code, 400)
+        convert.assert_not_called()
+
+
+class QuoteExpandTests(SimpleTestCase):
+
+    def viewset(self, action='list', **params):
+        request = APIRequestFactory().get('/api/v1/quotes/', params)
+        request.user = User(pk=1, username='tester')
+        return QuoteViewSet(action=action, request=Request(request), format_kwarg=None, kwargs={})
+
+    def test_expansions_are_annotations_of_the_same_query(self):
+        viewset = self.viewset(expand='work_order,invoice_status')
+        sql, _ = viewset.get_queryset().query.sql_with_params()
+        self.assertIn('AS "work_order"', sql)
+        self.assertIn('FROM "invoices" U0 WHERE U0."wo_id" = ("quotes"."converted_to_wo_id")', sql)
+        serializer = viewset.get_serializer(many=True)
+        self.assertIn('work_order', serializer.child.fields)
+        self.assertIn('invoice', serializer.child.fields)
+
+    def test_fields_absent_without_expand(self):
+        viewset = self.viewset()
+        self.assertEqual(viewset.get_queryset().query.annotations, {})
+        fields = viewset.get_serializer(many=True).child.fields
+        self.assertNotIn('work_order', fields)
+        self.assertNotIn('invoice', fields)
+
+    def test_unknown_expansion_is_400(self):
+        view = QuoteViewSet.as_view({'get': 'list'})
+        request = APIRequestFactory().get('/api/v1/quotes/', {'expand': 'client'})
+        force_authenticate(request, user=User(pk=1, username='tester'))
+        response = view(request)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('expand', response.data)
+
+    def test_expanded_serializer_stays_conditional(self):
+        viewset = self.viewset(expand='work_order')
+        queryset = viewset.get_queryset()
+        _, complete = serializer_models(QuoteSerializer, frozenset(queryset.query.annotations))
+        self.assertTrue(complete)
+        self.assertIn(WorkOrder, queryset_models(queryset))
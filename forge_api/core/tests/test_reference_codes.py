@@ -0,0 +1,152 @@
+"""
+Tests for reference code usage counts and renames (core/reference_codes.py).
+"""
+from contextlib import nullcontext
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.db.models.functions import Now
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import reference_codes
+from core.models import Equipment, FuelCode
+from core.views.catalog_views import ReferenceCodeRenameView, ReferenceCodeUsageView
+from frontend.forms.reference_code_forms import ReferenceCodeForm
+from frontend.views.reference_code_views import get_code_for_pk, get_code_usage
+
+
+def mock_connection(rows):
+    cursor = Mock()
+    cursor.fetchall.return_value = rows
+    connection = Mock()
+    connection.cursor.return_value.__enter__ = Mock(return_value=cursor)
+    connection.cursor.return_value.__exit__ = Mock(return_value=False)
+    return connection, cursor
+
+
+class UsageCountTests(SimpleTestCase):
+
+    def test_one_grouped_statement_over_every_reference(self):
+        connection, cursor = mock_connection([
+            ('RED', 'equipment.color', 12), ('RED', 'product_master.color_code', 3),
+        ])
+        with patch.object(reference_codes, 'connection', connection):
+            counts = reference_codes.usage_counts('color', ['RED', 'BLU'])
+        self.assertEqual(counts, {'RED': {'equipment.color': 12, 'product_master.color_code': 3}})
+        cursor.execute.assert_called_once()
+        sql, params = cursor.execute.call_args[0]
+        self.assertEqual(sql.count('GROUP BY'), 2)
+        self.assertIn('UNION ALL', sql)
+        self.assertEqual(params, ['equipment.color', ['RED', 'BLU'], 'product_master.color_code', ['RED', 'BLU']])
+
+    def test_all_codes(self):
+        connection, cursor = mock_connection([])
+        with patch.object(reference_codes, 'connection', connection):
+            reference_codes.usage_counts('fuel')
+        sql, params = cursor.execute.call_args[0]
+        self.assertIn('fuel_code IS NOT NULL', sql)
+        self.assertEqual(params, ['equipment.fuel_code'])
+
+    def test_unknown_category(self):
+        with self.assertRaises(reference_codes.ReferenceCodeError):
+            reference_codes.usage_counts('boat')
+        with self.assertRaises(reference_codes.ReferenceCodeError):
+            reference_codes.rename_code('boat', 'A', 'B')
+
+    def test_rename_touches_updated_at_of_referencing_rows(self):
+        # Equipment has no version counter: its ETag moves only with max(updated_at).
+        codes, equipment = Mock(), Mock()
+        codes.filter.return_value.exists.return_value = False
+        equipment.filter.return_value.update.return_value = 3
+        with patch.object(reference_codes.transaction, 'atomic', nullcontext), \
+                patch.object(reference_codes, 'model_to_dict', return_value={'fuel_code': 'GAS'}), \
+                patch.object(FuelCode, 'objects', codes), patch.object(Equipment, 'objects', equipment):
+            result = reference_codes.rename_code('fuel', 'GAS', 'GAS95')
+        self.assertEqual(result['updated'], {'equipment.fuel_code': 3})
+        equipment.filter.assert_called_once_with(fuel_code='GAS')
+        changes = equipment.filter.return_value.update.call_args.kwargs
+        self.assertEqual(changes['fuel_code'], 'GAS95')
+        self.assertIsInstance(changes['updated_at'], Now)
+
+    def test_normalize_code_keeps_color_case(self):
+        self.assertEqual(reference_codes.normalize_code('fuel', ' gas '), 'GAS')
+        self.assertEqual(reference_codes.normalize_code('color', ' Rojo-Ferrari '), 'Rojo-Ferrari')
+
+    def test_clean_fields(self):
+        self.assertEqual(
+            reference_codes.clean_fields('color', {'name_es': 'Rojo', 'color_id': 9, 'color_code': 'X'}),
+            {'name_es': 'Rojo'},
+        )
+        with self.assertRaisesMessage(reference_codes.ReferenceCodeError, 'hex_code'):
+            reference_codes.clean_fields('color', {'hex_code': '#FF0000FF'})
+
+
+class ReferenceCodeViewTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User(pk=1, username='tester')
+
+    def test_usage_lists_requested_codes(self):
+        request = self.factory.get('/api/v1/reference-codes/fuel/usage/', {'codes': 'GAS,DSL'})
+        force_authenticate(request, user=self.user)
+        with patch.object(reference_codes, 'usage_counts', return_value={'GAS': {'equipment.fuel_code': 40}}):
+            response = ReferenceCodeUsageView.as_view()(request, category='fuel')
+        self.assertEqual(response.data['results'], [
+            {'code': 'GAS', 'total': 40, 'references': {'equipment.fuel_code': 40}},
+            {'code': 'DSL', 'total': 0, 'references': {}},
+        ])
+
+    def test_rename_passes_only_code_table_fields(self):
+        request = self.factory.post('/api/v1/reference-codes/fuel/GAS/rename/', {
+            'new_code': 'gas95', 'name_es': 'Gasolina 95', 'client_id': 3,
+        }, format='json')
+        force_authenticate(request, user=self.user)
+        with patch.object(reference_codes, 'rename_code', return_value={'updated': {}}) as rename_code:
+            response = ReferenceCodeRenameView.as_view()(request, category='fuel', code='GAS')
+        self.assertEqual(response.status_code, 200)
+        rename_code.assert_called_once_with('fuel', 'GAS', 'GAS95', name_es='Gasolina 95')
+
+    def test_rename_errors_are_400(self):
+        request = self.factory.post('/api/v1/reference-codes/fuel/GAS/rename/', {'new_code': 'DSL'}, format='json')
+        force_authenticate(request, user=self.user)
+        error = reference_codes.ReferenceCodeError("Code 'DSL' already exists")
+        with patch.object(reference_codes, 'rename_code', side_effect=error):
+            response = ReferenceCodeRenameView.as_view()(request, category='fuel', code='GAS')
+        self.assertEqual(response.status_code, 400)
+
+    def test_rename_with_invalid_fields_is_400(self):
+        request = self.factory.post('/api/v1/reference-codes/color/Red/rename/', {
+            'new_code': 'Crimson', 'hex_code': '#FF0000FF',
+        }, format='json')
+        force_authenticate(request, user=self.user)
+        with patch.object(reference_codes, 'rename_code') as rename_code:
+            response = ReferenceCodeRenameView.as_view()(request, category='color', code='Red')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('hex_code', response.data['detail'])
+        rename_code.assert_not_called()
+
+
+class FrontendUsageTests(SimpleTestCase):
+
+    def test_usage_of_many_codes_in_one_call(self):
+        api_client = Mock()
+        api_client.get_reference_code_usage.return_value = {'GAS': 4}
+        self.assertEqual(get_code_usage(api_client, 'fuel', ['GAS', 'DSL']), {'GAS': 4})
+        api_client.get_reference_code_usage.assert_called_once_with('fuel', ['GAS', 'DSL'])
+
+    def test_usage_is_looked_up_by_code_not_pk(self):
+        api_client = Mock()
+        api_client.get.return_value = {'color_id': 7, 'color_code': 'Red'}
+        self.assertEqual(get_code_for_pk(api_client, 'color', 7), 'Red')
+        api_client.get.assert_called_once_with('color-codes/7/')
+        self.assertEqual(get_code_for_pk(api_client, 'fuel', 'GAS'), 'GAS')
+        api_client.get.assert_called_once()
+
+    def test_form_keeps_color_case(self):
+        for category, expected in (('color', 'Red'), ('fuel', 'RED')):
+            with self.subTest(category=category):
+                form = ReferenceCodeForm({'category': category, 'code': 'Red', 'description': 'Rojo'})
+                self.assertTrue(form.is_valid(), form.errors)
+                self.assertEqual(form.cleaned_data['code'], expected)
@@ -0,0 +1,121 @@
+"""
+Tests for the versioned reference-data bundle (core/reference_data.py).
+"""
+import json
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import reference_data, taxonomy
+from core.models import FuelCode, TaxonomyGroup, Technician
+from core.views.catalog_views import ReferenceBundleView
+from frontend.services import reference_data_service
+
+CATALOGS = {'fuel_codes': [{'fuel_code': 'GAS', 'name_es': 'Gasolina', 'name_en': 'Gasoline'}]}
+
+
+class SnapshotTests(SimpleTestCase):
+
+    def setUp(self):
+        reference_data.invalidate()
+        self.addCleanup(reference_data.invalidate)
+        patcher = patch.object(reference_data, 'load_catalogs', return_value=CATALOGS)
+        self.load_catalogs = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_snapshot_reused_until_version_changes(self):
+        with patch.object(reference_data, 'current_version', return_value=7):
+            first = reference_data.get_snapshot()
+            second = reference_data.get_snapshot()
+        self.assertIs(first, second)
+        self.assertEqual(first.etag, '"ref-7"')
+        self.assertEqual(json.loads(first.body), {'version': 7, 'catalogs': CATALOGS})
+        self.assertEqual(self.load_catalogs.call_count, 1)
+
+        with patch.object(reference_data, 'current_version', return_value=8):
+            third = reference_data.get_snapshot()
+        self.assertEqual(third.etag, '"ref-8"')
+        self.assertEqual(self.load_catalogs.call_count, 2)
+
+    def test_invalidate_forces_rebuild(self):
+        with patch.object(reference_data, 'current_version', return_value=3):
+            reference_data.get_snapshot()
+            reference_data.invalidate()
+            reference_data.get_snapshot()
+        self.assertEqual(self.load_catalogs.call_count, 2)
+
+    def test_without_version_table_uses_ttl_and_content_etag(self):
+        with patch.object(reference_data, 'current_version', return_value=None):
+            with self.settings(SNAPSHOT_TTL=300):
+                first = reference_data.get_snapshot()
+                self.assertIs(reference_data.get_snapshot(), first)
+            with self.settings(SNAPSHOT_TTL=0):
+                reference_data.get_snapshot()
+        self.assertTrue(first.etag.startswith('"ref-h'))
+        self.assertEqual(self.load_catalogs.call_count, 2)
+
+    def test_only_catalog_writes_drop_the_snapshot(self):
+        with patch('core.signals.transaction.on_commit') as on_commit:
+            post_save.send(sender=FuelCode, instance=Mock(), created=False)
+            post_delete.send(sender=TaxonomyGroup, instance=Mock())
+            post_save.send(sender=Technician, instance=Mock(), created=False)
+        self.assertEqual([c.args for c in on_commit.call_args_list],
+                         [(reference_data.invalidate,), (reference_data.invalidate,), (taxonomy.invalidate,)])
+
+
+class ReferenceBundleViewTests(SimpleTestCase):
+
+    def setUp(self):
+        reference_data.invalidate()
+        self.addCleanup(reference_data.invalidate)
+        for name, value in (('load_catalogs', CATALOGS), ('current_version', 5)):
+            patcher = patch.object(reference_data, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.factory = APIRequestFactory()
+        self.user = User(pk=1, username='tester')
+
+    def get(self, **headers):
+        request = self.factory.get('/api/v1/reference-bundle/', **headers)
+        force_authenticate(request, user=self.user)
+        return ReferenceBundleView.as_view()(request)
+
+    def test_returns_bundle_with_etag(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"ref-5"')
+        self.assertEqual(json.loads(response.content)['catalogs'], CATALOGS)
+
+    def test_matching_if_none_match_returns_304(self):
+        response = self.get(HTTP_IF_NONE_MATCH='"ref-5"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH='"ref-4"').status_code, 200)
+
+    def test_weak_etag_from_compressed_response_matches(self):
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH='W/"ref-5"').status_code, 304)
+
+
+class ReferenceDataServiceTests(SimpleTestCase):
+
+    def setUp(self):
+        reference_data_service.clear_reference_catalogs()
+        self.addCleanup(reference_data_service.clear_reference_catalogs)
+
+    def test_revalidates_with_etag_and_keeps_local_copy(self):
+        api_client = Mock()
+        api_client.get_reference_bundle.side_effect = [('"ref-1"', {'catalogs': CATALOGS}), None]
+
+        first = reference_data_service.get_reference_catalogs(api_client)
+        second = reference_data_service.get_reference_catalogs(api_client)
+
+        self.assertEqual(first, CATALOGS)
+        self.assertIs(second, first)
+        api_client.get_reference_bundle.assert_called_with('"ref-1"')
+
+    def test_code_choices(self):
+        choices = reference_data_service.code_choices(CATALOGS['fuel_codes'], 'fuel_code', 'Seleccionar')
+        self.assertEqual(choices, [('', 'Seleccionar'), ('GAS', 'Gasolina')])
@@ -0,0 +1,149 @@
+"""
+Tests for the replenishment planner (core/replenishment.py) and the
+auto-replenishment endpoint.
+"""
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import replenishment
+from core.views.inventory_stored_procedures_views import auto_replenishment
+
+
+def positions(**overrides):
+    """Two warehouses of one SKU selling 30 a month, 70/30, no stock."""
+    values = {
+        'warehouse_code': ['W1', 'W2'], 'internal_sku': ['SKU1', 'SKU1'],
+        'available': [0, 100], 'on_order': [0, 0], 'warehouse_usage': [70, 30], 'sku_usage': [100, 100],
+        'warehouses': [2, 2], 'monthly_demand': [30, 30], 'monthly_std': [6, 6], 'min_stock': [0, 0],
+        'max_stock': [0, 0], 'reorder_point': [0, 0], 'safety_stock': [0, 0], 'product_lead_time': [7, 7],
+        'package_qty': [1, 1], 'product_cost': [100, 100], 'supplier_id': [5, 5], 'supplier_sku_id': [9, 9],
+        'supplier_cost': [80, 80], 'supplier_lead_time': [10, 10], 'min_order_qty': [1, 1],
+        'oem_lead_time': [None, None],
+    }
+    values.update(overrides)
+    return {
+        name: np.array(column, dtype=object) if name in ('warehouse_code', 'internal_sku')
+        else np.array([np.nan if v is None else v for v in column], dtype=float)
+        for name, column in values.items()
+    }
+
+
+@override_settings(REPLENISHMENT_SERVICE_LEVEL=0.95, REPLENISHMENT_ORDER_COST=50.0, REPLENISHMENT_HOLDING_RATE=0.25)
+class PlanTests(SimpleTestCase):
+
+    def test_reorder_point_and_eoq(self):
+        [suggestion] = replenishment.plan(positions())
+        self.assertEqual((suggestion.warehouse_code, suggestion.supplier_id), ('W1', 5))
+        daily = 30 * 0.7 / replenishment.DAYS_PER_MONTH
+        self.assertAlmostEqual(suggestion.daily_demand, daily, places=3)
+        self.assertEqual(suggestion.lead_time_days, 10)
+        # 1.645 * (6 * 0.7 / sqrt(30.44)) * sqrt(10) = 3.96; 0.69 * 10 + 3.96 = 10.86
+        self.assertEqual(suggestion.safety_stock, 4)
+        self.assertEqual(suggestion.reorder_point, 11)
+        # sqrt(2 * 252 * 50 / (0.25 * 80)) = 35.5
+        self.assertEqual(suggestion.eoq, 36)
+        self.assertEqual(suggestion.order_qty, 36)
+        self.assertEqual(suggestion.unit_price, Decimal('80.00'))
+
+    def test_oem_lead_time_is_a_floor(self):
+        [suggestion] = replenishment.plan(positions(oem_lead_time=[45, 45]))
+        self.assertEqual(suggestion.lead_time_days, 45)
+
+    def test_product_settings_are_floors_and_rounding(self):
+        [suggestion] = replenishment.plan(positions(
+            reorder_point=[40, 40], min_order_qty=[50, 50], package_qty=[12, 12],
+        ))
+        self.assertEqual(suggestion.reorder_point, 40)
+        # two EOQs (72) to get above 40, already a multiple of 12 and above 50
+        self.assertEqual(suggestion.order_qty, 72)
+
+    def test_capped_at_max_stock(self):
+        [suggestion] = replenishment.plan(positions(available=[10, 100], max_stock=[30, 30]))
+        self.assertEqual(suggestion.order_qty, 20)
+
+    def test_no_usage_history_splits_evenly(self):
+        [first, second] = replenishment.plan(positions(warehouse_usage=[0, 0], sku_usage=[0, 0], available=[0, 0]))
+        self.assertEqual(first.daily_demand, second.daily_demand)
+
+    def test_without_supplier(self):
+        [suggestion] = replenishment.plan(positions(supplier_id=[None, None], supplier_sku_id=[None, None],
+                                                    supplier_cost=[None, None], supplier_lead_time=[None, None]))
+        self.assertIsNone(suggestion.supplier_id)
+        self.assertEqual(suggestion.lead_time_days, 7)
+        self.assertEqual(suggestion.unit_price, Decimal('100.00'))
+
+
+class LoadPositionsTests(SimpleTestCase):
+
+    def test_one_statement_with_warehouse_filter_after_shares(self):
+        cursor = Mock()
+        cursor.fetchone.return_value = (True,)
+        cursor.fetchall.return_value = [('W1', 'SKU1') + (1,) * 20]
+        connection = Mock()
+        connection.cursor.return_value.__enter__ = Mock(return_value=cursor)
+        connection.cursor.return_value.__exit__ = Mock(return_value=False)
+        with patch.object(replenishment, 'connection', connection):
+            loaded = replenishment.load_positions('W1', today=date(2026, 10, 19))
+        sql, params = cursor.execute.call_args[0]
+        self.assertEqual(params, [date(2025, 10, 19), 'W1'])
+        self.assertLess(sql.index('OVER w'), sql.index('WHERE pos.warehouse_code'))
+        self.assertIn('inv.supplier_skus', sql)
+        self.assertEqual(loaded['warehouse_code'].tolist(), ['W1'])
+        self.assertEqual(loaded['oem_lead_time'].tolist(), [1.0])
+
+
+def suggestion(warehouse, sku, supplier, qty):
+    return replenishment.Suggestion(warehouse, sku, supplier, None, 0, 1.0, 10, 5, 15, qty, qty, Decimal('2.50'))
+
+
+class PurchaseOrderTests(SimpleTestCase):
+
+    def test_one_draft_per_supplier_and_warehouse(self):
+        suggestions = [
+            suggestion('W1', 'A', 1, 10), suggestion('W1', 'B', 1, 4),
+            suggestion('W2', 'A', 1, 2), suggestion('W1', 'C', None, 3),
+        ]
+        with patch.object(replenishment.PurchaseOrder, 'objects') as orders, \
+                patch.object(replenishment.POItem, 'objects') as items, \
+                patch.object(replenishment, 'transaction'):
+            orders.bulk_create.side_effect = lambda objs: objs
+            created = replenishment.create_purchase_orders(suggestions, today=date(2026, 10, 19))
+        self.assertEqual([(o.supplier_id, o.subtotal) for o in created], [(1, Decimal('35.00')), (1, Decimal('5.00'))])
+        self.assertTrue(all(o.po_number.startswith('AR-') and o.status == 'DRAFT' for o in created))
+        self.assertEqual(created[0].expected_delivery_date, date(2026, 10, 29))
+        orders.filter.assert_called_once_with(
+            status='DRAFT', po_number__startswith='AR-',
+            notes__in=['Reposición automática - almacén W1', 'Reposición automática - almacén W2'],
+        )
+        [lines] = items.bulk_create.call_args[0]
+        self.assertEqual([(line.po.po_number, line.internal_sku) for line in lines],
+                         [(created[0].po_number, 'A'), (created[0].po_number, 'B'), (created[1].po_number, 'A')])
+
+
+class AutoReplenishmentViewTests(SimpleTestCase):
+
+    def post(self, data):
+        request = APIRequestFactory().post('/api/v1/inventory/auto-replenishment/', data, format='json')
+        user = User(pk=1, username='T-007', is_staff=True, is_superuser=True)
+        user._technician_id = 7
+        force_authenticate(request, user=user)
+        return auto_replenishment(request)
+
+    def test_dry_run_by_default(self):
+        result = {'pairs': 2, 'suggestions': [suggestion('W1', 'A', 1, 10)],
+                  'unassigned': 0, 'orders': []}
+        with patch.object(replenishment, 'run', return_value=result) as run:
+            response = self.post({'warehouse_code': 'W1', 'service_level': 0.98})
+        self.assertEqual(response.status_code, 200)
+        run.assert_called_once_with(warehouse_code='W1', service_level=0.98, dry_run=True, created_by=7)
+        self.assertEqual(response.data['items_ordered'], ['A'])
+        self.assertEqual(response.data['suggestions'][0]['order_qty'], 10)
+
+    def test_invalid_service_level(self):
+        self.assertEqual(self.post({'service_level': 1.5}).status_code, 400)
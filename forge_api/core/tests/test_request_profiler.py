@@ -0,0 +1,127 @@
+"""
+Tests for the per-request profiler (core.profiling / QueryProfilerMiddleware).
+"""
+import random
+
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import resolve
+
+from core.middleware import QueryProfilerMiddleware
+from core.profiling import (
+    EndpointProfile, Histogram, ProfileRegistry, endpoint_key, fingerprint_sql,
+)
+
+
+class HistogramTests(SimpleTestCase):
+
+    def test_percentiles_within_bucket_precision(self):
+        rng = random.Random(42)
+        values = [rng.uniform(1, 2000) for _ in range(5000)]
+        histogram = Histogram()
+        for value in values:
+            histogram.record(value)
+
+        ordered = sorted(values)
+        for pct in (50, 95, 99):
+            exact = ordered[int(len(ordered) * pct / 100) - 1]
+            self.assertAlmostEqual(histogram.percentile(pct), exact, delta=exact * 0.03)
+        self.assertEqual(histogram.count, 5000)
+        self.assertAlmostEqual(histogram.mean, sum(values) / len(values), places=6)
+
+    def test_merge_and_serialization_roundtrip(self):
+        a, b = Histogram(), Histogram()
+        for value in (1, 2, 3):
+            a.record(value)
+        for value in (100, 200):
+            b.record(value)
+
+        merged = Histogram.from_dict(a.to_dict())
+        merged.merge(Histogram.from_dict(b.to_dict()))
+
+        self.assertEqual(merged.count, 5)
+        self.assertEqual(merged.min, 1)
+        self.assertEqual(merged.max, 200)
+        self.assertAlmostEqual(merged.percentile(100), 200, delta=4)
+
+    def test_empty_histogram(self):
+        self.assertEqual(Histogram().percentile(95), 0.0)
+
+
+class FingerprintTests(SimpleTestCase):
+
+    def test_literals_and_in_lists_are_normalized(self):
+        self.assertEqual(
+            fingerprint_sql("SELECT * FROM inv.bins WHERE id = 5 AND code = 'A1'"),
+            'SELECT * FROM inv.bins WHERE id = ? AND code = ?',
+        )
+        self.assertEqual(
+            fingerprint_sql('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            fingerprint_sql('SELECT * FROM t WHERE id IN (%s)'),
+        )
+
+    def test_endpoint_key_uses_route(self):
+        request = RequestFactory().get('/api/v1/clients/42/')
+        request.resolver_match = resolve('/api/v1/clients/42/')
+        self.assertEqual(endpoint_key(request), 'GET /api/v1/clients/<pk>/')
+
+
+@override_settings(REQUEST_PROFILER_FLUSH_INTERVAL=0)
+class ProfilerMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        from core import middleware
+        self.registry = ProfileRegistry(worker_id='test:1')
+        self._original = middleware.profiler
+        middleware.profiler = self.registry
+
+    def tearDown(self):
+        from core import middleware
+        middleware.profiler = self._original
+
+    def _run(self, path, queries, status=200):
+        def get_response(request):
+            request.resolver_match = resolve(path)
+            recorder = connection.execute_wrappers[-1]
+            for sql in queries:
+                recorder(lambda *args: None, sql, None, False, {})
+            return HttpResponse(b'x' * 10, status=status)
+
+        return QueryProfilerMiddleware(get_response)(RequestFactory().get(path))
+
+    def test_records_queries_status_and_size(self):
+        self._run('/api/v1/clients/1/', ['SELECT 1', 'SELECT 2'])
+        self._run('/api/v1/clients/2/', [], status=404)
+
+        report = self.registry.report()
+        endpoint = report['endpoints']['GET /api/v1/clients/<pk>/']
+        self.assertEqual(report['total_requests'], 2)
+        self.assertEqual(report['failed_requests'], 1)
+        self.assertEqual(report['error_types'], {'404': 1})
+        self.assertEqual(endpoint['max_queries'], 2)
+        self.assertEqual(endpoint['avg_response_bytes'], 10)
+
+    def test_repeated_queries_are_reported_as_n_plus_one(self):
+        queries = [f'SELECT * FROM inv.bins WHERE warehouse_id = {i}' for i in range(8)]
+        self._run('/api/v1/clients/', queries)
+
+        offenders = self.registry.report()['n_plus_one']
+        self.assertEqual(len(offenders), 1)
+        self.assertEqual(offenders[0]['endpoint'], 'GET /api/v1/clients/')
+        self.assertEqual(offenders[0]['max_repeats'], 8)
+
+    def test_report_merges_worker_snapshots(self):
+        self._run('/api/v1/clients/', ['SELECT 1'])
+        other = ProfileRegistry(worker_id='test:2')
+        profile = EndpointProfile()
+        profile.record({'status': 500, 'wall_ms': 50.0, 'db_ms': 1.0, 'queries': 1, 'response_bytes': 0})
+        other._endpoints['GET /api/v1/clients/'] = profile
+        other.flush()
+
+        report = self.registry.report()
+        self.assertEqual(report['workers'], 2)
+        self.assertEqual(report['endpoints']['GET /api/v1/clients/']['requests'], 2)
+        self.assertEqual(report['error_types'], {'500': 1})
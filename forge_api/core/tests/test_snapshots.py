@@ -0,0 +1,48 @@
+"""
+Tests for the per-worker versioned snapshot cache (core/snapshots.py).
+"""
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from core import snapshots
+from core.models import FuelCode, UOMCode
+
+
+class SnapshotCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.cache = snapshots.SnapshotCache()
+        self.build = Mock(side_effect=lambda version: ('snapshot', version))
+
+    def test_rebuilt_when_the_version_changes(self):
+        versions = iter([1, 1, 2])
+        results = [self.cache.get(lambda: next(versions), self.build) for _ in range(3)]
+        self.assertEqual(results, [('snapshot', 1), ('snapshot', 1), ('snapshot', 2)])
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_check_interval_skips_the_version_read(self):
+        version = Mock(return_value=1)
+        for _ in range(3):
+            self.cache.get(version, self.build, check_interval=60)
+        self.assertEqual((version.call_count, self.build.call_count), (1, 1))
+
+    def test_without_counters_the_snapshot_expires(self):
+        with override_settings(SNAPSHOT_TTL=300):
+            first = self.cache.get(lambda: None, self.build)
+            self.assertIs(self.cache.get(lambda: None, self.build), first)
+        with override_settings(SNAPSHOT_TTL=0):
+            self.cache.get(lambda: None, self.build)
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_invalidate(self):
+        self.cache.get(lambda: 1, self.build)
+        self.cache.invalidate()
+        self.cache.get(lambda: 1, self.build)
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_tables_version_sums_the_counters(self):
+        with patch.object(snapshots, 'table_versions', return_value={FuelCode: (3, None), UOMCode: (4, None)}):
+            self.assertEqual(snapshots.tables_version([FuelCode, UOMCode]), 7)
+        with patch.object(snapshots, 'table_versions', return_value={}):
+            self.assertIsNone(snapshots.tables_version([FuelCode]))
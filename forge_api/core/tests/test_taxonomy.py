@@ -0,0 +1,163 @@
+"""
+Tests for the cached taxonomy tree and closure-table queries (core/taxonomy.py).
+"""
+import json
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import taxonomy
+from core.views.taxonomy_views import TaxonomyCheckParentView, TaxonomySubsystemViewSet, TaxonomyTreeView
+from frontend.utils.taxonomy_validators import TaxonomyValidator
+from frontend.views.taxonomy_views import TaxonomyBulkActionView
+
+STATS = {'systems_count': 1, 'subsystems_count': 0, 'groups_count': 0, 'total_nodes': 1}
+
+
+def fake_tree(active_only=False):
+    systems = [{'system_code': 'ENG', 'is_active': True, 'subsystems': []}]
+    if not active_only:
+        systems.append({'system_code': 'OLD', 'is_active': False, 'subsystems': []})
+    return {'systems': systems, 'stats': dict(STATS, systems_count=len(systems))}
+
+
+class TreeSnapshotTests(SimpleTestCase):
+
+    def setUp(self):
+        taxonomy.invalidate()
+        self.addCleanup(taxonomy.invalidate)
+        patcher = patch.object(taxonomy, 'load_tree', side_effect=fake_tree)
+        self.load_tree = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_snapshot_reused_until_version_changes(self):
+        with patch.object(taxonomy, 'current_version', return_value=4):
+            first = taxonomy.get_snapshot()
+            self.assertIs(taxonomy.get_snapshot(), first)
+        self.assertEqual(first.etag, '"tax-4"')
+        self.assertEqual(len(json.loads(first.body)['systems']), 2)
+        self.assertEqual(len(json.loads(first.active_body)['systems']), 1)
+        # Full and active-only trees
+        self.assertEqual(self.load_tree.call_count, 2)
+
+        with patch.object(taxonomy, 'current_version', return_value=5):
+            self.assertEqual(taxonomy.get_snapshot().etag, '"tax-5"')
+        self.assertEqual(self.load_tree.call_count, 4)
+
+    def test_tree_view_etags(self):
+        factory = APIRequestFactory()
+        user = User(pk=1, username='tester')
+
+        def get(path, **headers):
+            request = factory.get(path, **headers)
+            force_authenticate(request, user=user)
+            return TaxonomyTreeView.as_view()(request)
+
+        with patch.object(taxonomy, 'current_version', return_value=4):
+            response = get('/api/v1/taxonomy/tree/?active=true')
+            self.assertEqual(response['ETag'], '"tax-4-a"')
+            self.assertEqual(len(json.loads(response.content)['systems']), 1)
+            self.assertEqual(get('/api/v1/taxonomy/tree/', HTTP_IF_NONE_MATCH='"tax-4"').status_code, 304)
+            self.assertEqual(get('/api/v1/taxonomy/tree/', HTTP_IF_NONE_MATCH='W/"tax-4"').status_code, 304)
+            self.assertEqual(get('/api/v1/taxonomy/tree/?active=true', HTTP_IF_NONE_MATCH='"tax-4"').status_code, 200)
+
+
+class ClosureQueryTests(SimpleTestCase):
+
+    def test_system_has_no_parent(self):
+        with self.assertRaises(taxonomy.InvalidNode):
+            taxonomy.check_parent('system', 'ENG', 'X')
+        with self.assertRaises(taxonomy.InvalidNode):
+            taxonomy.descendants('part', 'X')
+
+    def test_check_parent_view_requires_parent(self):
+        request = APIRequestFactory().get('/api/v1/taxonomy/subsystem/ENG-01/check-parent/')
+        force_authenticate(request, user=User(pk=1, username='tester'))
+        response = TaxonomyCheckParentView.as_view()(request, node_type='subsystem', code='ENG-01')
+        self.assertEqual(response.status_code, 400)
+
+
+class BulkActionTests(SimpleTestCase):
+
+    def test_clean_codes(self):
+        self.assertEqual(taxonomy.clean_codes('group', [' A ', 'B', 'A', '']), ['A', 'B'])
+        with self.assertRaises(taxonomy.InvalidNode):
+            taxonomy.clean_codes('group', [])
+        with self.assertRaises(taxonomy.InvalidNode):
+            taxonomy.clean_codes('group', [str(i) for i in range(taxonomy.BULK_MAX_CODES + 1)])
+
+    def test_dependency_counts_is_one_grouped_statement(self):
+        cursor = Mock()
+        cursor.fetchall.return_value = [('ENG', 'subsystems', 2), ('ENG', 'products', 5)]
+        connection = Mock()
+        connection.cursor.return_value.__enter__ = Mock(return_value=cursor)
+        connection.cursor.return_value.__exit__ = Mock(return_value=False)
+        with patch.object(taxonomy, 'connection', connection):
+            counts = taxonomy.dependency_counts('system', ['ENG', 'BRK'])
+        self.assertEqual(counts, {'ENG': {'subsystems': 2, 'products': 5}})
+        cursor.execute.assert_called_once()
+        sql, params = cursor.execute.call_args[0]
+        for table in ('taxonomy_subsystems', 'product_master', 'catalog_items', 'flat_rate_standards'):
+            self.assertIn(table, sql)
+        self.assertEqual(params, [['ENG', 'BRK'], ['ENG', 'BRK']])
+
+    def test_subsystems_cannot_be_activated(self):
+        request = APIRequestFactory().post('/api/v1/taxonomy-subsystems/bulk-activate/', {'codes': ['ENG-01']}, format='json')
+        force_authenticate(request, user=User(pk=1, username='tester'))
+        response = TaxonomySubsystemViewSet.as_view({'post': 'bulk_activate'})(request)
+        self.assertEqual(response.status_code, 400)
+
+    def test_frontend_bulk_delete_in_one_call(self):
+        api_client = Mock()
+        api_client.taxonomy_bulk_action.return_value = {
+            'results': [
+                {'code': 'ENG', 'status': 'deleted', 'dependencies': {}},
+                {'code': 'BRK', 'status': 'blocked', 'dependencies': {'subsystems': 3}},
+            ],
+            'summary': {'deleted': 1, 'blocked': 1},
+        }
+        with patch.object(TaxonomyBulkActionView, 'api_client', api_client):
+            response = TaxonomyBulkActionView()._bulk_delete('system', ['ENG', 'BRK'])
+        api_client.taxonomy_bulk_action.assert_called_once_with('system', 'delete', ['ENG', 'BRK'])
+        payload = json.loads(response.content)
+        self.assertEqual(payload['systems_with_dependencies'], ['BRK'])
+        self.assertTrue(payload['message'].startswith('1 sistemas eliminados'))
+
+
+class TaxonomyValidatorTests(SimpleTestCase):
+
+    def test_dependencies_in_one_call(self):
+        api_client = Mock()
+        api_client.get_taxonomy_dependencies.return_value = [
+            {'code': 'ENG', 'has_dependencies': True, 'dependencies': {'subsystems': 2, 'products': 7}},
+            {'code': 'BRK', 'has_dependencies': False, 'dependencies': {}},
+        ]
+        results = TaxonomyValidator(api_client).check_dependencies_bulk('system', ['ENG', 'BRK'])
+        api_client.get_taxonomy_dependencies.assert_called_once_with('system', ['ENG', 'BRK'])
+        self.assertFalse(results['ENG']['can_delete'])
+        self.assertEqual(results['ENG']['dependency_counts'], {'subsistemas': 2, 'productos': 7})
+        self.assertTrue(results['BRK']['can_delete'])
+
+    def test_descendants_in_one_call(self):
+        api_client = Mock()
+        api_client.get_taxonomy_descendants.return_value = [
+            {'type': 'subsystem', 'code': 'ENG-01', 'depth': 1},
+            {'type': 'group', 'code': 'ENG-01-001', 'depth': 2},
+        ]
+        descendants = TaxonomyValidator(api_client)._get_all_descendants('system', 'ENG')
+        self.assertEqual(descendants, {'ENG-01', 'ENG-01-001'})
+        api_client.get_taxonomy_descendants.assert_called_once_with('system', 'ENG')
+
+    def test_circular_reference_from_api(self):
+        api_client = Mock()
+        api_client.check_taxonomy_parent.return_value = {
+            'valid': False, 'error': 'Circular reference: the proposed parent is a descendant of this node',
+        }
+        circular, message = TaxonomyValidator(api_client).check_circular_reference('subsystem', 'A', 'B')
+        self.assertTrue(circular)
+        self.assertIn('circular', message)
+
+        api_client.check_taxonomy_parent.return_value = {'valid': True, 'error': None}
+        self.assertEqual(TaxonomyValidator(api_client).check_circular_reference('subsystem', 'A', 'B'), (False, None))
@@ -23,7 +23,16 @@ from .views.auth_views import (
 from .views.dashboard_views import dashboard_data, health_check, kpi_details
 
 # Health check views
-from .views.health_views import HealthCheckView, DetailedHealthCheckView, SimpleHealthView
+from .views.health_views import HealthCheckView, DetailedHealthCheckView, SimpleHealthView, DatabasePoolStatusView
+
+# Reference data bundle
+from .views.catalog_views import (
+    ReferenceBundleView, ReferenceBundleVersionView, ReferenceCodeRenameView, ReferenceCodeUsageView,
+)
+
+# Lookups for remote select widgets
+from .views.lookup_views import LookupView
+from .views.taxonomy_views import TaxonomyCheckParentView, TaxonomyDescendantsView, TaxonomyTreeView
 
 # Notification views
 from .views.notification_views import (
@@ -143,6 +152,7 @@ urlpatterns = [
     # Health check endpoints
     path('health/', HealthCheckView.as_view(), name='health_check_simple'),
     path('health/detailed/', DetailedHealthCheckView.as_view(), name='health_check_detailed'),
+    path('health/db-pool/', DatabasePoolStatusView.as_view(), name='health_check_db_pool'),
     path('ping/', SimpleHealthView.as_view(), name='ping'),
     
     # Dashboard endpoints
@@ -155,6 +165,20 @@ urlpatterns = [
     path('notifications/mark-all-read/', mark_all_notifications_read, name='mark_all_notifications_read'),
     path('notifications/summary/', notification_summary, name='notification_summary'),
     
+    # Reference data bundle (small catalogs, versioned)
+    path('reference-bundle/', ReferenceBundleView.as_view(), name='reference_bundle'),
+    path('reference-bundle/version/', ReferenceBundleVersionView.as_view(), name='reference_bundle_version'),
+    path('reference-codes/<str:category>/usage/', ReferenceCodeUsageView.as_view(), name='reference_code_usage'),
+    path('reference-codes/<str:category>/<str:code>/rename/', ReferenceCodeRenameView.as_view(), name='reference_code_rename'),
+
+    # Taxonomy tree (cached) and closure-table queries
+    path('taxonomy/tree/', TaxonomyTreeView.as_view(), name='taxonomy_tree'),
+    path('taxonomy/<str:node_type>/<str:code>/descendants/', TaxonomyDescendantsView.as_view(), name='taxonomy_descendants'),
+    path('taxonomy/<str:node_type>/<str:code>/check-parent/', TaxonomyCheckParentView.as_view(), name='taxonomy_check_parent'),
+
+    # (id, label) lookups with keyset pagination
+    path('lookups/<str:kind>/', LookupView.as_view(), name='lookup'),
+
     # Authentication endpoints
     path('auth/login/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('auth/refresh/', refresh_token, name='token_refresh'),
@@ -7,12 +7,14 @@ from rest_framework import viewsets, permissions
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import Alert
 from ..serializers import AlertSerializer
 from ..permissions import CanViewReports
 
 
-class AlertViewSet(viewsets.ModelViewSet):
+class AlertViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Alerts.
     
@@ -11,8 +11,11 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 import json
 import logging
+from statistics import NormalDist
 
+from .. import forecasting
 from ..authentication import CanViewReports, IsTechnicianOrReadOnly
+from ..metrics import callproc
 
 logger = logging.getLogger(__name__)
 
@@ -76,7 +79,7 @@ def abc_analysis_inventory(request):
         metric = request.query_params.get('metric', 'value')
 
         with connection.cursor() as cursor:
-            cursor.callproc('kpi.abc_inventory_analysis', [warehouse_code, int(period_months), metric])
+            callproc(cursor, 'kpi.abc_inventory_analysis', [warehouse_code, int(period_months), metric])
             results = []
             for row in cursor.fetchall():
                 if len(row) > 0 and row[0]:
@@ -151,7 +154,7 @@ def technician_productivity_report(request):
         department = request.query_params.get('department')
 
         with connection.cursor() as cursor:
-            cursor.callproc('kpi.generate_technician_productivity_report', [date_from, date_to, department])
+            callproc(cursor, 'kpi.generate_technician_productivity_report', [date_from, date_to, department])
             results = []
             for row in cursor.fetchall():
                 if len(row) > 0 and row[0]:
@@ -180,7 +183,7 @@ def technician_productivity_report(request):
         openapi.Parameter(
             'forecast_horizon_months', 
             openapi.IN_QUERY, 
-            description="Number of months ahead to forecast", 
+            description="Number of months ahead to forecast (at most the stored horizon)", 
             type=openapi.TYPE_INTEGER,
             default=3
         ),
@@ -190,6 +193,19 @@ def technician_productivity_report(request):
             description="Confidence level for prediction (0.8 = 80%)", 
             type=openapi.TYPE_NUMBER,
             default=0.8
+        ),
+        openapi.Parameter(
+            'sku',
+            openapi.IN_QUERY,
+            description="Single SKU",
+            type=openapi.TYPE_STRING
+        ),
+        openapi.Parameter(
+            'limit',
+            openapi.IN_QUERY,
+            description="Maximum number of SKUs, highest demand first",
+            type=openapi.TYPE_INTEGER,
+            default=100
         )
     ],
     responses={
@@ -201,7 +217,13 @@ def technician_productivity_report(request):
                     'internal_sku': openapi.Schema(type=openapi.TYPE_STRING),
                     'product_name': openapi.Schema(type=openapi.TYPE_STRING),
                     'predicted_demand': openapi.Schema(type=openapi.TYPE_NUMBER),
+                    'lower_bound': openapi.Schema(type=openapi.TYPE_NUMBER),
+                    'upper_bound': openapi.Schema(type=openapi.TYPE_NUMBER),
+                    'reorder_point': openapi.Schema(type=openapi.TYPE_NUMBER),
                     'confidence_level': openapi.Schema(type=openapi.TYPE_NUMBER),
+                    'method': openapi.Schema(type=openapi.TYPE_STRING, enum=['ses', 'seasonal', 'tsb']),
+                    'demand_pattern': openapi.Schema(type=openapi.TYPE_STRING),
+                    'available_qty': openapi.Schema(type=openapi.TYPE_NUMBER),
                     'reorder_recommendation': openapi.Schema(type=openapi.TYPE_STRING, enum=['YES', 'NO', 'CONSIDER']),
                     'forecast_date_start': openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE),
                     'forecast_date_end': openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE)
@@ -217,24 +239,37 @@ def technician_productivity_report(request):
 @permission_classes([IsAuthenticated, CanViewReports])
 def demand_forecasting(request):
     """
-    Generate demand forecasting report
+    Demand forecast per SKU, read from kpi.demand_forecasts (see core.forecasting;
+    the table is refreshed by the forecast_demand command).
+
+    The reorder recommendation compares stock available plus on order with the
+    forecast over the horizon: YES below the forecast, CONSIDER below the
+    reorder point, NO otherwise. The reorder point is the one-sided quantile
+    (stock that covers the demand with probability ``confidence_level``), so
+    it is lower than ``upper_bound``, the top of the two-sided interval.
     """
     try:
-        product_category = request.query_params.get('product_category')
-        forecast_horizon_months = request.query_params.get('forecast_horizon_months', 3)
-        confidence_level = request.query_params.get('confidence_level', 0.8)
-
-        with connection.cursor() as cursor:
-            cursor.callproc('kpi.demand_forecasting', [
-                product_category, int(forecast_horizon_months), float(confidence_level)
-            ])
-            results = []
-            for row in cursor.fetchall():
-                if len(row) > 0 and row[0]:
-                    results.append(json.loads(row[0]))
-            
-            return Response(results, status=status.HTTP_200_OK)
+        horizon = int(request.query_params.get('forecast_horizon_months', 3))
+        confidence_level = float(request.query_params.get('confidence_level', 0.8))
+        limit = int(request.query_params.get('limit', 100))
+    except ValueError:
+        return Response({'error': 'Invalid numeric parameter'}, status=status.HTTP_400_BAD_REQUEST)
+    if not 1 <= horizon <= forecasting.DEFAULT_HORIZON:
+        return Response(
+            {'error': f'forecast_horizon_months must be between 1 and {forecasting.DEFAULT_HORIZON}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if not 0 < confidence_level < 1:
+        return Response({'error': 'confidence_level must be between 0 and 1'}, status=status.HTTP_400_BAD_REQUEST)
+    limit = min(max(limit, 1), 1000)
 
+    try:
+        rows = forecasting.read_forecasts(
+            horizon,
+            group_code=request.query_params.get('product_category'),
+            sku=request.query_params.get('sku'),
+            limit=limit,
+        )
     except Exception as e:
         logger.error(f"Error generating demand forecasting: {str(e)}")
         return Response(
@@ -242,6 +277,37 @@ def demand_forecasting(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+    two_sided = NormalDist().inv_cdf((1 + confidence_level) / 2)
+    one_sided = NormalDist().inv_cdf(confidence_level)
+    results = []
+    for row in rows:
+        demand, std, available = float(row['demand']), float(row['std']), float(row['available'])
+        reorder_point = demand + one_sided * std
+        if available < demand:
+            recommendation = 'YES'
+        elif available < reorder_point:
+            recommendation = 'CONSIDER'
+        else:
+            recommendation = 'NO'
+        results.append({
+            'internal_sku': row['internal_sku'],
+            'product_name': row['product_name'],
+            'predicted_demand': round(demand, 2),
+            'lower_bound': round(max(demand - two_sided * std, 0.0), 2),
+            'upper_bound': round(demand + two_sided * std, 2),
+            'reorder_point': round(reorder_point, 2),
+            'confidence_level': confidence_level,
+            'method': row['method'],
+            'demand_pattern': row['pattern'],
+            'historical_avg': float(row['historical_avg']),
+            'available_qty': available,
+            'reorder_recommendation': recommendation,
+            'forecast_date_start': row['date_start'],
+            'forecast_date_end': row['date_end'],
+            'generated_at': row['generated_at'],
+        })
+    return Response(results, status=status.HTTP_200_OK)
+
 
 @swagger_auto_schema(
     method='get',
@@ -299,7 +365,7 @@ def financial_kpi_dashboard(request):
         department = request.query_params.get('department')
 
         with connection.cursor() as cursor:
-            cursor.callproc('kpi.generate_financial_kpis', [date_from, date_to, department])
+            callproc(cursor, 'kpi.generate_financial_kpis', [date_from, date_to, department])
             result = cursor.fetchone()
             
             if result and len(result) > 0 and result[0]:
@@ -3,36 +3,114 @@ ForgeDB API REST - Audit Log Views
 Automotive Workshop Management System
 """
 
+from datetime import datetime, time
+
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
 
+from .. import audit
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import AuditLog
 from ..serializers import AuditLogSerializer
 from ..permissions import CanViewReports
+from ..pagination import KeysetPagination
+
+VALUE_PARAMS = ('old_values', 'new_values', 'values')
+
+
+def _bound(request, name, end_of_day=False):
+    raw = request.query_params.get(name)
+    if not raw:
+        return None
+    value = parse_datetime(raw)
+    if value is None:
+        day = parse_date(raw)
+        if day is None:
+            raise ValidationError({name: f'Fecha inválida: {raw}'})
+        value = datetime.combine(day, time.max if end_of_day else time.min)
+    return timezone.make_aware(value) if timezone.is_naive(value) else value
 
 
-class AuditLogViewSet(viewsets.ModelViewSet):
+class AuditLogViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Audit Logs.
     
     Provides read-only access to audit log records with appropriate permissions,
     filtering, search, and ordering capabilities.
+    
+    - ``?values=status:COMPLETED`` (``old_values=`` / ``new_values=`` for one
+      side, repeatable) matches diff values through the GIN indexes; with
+      ``?search=`` (user agent) it only covers the last
+      AUDIT_SEARCH_DEFAULT_DAYS days unless ``changed_at__gte`` is given.
+    - GET ``timeline/<table>/<id>/``: the record's history, newest first,
+      with keyset pagination (see core.audit.timeline).
     """
     queryset = AuditLog.objects.all()
     serializer_class = AuditLogSerializer
     permission_classes = [permissions.IsAuthenticated, CanViewReports]
+    pagination_class = KeysetPagination
     
     # Filtering, search, and ordering
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['table_name', 'action', 'changed_by']
-    search_fields = ['old_values', 'new_values', 'user_agent']
+    search_fields = ['user_agent']
     ordering_fields = ['changed_at', 'table_name', 'action']
     ordering = ['-changed_at']
     
     # Audit logs should be read-only
     http_method_names = ['get', 'head', 'options']
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            return queryset
+        params = self.request.query_params
+        since = _bound(self.request, 'changed_at__gte')
+        until = _bound(self.request, 'changed_at__lte', end_of_day=True)
+        try:
+            filters = {name: [audit.parse_value_filter(raw) for raw in params.getlist(name)]
+                       for name in VALUE_PARAMS}
+        except ValueError as e:
+            raise ValidationError({'values': str(e)})
+        if any(filters.values()) or params.get('search'):
+            return audit.search(queryset, since=since, until=until, **filters)
+        if since is not None:
+            queryset = queryset.filter(changed_at__gte=since)
+        if until is not None:
+            queryset = queryset.filter(changed_at__lte=until)
+        return queryset
+
+    @action(detail=False, methods=['get'], url_path=r'timeline/(?P<table>[a-z_]+)/(?P<record_id>\d+)')
+    def timeline(self, request, table, record_id):
+        try:
+            limit = min(int(request.query_params.get('page_size', audit.TIMELINE_PAGE_SIZE)),
+                        audit.MAX_TIMELINE_PAGE_SIZE)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            raise ValidationError({'page_size': 'Debe ser un entero positivo'})
+        try:
+            entries, cursor = audit.timeline(table, int(record_id), request.query_params.get('cursor'), limit)
+        except ValueError as e:
+            raise ValidationError({'cursor': str(e)})
+        next_link = None
+        if cursor:
+            next_link = replace_query_param(request.build_absolute_uri(), 'cursor', cursor)
+        return Response({
+            'table_name': table,
+            'record_id': int(record_id),
+            'next': next_link,
+            'results': entries,
+        })
+    
     def perform_create(self, serializer):
         """Audit logs are created automatically by the system, not through API"""
         pass
\ No newline at end of file
@@ -3,16 +3,20 @@ ForgeDB API REST - Business Rule Views
 Automotive Workshop Management System
 """
 
+from django.db import DataError, transaction
 from rest_framework import viewsets, permissions
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import BusinessRule
 from ..serializers import BusinessRuleSerializer
 from ..permissions import IsWorkshopAdmin
 
 
-class BusinessRuleViewSet(viewsets.ModelViewSet):
+class BusinessRuleViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Business Rules.
     
@@ -32,4 +36,18 @@ class BusinessRuleViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         """Save the business rule record"""
-        serializer.save()
\ No newline at end of file
+        self._save_compiled(serializer)
+
+    def perform_update(self, serializer):
+        self._save_compiled(serializer)
+
+    def _save_compiled(self, serializer):
+        """
+        Saving a rule recompiles the table's trigger function (migration 0023);
+        a SQL condition that does not compile rolls the save back.
+        """
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except DataError as e:
+            raise ValidationError({'condition_text': [str(e).splitlines()[0]]})
\ No newline at end of file
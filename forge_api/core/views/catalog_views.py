@@ -3,10 +3,16 @@ ForgeDB API REST - Catalog Reference Views
 Automotive Workshop Management System
 """
 
-from rest_framework import viewsets, permissions
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
+from rest_framework import viewsets, permissions, status
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import (
     Category, EquipmentType, FuelCode, AspirationCode, TransmissionCode, DrivetrainCode,
     ColorCode, PositionCode, FinishCode, SourceCode, ConditionCode, UOMCode, Currency
@@ -17,12 +23,14 @@ from ..serializers import (
     PositionCodeSerializer, FinishCodeSerializer, SourceCodeSerializer,
     ConditionCodeSerializer, UOMCodeSerializer, CurrencySerializer
 )
+from .. import reference_codes, reference_data
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Categories"""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    conditional_models = (EquipmentType,)  # equipment_type_count
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_active']
@@ -31,7 +39,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
     ordering = ['sort_order', 'name']
 
 
-class EquipmentTypeViewSet(viewsets.ModelViewSet):
+class EquipmentTypeViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Equipment Types"""
     queryset = EquipmentType.objects.all()
     serializer_class = EquipmentTypeSerializer
@@ -43,7 +51,7 @@ class EquipmentTypeViewSet(viewsets.ModelViewSet):
     ordering = ['category', 'name']
 
 
-class FuelCodeViewSet(viewsets.ModelViewSet):
+class FuelCodeViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Fuel Codes"""
     queryset = FuelCode.objects.all()
     serializer_class = FuelCodeSerializer
@@ -53,7 +61,7 @@ class FuelCodeViewSet(viewsets.ModelViewSet):
     ordering = ['fuel_code']
 
 
-class AspirationCodeViewSet(viewsets.ModelViewSet):
+class AspirationCodeViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Aspiration Codes"""
     queryset = AspirationCode.objects.all()
     serializer_class = AspirationCodeSerializer
@@ -63,7 +71,7 @@ class AspirationCodeViewSet(viewsets.ModelViewSet):
     ordering = ['aspiration_code']
 
 
-class TransmissionCodeViewSet(viewsets.ModelViewSet):
+class TransmissionCodeViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Transmission Codes"""
     queryset = TransmissionCode.objects.all()
     serializer_class = TransmissionCodeSerializer
@@ -73,7 +81,7 @@ class TransmissionCodeViewSet(viewsets.ModelViewSet):
     ordering = ['transmission_code']
 
 
-class DrivetrainCodeViewSet(viewsets.ModelViewSet):
+class DrivetrainCodeViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Drivetrain Codes"""
     queryset = DrivetrainCode.objects.all()
     serializer_class = DrivetrainCodeSerializer
@@ -83,7 +91,7 @@ class DrivetrainCodeViewSet(viewsets.ModelViewSet):
     ordering = ['drivetrain_code']
 
 
-class ColorCodeViewSet(viewsets.ModelViewSet):
+class ColorCodeViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Color Codes"""
     queryset = ColorCode.objects.all()
     serializer_class = ColorCodeSerializer
@@ -95,7 +103,7 @@ class ColorCodeViewSet(viewsets.ModelViewSet):
     ordering = ['brand', 'sort_order', 'color_code']
 
 
-class PositionCodeViewSet(viewsets.ModelViewSet):
+class PositionCodeViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Position Codes"""
     queryset = PositionCode.objects.all()
     serializer_class = PositionCodeSerializer
@@ -107,7 +115,7 @@ class PositionCodeViewSet(viewsets.ModelViewSet):
     ordering = ['sort_order', 'position_code']
 
 
-class FinishCodeViewSet(viewsets.ModelViewSet):
+class FinishCodeViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Finish Codes"""
     queryset = FinishCode.objects.all()
     serializer_class = FinishCodeSerializer
@@ -118,7 +126,7 @@ class FinishCodeViewSet(viewsets.ModelViewSet):
     ordering = ['sort_order', 'finish_code']
 
 
-class SourceCodeViewSet(viewsets.ModelViewSet):
+class SourceCodeViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Source Codes"""
     queryset = SourceCode.objects.all()
     serializer_class = SourceCodeSerializer
@@ -130,7 +138,7 @@ class SourceCodeViewSet(viewsets.ModelViewSet):
     ordering = ['sort_order', 'source_code']
 
 
-class ConditionCodeViewSet(viewsets.ModelViewSet):
+class ConditionCodeViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Condition Codes"""
     queryset = ConditionCode.objects.all()
     serializer_class = ConditionCodeSerializer
@@ -141,7 +149,7 @@ class ConditionCodeViewSet(viewsets.ModelViewSet):
     ordering = ['sort_order', 'condition_code']
 
 
-class UOMCodeViewSet(viewsets.ModelViewSet):
+class UOMCodeViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing UOM Codes"""
     queryset = UOMCode.objects.all()
     serializer_class = UOMCodeSerializer
@@ -152,7 +160,7 @@ class UOMCodeViewSet(viewsets.ModelViewSet):
     ordering = ['uom_code']
 
 
-class CurrencyViewSet(viewsets.ModelViewSet):
+class CurrencyViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Currencies"""
     queryset = Currency.objects.all()
     serializer_class = CurrencySerializer
@@ -169,3 +177,81 @@ class CurrencyViewSet(viewsets.ModelViewSet):
             kwargs['partial'] = True
         return super().get_serializer(*args, **kwargs)
 
+
+class ReferenceBundleView(APIView):
+    """
+    All small catalogs in one versioned document.
+
+    Served from the worker's snapshot (core.reference_data). Clients send the
+    ETag back in If-None-Match and get 304 while the catalogs are unchanged.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        snapshot = reference_data.get_snapshot()
+        # Weak comparison: CompressionMiddleware sends the ETag back as W/"...".
+        response = get_conditional_response(request, etag=snapshot.etag)
+        if response is None:
+            response = HttpResponse(snapshot.body, content_type='application/json')
+        response['ETag'] = snapshot.etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class ReferenceBundleVersionView(APIView):
+    """Current reference-data version, without the catalogs."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return JsonResponse({'version': reference_data.current_version()})
+
+
+class ReferenceCodeUsageView(APIView):
+    """
+    GET /api/v1/reference-codes/<category>/usage/[?codes=A,B]
+
+    Rows using each code of a category, per referencing ``table.column``
+    (core.reference_codes.usage_counts). Without ``codes`` every code in use
+    is listed.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, category):
+        codes = request.query_params.get('codes')
+        codes = [code.strip() for code in codes.split(',') if code.strip()] if codes else None
+        try:
+            counts = reference_codes.usage_counts(category, codes)
+        except reference_codes.ReferenceCodeError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            'category': category,
+            'results': [
+                {'code': code, 'total': sum(counts.get(code, {}).values()), 'references': counts.get(code, {})}
+                for code in (codes if codes is not None else sorted(counts))
+            ],
+        })
+
+
+class ReferenceCodeRenameView(APIView):
+    """
+    POST /api/v1/reference-codes/<category>/<code>/rename/
+
+    Body: ``{"new_code": "...", "name_es": "...", ...}``. Renames the code and
+    every row referencing it in one transaction; the other fields of the code
+    table given in the body are validated by their model fields and applied
+    to the renamed row.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, category, code):
+        try:
+            reference_codes.get_table(category)
+        except reference_codes.ReferenceCodeError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            fields = reference_codes.clean_fields(category, request.data)
+            new_code = reference_codes.normalize_code(category, request.data.get('new_code'))
+            result = reference_codes.rename_code(category, code, new_code, **fields)
+        except reference_codes.ReferenceCodeError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
@@ -10,14 +10,18 @@ from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
+from ..entity_stats import annotate_client_summary, work_order_stats
 from ..models import Client, Technician
-from ..serializers import ClientSerializer
+from ..serializers import ClientSerializer, ClientSummarySerializer
 from ..permissions import CanManageClients
+from ..pagination import KeysetPagination
 
 logger = logging.getLogger(__name__)
 
 
-class ClientViewSet(viewsets.ModelViewSet):
+class ClientViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Clients.
 
@@ -26,7 +30,9 @@ class ClientViewSet(viewsets.ModelViewSet):
     """
     queryset = Client.objects.all()
     serializer_class = ClientSerializer
+    conditional_models = ()  # available_credit only reads the row
     permission_classes = [permissions.IsAuthenticated]  # Temporarily simplified for testing
+    pagination_class = KeysetPagination
     
     # Filtering, search, and ordering
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -35,6 +41,17 @@ class ClientViewSet(viewsets.ModelViewSet):
     ordering_fields = ['name', 'created_at', 'updated_at', 'credit_used']
     ordering = ['-created_at']
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'summary':
+            queryset = annotate_client_summary(queryset)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == 'summary':
+            return ClientSummarySerializer
+        return super().get_serializer_class()
+
     def perform_create(self, serializer):
         """Set created_by to current user's ID on creation"""
         # Don't set created_by - let it default to NULL
@@ -55,4 +72,18 @@ class ClientViewSet(viewsets.ModelViewSet):
             )
         
         exists = Client.objects.filter(client_code=code).exists()
-        return Response({'exists': exists, 'code': code})
\ No newline at end of file
+        return Response({'exists': exists, 'code': code})
+
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """
+        The client list with ``equipment_count``, ``open_work_orders`` and
+        ``last_service_date``, annotated as subqueries of the page query.
+        Same filters, search, ordering and cursor as the list.
+        """
+        return self.list(request)
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """Work order status histogram, invoiced total, last service and average cycle time."""
+        return Response(work_order_stats('client', self.get_object().pk))
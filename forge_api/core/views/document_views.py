@@ -7,12 +7,14 @@ from rest_framework import viewsets, permissions
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import Document
 from ..serializers import DocumentSerializer
 from ..permissions import CanViewReports
 
 
-class DocumentViewSet(viewsets.ModelViewSet):
+class DocumentViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Documents.
     
@@ -4,15 +4,21 @@ Automotive Workshop Management System
 """
 
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
-from ..models import Equipment
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
+from ..entity_stats import work_order_stats
+from ..models import Client, Equipment
 from ..serializers import EquipmentSerializer
 from ..permissions import CanManageClients
+from ..pagination import KeysetPagination
 
 
-class EquipmentViewSet(viewsets.ModelViewSet):
+class EquipmentViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Equipment (vehicles).
     
@@ -21,7 +27,9 @@ class EquipmentViewSet(viewsets.ModelViewSet):
     """
     queryset = Equipment.objects.all()
     serializer_class = EquipmentSerializer
+    conditional_models = (Client,)  # get_client
     permission_classes = [permissions.IsAuthenticated, CanManageClients]
+    pagination_class = KeysetPagination
     
     # Filtering, search, and ordering
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -32,4 +40,9 @@ class EquipmentViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         """Save the equipment record"""
-        serializer.save()
\ No newline at end of file
+        serializer.save()
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """Work order status histogram, invoiced total, last service and average cycle time."""
+        return Response(work_order_stats('equipment', self.get_object().pk))
@@ -7,11 +7,13 @@ from rest_framework import viewsets, permissions
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import Fitment
 from ..serializers import FitmentSerializer
 
 
-class FitmentViewSet(viewsets.ModelViewSet):
+class FitmentViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Fitments"""
     queryset = Fitment.objects.all().select_related('equipment', 'verified_by')
     serializer_class = FitmentSerializer
@@ -1,7 +1,8 @@
 """
 Health check views for API monitoring
 """
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
 from django.db import connection
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
@@ -13,6 +14,15 @@ from rest_framework.permissions import AllowAny
 import time
 from datetime import datetime
 
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from ..database import get_pool_status
+from ..metrics import render_metrics
+
+# Server connection usage above this share of max_connections is reported
+# as degraded so workers can be scaled back before new connections fail.
+POOL_USAGE_WARNING_PCT = 90
+
 
 class HealthCheckView(APIView):
     """
@@ -66,6 +76,12 @@ class DetailedHealthCheckView(APIView):
             }
             health_data['status'] = 'unhealthy'
         
+        # Connection pool check
+        if health_data['checks']['database']['status'] == 'healthy':
+            health_data['checks']['database_pool'] = _pool_check()
+            if health_data['checks']['database_pool']['status'] == 'unhealthy':
+                health_data['status'] = 'unhealthy'
+
         # API endpoints check
         health_data['checks']['api'] = {
             'status': 'healthy',
@@ -81,6 +97,33 @@ class DetailedHealthCheckView(APIView):
         return Response(health_data, status=status_code)
 
 
+def _pool_check():
+    """Summarize connection pool usage for the detailed health check."""
+    try:
+        pool = get_pool_status()
+    except Exception as e:
+        return {
+            'status': 'unhealthy',
+            'message': f'Connection pool status unavailable: {str(e)}'
+        }
+    usage = pool['server']['usage_pct']
+    pool['status'] = 'degraded' if usage >= POOL_USAGE_WARNING_PCT else 'healthy'
+    pool['message'] = f"{pool['server']['connections']}/{pool['server']['max_connections']} server connections in use"
+    return pool
+
+
+class DatabasePoolStatusView(APIView):
+    """
+    Database connection pool metrics
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        pool = _pool_check()
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE if pool['status'] == 'unhealthy' else status.HTTP_200_OK
+        return Response(pool, status=status_code)
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class SimpleHealthView(View):
     """
@@ -88,4 +131,21 @@ class SimpleHealthView(View):
     """
     
     def get(self, request):
-        return JsonResponse({'status': 'ok'})
\ No newline at end of file
+        return JsonResponse({'status': 'ok'})
+
+
+class MetricsView(View):
+    """
+    Prometheus/OpenMetrics scrape endpoint.
+
+    The scraper must send ``Authorization: Bearer <METRICS_TOKEN>``. Without
+    a token the endpoint is only open with DEBUG on.
+    """
+
+    def get(self, request):
+        token = getattr(settings, 'METRICS_TOKEN', '')
+        if not token and not settings.DEBUG:
+            return HttpResponse(status=403)
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return HttpResponse(status=401)
+        return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
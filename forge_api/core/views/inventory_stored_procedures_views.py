@@ -6,13 +6,16 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.conf import settings
 from django.db import connection
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 import json
 import logging
 
-from ..authentication import CanManageInventory, IsTechnicianOrReadOnly
+from .. import replenishment
+from ..authentication import CanManageInventory, IsTechnicianOrReadOnly, get_technician_id
+from ..metrics import callproc
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +64,7 @@ def release_reserved_stock(request):
             )
 
         with connection.cursor() as cursor:
-            cursor.callproc('inv.release_reserved_stock_for_wo', [wo_id, internal_sku, warehouse_code])
+            callproc(cursor, 'inv.release_reserved_stock_for_wo', [wo_id, internal_sku, warehouse_code])
             result = cursor.fetchone()
 
             if result and len(result) > 0:
@@ -82,12 +85,13 @@ def release_reserved_stock(request):
 
 @swagger_auto_schema(
     method='post',
-    operation_description="Automatic replenishment based on stock levels",
+    operation_description="Plan replenishment for every (warehouse, SKU) pair and create draft purchase orders",
     request_body=openapi.Schema(
         type=openapi.TYPE_OBJECT,
         properties={
             'warehouse_code': openapi.Schema(type=openapi.TYPE_STRING, description='Warehouse code (optional)'),
-            'auto_order_threshold': openapi.Schema(type=openapi.TYPE_NUMBER, description='Threshold to trigger auto-order')
+            'service_level': openapi.Schema(type=openapi.TYPE_NUMBER, description='Target service level (default 0.95)'),
+            'dry_run': openapi.Schema(type=openapi.TYPE_BOOLEAN, description='Only return suggestions (default true)')
         }
     ),
     responses={
@@ -97,7 +101,10 @@ def release_reserved_stock(request):
                 'success': openapi.Schema(type=openapi.TYPE_BOOLEAN),
                 'items_processed': openapi.Schema(type=openapi.TYPE_INTEGER),
                 'orders_created': openapi.Schema(type=openapi.TYPE_INTEGER),
-                'items_ordered': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_STRING))
+                'items_ordered': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_STRING)),
+                'unassigned': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'suggestions': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_OBJECT)),
+                'orders': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_OBJECT))
             }
         ),
         400: 'Bad request',
@@ -109,24 +116,24 @@ def release_reserved_stock(request):
 @permission_classes([IsAuthenticated, CanManageInventory])
 def auto_replenishment(request):
     """
-    Trigger automatic replenishment based on stock levels
+    Plan replenishment (see core.replenishment) and, unless dry_run, replace
+    the planner's draft purchase orders with one per supplier and warehouse.
     """
     try:
-        warehouse_code = request.data.get('warehouse_code')
-        auto_order_threshold = request.data.get('auto_order_threshold', 0.8)
-
-        with connection.cursor() as cursor:
-            cursor.callproc('inv.auto_replenishment', [warehouse_code, auto_order_threshold])
-            result = cursor.fetchone()
-
-            if result and len(result) > 0:
-                return Response(json.loads(result[0]), status=status.HTTP_200_OK)
-            else:
-                return Response(
-                    {'error': 'No result returned from stored procedure'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+        service_level = float(request.data.get('service_level') or settings.REPLENISHMENT_SERVICE_LEVEL)
+    except (TypeError, ValueError):
+        return Response({'error': 'Invalid service_level'}, status=status.HTTP_400_BAD_REQUEST)
+    if not 0.5 <= service_level < 1:
+        return Response({'error': 'service_level must be between 0.5 and 1'}, status=status.HTTP_400_BAD_REQUEST)
+    dry_run = str(request.data.get('dry_run', True)).lower() not in ('false', '0', 'no')
 
+    try:
+        result = replenishment.run(
+            warehouse_code=request.data.get('warehouse_code') or None,
+            service_level=service_level,
+            dry_run=dry_run,
+            created_by=get_technician_id(request.user),
+        )
     except Exception as e:
         logger.error(f"Error in auto replenishment: {str(e)}")
         return Response(
@@ -134,6 +141,22 @@ def auto_replenishment(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+    suggestions = result['suggestions']
+    return Response({
+        'success': True,
+        'dry_run': dry_run,
+        'items_processed': result['pairs'],
+        'orders_created': len(result['orders']),
+        'items_ordered': sorted({s.internal_sku for s in suggestions if s.supplier_id is not None}),
+        'unassigned': result['unassigned'],
+        'suggestions': [s._asdict() for s in suggestions],
+        'orders': [
+            {'po_id': order.po_id, 'po_number': order.po_number, 'supplier_id': order.supplier_id,
+             'subtotal': order.subtotal, 'expected_delivery_date': order.expected_delivery_date}
+            for order in result['orders']
+        ],
+    }, status=status.HTTP_200_OK)
+
 
 @swagger_auto_schema(
     method='get',
@@ -185,7 +208,7 @@ def calculate_inventory_aging(request):
         months = request.query_params.get('months', 12)
 
         with connection.cursor() as cursor:
-            cursor.callproc('inv.calculate_inventory_age', [warehouse_code, months])
+            callproc(cursor, 'inv.calculate_inventory_age', [warehouse_code, months])
             results = []
             for row in cursor.fetchall():
                 if len(row) > 0 and row[0]:
@@ -7,6 +7,8 @@ from rest_framework import viewsets, permissions
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import Bin, PriceList, ProductPrice, PurchaseOrder, POItem
 from ..serializers import (
     BinSerializer, PriceListSerializer, ProductPriceSerializer,
@@ -14,7 +16,7 @@ from ..serializers import (
 )
 
 
-class BinViewSet(viewsets.ModelViewSet):
+class BinViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Bins"""
     queryset = Bin.objects.all().select_related('warehouse_code')
     serializer_class = BinSerializer
@@ -26,7 +28,7 @@ class BinViewSet(viewsets.ModelViewSet):
     ordering = ['warehouse_code', 'zone', 'aisle', 'rack', 'level', 'position']
 
 
-class PriceListViewSet(viewsets.ModelViewSet):
+class PriceListViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Price Lists"""
     queryset = PriceList.objects.all()
     serializer_class = PriceListSerializer
@@ -38,7 +40,7 @@ class PriceListViewSet(viewsets.ModelViewSet):
     ordering = ['price_list_code']
 
 
-class ProductPriceViewSet(viewsets.ModelViewSet):
+class ProductPriceViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Product Prices"""
     queryset = ProductPrice.objects.all().select_related('price_list')
     serializer_class = ProductPriceSerializer
@@ -49,7 +51,7 @@ class ProductPriceViewSet(viewsets.ModelViewSet):
     ordering = ['price_list', 'internal_sku', '-valid_from']
 
 
-class PurchaseOrderViewSet(viewsets.ModelViewSet):
+class PurchaseOrderViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Purchase Orders"""
     queryset = PurchaseOrder.objects.all().select_related('supplier', 'created_by', 'approved_by')
     serializer_class = PurchaseOrderSerializer
@@ -61,7 +63,7 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
     ordering = ['-order_date', 'po_number']
 
 
-class POItemViewSet(viewsets.ModelViewSet):
+class POItemViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Purchase Order Items"""
     queryset = POItem.objects.all().select_related('po')
     serializer_class = POItemSerializer
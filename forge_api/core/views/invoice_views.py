@@ -7,13 +7,14 @@ from rest_framework import viewsets, permissions
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..fieldsets import SparseFieldsetMixin
 from ..models import Invoice
 from ..serializers import InvoiceSerializer
 from ..permissions import IsTechnicianOrReadOnly
-from ..pagination import OptimizedCursorPagination
+from ..pagination import KeysetPagination
 
 
-class InvoiceViewSet(viewsets.ModelViewSet):
+class InvoiceViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Invoices.
     
@@ -23,7 +24,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
     queryset = Invoice.objects.all().prefetch_related('invoiceitem_set', 'payment_set')
     serializer_class = InvoiceSerializer
     permission_classes = [permissions.IsAuthenticated, IsTechnicianOrReadOnly]
-    pagination_class = OptimizedCursorPagination
+    pagination_class = KeysetPagination
     
     # Filtering, search, and ordering
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -7,11 +7,13 @@ from rest_framework import viewsets, permissions
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import WOMetric
 from ..serializers import WOMetricSerializer
 
 
-class WOMetricViewSet(viewsets.ModelViewSet):
+class WOMetricViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Work Order Metrics"""
     queryset = WOMetric.objects.all().select_related('wo')
     serializer_class = WOMetricSerializer
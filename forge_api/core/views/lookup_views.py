@@ -0,0 +1,39 @@
+"""
+Lookup endpoint for remote select widgets: ``(id, label)`` pairs with
+keyset pagination and prefix search (core.lookups).
+"""
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .. import lookups
+
+# Query parameters that are not exact-match filters.
+RESERVED_PARAMS = {'q', 'after', 'limit', 'ids'}
+
+
+class LookupView(APIView):
+    """
+    GET /api/v1/lookups/<kind>/?q=<prefix>&after=<cursor>&limit=<n>
+
+    Returns ``{"results": [{"id", "label"}], "next": cursor}``. With
+    ``?ids=1,2`` it returns the labels of those ids instead (used to render
+    the selected value of a form).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, kind):
+        params = request.query_params
+        try:
+            if 'ids' in params:
+                ids = [i for i in params['ids'].split(',') if i]
+                return Response({'results': lookups.labels(kind, ids), 'next': None})
+            filters = {k: v for k, v in params.items() if k not in RESERVED_PARAMS}
+            page = lookups.search(
+                kind, q=params.get('q', ''), after=params.get('after'),
+                limit=params.get('limit'), filters=filters,
+            )
+        except lookups.InvalidLookup as e:
+            code = status.HTTP_404_NOT_FOUND if kind not in lookups.LOOKUPS else status.HTTP_400_BAD_REQUEST
+            return Response({'detail': str(e)}, status=code)
+        return Response(page)
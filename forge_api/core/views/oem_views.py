@@ -7,13 +7,16 @@ from rest_framework import viewsets, permissions
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import OEMBrand, OEMCatalogItem, OEMEquivalence
+from ..pagination import KeysetPagination
 from ..serializers import (
     OEMBrandSerializer, OEMCatalogItemSerializer, OEMEquivalenceSerializer
 )
 
 
-class OEMBrandViewSet(viewsets.ModelViewSet):
+class OEMBrandViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing OEM Brands"""
     queryset = OEMBrand.objects.all()
     serializer_class = OEMBrandSerializer
@@ -24,11 +27,12 @@ class OEMBrandViewSet(viewsets.ModelViewSet):
     ordering = ['name']
 
 
-class OEMCatalogItemViewSet(viewsets.ModelViewSet):
+class OEMCatalogItemViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing OEM Catalog Items"""
     queryset = OEMCatalogItem.objects.all().select_related('oem_code', 'group_code')
     serializer_class = OEMCatalogItemSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]  # Allow read without auth for debugging
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['oem_code', 'group_code', 'is_discontinued', 'is_active', 'item_type']
     search_fields = ['part_number', 'description_es', 'description_en']
@@ -36,11 +40,12 @@ class OEMCatalogItemViewSet(viewsets.ModelViewSet):
     ordering = ['oem_code', 'part_number']
 
 
-class OEMEquivalenceViewSet(viewsets.ModelViewSet):
+class OEMEquivalenceViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing OEM Equivalences"""
     queryset = OEMEquivalence.objects.all().select_related('oem_code', 'verified_by')
     serializer_class = OEMEquivalenceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['oem_code', 'equivalence_type', 'verified_by']
     search_fields = ['oem_part_number', 'aftermarket_sku', 'notes']
@@ -7,12 +7,15 @@ from rest_framework import viewsets, permissions
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import ProductMaster
 from ..serializers import ProductMasterSerializer
 from ..permissions import CanManageInventory
+from ..pagination import KeysetPagination
 
 
-class ProductMasterViewSet(viewsets.ModelViewSet):
+class ProductMasterViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Product Master records.
     
@@ -22,13 +25,14 @@ class ProductMasterViewSet(viewsets.ModelViewSet):
     queryset = ProductMaster.objects.all()
     serializer_class = ProductMasterSerializer
     permission_classes = [permissions.IsAuthenticated, CanManageInventory]
+    pagination_class = KeysetPagination
     
     # Filtering, search, and ordering
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['group_code', 'brand']
     search_fields = ['product_code', 'barcode', 'name', 'description']
-    ordering_fields = ['product_code', 'name', 'created_at', 'updated_at']
-    ordering = ['product_code']
+    ordering_fields = ['internal_sku', 'name', 'created_at', 'updated_at']
+    ordering = ['internal_sku']
     
     def perform_create(self, serializer):
         """Save the product master record"""
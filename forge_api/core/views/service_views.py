@@ -3,22 +3,32 @@ ForgeDB API REST - Additional Service Views
 Automotive Workshop Management System
 """
 
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Case, F, JSONField, OuterRef, Subquery, When
+from django.db.models.functions import JSONObject
 
+from ..authentication import get_technician_id
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
+from ..quotes import QuoteConversionError, convert_to_work_order
 from ..models import (
     WOItem, WOService, FlatRateStandard, ServiceChecklist,
-    InvoiceItem, Payment, Quote, QuoteItem
+    InvoiceItem, Payment, Quote, QuoteItem, Invoice
 )
 from ..serializers import (
     WOItemSerializer, WOServiceSerializer, FlatRateStandardSerializer,
     ServiceChecklistSerializer, InvoiceItemSerializer, PaymentSerializer,
-    QuoteSerializer, QuoteItemSerializer
+    QuoteSerializer, QuoteItemSerializer, QuoteWithItemsSerializer,
+    QuoteConversionSerializer, WorkOrderSerializer
 )
 
 
-class WOItemViewSet(viewsets.ModelViewSet):
+class WOItemViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Work Order Items"""
     queryset = WOItem.objects.all().select_related('wo')
     serializer_class = WOItemSerializer
@@ -28,7 +38,7 @@ class WOItemViewSet(viewsets.ModelViewSet):
     ordering = ['wo', 'item_id']
 
 
-class WOServiceViewSet(viewsets.ModelViewSet):
+class WOServiceViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Work Order Services"""
     queryset = WOService.objects.all().select_related('wo', 'flat_rate', 'technician')
     serializer_class = WOServiceSerializer
@@ -40,7 +50,7 @@ class WOServiceViewSet(viewsets.ModelViewSet):
     ordering = ['wo', 'service_id']
 
 
-class FlatRateStandardViewSet(viewsets.ModelViewSet):
+class FlatRateStandardViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Flat Rate Standards"""
     queryset = FlatRateStandard.objects.all().select_related('equipment_type', 'group_code')
     serializer_class = FlatRateStandardSerializer
@@ -51,7 +61,7 @@ class FlatRateStandardViewSet(viewsets.ModelViewSet):
     ordering = ['service_code']
 
 
-class ServiceChecklistViewSet(viewsets.ModelViewSet):
+class ServiceChecklistViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Service Checklists"""
     queryset = ServiceChecklist.objects.all().select_related('flat_rate')
     serializer_class = ServiceChecklistSerializer
@@ -63,7 +73,7 @@ class ServiceChecklistViewSet(viewsets.ModelViewSet):
     ordering = ['flat_rate', 'sequence_no']
 
 
-class InvoiceItemViewSet(viewsets.ModelViewSet):
+class InvoiceItemViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Invoice Items"""
     queryset = InvoiceItem.objects.all().select_related('invoice')
     serializer_class = InvoiceItemSerializer
@@ -74,7 +84,7 @@ class InvoiceItemViewSet(viewsets.ModelViewSet):
     ordering = ['invoice', 'invoice_item_id']
 
 
-class PaymentViewSet(viewsets.ModelViewSet):
+class PaymentViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Payments"""
     queryset = Payment.objects.all().select_related('invoice')
     serializer_class = PaymentSerializer
@@ -86,7 +96,7 @@ class PaymentViewSet(viewsets.ModelViewSet):
     ordering = ['-payment_date', 'invoice']
 
 
-class QuoteViewSet(viewsets.ModelViewSet):
+class QuoteViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Quotes"""
     queryset = Quote.objects.all().select_related('client', 'equipment', 'created_by', 'converted_to_wo').prefetch_related('items')
     serializer_class = QuoteSerializer
@@ -97,8 +107,92 @@ class QuoteViewSet(viewsets.ModelViewSet):
     ordering_fields = ['quote_date', 'created_at', 'total']
     ordering = ['-quote_date', '-quote_number']
 
-
-class QuoteItemViewSet(viewsets.ModelViewSet):
+    # ?expand=<name> -> (serializer field, annotation). Both resolve in the
+    # quotes query itself: a join to the converted work order and a
+    # correlated subquery for its latest invoice.
+    EXPANSIONS = {
+        'work_order': ('work_order', lambda: Case(
+            When(converted_to_wo__isnull=False, then=JSONObject(
+                wo_id=F('converted_to_wo_id'),
+                wo_number=F('converted_to_wo__wo_number'),
+                status=F('converted_to_wo__status'),
+            )),
+            default=None,
+            output_field=JSONField(),
+        )),
+        'invoice_status': ('invoice', lambda: Subquery(
+            Invoice.objects.filter(wo_id=OuterRef('converted_to_wo_id'))
+            .order_by('-issue_date', '-invoice_id')
+            .values(data=JSONObject(
+                invoice_id=F('invoice_id'),
+                invoice_number=F('invoice_number'),
+                status=F('status'),
+                total_amount=F('total_amount'),
+            ))[:1],
+            output_field=JSONField(),
+        )),
+    }
+
+    def get_expand(self):
+        """Names requested in ``?expand=``; unknown names are a 400."""
+        raw = self.request.query_params.get('expand', '') if self.request else ''
+        names = [name.strip() for name in raw.split(',') if name.strip()]
+        unknown = sorted(set(names) - set(self.EXPANSIONS))
+        if unknown:
+            raise ValidationError({'expand': [
+                f"Unknown expansion(s): {', '.join(unknown)}. "
+                f"Valid: {', '.join(sorted(self.EXPANSIONS))}"
+            ]})
+        return names
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.annotate(**{
+                self.EXPANSIONS[name][0]: self.EXPANSIONS[name][1]()
+                for name in self.get_expand()
+            })
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ('list', 'retrieve'):
+            context['expand'] = {self.EXPANSIONS[name][0] for name in self.get_expand()}
+        return context
+
+    def get_serializer_class(self):
+        """Creating a quote takes its items nested and computes the totals"""
+        if self.action == 'create':
+            return QuoteWithItemsSerializer
+        return super().get_serializer_class()
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    @action(detail=True, methods=['post'], url_path='convert-to-work-order')
+    def convert_to_work_order(self, request, pk=None):
+        """
+        Create a work order with one service per quote item and mark the
+        quote as converted, in a single transaction.
+        """
+        quote = self.get_object()
+        options = QuoteConversionSerializer(data=request.data)
+        options.is_valid(raise_exception=True)
+        try:
+            work_order = convert_to_work_order(
+                quote.pk,
+                service_type=options.validated_data['service_type'],
+                created_by=get_technician_id(request.user),
+            )
+        except QuoteConversionError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+        return Response(
+            WorkOrderSerializer(work_order, context=self.get_serializer_context()).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class QuoteItemViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Quote Items"""
     queryset = QuoteItem.objects.all().select_related('quote', 'flat_rate')
     serializer_class = QuoteItemSerializer
@@ -7,12 +7,15 @@ from rest_framework import viewsets, permissions
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
-from ..models import Stock
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
+from ..models import ProductMaster, Stock
 from ..serializers import StockSerializer
 from ..permissions import CanManageInventory
+from ..pagination import KeysetPagination
 
 
-class StockViewSet(viewsets.ModelViewSet):
+class StockViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Stock records.
     
@@ -21,14 +24,16 @@ class StockViewSet(viewsets.ModelViewSet):
     """
     queryset = Stock.objects.all().select_related('warehouse', 'product')
     serializer_class = StockSerializer
+    conditional_models = (ProductMaster,)  # is_below_minimum, needs_reorder
     permission_classes = [permissions.IsAuthenticated, CanManageInventory]
+    pagination_class = KeysetPagination
     
     # Filtering, search, and ordering
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['warehouse', 'product', 'qty_on_hand', 'qty_reserved']
     search_fields = ['product__product_code', 'product__name']
-    ordering_fields = ['qty_on_hand', 'qty_reserved', 'last_movement_date', 'created_at']
-    ordering = ['-last_movement_date']
+    ordering_fields = ['qty_on_hand', 'qty_reserved', 'updated_at', 'created_at']
+    ordering = ['-updated_at']
     
     def perform_create(self, serializer):
         """Save the stock record"""
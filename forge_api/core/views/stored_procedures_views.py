@@ -17,6 +17,7 @@ import json
 import logging
 
 from ..authentication import CanManageInventory, IsTechnicianOrReadOnly
+from ..metrics import callproc
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +69,7 @@ def reserve_stock(request):
             )
 
         with connection.cursor() as cursor:
-            cursor.callproc('inv.reserve_stock_for_wo', [wo_id, internal_sku, qty_needed, warehouse_code])
+            callproc(cursor, 'inv.reserve_stock_for_wo', [wo_id, internal_sku, qty_needed, warehouse_code])
             result = cursor.fetchone()
 
             if result and len(result) > 0:
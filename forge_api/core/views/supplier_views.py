@@ -7,11 +7,13 @@ from rest_framework import viewsets, permissions
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import Supplier
 from ..serializers import SupplierSerializer
 
 
-class SupplierViewSet(viewsets.ModelViewSet):
+class SupplierViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Suppliers"""
     queryset = Supplier.objects.all()
     serializer_class = SupplierSerializer
@@ -3,25 +3,93 @@ ForgeDB API REST - Taxonomy Views
 Automotive Workshop Management System
 """
 
-from rest_framework import viewsets, permissions
+from collections import Counter
+
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import models
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
 
+from .. import taxonomy
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import TaxonomySystem, TaxonomySubsystem, TaxonomyGroup
 from ..serializers import (
     TaxonomySystemSerializer, TaxonomySubsystemSerializer, TaxonomyGroupSerializer
 )
 
 
-class TaxonomySystemViewSet(viewsets.ModelViewSet):
+def _request_codes(request):
+    """``codes`` from a JSON list, a comma-separated string or the query string."""
+    codes = request.data.get('codes') if request.method == 'POST' else request.query_params.get('codes')
+    if isinstance(codes, str):
+        codes = codes.split(',')
+    return codes if isinstance(codes, list) else []
+
+
+class TaxonomyBulkActionsMixin:
+    """
+    Set-based actions on a list of node codes:
+
+    - POST ``bulk-activate/``, ``bulk-deactivate/``, ``bulk-delete/`` with
+      ``{"codes": [...]}``: one statement for the whole list, one outcome per
+      code (see core.taxonomy.bulk_set_active / bulk_delete).
+    - GET ``dependencies/?codes=A,B``: dependency counts for every code from
+      one grouped query.
+    """
+    node_type = None
+
+    def _bulk_response(self, name, run):
+        try:
+            results = run(self.node_type, _request_codes(self.request))
+        except taxonomy.InvalidNode as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'action': name,
+            'results': results,
+            'summary': Counter(result['status'] for result in results),
+        })
+
+    @action(detail=False, methods=['post'], url_path='bulk-activate')
+    def bulk_activate(self, request):
+        return self._bulk_response('activate', lambda node_type, codes: taxonomy.bulk_set_active(node_type, codes, True))
+
+    @action(detail=False, methods=['post'], url_path='bulk-deactivate')
+    def bulk_deactivate(self, request):
+        return self._bulk_response('deactivate', lambda node_type, codes: taxonomy.bulk_set_active(node_type, codes, False))
+
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request):
+        return self._bulk_response('delete', taxonomy.bulk_delete)
+
+    @action(detail=False, methods=['get'])
+    def dependencies(self, request):
+        try:
+            codes = taxonomy.clean_codes(self.node_type, _request_codes(request))
+        except taxonomy.InvalidNode as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        counts = taxonomy.dependency_counts(self.node_type, codes)
+        return Response({'results': [
+            {'code': code, 'has_dependencies': code in counts, 'dependencies': counts.get(code, {})}
+            for code in codes
+        ]})
+
+
+class TaxonomySystemViewSet(SparseFieldsetMixin, TaxonomyBulkActionsMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Taxonomy Systems"""
+    node_type = 'system'
     queryset = TaxonomySystem.objects.prefetch_related(
         'taxonomysubsystem_set',  # Prefetch subsystems to avoid N+1
     ).annotate(
         subsystems_count=models.Count('taxonomysubsystem', distinct=True)
     )
     serializer_class = TaxonomySystemSerializer
+    defer_unread_actions = ('list',)  # load only what the list serializer reads
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['category', 'is_active']
@@ -37,8 +105,9 @@ class TaxonomySystemViewSet(viewsets.ModelViewSet):
         return TaxonomySystemSerializer
 
 
-class TaxonomySubsystemViewSet(viewsets.ModelViewSet):
+class TaxonomySubsystemViewSet(SparseFieldsetMixin, TaxonomyBulkActionsMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Taxonomy Subsystems"""
+    node_type = 'subsystem'
     queryset = TaxonomySubsystem.objects.select_related(
         'system_code'
     ).prefetch_related(
@@ -47,6 +116,7 @@ class TaxonomySubsystemViewSet(viewsets.ModelViewSet):
         groups_count=models.Count('taxonomygroup', distinct=True)
     )
     serializer_class = TaxonomySubsystemSerializer
+    defer_unread_actions = ('list',)  # load only what the list serializer reads
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['system_code']
@@ -60,20 +130,11 @@ class TaxonomySubsystemViewSet(viewsets.ModelViewSet):
             from ..serializers import TaxonomySubsystemListSerializer
             return TaxonomySubsystemListSerializer
         return TaxonomySubsystemSerializer
-    
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        # Optimize for list view
-        if self.action == 'list':
-            queryset = queryset.only(
-                'subsystem_code', 'system_code', 'name_es', 'name_en',
-                'sort_order', 'created_at'
-            )
-        return queryset
 
 
-class TaxonomyGroupViewSet(viewsets.ModelViewSet):
+class TaxonomyGroupViewSet(SparseFieldsetMixin, TaxonomyBulkActionsMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing Taxonomy Groups"""
+    node_type = 'group'
     queryset = TaxonomyGroup.objects.select_related(
         'subsystem_code', 'system_code'
     ).annotate(
@@ -81,6 +142,7 @@ class TaxonomyGroupViewSet(viewsets.ModelViewSet):
         full_path=models.F('system_code__name_es')
     )
     serializer_class = TaxonomyGroupSerializer
+    defer_unread_actions = ('list',)  # load only what the list serializer reads
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['system_code', 'subsystem_code', 'is_active']
@@ -94,16 +156,69 @@ class TaxonomyGroupViewSet(viewsets.ModelViewSet):
             from ..serializers import TaxonomyGroupListSerializer
             return TaxonomyGroupListSerializer
         return TaxonomyGroupSerializer
-    
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        # Optimize for list view
-        if self.action == 'list':
-            queryset = queryset.only(
-                'group_code', 'subsystem_code', 'system_code',
-                'name_es', 'name_en', 'description', 'is_active',
-                'requires_position', 'requires_color', 'requires_finish', 
-                'requires_side', 'sort_order', 'created_at', 'updated_at'
-            )
-        return queryset
 
+
+class TaxonomyTreeView(APIView):
+    """
+    GET /api/v1/taxonomy/tree/[?active=true]
+
+    The whole taxonomy as nested ``systems[].subsystems[].groups[]`` plus
+    ``stats``, served pre-serialized from the worker's snapshot
+    (core.taxonomy). ``active=true`` leaves out inactive systems and groups.
+    Clients send the ETag back in If-None-Match and get 304 while the
+    taxonomy is unchanged.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        snapshot = taxonomy.get_snapshot()
+        active = request.query_params.get('active', '').lower() in ('1', 'true')
+        etag = snapshot.etag[:-1] + '-a"' if active else snapshot.etag
+        # Weak comparison: CompressionMiddleware sends the ETag back as W/"...".
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            body = snapshot.active_body if active else snapshot.body
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class TaxonomyDescendantsView(APIView):
+    """
+    GET /api/v1/taxonomy/<type>/<code>/descendants/
+
+    Every node below a system or subsystem (closure table, one query).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, node_type, code):
+        try:
+            nodes = taxonomy.descendants(node_type, code)
+        except taxonomy.InvalidNode as e:
+            return Response({'detail': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            'type': node_type,
+            'code': code,
+            'descendants': [node._asdict() for node in nodes],
+        })
+
+
+class TaxonomyCheckParentView(APIView):
+    """
+    GET /api/v1/taxonomy/<type>/<code>/check-parent/?parent=<code>
+
+    Whether ``parent`` can be the parent of the node: it must exist at the
+    level above and must not be inside the node's subtree.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, node_type, code):
+        parent = request.query_params.get('parent', '').strip()
+        if not parent:
+            return Response({'detail': 'parent is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            error = taxonomy.check_parent(node_type, code, parent)
+        except taxonomy.InvalidNode as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'valid': error is None, 'error': error})
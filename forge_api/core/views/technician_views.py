@@ -4,15 +4,20 @@ Automotive Workshop Management System
 """
 
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
+from ..entity_stats import work_order_stats
 from ..models import Technician
 from ..serializers import TechnicianSerializer
 from ..permissions import IsWorkshopAdmin
 
 
-class TechnicianViewSet(viewsets.ModelViewSet):
+class TechnicianViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Technicians.
     
@@ -21,6 +26,7 @@ class TechnicianViewSet(viewsets.ModelViewSet):
     """
     queryset = Technician.objects.all()
     serializer_class = TechnicianSerializer
+    conditional_models = ()  # full_name only reads the row
     
     # Read access for authenticated users, write requires admin
     permission_classes = [permissions.IsAuthenticated]
@@ -42,4 +48,9 @@ class TechnicianViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         """Save the technician record"""
-        serializer.save()
\ No newline at end of file
+        serializer.save()
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """Work order status histogram, invoiced total, last service and average cycle time."""
+        return Response(work_order_stats('technician', self.get_object().pk))
@@ -7,13 +7,15 @@ from rest_framework import viewsets, permissions
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import Transaction
 from ..serializers import TransactionSerializer
 from ..permissions import CanManageInventory
-from ..pagination import OptimizedCursorPagination
+from ..pagination import KeysetPagination
 
 
-class TransactionViewSet(viewsets.ModelViewSet):
+class TransactionViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Transaction records.
     
@@ -23,7 +25,7 @@ class TransactionViewSet(viewsets.ModelViewSet):
     queryset = Transaction.objects.all().select_related('warehouse', 'product', 'created_by')
     serializer_class = TransactionSerializer
     permission_classes = [permissions.IsAuthenticated, CanManageInventory]
-    pagination_class = OptimizedCursorPagination
+    pagination_class = KeysetPagination
     
     # Filtering, search, and ordering
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -7,12 +7,14 @@ from rest_framework import viewsets, permissions
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
 from ..models import Warehouse
 from ..serializers import WarehouseSerializer
 from ..permissions import CanManageInventory
 
 
-class WarehouseViewSet(viewsets.ModelViewSet):
+class WarehouseViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Warehouses.
     
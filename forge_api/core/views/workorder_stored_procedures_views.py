@@ -13,6 +13,7 @@ import json
 import logging
 
 from ..authentication import IsWorkshopAdmin, IsTechnicianOrReadOnly
+from ..metrics import callproc
 
 logger = logging.getLogger(__name__)
 
@@ -65,7 +66,7 @@ def advance_work_order_status(request):
             )
 
         with connection.cursor() as cursor:
-            cursor.callproc('svc.advance_work_order_status', [wo_id, new_status, notes, completed_date])
+            callproc(cursor, 'svc.advance_work_order_status', [wo_id, new_status, notes, completed_date])
             result = cursor.fetchone()
 
             if result and len(result) > 0:
@@ -140,7 +141,7 @@ def add_service_to_work_order(request):
             )
 
         with connection.cursor() as cursor:
-            cursor.callproc('svc.add_service_to_wo', [
+            callproc(cursor, 'svc.add_service_to_wo', [
                 wo_id, service_code, quantity, unit_price, description, assigned_technician_id
             ])
             result = cursor.fetchone()
@@ -209,7 +210,7 @@ def create_invoice_from_work_order(request):
             )
 
         with connection.cursor() as cursor:
-            cursor.callproc('svc.create_invoice_from_wo', [wo_id, invoice_date, due_date, notes])
+            callproc(cursor, 'svc.create_invoice_from_wo', [wo_id, invoice_date, due_date, notes])
             result = cursor.fetchone()
 
             if result and len(result) > 0:
@@ -7,13 +7,15 @@ from rest_framework import viewsets, permissions
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
-from ..models import WorkOrder
+from ..conditional import ConditionalGetMixin
+from ..fieldsets import SparseFieldsetMixin
+from ..models import Client, Equipment, Technician, WorkOrder
 from ..serializers import WorkOrderSerializer
 from ..permissions import IsTechnicianOrReadOnly
-from ..pagination import OptimizedCursorPagination
+from ..pagination import KeysetPagination
 
 
-class WorkOrderViewSet(viewsets.ModelViewSet):
+class WorkOrderViewSet(SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Work Orders.
     
@@ -22,8 +24,9 @@ class WorkOrderViewSet(viewsets.ModelViewSet):
     """
     queryset = WorkOrder.objects.all().prefetch_related('invoiceitem_set', 'transaction_set')
     serializer_class = WorkOrderSerializer
+    conditional_models = (Client, Equipment, Technician)  # get_client, get_equipment, get_assigned_technician
     permission_classes = [permissions.IsAuthenticated, IsTechnicianOrReadOnly]
-    pagination_class = OptimizedCursorPagination
+    pagination_class = KeysetPagination
     
     # Filtering, search, and ordering
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -59,15 +59,18 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.QueryProfilerMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'frontend.middleware.StaticFilesCacheMiddleware',
-    # 'frontend.middleware.CompressionMiddleware',  # TEMPORARILY DISABLED - causa errores de decodificación
+    'frontend.middleware.CompressionMiddleware',  # br/zstd/gzip; see docs/COMPRESSION.md
+    'frontend.middleware.PerformanceMiddleware',
     'frontend.middleware.MobileOptimizationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.AuditUserMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -93,6 +96,12 @@ TEMPLATES = [
 WSGI_APPLICATION = 'forge_api.wsgi.application'
 
 # Database configuration for ForgeDB
+# DB_POOLER=pgbouncer when DB_HOST points at pgbouncer in transaction pooling
+# mode (see docs/CONNECTION_POOLING.md). Session state cannot be used there:
+# search_path is set on the role instead of as a startup option and
+# server-side cursors are disabled.
+DB_POOLER = config('DB_POOLER', default='')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -103,12 +112,20 @@ DATABASES = {
         'PORT': config('DB_PORT', default='5432'),
         'OPTIONS': {
             'client_encoding': 'UTF8',
-            'options': '-c search_path=app,cat,doc,inv,kpi,oem,svc,public'
         },
-        'CONN_MAX_AGE': 600,  # Keep connections alive for 10 minutes
+        # Keep connections alive for 10 minutes. Set DB_CONN_MAX_AGE=0 when
+        # serving through ASGI (see docs/ASYNC_DEPLOYMENT.md).
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+        # Ping persistent connections before reuse so a restarted pooler or
+        # server does not surface as a failed request.
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': DB_POOLER == 'pgbouncer',
     }
 }
 
+if DB_POOLER != 'pgbouncer':
+    DATABASES['default']['OPTIONS']['options'] = '-c search_path=app,cat,doc,inv,kpi,oem,svc,public'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -138,37 +155,91 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
-# Static files caching configuration
-# STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+# Static files caching configuration: content-hashed names (cached as
+# immutable) plus .gz/.br siblings for nginx, see docs/STATIC_ASSETS.md
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'frontend.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Sent as Link: rel=preload on every HTML page (frontend.middleware.PerformanceMiddleware)
+STATIC_PRELOAD = [
+    'frontend/css/main.css',
+    'frontend/js/performance.js',
+    'frontend/js/main.js',
+]
+
+# Responses smaller than this are sent uncompressed (frontend.middleware.CompressionMiddleware)
+COMPRESSION_MIN_SIZE = 1024
 
 # Cache configuration
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'core.cache.InstrumentedLocMemCache',
         'LOCATION': 'unique-snowflake',
         'TIMEOUT': 300,  # 5 minutes
         'OPTIONS': {
             'MAX_ENTRIES': 2000,  # Increased for better coverage
+            'METRICS_ALIAS': 'default',
         }
     },
     'static_files': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'core.cache.InstrumentedLocMemCache',
         'LOCATION': 'static-files-cache',
         'TIMEOUT': 86400,  # 24 hours
         'OPTIONS': {
             'MAX_ENTRIES': 500,
+            'METRICS_ALIAS': 'static_files',
         }
     },
     'api_responses': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'core.cache.InstrumentedLocMemCache',
         'LOCATION': 'api-responses-cache',
         'TIMEOUT': 120,  # 2 minutes for API responses
         'OPTIONS': {
             'MAX_ENTRIES': 500,
+            'METRICS_ALIAS': 'api_responses',
         }
     }
 }
 
+# Per-request profiling (core.middleware.QueryProfilerMiddleware). Worker
+# snapshots are merged through REQUEST_PROFILER_CACHE, which must be a shared
+# backend for the report to cover every worker.
+REQUEST_PROFILER_ENABLED = config('REQUEST_PROFILER_ENABLED', default=True, cast=bool)
+REQUEST_PROFILER_CACHE = 'default'
+REQUEST_PROFILER_FLUSH_INTERVAL = 10  # seconds
+REQUEST_PROFILER_N_PLUS_ONE_THRESHOLD = 5  # same statement repeated per request
+
+# Prometheus /metrics bearer token. Without it /metrics answers 403 unless DEBUG is on.
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Per-worker snapshots (core.snapshots: reference data, taxonomy, business
+# rules). Only used when the app.table_versions counters are missing:
+# snapshot lifetime in seconds.
+SNAPSHOT_TTL = config('SNAPSHOT_TTL', default=300, cast=int)
+
+# Quote/invoice PDFs (frontend.services.document_renderer). Cached per
+# (document, hash of the rendered data), so an edit never serves a stale PDF.
+DOCUMENT_PDF_CACHE = 'default'
+DOCUMENT_PDF_CACHE_TIMEOUT = config('DOCUMENT_PDF_CACHE_TIMEOUT', default=86400, cast=int)
+DOCUMENT_PDF_MAX_BATCH = 200  # documents per zip requested from the web UI
+
+# Replenishment planner (core.replenishment): target probability of not
+# stocking out during the lead time, cost of placing one purchase order and
+# yearly holding cost as a fraction of the unit cost.
+REPLENISHMENT_SERVICE_LEVEL = config('REPLENISHMENT_SERVICE_LEVEL', default=0.95, cast=float)
+REPLENISHMENT_ORDER_COST = config('REPLENISHMENT_ORDER_COST', default=50.0, cast=float)
+REPLENISHMENT_HOLDING_RATE = config('REPLENISHMENT_HOLDING_RATE', default=0.25, cast=float)
+
+# Audit log search (core.audit.search): days searched when the request gives
+# no changed_at__gte, so only the recent app.audit_logs partitions are read.
+AUDIT_SEARCH_DEFAULT_DAYS = config('AUDIT_SEARCH_DEFAULT_DAYS', default=90, cast=int)
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -196,8 +267,14 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson-backed, same output as the stock JSONRenderer/JSONParser (core/fastjson.py)
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'core.renderers.ORJSONRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -328,6 +405,12 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': False,
         },
+        # httpx (AsyncForgeAPIClient) logs every request at INFO
+        'httpx': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
 
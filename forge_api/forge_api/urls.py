@@ -22,6 +22,8 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from core.views.health_views import MetricsView
+
 # Swagger/OpenAPI configuration
 schema_view = get_schema_view(
     openapi.Info(
@@ -60,6 +62,9 @@ urlpatterns = [
     # API endpoints
     path('api/v1/', include('core.urls')),
     
+    # Prometheus scrape endpoint
+    path('metrics', MetricsView.as_view(), name='metrics'),
+    
     # API Documentation
     path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
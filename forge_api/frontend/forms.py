@@ -8,6 +8,8 @@ from django.core.exceptions import ValidationError
 from django.db import connection
 import re
 
+from .forms.widgets import RemoteSelect
+
 logger = logging.getLogger(__name__)
 
 
@@ -2283,10 +2285,10 @@ class MaintenanceForm(forms.Form):
     """
     
     equipment_id = forms.IntegerField(
-        widget=forms.Select(attrs={
+        widget=RemoteSelect('equipment', attrs={
             'class': 'form-select',
             'required': True
-        }),
+        }, placeholder='Buscar equipo por código o placa...', empty_label='Seleccionar equipo'),
         label='Equipo',
         help_text='Selecciona el equipo para el mantenimiento'
     )
@@ -2510,11 +2512,11 @@ class StockMovementForm(forms.Form):
         ('consumption', 'Consumo')
     ]
     
-    product_id = forms.IntegerField(
-        widget=forms.Select(attrs={
+    product_id = forms.CharField(
+        widget=RemoteSelect('products', attrs={
             'class': 'form-select',
             'required': True
-        }),
+        }, placeholder='Buscar producto por nombre o SKU...', empty_label='Seleccionar producto'),
         label='Producto',
         help_text='Selecciona el producto para el movimiento'
     )
@@ -2853,11 +2855,11 @@ class StockMovementForm(forms.Form):
         ('transfer', 'Transferencia')
     ]
     
-    product_id = forms.IntegerField(
-        widget=forms.Select(attrs={
+    product_id = forms.CharField(
+        widget=RemoteSelect('products', attrs={
             'class': 'form-select',
             'required': True
-        }),
+        }, placeholder='Buscar producto por nombre o SKU...', empty_label='Seleccionar producto'),
         label='Producto',
         help_text='Selecciona el producto para el movimiento'
     )
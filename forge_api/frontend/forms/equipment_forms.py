@@ -6,6 +6,8 @@ from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
 from datetime import datetime
 
+from .widgets import RemoteSelect
+
 
 class EquipmentForm(forms.Form):
     """
@@ -53,10 +55,10 @@ class EquipmentForm(forms.Form):
     )
 
     client_id = forms.IntegerField(
-        widget=forms.Select(attrs={
+        widget=RemoteSelect('clients', attrs={
             'class': 'form-select',
             'required': True
-        }),
+        }, placeholder='Buscar cliente por nombre o código...', empty_label='Seleccione un cliente'),
         label='Cliente Propietario',
         help_text='Cliente al que pertenece este equipo'
     )
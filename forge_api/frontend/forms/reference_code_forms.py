@@ -4,6 +4,8 @@ Forms for Reference Code management
 from django import forms
 import os
 
+from core import reference_codes
+
 
 class ReferenceCodeForm(forms.Form):
     """Formulario para crear/editar códigos de referencia"""
@@ -35,7 +37,7 @@ class ReferenceCodeForm(forms.Form):
             'required': True,
             'maxlength': 20
         }),
-        help_text='Código único dentro de la categoría (se convertirá a mayúsculas)'
+        help_text='Código único dentro de la categoría (se convertirá a mayúsculas, salvo en colores)'
     )
     
     description = forms.CharField(
@@ -61,8 +63,11 @@ class ReferenceCodeForm(forms.Form):
     )
     
     def clean_code(self):
-        """Convierte el código a mayúsculas y valida formato"""
-        code = self.cleaned_data.get('code', '').strip().upper()
+        """Normaliza el código como lo guarda su categoría y valida formato"""
+        code = self.cleaned_data.get('code', '').strip()
+        category = self.cleaned_data.get('category')
+        if category in reference_codes.CODE_TABLES:
+            code = reference_codes.normalize_code(category, code)
         
         if not code:
             raise forms.ValidationError("El código es requerido")
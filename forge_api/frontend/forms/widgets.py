@@ -0,0 +1,64 @@
+"""
+Widgets compartidos de los formularios del frontend.
+"""
+import logging
+
+from django import forms
+from django.urls import reverse_lazy
+
+from ..services.api_client import APIException
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteSelect(forms.Select):
+    """
+    <select> cuyas opciones se cargan bajo demanda desde
+    /api/lookups/<kind>/ (pares id/etiqueta con paginación por cursor y
+    búsqueda por prefijo; ver static/frontend/js/remote-select.js).
+
+    El HTML sólo lleva la opción vacía y la seleccionada; usa
+    ``load_remote_selection`` para resolver la etiqueta de esta última.
+
+    ``depends_on`` es el id del <select> cuyo valor se envía como filtro
+    ``depends_param`` (p. ej. equipos de un cliente).
+    """
+
+    def __init__(self, kind, attrs=None, placeholder='Buscar...', empty_label='Seleccionar',
+                 depends_on=None, depends_param=None):
+        super().__init__(attrs)
+        self.kind = kind
+        self.placeholder = placeholder
+        self.empty_label = empty_label
+        self.depends_on = depends_on
+        self.depends_param = depends_param
+        self.choices = [('', empty_label)]
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        widget_attrs = context['widget']['attrs']
+        widget_attrs['data-remote-select'] = str(reverse_lazy('frontend:lookup', args=[self.kind]))
+        widget_attrs['data-remote-placeholder'] = self.placeholder
+        if self.depends_on:
+            widget_attrs['data-remote-depends-on'] = self.depends_on
+            widget_attrs['data-remote-depends-param'] = self.depends_param
+        return context
+
+
+def load_remote_selection(form, field_name, api_client):
+    """
+    Pone en el RemoteSelect de ``field_name`` la opción vacía y la del valor
+    actual (datos enviados o inicial) con su etiqueta.
+    """
+    field = form.fields[field_name]
+    widget = field.widget
+    value = form.data.get(form.add_prefix(field_name)) if form.is_bound else form.initial.get(field_name, field.initial)
+    choices = [('', widget.empty_label)]
+    if value not in (None, ''):
+        try:
+            rows = api_client.lookup_labels(widget.kind, [value])
+        except APIException as e:
+            logger.warning(f"Could not resolve {widget.kind} label for {value}: {e}")
+            rows = []
+        choices += [(row['id'], row['label']) for row in rows] or [(value, str(value))]
+    widget.choices = choices
@@ -0,0 +1,75 @@
+"""
+Renderiza cotizaciones o facturas a PDF en un zip, leyendo de la base de
+datos (sin pasar por la API). Pensado para lotes grandes fuera de una
+petición web, p. ej. desde cron:
+
+    python manage.py render_documents quote 10 11 12 --output cotizaciones.zip
+    python manage.py render_documents invoice --status paid --since 2026-01-01 --output facturas.zip
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Client, Invoice, InvoiceItem, Quote
+from core.serializers import InvoiceItemSerializer, InvoiceSerializer, QuoteSerializer
+from frontend.services.document_renderer import DocumentRenderer, DOCUMENT_TYPES
+
+
+class DatabaseDocumentSource:
+    """Documentos con la misma forma que las respuestas de la API."""
+
+    def get(self, kind, doc_id):
+        if kind == 'quote':
+            quote = Quote.objects.prefetch_related('items').get(pk=doc_id)
+            return dict(QuoteSerializer(quote).data)
+        return dict(InvoiceSerializer(Invoice.objects.get(pk=doc_id)).data)
+
+    def complete(self, kind, document):
+        if kind == 'quote':
+            document['client'] = Client.objects.filter(pk=document['client']).values(
+                'name', 'address', 'phone', 'email'
+            ).first() or {}
+        else:
+            items = InvoiceItem.objects.filter(invoice_id=document['invoice_id']).order_by('invoice_item_id')
+            document['items'] = InvoiceItemSerializer(items.iterator(), many=True).data
+
+
+class Command(BaseCommand):
+    help = "Render quotes or invoices to PDF into a zip file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(DOCUMENT_TYPES))
+        parser.add_argument('ids', nargs='*', type=int, help="Document ids (default: filters below)")
+        parser.add_argument('--status', help="Filter by status when no ids are given")
+        parser.add_argument('--since', help="Quote/issue date from (YYYY-MM-DD) when no ids are given")
+        parser.add_argument('--limit', type=int, default=1000, help="Maximum documents per run")
+        parser.add_argument('--output', required=True, help="Zip file to write")
+
+    def handle(self, *args, **options):
+        kind = options['kind']
+        ids = options['ids'] or self._select_ids(kind, options)
+        if not ids:
+            raise CommandError("No documents match")
+        ids = ids[:options['limit']]
+
+        started = time.perf_counter()
+        try:
+            with open(options['output'], 'wb') as fileobj:
+                DocumentRenderer().render_zip(kind, ids, DatabaseDocumentSource(), fileobj, limit=None)
+        except (Quote.DoesNotExist, Invoice.DoesNotExist) as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(ids)} {kind} PDF(s) written to {options['output']} in {time.perf_counter() - started:.1f}s"
+        ))
+
+    def _select_ids(self, kind, options):
+        if kind == 'quote':
+            queryset, date_field = Quote.objects.all(), 'quote_date'
+        else:
+            queryset, date_field = Invoice.objects.all(), 'issue_date'
+        if options['status']:
+            queryset = queryset.filter(status=options['status'])
+        if options['since']:
+            queryset = queryset.filter(**{f'{date_field}__gte': options['since']})
+        return list(queryset.order_by('pk').values_list('pk', flat=True)[:options['limit']])
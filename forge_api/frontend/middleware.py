@@ -2,9 +2,15 @@
 Custom middleware for frontend optimizations
 """
 import re
-from django.utils.cache import patch_cache_control
+from functools import lru_cache
+
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.cache import patch_cache_control, patch_vary_headers
 from django.utils.deprecation import MiddlewareMixin
 
+from . import compression
+
 
 class StaticFilesCacheMiddleware(MiddlewareMixin):
     """
@@ -32,7 +38,11 @@ class StaticFilesCacheMiddleware(MiddlewareMixin):
         r'manifest\.json$',
         r'sw\.js$',
     ]
-    
+
+    # ManifestStaticFilesStorage names (main.3abe22895787.css): only these
+    # never change, unhashed names are replaced in place on deploy.
+    HASHED_NAME_PATTERN = re.compile(r'\.[0-9a-f]{12}\.[a-z0-9]+$')
+
     def process_response(self, request, response):
         # Only process static file requests
         if not request.path.startswith('/static/'):
@@ -41,92 +51,135 @@ class StaticFilesCacheMiddleware(MiddlewareMixin):
         # Check if it's a static file that should be cached
         path = request.path.lower()
         
-        # Long cache for static assets (1 year)
-        if any(re.search(pattern, path) for pattern in self.LONG_CACHE_PATTERNS):
+        # Long cache for hashed static assets (1 year)
+        if (self.HASHED_NAME_PATTERN.search(path)
+                and any(re.search(pattern, path) for pattern in self.LONG_CACHE_PATTERNS)):
             patch_cache_control(
                 response,
                 max_age=31536000,  # 1 year
                 public=True,
                 immutable=True
             )
-            response['Vary'] = 'Accept-Encoding'
+            patch_vary_headers(response, ('Accept-Encoding',))
             
-        # Short cache for dynamic static files (1 hour)
-        elif any(re.search(pattern, path) for pattern in self.SHORT_CACHE_PATTERNS):
+        # Short cache for unhashed and dynamic static files (1 hour)
+        elif any(re.search(pattern, path) for pattern in self.LONG_CACHE_PATTERNS + self.SHORT_CACHE_PATTERNS):
             patch_cache_control(
                 response,
                 max_age=3600,  # 1 hour
                 public=True
             )
-            
-        # Add compression hints
-        if path.endswith(('.css', '.js', '.json')):
-            response['Content-Encoding'] = 'gzip'
-            
+
         return response
 
 
 class PerformanceMiddleware(MiddlewareMixin):
     """
-    Middleware to add performance-related headers
+    Middleware to add performance-related headers.
+
+    HTML pages get ``Link: rel=preload`` for the assets in
+    ``settings.STATIC_PRELOAD``, resolved through the static files manifest
+    so the URLs carry the content hash the page itself references.
     """
-    
+
+    PRELOAD_AS = {'.css': 'style', '.js': 'script', '.woff2': 'font', '.woff': 'font'}
+
+    DNS_PREFETCH = (
+        '<https://cdn.jsdelivr.net>; rel=dns-prefetch, '
+        '<https://fonts.googleapis.com>; rel=dns-prefetch'
+    )
+
     def process_response(self, request, response):
-        # Add security headers
-        response['X-Content-Type-Options'] = 'nosniff'
-        response['X-Frame-Options'] = 'DENY'
-        response['X-XSS-Protection'] = '1; mode=block'
-        
-        # Add performance hints
-        if request.path.startswith('/static/'):
-            # Preload critical resources
-            if 'main.css' in request.path:
-                response['Link'] = '</static/frontend/js/main.js>; rel=preload; as=script'
-            elif 'main.js' in request.path:
-                response['Link'] = '</static/frontend/css/main.css>; rel=preload; as=style'
-        
+        # Security headers come from SecurityMiddleware and XFrameOptionsMiddleware.
+
         # Add resource hints for HTML pages
-        elif response.get('Content-Type', '').startswith('text/html'):
-            # DNS prefetch for external resources
-            response['Link'] = (
-                '<https://cdn.jsdelivr.net>; rel=dns-prefetch, '
-                '<https://fonts.googleapis.com>; rel=dns-prefetch'
-            )
-            
+        if response.get('Content-Type', '').startswith('text/html') and not response.has_header('Link'):
+            response['Link'] = ', '.join(filter(None, [preload_link_header(), self.DNS_PREFETCH]))
+
         return response
 
 
+@lru_cache(maxsize=None)
+def preload_link_header():
+    """
+    ``Link`` value preloading ``settings.STATIC_PRELOAD``. Built once per
+    process: the manifest only changes with a deploy, which restarts it.
+    """
+    links = []
+    for name in getattr(settings, 'STATIC_PRELOAD', ()):
+        extension = name[name.rfind('.'):].lower()
+        link = f'<{static(name)}>; rel=preload; as={PerformanceMiddleware.PRELOAD_AS.get(extension, "fetch")}'
+        if extension in ('.woff', '.woff2'):
+            link += '; crossorigin'
+        links.append(link)
+    return ', '.join(links)
+
+
 class CompressionMiddleware(MiddlewareMixin):
     """
-    Middleware to handle compression for better performance
+    Compress API and HTML responses with the best coding the client accepts
+    (brotli, zstd or gzip, see frontend.compression).
+
+    Skipped for streaming responses (SSE, file downloads), bodies under
+    ``COMPRESSION_MIN_SIZE`` bytes, non-text content types, responses that
+    already have a ``Content-Encoding`` and ``Cache-Control: no-transform``.
+    A strong ETag is made weak, as Django's GZipMiddleware does, so
+    ``If-None-Match`` keeps matching. Compressed HTML gets a random-length
+    comment appended (``compression.pad_html``) whatever the coding.
     """
-    
-    COMPRESSIBLE_TYPES = [
+
+    COMPRESSIBLE_TYPES = {
         'text/html',
         'text/css',
+        'text/plain',
+        'text/csv',
         'text/javascript',
         'application/javascript',
         'application/json',
         'text/xml',
         'application/xml',
         'image/svg+xml',
-    ]
-    
+    }
+
+    # Random padding for HTML (BREACH), as in Django's GZipMiddleware.
+    max_random_bytes = 100
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self.encodings = compression.available_encodings()
+
+    def is_compressible(self, response):
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        return (content_type in self.COMPRESSIBLE_TYPES
+                or content_type.endswith(('+json', '+xml')))
+
     def process_response(self, request, response):
-        # Check if response should be compressed
-        # FileResponse doesn't have 'content' attribute, check first
-        if not hasattr(response, 'content'):
+        if (response.streaming
+                or len(response.content) < self.min_size
+                or response.has_header('Content-Encoding')
+                or 'no-transform' in response.get('Cache-Control', '')
+                or not self.is_compressible(response)):
             return response
-            
-        content_type = response.get('Content-Type', '').split(';')[0]
-        
-        if (content_type in self.COMPRESSIBLE_TYPES and 
-            'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '') and
-            len(response.content) > 1024):  # Only compress if > 1KB
-            
-            # Add compression headers
-            response['Vary'] = 'Accept-Encoding'
-            
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = compression.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), self.encodings)
+        if coding is None:
+            return response
+
+        content = response.content
+        if response.get('Content-Type', '').startswith('text/html'):
+            content = compression.pad_html(content, self.max_random_bytes)
+        compressed = compression.compress(content, coding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = coding
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
         return response
 
 
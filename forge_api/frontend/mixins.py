@@ -2,13 +2,75 @@
 Mixins for frontend views.
 """
 import logging
+from urllib.parse import parse_qs, urlparse
+
+from asgiref.sync import sync_to_async
 from django.contrib import messages
+from django.contrib.auth.mixins import AccessMixin
+from django.utils.dateparse import parse_datetime
 from .services.api_client import ForgeAPIClient, APIException
+from .services.async_api_client import AsyncForgeAPIClient
 
 logger = logging.getLogger(__name__)
 
+EMPTY_WORKORDER_STATS = {
+    'total': 0,
+    'completed': 0,
+    'pending': 0,
+    'in_progress': 0,
+    'completion_rate': 0
+}
+
+EMPTY_CURSOR_PAGINATION = {
+    'count': 0,
+    'count_is_estimate': False,
+    'shown': 0,
+    'next_cursor': None,
+    'previous_cursor': None,
+    'has_next': False,
+    'has_previous': False,
+    'is_first': True,
+}
+
 
-class APIClientMixin:
+class CursorPaginationMixin:
+    """Cursor navigation for list views over keyset-paginated API endpoints."""
+
+    def _get_cursor(self):
+        """Cursor of the requested page (``?cursor=``), or None for the first one."""
+        return self.request.GET.get('cursor') or None
+
+    def _get_page_size(self, default, maximum=100):
+        """``?page_size=`` of the request, kept between 1 and the API's maximum."""
+        try:
+            return min(max(int(self.request.GET.get('page_size', default)), 1), maximum)
+        except (TypeError, ValueError):
+            return default
+
+    def _cursor_pagination(self, data):
+        """
+        Contexto de paginación por cursor para una respuesta de la API con
+        paginación por clave: los enlaces ``next``/``previous`` de la API se
+        traducen a ``?cursor=`` de la vista y ``count`` puede ser estimado
+        (``count_is_estimate``). Se muestra con ``{% render_cursor_pagination %}``.
+        """
+        def cursor(link):
+            return parse_qs(urlparse(link).query).get('cursor', [None])[0] if link else None
+
+        next_cursor, previous_cursor = cursor(data.get('next')), cursor(data.get('previous'))
+        return {
+            'count': data.get('count') or 0,
+            'count_is_estimate': bool(data.get('count_is_estimate')),
+            'shown': len(data.get('results', [])),
+            'next_cursor': next_cursor,
+            'previous_cursor': previous_cursor,
+            'has_next': next_cursor is not None,
+            'has_previous': previous_cursor is not None,
+            'is_first': self._get_cursor() is None,
+        }
+
+
+class APIClientMixin(CursorPaginationMixin):
     """Mixin to provide API client functionality to views."""
     
     @property
@@ -44,6 +106,29 @@ class APIClientMixin:
         
         return list(range(start, end + 1))
     
+    def get_workorder_stats(self, api_client, entity, entity_id):
+        """
+        Contadores de órdenes de trabajo de un cliente, técnico o equipo,
+        calculados en la API sobre todas sus órdenes (``/<entity>/<id>/stats/``).
+        """
+        try:
+            stats = api_client.get_work_order_stats(entity, entity_id)
+        except APIException as e:
+            logger.warning(f"Could not load work order stats for {entity} {entity_id}: {e}")
+            return dict(EMPTY_WORKORDER_STATS)
+        in_progress = stats['by_status'].get('IN_PROGRESS', 0)
+        return {
+            'total': stats['total'],
+            'completed': stats['completed'],
+            'in_progress': in_progress,
+            'pending': stats['open'] - in_progress,
+            'completion_rate': stats['completion_rate'],
+            'by_status': stats['by_status'],
+            'total_invoiced': stats['total_invoiced'],
+            'last_service_date': parse_datetime(stats['last_service_date'] or ''),
+            'avg_cycle_hours': stats['avg_cycle_hours'],
+        }
+
     def handle_api_error(self, error: APIException, default_message: str = "Error en la operación"):
         """Handle API errors and display appropriate messages."""
         if error.status_code == 401:
@@ -65,4 +150,39 @@ class APIClientMixin:
             else:
                 messages.error(self.request, error.message)
         else:
-            messages.error(self.request, error.message or default_message)
\ No newline at end of file
+            messages.error(self.request, error.message or default_message)
+
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    """
+    LoginRequiredMixin for async views.
+
+    ``request.user`` is lazy and loading it touches the session/auth tables,
+    which Django forbids from an event loop, so it is resolved in a thread.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+        if not is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncAPIClientMixin(APIClientMixin):
+    """
+    Mixin for async TemplateViews that fetch independent API resources.
+
+    Subclasses implement ``aget_context_data`` instead of
+    ``get_context_data``.
+    """
+
+    async def get_async_api_client(self):
+        """Get an async API client configured for the current request."""
+        return await AsyncForgeAPIClient.for_request(self.request)
+
+    async def aget_context_data(self, **kwargs):
+        return self.get_context_data(**kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        context = await self.aget_context_data(**kwargs)
+        return self.render_to_response(context)
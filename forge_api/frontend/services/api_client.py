@@ -6,14 +6,52 @@ including authentication, session management, and CRUD operations.
 """
 import requests
 import logging
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Iterator, Optional, List, Union
 from django.conf import settings
 from django.core.cache import cache
 from datetime import datetime, timedelta
 import json
 
+from core import fastjson
+
 logger = logging.getLogger(__name__)
 
+# Bytes of a request/response body written to debug logs.
+LOG_BODY_LIMIT = 2000
+
+
+def decode_json(response):
+    """
+    The JSON body of a requests/httpx ``response`` decoded with
+    core.fastjson; ``response.json()`` when the body is not bytes (stubbed
+    responses in tests).
+    """
+    content = response.content
+    if isinstance(content, (bytes, bytearray)):
+        return fastjson.loads(content)
+    return response.json()
+
+
+class LogBody:
+    """
+    A request/response body for debug logs. Passed as a ``%s`` argument, so
+    it is only encoded and cut to ``LOG_BODY_LIMIT`` bytes when a record is
+    actually emitted.
+    """
+
+    def __init__(self, body, limit: int = LOG_BODY_LIMIT):
+        self.body = body
+        self.limit = limit
+
+    def __str__(self):
+        body = self.body
+        if not isinstance(body, (bytes, bytearray)):
+            body = fastjson.dumps(body)
+        text = bytes(body[:self.limit]).decode('utf-8', 'replace')
+        if len(body) > self.limit:
+            text += f'... ({len(body)} bytes)'
+        return text
+
 
 class APIException(Exception):
     """Custom exception for API-related errors."""
@@ -38,6 +76,8 @@ class BaseAPIClient:
         self.session = requests.Session()
         self.timeout = timeout if timeout is not None else getattr(settings, 'API_TIMEOUT', 30)
         self.max_retries = max_retries if max_retries is not None else getattr(settings, 'API_MAX_RETRIES', 3)
+        # How long GET validators (ETag / Last-Modified + body) are kept for revalidation
+        self.validator_timeout = getattr(settings, 'API_VALIDATOR_CACHE_TIMEOUT', 3600)
 
         # Configure session headers
         self.session.headers.update({
@@ -48,18 +88,16 @@ class BaseAPIClient:
 
     def _log_request(self, method: str, url: str, data: Dict = None):
         """Log API request for debugging."""
-        logger.debug(f"API Request: {method} {url}")
-        if data and logger.isEnabledFor(logging.DEBUG):
-            logger.debug(f"Request data: {json.dumps(data, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("API Request: %s %s", method, url)
+            if data:
+                logger.debug("Request data: %s", LogBody(data))
     
     def _log_response(self, response: requests.Response):
         """Log API response for debugging."""
-        logger.debug(f"API Response: {response.status_code} {response.url}")
         if logger.isEnabledFor(logging.DEBUG):
-            try:
-                logger.debug(f"Response data: {json.dumps(response.json(), indent=2)}")
-            except (ValueError, json.JSONDecodeError):
-                logger.debug(f"Response text: {response.text[:500]}")
+            logger.debug("API Response: %s %s", response.status_code, response.url)
+            logger.debug("Response data: %s", LogBody(response.content))
     
     def _handle_network_error(self, error: requests.RequestException, attempt: int) -> bool:
         """Handle network errors with appropriate retry logic."""
@@ -207,6 +245,31 @@ class ForgeAPIClient(BaseAPIClient):
             key_parts.append(params_str)
         return ':'.join(key_parts)
     
+    def _get_validator_key(self, endpoint: str, params: Dict = None) -> str:
+        """Cache key for the stored validators of a GET response."""
+        return f"{self._get_cache_key(endpoint, params)}:validators"
+
+    def _conditional_headers(self, validators: Optional[Dict]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers from stored validators."""
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def _store_validators(self, validator_key: str, response: requests.Response, result: Any):
+        """Keep the body of a GET response together with its validators."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            cache.set(validator_key, {
+                'etag': etag,
+                'last_modified': last_modified,
+                'data': result,
+            }, self.validator_timeout)
+
     def _invalidate_related_cache(self, endpoint: str):
         """Invalidate cache for related endpoints after mutations."""
         try:
@@ -252,20 +315,6 @@ class ForgeAPIClient(BaseAPIClient):
         except Exception as e:
             logger.warning(f"Failed to invalidate cache: {e}")
     
-    def _log_request(self, method: str, url: str, data: Dict = None):
-        """Log API request for debugging."""
-        logger.debug(f"API Request: {method} {url}")
-        if data and logger.isEnabledFor(logging.DEBUG):
-            logger.debug(f"Request data: {json.dumps(data, indent=2)}")
-    
-    def _log_response(self, response: requests.Response):
-        """Log API response for debugging."""
-        logger.debug(f"API Response: {response.status_code} {response.url}")
-        if logger.isEnabledFor(logging.DEBUG):
-            try:
-                logger.debug(f"Response data: {json.dumps(response.json(), indent=2)}")
-            except (ValueError, json.JSONDecodeError):
-                logger.debug(f"Response text: {response.text[:500]}")
     
     def _handle_auth_error(self, response: requests.Response):
         """Handle authentication errors and attempt token refresh."""
@@ -369,6 +418,13 @@ class ForgeAPIClient(BaseAPIClient):
                 logger.debug(f"Cache hit for {endpoint}")
                 return cached_response
         
+        # Revalidate GET responses the API sent with an ETag / Last-Modified
+        validator_key = None
+        validators = None
+        if method == 'GET':
+            validator_key = self._get_validator_key(endpoint, params)
+            validators = cache.get(validator_key)
+        
         self._log_request(method, url, data)
         
         # Retry logic
@@ -379,11 +435,20 @@ class ForgeAPIClient(BaseAPIClient):
                     url=url,
                     json=data if data else None,
                     params=params,
+                    headers=self._conditional_headers(validators) or None,
                     timeout=self.timeout
                 )
                 
                 self._log_response(response)
                 
+                # Not modified: reuse the stored body
+                if response.status_code == 304 and validators:
+                    logger.debug(f"Not modified: {endpoint}")
+                    result = validators['data']
+                    if use_cache:
+                        cache.set(self._get_cache_key(endpoint, params), result, cache_timeout)
+                    return result
+                
                 # Handle authentication errors
                 if response.status_code == 401:
                     if self._handle_auth_error(response) and attempt < self.max_retries - 1:
@@ -394,12 +459,14 @@ class ForgeAPIClient(BaseAPIClient):
                 # Handle successful responses
                 if 200 <= response.status_code < 300:
                     try:
-                        result = response.json() if response.content else {}
+                        result = decode_json(response) if response.content else {}
                         
                         # Cache GET responses
                         if method == 'GET' and use_cache:
                             cache_key = self._get_cache_key(endpoint, params)
                             cache.set(cache_key, result, cache_timeout)
+                        if validator_key:
+                            self._store_validators(validator_key, response, result)
                         
                         # Invalidate related cache on POST/PUT/PATCH/DELETE
                         # This happens AFTER the request succeeds
@@ -433,7 +500,7 @@ class ForgeAPIClient(BaseAPIClient):
                 # Handle client errors (4xx)
                 elif 400 <= response.status_code < 500:
                     try:
-                        error_data = response.json()
+                        error_data = decode_json(response)
                     except (ValueError, json.JSONDecodeError):
                         error_data = {'detail': response.text}
                     
@@ -449,7 +516,7 @@ class ForgeAPIClient(BaseAPIClient):
                     # Try to get more error details from response
                     error_detail = 'Internal server error'
                     try:
-                        error_data = response.json()
+                        error_data = decode_json(response)
                         if isinstance(error_data, dict):
                             error_detail = self._extract_error_message(error_data)
                         else:
@@ -505,7 +572,18 @@ class ForgeAPIClient(BaseAPIClient):
             **filters
         }
         return self.get(endpoint, params=params, use_cache=True)
-    
+
+    def iter_results(self, endpoint: str, params: Dict = None) -> Iterator[Dict[str, Any]]:
+        """Yield every result of a page-number paginated list, page by page."""
+        params = dict(params or {})
+        page = 1
+        while True:
+            data = self.get(endpoint, params={**params, 'page': page})
+            yield from data.get('results', [])
+            if not data.get('next'):
+                break
+            page += 1
+
     def search(self, endpoint: str, query: str, limit: int = 10) -> Dict[str, Any]:
         """Search for items using a query string."""
         params = {
@@ -514,6 +592,28 @@ class ForgeAPIClient(BaseAPIClient):
         }
         return self.get(endpoint, params=params)
     
+    def lookup(self, kind: str, q: str = '', after: str = None, limit: int = None, **filters) -> Dict[str, Any]:
+        """
+        (id, label) pairs for remote selects (/lookups/<kind>/).
+
+        Returns ``{'results': [{'id', 'label'}], 'next': cursor}``; pass
+        ``next`` back as ``after`` for the following page.
+        """
+        params = {'q': q}
+        if after:
+            params['after'] = after
+        if limit:
+            params['limit'] = limit
+        params.update(filters)
+        return self.get(f'lookups/{kind}/', params=params)
+
+    def lookup_labels(self, kind: str, ids: List[Any]) -> List[Dict[str, Any]]:
+        """Labels of the given ids, to render the selected value of a remote select."""
+        ids = [str(i) for i in ids if i not in (None, '')]
+        if not ids:
+            return []
+        return self.get(f'lookups/{kind}/', params={'ids': ','.join(ids)}).get('results', [])
+
     def bulk_create(self, endpoint: str, items: List[Dict]) -> Dict[str, Any]:
         """Create multiple items in a single request."""
         return self.post(f"{endpoint}bulk_create/", data={'items': items})
@@ -523,9 +623,9 @@ class ForgeAPIClient(BaseAPIClient):
         return self.post(f"{endpoint}bulk_update/", data={'items': items})
     
     # Entity-specific methods
-    def get_clients(self, page: int = 1, search: str = None, **filters) -> Dict[str, Any]:
-        """Get clients with optional filtering."""
-        params = {'page': page}
+    def get_clients(self, page: int = None, search: str = None, **filters) -> Dict[str, Any]:
+        """Get clients with optional filtering (``cursor=`` pages by key; ``page`` by number)."""
+        params = {'page': page} if page else {}
         if search:
             params['search'] = search
         params.update(filters)
@@ -551,16 +651,42 @@ class ForgeAPIClient(BaseAPIClient):
         """Delete a client."""
         return self.delete(f'clients/{client_id}/')
     
-    def get_workorders(self, page: int = 1, client_id: int = None, status: str = None, **filters) -> Dict[str, Any]:
-        """Get work orders with optional filtering."""
-        params = {'page': page}
+    def get_workorders(self, page: int = None, client_id: int = None, status: str = None, **filters) -> Dict[str, Any]:
+        """Get work orders with optional filtering (``cursor=`` pages by key; ``page`` by number)."""
+        params = {'page': page} if page else {}
         if client_id:
-            params['client'] = client_id
+            params['client_id'] = client_id
         if status:
             params['status'] = status
         params.update(filters)
         return self.get('work-orders/', params=params, use_cache=True)
     
+    def get_work_order_stats(self, entity: str, entity_id: int) -> Dict[str, Any]:
+        """Work order stats of a client, technician or equipment (``<entity>/<id>/stats/``)."""
+        endpoint = {'client': 'clients', 'technician': 'technicians', 'equipment': 'equipment'}[entity]
+        return self.get(f'{endpoint}/{entity_id}/stats/', use_cache=False)
+
+    def get_taxonomy_tree(self, active_only: bool = True) -> Dict[str, Any]:
+        """Whole taxonomy tree with node counts, in one request (``taxonomy/tree/``)."""
+        params = {'active': 'true'} if active_only else None
+        return self.get('taxonomy/tree/', params=params, use_cache=False)
+
+    def get_taxonomy_descendants(self, node_type: str, code: str) -> List[Dict[str, Any]]:
+        """Every node below a system or subsystem."""
+        return self.get(f'taxonomy/{node_type}/{code}/descendants/', use_cache=False).get('descendants', [])
+
+    def check_taxonomy_parent(self, node_type: str, code: str, parent_code: str) -> Dict[str, Any]:
+        """Whether ``parent_code`` is a valid parent for the node: ``{'valid', 'error'}``."""
+        return self.get(f'taxonomy/{node_type}/{code}/check-parent/', params={'parent': parent_code}, use_cache=False)
+
+    def taxonomy_bulk_action(self, node_type: str, action: str, codes: List[str]) -> Dict[str, Any]:
+        """Activate, deactivate or delete many taxonomy nodes in one request; one outcome per code."""
+        return self.post(f'taxonomy-{node_type}s/bulk-{action}/', data={'codes': codes})
+
+    def get_taxonomy_dependencies(self, node_type: str, codes: List[str]) -> List[Dict[str, Any]]:
+        """Dependency counts of many taxonomy nodes in one request."""
+        return self.get(f'taxonomy-{node_type}s/dependencies/', params={'codes': ','.join(codes)}).get('results', [])
+
     def get_workorder(self, workorder_id: int) -> Dict[str, Any]:
         """Get a specific work order by ID."""
         return self.get(f'work-orders/{workorder_id}/', use_cache=True)
@@ -581,9 +707,9 @@ class ForgeAPIClient(BaseAPIClient):
         """Delete a work order."""
         return self.delete(f'work-orders/{workorder_id}/')
 
-    def get_invoices(self, page: int = 1, client_id: int = None, status: str = None, **filters) -> Dict[str, Any]:
-        """Get invoices with optional filtering."""
-        params = {'page': page}
+    def get_invoices(self, page: int = None, client_id: int = None, status: str = None, **filters) -> Dict[str, Any]:
+        """Get invoices with optional filtering (``cursor=`` pages by key; ``page`` by number)."""
+        params = {'page': page} if page else {}
         if client_id:
             params['client'] = client_id
         if status:
@@ -618,12 +744,19 @@ class ForgeAPIClient(BaseAPIClient):
         params.update(filters)
         return self.get('quotes/', params=params)
     
-    def get_quote(self, quote_id: int) -> Dict[str, Any]:
-        """Get a specific quote by ID."""
-        return self.get(f'quotes/{quote_id}/')
+    def get_quote(self, quote_id: int, expand: str = None) -> Dict[str, Any]:
+        """
+        Get a specific quote by ID. ``expand`` (e.g. ``'work_order,invoice_status'``)
+        adds the converted work order and its invoice to the response.
+        """
+        params = {'expand': expand} if expand else None
+        return self.get(f'quotes/{quote_id}/', params=params)
     
     def create_quote(self, quote_data: Dict) -> Dict[str, Any]:
-        """Create a new quote."""
+        """
+        Create a new quote with its items (``quote_data['items']``) in one
+        request. The API computes line totals and quote totals.
+        """
         return self.post('quotes/', data=quote_data)
     
     def update_quote(self, quote_id: int, quote_data: Dict) -> Dict[str, Any]:
@@ -655,13 +788,13 @@ class ForgeAPIClient(BaseAPIClient):
         return self.delete(f'quote-items/{item_id}/')
     
     def convert_quote_to_work_order(self, quote_id: int, wo_data: Dict = None) -> Dict[str, Any]:
-        """Convert a quote to a work order."""
+        """Convert a quote to a work order (atomic; one service per quote item)."""
         endpoint = f'quotes/{quote_id}/convert-to-work-order/'
         return self.post(endpoint, data=wo_data or {})
     
-    def get_equipment(self, page: int = 1, client_id: int = None, **filters) -> Dict[str, Any]:
-        """Get equipment with optional filtering."""
-        params = {'page': page}
+    def get_equipment(self, page: int = None, client_id: int = None, **filters) -> Dict[str, Any]:
+        """Get equipment with optional filtering (``cursor=`` pages by key; ``page`` by number)."""
+        params = {'page': page} if page else {}
         if client_id:
             params['client'] = client_id
         params.update(filters)
@@ -687,9 +820,9 @@ class ForgeAPIClient(BaseAPIClient):
         """Delete an equipment."""
         return self.delete(f'equipment/{equipment_id}/')
     
-    def get_products(self, type: str = None, page: int = 1, page_size: int = 50, **filters) -> Dict[str, Any]:
-        """Get products/services with optional filtering."""
-        params = {'page': page, 'page_size': page_size}
+    def get_products(self, type: str = None, page: int = None, page_size: int = 50, **filters) -> Dict[str, Any]:
+        """Get products/services with optional filtering (``cursor=`` pages by key; ``page`` by number)."""
+        params = {'page': page, 'page_size': page_size} if page else {'page_size': page_size}
         
         if type:
             params['type'] = type
@@ -877,7 +1010,44 @@ class ForgeAPIClient(BaseAPIClient):
         params = {'page': page}
         params.update(filters)
         return self.get('color-codes/', params=params, use_cache=True)
-    
+
+    def get_reference_code_usage(self, category: str, codes: List[str] = None) -> Dict[str, int]:
+        """Rows using each code of a reference category, ``{code: total}`` (one grouped query server-side)."""
+        params = {'codes': ','.join(codes)} if codes is not None else None
+        response = self.get(f'reference-codes/{category}/usage/', params=params, use_cache=False)
+        return {row['code']: row['total'] for row in response.get('results', [])}
+
+    def rename_reference_code(self, category: str, code: str, new_code: str, **fields) -> Dict[str, Any]:
+        """Rename a reference code and every row referencing it, in one transaction."""
+        return self.post(f'reference-codes/{category}/{code}/rename/', data={'new_code': new_code, **fields})
+
+    def get_reference_bundle(self, etag: str = None) -> Optional[tuple]:
+        """
+        Get the reference-data bundle (all small catalogs, versioned).
+
+        Sends ``etag`` as If-None-Match. Returns ``(etag, data)`` or None when
+        the server answers 304 Not Modified.
+        """
+        url = f"{self.base_url.rstrip('/')}/reference-bundle/"
+        headers = {'If-None-Match': etag} if etag else {}
+        self._set_auth_headers()
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 401 and self._handle_auth_error(response):
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise APIException(f"Network error: {str(e)}")
+
+        if response.status_code == 304:
+            return None
+        if response.status_code != 200:
+            try:
+                error_data = decode_json(response)
+            except (ValueError, json.JSONDecodeError):
+                error_data = {'detail': response.text[:500]}
+            raise APIException(self._extract_error_message(error_data), response.status_code, error_data)
+        return response.headers.get('ETag'), decode_json(response)
+
     # Currency methods
     def get_currencies(self, page: int = 1, **filters) -> Dict[str, Any]:
         """Get currencies with optional filtering."""
@@ -952,7 +1122,7 @@ class ForgeAPIClient(BaseAPIClient):
         params.update(filters)
         return self.get('oem-brands/', params=params, use_cache=True)
     
-    def get_oem_catalog_items(self, page: int = 1, page_size: int = 1000, use_cache: bool = True, **filters) -> Dict[str, Any]:
+    def get_oem_catalog_items(self, page: int = None, page_size: int = 1000, use_cache: bool = True, **filters) -> Dict[str, Any]:
         """
         Get OEM catalog items (models/parts) with optional filtering.
         
@@ -962,7 +1132,7 @@ class ForgeAPIClient(BaseAPIClient):
         - is_active=True
         - is_discontinued=False
         """
-        params = {'page': page, 'page_size': page_size}
+        params = {'page': page, 'page_size': page_size} if page else {'page_size': page_size}
         params.update(filters)
         return self.get('oem-catalog-items/', params=params, use_cache=use_cache)
     
@@ -0,0 +1,253 @@
+"""
+ForgeDB Async API Client
+
+Async counterpart of ForgeAPIClient for I/O-bound frontend pages. Pages that
+need several independent backend calls (per-row summaries, dashboards) can
+issue them concurrently with ``asyncio.gather`` instead of serially.
+
+Authentication, cache keys, error extraction and token refresh are delegated
+to a regular ForgeAPIClient built for the same request, so both clients
+behave identically; only the transport (httpx) is async.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Dict, List, Optional
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from .api_client import APIException, ForgeAPIClient, LogBody, decode_json
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncForgeAPIClient:
+    """
+    Async HTTP client for ForgeDB backend communication.
+
+    Usage::
+
+        async with await AsyncForgeAPIClient.for_request(request) as client:
+            warehouses, movements = await client.gather(
+                client.get('warehouses/', params={'page_size': 100}),
+                client.get('stock/movements/', params={'page_size': 10}),
+            )
+    """
+
+    def __init__(
+        self,
+        sync_client: ForgeAPIClient,
+        max_connections: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """Initialize the async client.
+
+        Args:
+            sync_client: ForgeAPIClient already configured for the request.
+                Provides base URL, auth headers, session cookie and helpers.
+            max_connections: Maximum concurrent connections to the backend.
+            transport: Optional httpx transport (used by tests).
+        """
+        self.sync_client = sync_client
+        self.base_url = sync_client.base_url
+        self.timeout = sync_client.timeout
+        self.max_retries = sync_client.max_retries
+        self.max_connections = max_connections or getattr(settings, 'API_ASYNC_MAX_CONNECTIONS', 20)
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    async def for_request(cls, request, **kwargs) -> 'AsyncForgeAPIClient':
+        """Build a client for a Django request.
+
+        Reading the session may hit the database, so the sync client is
+        constructed in a worker thread.
+        """
+        sync_client = await sync_to_async(ForgeAPIClient)(request=request)
+        return cls(sync_client, **kwargs)
+
+    async def __aenter__(self) -> 'AsyncForgeAPIClient':
+        self._client = httpx.AsyncClient(
+            headers=dict(self.sync_client.session.headers),
+            cookies={cookie.name: cookie.value for cookie in self.sync_client.session.cookies},
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            transport=self.transport,
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _build_url(self, endpoint: str) -> str:
+        return f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+
+    def _is_retryable(self, error: httpx.HTTPError, attempt: int) -> bool:
+        """Mirror BaseAPIClient._handle_network_error for httpx errors."""
+        if attempt >= self.max_retries - 1:
+            return False
+        if isinstance(error, (httpx.TimeoutException, httpx.TransportError)):
+            logger.warning(f"{type(error).__name__} on attempt {attempt + 1}, retrying...")
+            return True
+        return False
+
+    async def _refresh_auth(self, response: httpx.Response) -> bool:
+        """Run the sync client's token refresh and pick up the new header."""
+        refreshed = await sync_to_async(self.sync_client._handle_auth_error)(response)
+        authorization = self.sync_client.session.headers.get('Authorization')
+        if authorization:
+            self._client.headers['Authorization'] = authorization
+        else:
+            self._client.headers.pop('Authorization', None)
+        return refreshed
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Dict = None,
+        params: Dict = None,
+        use_cache: bool = False,
+        cache_timeout: int = 300
+    ) -> Dict[str, Any]:
+        """
+        Make an HTTP request to the API.
+
+        Same contract as ForgeAPIClient._make_request: returns the decoded
+        JSON body and raises APIException on errors.
+        """
+        if self._client is None:
+            raise RuntimeError("AsyncForgeAPIClient must be used as an async context manager")
+
+        url = self._build_url(endpoint)
+
+        cache_key = None
+        if method == 'GET' and use_cache:
+            cache_key = self.sync_client._get_cache_key(endpoint, params)
+            cached_response = await cache.aget(cache_key)
+            if cached_response:
+                logger.debug(f"Cache hit for {endpoint}")
+                return cached_response
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Async API Request: %s %s", method, url)
+            if data:
+                logger.debug("Request data: %s", LogBody(data))
+
+        for attempt in range(self.max_retries):
+            try:
+                response = await self._client.request(
+                    method,
+                    url,
+                    json=data if data else None,
+                    params=params,
+                )
+            except httpx.HTTPError as e:
+                if self._is_retryable(e, attempt):
+                    continue
+                logger.error(f"Async request failed after {attempt + 1} attempts: {e}")
+                raise APIException(f"Network error: {str(e)}")
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Async API Response: %s %s", response.status_code, url)
+                logger.debug("Response data: %s", LogBody(response.content))
+
+            if response.status_code == 401:
+                if await self._refresh_auth(response) and attempt < self.max_retries - 1:
+                    continue
+
+            if 200 <= response.status_code < 300:
+                try:
+                    result = decode_json(response) if response.content else {}
+                except ValueError as e:
+                    logger.error(f"JSON decode error: {e}")
+                    raise APIException(
+                        "Invalid JSON response from server",
+                        response.status_code,
+                        {'raw_response': response.text}
+                    )
+
+                if cache_key:
+                    await cache.aset(cache_key, result, cache_timeout)
+                if method in ['POST', 'PUT', 'PATCH', 'DELETE']:
+                    await sync_to_async(self.sync_client._invalidate_related_cache)(endpoint)
+                return result
+
+            if 400 <= response.status_code < 500:
+                try:
+                    error_data = decode_json(response)
+                except ValueError:
+                    error_data = {'detail': response.text}
+                raise APIException(
+                    self.sync_client._extract_error_message(error_data),
+                    response.status_code,
+                    error_data
+                )
+
+            if attempt < self.max_retries - 1:
+                logger.warning(f"Server error {response.status_code}, retrying...")
+                continue
+
+            try:
+                error_data = decode_json(response)
+                error_detail = (
+                    self.sync_client._extract_error_message(error_data)
+                    if isinstance(error_data, dict) else str(error_data)
+                )
+            except ValueError:
+                error_detail = response.text[:500] if response.text else 'Internal server error'
+
+            logger.error(f"Server error {response.status_code}: {error_detail}")
+            raise APIException(
+                f"Error del servidor ({response.status_code}): {error_detail}",
+                response.status_code,
+                {'detail': error_detail, 'response_text': response.text[:1000] if response.text else ''}
+            )
+
+        raise APIException("Maximum retry attempts exceeded")
+
+    # CRUD Operations
+    async def get(self, endpoint: str, params: Dict = None, use_cache: bool = False, cache_timeout: int = 300) -> Dict[str, Any]:
+        """Make a GET request."""
+        return await self._make_request('GET', endpoint, params=params, use_cache=use_cache, cache_timeout=cache_timeout)
+
+    async def post(self, endpoint: str, data: Dict = None) -> Dict[str, Any]:
+        """Make a POST request."""
+        return await self._make_request('POST', endpoint, data=data)
+
+    async def put(self, endpoint: str, data: Dict = None) -> Dict[str, Any]:
+        """Make a PUT request."""
+        return await self._make_request('PUT', endpoint, data=data)
+
+    async def patch(self, endpoint: str, data: Dict = None) -> Dict[str, Any]:
+        """Make a PATCH request."""
+        return await self._make_request('PATCH', endpoint, data=data)
+
+    async def delete(self, endpoint: str) -> Dict[str, Any]:
+        """Make a DELETE request."""
+        return await self._make_request('DELETE', endpoint)
+
+    async def gather(self, *aws: Awaitable) -> List[Any]:
+        """
+        Run independent requests concurrently.
+
+        Every request is allowed to finish before the first APIException
+        (if any) is re-raised, so no request is left running against a
+        closed connection pool.
+        """
+        results = await asyncio.gather(*aws, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
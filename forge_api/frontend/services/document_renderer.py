@@ -0,0 +1,143 @@
+"""
+Document Renderer - PDFs de cotizaciones y facturas con caché
+
+Los PDFs se guardan en caché con la clave ``(tipo, id, hash de los datos)``:
+el hash cubre todo lo que se dibuja (documento, partidas, cliente), así que
+editar una partida o el cliente también cambia la clave, aunque no toque el
+``updated_at`` del documento. Mientras nada cambie, descargarlo otra vez no
+vuelve a pasar por ReportLab. Los generadores (y sus hojas de estilo) se
+crean una vez por proceso.
+
+``render_zip`` genera varios documentos en un zip sobre un archivo temporal,
+de uno en uno, sin mantenerlos todos en memoria. Los datos llegan de una
+"fuente": ``APIDocumentSource`` en las vistas y la base de datos en el
+comando ``render_documents``.
+"""
+
+import hashlib
+import json
+import logging
+import tempfile
+import zipfile
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .api_client import APIException
+from .invoice_pdf_generator import InvoicePDFGenerator
+from .quote_pdf_generator import QuotePDFGenerator
+
+logger = logging.getLogger(__name__)
+
+PDF_CACHE_ALIAS = getattr(settings, 'DOCUMENT_PDF_CACHE', 'default')
+PDF_CACHE_TIMEOUT = getattr(settings, 'DOCUMENT_PDF_CACHE_TIMEOUT', 86400)
+MAX_BATCH_SIZE = getattr(settings, 'DOCUMENT_PDF_MAX_BATCH', 200)
+
+# tipo -> (generador, campo id, campo número, prefijo del archivo)
+DOCUMENT_TYPES = {
+    'quote': (QuotePDFGenerator, 'quote_id', 'quote_number', 'cotizacion'),
+    'invoice': (InvoicePDFGenerator, 'invoice_id', 'invoice_number', 'factura'),
+}
+
+
+class DocumentRenderer:
+    """Renderiza cotizaciones y facturas a PDF, con caché por versión."""
+
+    _generators = {}
+
+    def __init__(self, cache_alias=None):
+        self.cache = caches[cache_alias or PDF_CACHE_ALIAS]
+
+    @classmethod
+    def generator(cls, kind):
+        if kind not in DOCUMENT_TYPES:
+            raise ValueError(f"Tipo de documento desconocido: {kind}")
+        if kind not in cls._generators:
+            cls._generators[kind] = DOCUMENT_TYPES[kind][0]()
+        return cls._generators[kind]
+
+    @staticmethod
+    def cache_key(kind, document):
+        """
+        Clave del PDF para los datos completos de ``document`` (después de
+        ``source.complete``). ``None`` si el documento no trae id (no se cachea).
+        """
+        _, id_field, _, _ = DOCUMENT_TYPES[kind]
+        doc_id = document.get(id_field)
+        if doc_id is None:
+            return None
+        data = json.dumps(document, sort_keys=True, separators=(',', ':'), default=str)
+        digest = hashlib.sha256(data.encode()).hexdigest()
+        return f"document_pdf:{kind}:{doc_id}:{digest}"
+
+    @staticmethod
+    def filename(kind, document):
+        _, id_field, number_field, prefix = DOCUMENT_TYPES[kind]
+        number = document.get(number_field) or document.get(id_field)
+        return f"{prefix}_{number}.pdf"
+
+    def render(self, kind, document, source=None):
+        """
+        Bytes del PDF de ``document`` (dict de la API con ``items``).
+
+        ``source.complete(kind, document)`` carga antes lo que no trae el
+        documento (cliente, items), que también entra en la clave de caché.
+        """
+        if source is not None:
+            source.complete(kind, document)
+        key = self.cache_key(kind, document)
+        if key:
+            pdf = self.cache.get(key)
+            if pdf is not None:
+                return pdf
+        pdf = self.generator(kind).generate_pdf(document).getvalue()
+        if key:
+            self.cache.set(key, pdf, PDF_CACHE_TIMEOUT)
+        return pdf
+
+    def render_zip(self, kind, ids, source, fileobj=None, limit=MAX_BATCH_SIZE):
+        """
+        Escribe un zip con un PDF por id en ``fileobj`` (por defecto un
+        archivo temporal) y lo devuelve posicionado al inicio.
+
+        Cada documento se carga, renderiza y escribe antes de pasar al
+        siguiente. ``limit=None`` quita el tope de documentos por lote.
+        """
+        if limit is not None and len(ids) > limit:
+            raise ValueError(f"Máximo {limit} documentos por lote")
+        if fileobj is None:
+            fileobj = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        # Los PDF ya van comprimidos: ZIP_STORED evita recomprimirlos
+        with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_STORED) as archive:
+            for doc_id in ids:
+                document = source.get(kind, doc_id)
+                archive.writestr(self.filename(kind, document), self.render(kind, document, source))
+        fileobj.seek(0)
+        return fileobj
+
+
+class APIDocumentSource:
+    """Carga cotizaciones y facturas desde la API con el cliente de la sesión."""
+
+    def __init__(self, api_client):
+        self.api_client = api_client
+
+    def get(self, kind, doc_id):
+        if kind == 'quote':
+            # La cotización trae todos sus items anidados
+            return self.api_client.get_quote(doc_id)
+        return self.api_client.get_invoice(doc_id)
+
+    def complete(self, kind, document):
+        if kind == 'quote':
+            client_id = document.get('client')
+            if client_id and not isinstance(client_id, dict):
+                try:
+                    document['client'] = self.api_client.get_client(client_id)
+                except APIException as e:
+                    logger.warning(f"Could not load client {client_id} for quote PDF: {e}")
+                    document['client'] = {}
+        else:
+            document['items'] = list(self.api_client.iter_results(
+                'invoice-items/', {'invoice': document['invoice_id']}
+            ))
@@ -0,0 +1,117 @@
+"""
+Invoice PDF Generator - Generador de PDF para facturas
+
+Reutiliza los estilos y la estructura de QuotePDFGenerator.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict
+
+from .quote_pdf_generator import (
+    QuotePDFGenerator, ITEM_HEADER_HEIGHT, ITEM_ROW_HEIGHT, _short,
+    Paragraph, Table, cm,
+)
+
+
+def _as_date(value):
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+        except ValueError:
+            return None
+    return None
+
+
+def _line_total(item: Dict) -> Decimal:
+    qty = Decimal(str(item.get('qty') or 0))
+    unit_price = Decimal(str(item.get('unit_price') or 0))
+    discount = Decimal(str(item.get('discount_percent') or 0))
+    total = qty * unit_price * (100 - discount) / 100
+    return total.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+class InvoicePDFGenerator(QuotePDFGenerator):
+    """Generador de PDF para facturas (``invoice`` + ``items`` de invoice-items)."""
+
+    title = "FACTURA"
+    number_field = 'invoice_number'
+
+    def _build_info_section(self, invoice_data: Dict) -> list:
+        """Cliente, fechas de emisión y vencimiento, estado."""
+        client = invoice_data.get('client') or {}
+        issue_date = _as_date(invoice_data.get('issue_date'))
+        due_date = _as_date(invoice_data.get('due_date'))
+
+        info_data = [
+            ['Cliente:', client.get('name', 'N/A')],
+            ['Fecha de emisión:', issue_date.strftime('%d/%m/%Y') if issue_date else 'N/A'],
+            ['Vencimiento:', due_date.strftime('%d/%m/%Y') if due_date else 'No especificado'],
+            ['Estado:', str(invoice_data.get('status') or 'N/A')],
+        ]
+        if invoice_data.get('wo_id'):
+            work_order = invoice_data.get('work_order') or {}
+            info_data.append(['Orden de trabajo:', work_order.get('wo_number') or f"#{invoice_data['wo_id']}"])
+
+        info_table = Table(info_data, colWidths=[4*cm, 12*cm])
+        info_table.setStyle(self.table_styles['info'])
+        return [info_table]
+
+    def _build_items_section(self, invoice_data: Dict) -> list:
+        """Conceptos de la factura."""
+        elements = [Paragraph("CONCEPTOS", self.styles['CustomHeading'])]
+
+        items = invoice_data.get('items', [])
+        if not items:
+            elements.append(Paragraph("No hay conceptos en esta factura.", self.styles['CustomNormal']))
+            return elements
+
+        items_data = [['#', 'SKU', 'Descripción', 'Cant.', 'Precio', 'Desc. %', 'Importe']]
+        items_data.extend(
+            [
+                str(idx),
+                item.get('internal_sku') or '',
+                _short(item.get('description', ''), 40),
+                f"{float(item.get('qty') or 0):g}",
+                f"${float(item.get('unit_price') or 0):.2f}",
+                f"{float(item.get('discount_percent') or 0):.2f}",
+                f"${_line_total(item):.2f}",
+            ]
+            for idx, item in enumerate(items, 1)
+        )
+
+        items_table = Table(
+            items_data,
+            colWidths=[0.8*cm, 2.2*cm, 6.5*cm, 1.2*cm, 2*cm, 1.5*cm, 2.1*cm],
+            rowHeights=[ITEM_HEADER_HEIGHT] + [ITEM_ROW_HEIGHT] * len(items),
+            repeatRows=1,
+        )
+        items_table.setStyle(self.table_styles['items'])
+        elements.append(items_table)
+        return elements
+
+    def _build_totals_section(self, invoice_data: Dict) -> list:
+        """Subtotal, descuento, impuestos y total."""
+        elements = [Paragraph("RESUMEN DE TOTALES", self.styles['CustomHeading'])]
+
+        subtotal = float(invoice_data.get('subtotal') or 0)
+        discount_amount = float(invoice_data.get('discount_amount') or 0)
+        tax_amount = float(invoice_data.get('tax_amount') or 0)
+        total = float(invoice_data.get('total_amount') or 0)
+        currency_code = invoice_data.get('currency_code') or 'MXN'
+
+        totals_data = [['Subtotal:', f"${subtotal:.2f}"]]
+        if discount_amount > 0:
+            totals_data.append(['Descuento:', f"-${discount_amount:.2f}"])
+        totals_data.extend([
+            ['Impuestos:', f"${tax_amount:.2f}"],
+            ['TOTAL:', f"${total:.2f} {currency_code}"],
+            ['Saldo:', 'Pagada' if str(invoice_data.get('status')).lower() == 'paid' else 'Pendiente'],
+        ])
+
+        totals_table = Table(totals_data, colWidths=[10*cm, 6*cm])
+        totals_table.setStyle(self.table_styles['totals'])
+        elements.append(totals_table)
+        return elements
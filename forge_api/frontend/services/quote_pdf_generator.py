@@ -4,6 +4,7 @@ Tarea 6.3: Generación de PDF
 """
 
 import logging
+from functools import lru_cache
 from io import BytesIO
 from decimal import Decimal
 from datetime import datetime, date
@@ -14,7 +15,7 @@ try:
     from reportlab.lib.units import inch, cm
     from reportlab.lib import colors
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
     from reportlab.pdfgen import canvas
     REPORTLAB_AVAILABLE = True
@@ -25,70 +26,145 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+# Filas de la tabla de items: una línea de texto (la descripción se recorta)
+# más el padding. Con alturas fijas ReportLab no mide cada celda al partir
+# la tabla entre páginas, lo que en cotizaciones largas era cuadrático.
+ITEM_HEADER_HEIGHT = 28
+ITEM_ROW_HEIGHT = 18
+ITEM_DESCRIPTION_LENGTH = 50
+
+
+@lru_cache(maxsize=None)
+def _stylesheet():
+    """Hoja de estilos compartida por todos los PDFs del proceso."""
+    styles = getSampleStyleSheet()
+
+    # Título
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1e3a8a'),
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+
+    # Subtítulo
+    styles.add(ParagraphStyle(
+        name='CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.HexColor('#1e40af'),
+        spaceAfter=12,
+        spaceBefore=12,
+        fontName='Helvetica-Bold'
+    ))
+
+    # Texto normal
+    styles.add(ParagraphStyle(
+        name='CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor('#1f2937'),
+        leading=12
+    ))
+
+    # Texto destacado
+    styles.add(ParagraphStyle(
+        name='CustomBold',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor('#1f2937'),
+        fontName='Helvetica-Bold'
+    ))
+
+    # Texto pequeño
+    styles.add(ParagraphStyle(
+        name='CustomSmall',
+        parent=styles['Normal'],
+        fontSize=8,
+        textColor=colors.HexColor('#6b7280'),
+        leading=10
+    ))
+    return styles
+
+
+@lru_cache(maxsize=None)
+def _table_styles():
+    """Estilos de tabla compartidos (TableStyle no se modifica al dibujar)."""
+    return {
+        'info': TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ]),
+        'items': TableStyle([
+            # Encabezado
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e3a8a')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('TOPPADDING', (0, 0), (-1, 0), 8),
+            # Filas
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+        ]),
+        'totals': TableStyle([
+            ('ALIGN', (0, 0), (0, -2), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('ALIGN', (0, -1), (0, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -2), 'Helvetica'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTNAME', (0, -2), (-1, -2), 'Helvetica-Bold'),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -2), 10),
+            ('FONTSIZE', (0, -2), (-1, -1), 12),
+            ('TEXTCOLOR', (0, -2), (-1, -2), colors.HexColor('#1e3a8a')),
+            ('LINEABOVE', (0, -2), (-1, -2), 1, colors.grey),
+            ('LINEABOVE', (0, -1), (-1, -1), 2, colors.HexColor('#1e3a8a')),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ]),
+    }
+
+
+def _short(text, length=ITEM_DESCRIPTION_LENGTH):
+    text = ' '.join(str(text or '').split())
+    return text[:length] + '...' if len(text) > length else text
+
+
 class QuotePDFGenerator:
     """
     Generador de PDF para cotizaciones usando ReportLab.
+
+    Los estilos se crean una vez por proceso; una instancia puede generar
+    cualquier número de documentos.
     """
     
+    title = "COTIZACIÓN"
+    number_field = 'quote_number'
+
     def __init__(self):
         """Inicializar generador de PDF."""
         if not REPORTLAB_AVAILABLE:
             raise ImportError("ReportLab no está instalado. Instale con: pip install reportlab")
         
         self.page_size = A4
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-    
-    def _setup_custom_styles(self):
-        """Configurar estilos personalizados."""
-        # Título
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1e3a8a'),
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Subtítulo
-        self.styles.add(ParagraphStyle(
-            name='CustomHeading',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#1e40af'),
-            spaceAfter=12,
-            spaceBefore=12,
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Texto normal
-        self.styles.add(ParagraphStyle(
-            name='CustomNormal',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#1f2937'),
-            leading=12
-        ))
-        
-        # Texto destacado
-        self.styles.add(ParagraphStyle(
-            name='CustomBold',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#1f2937'),
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Texto pequeño
-        self.styles.add(ParagraphStyle(
-            name='CustomSmall',
-            parent=self.styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#6b7280'),
-            leading=10
-        ))
+        self.styles = _stylesheet()
+        self.table_styles = _table_styles()
     
     def generate_pdf(self, quote_data: Dict[str, Any], company_data: Optional[Dict[str, Any]] = None) -> BytesIO:
         """
@@ -148,7 +224,7 @@ class QuotePDFGenerator:
         elements = []
         
         # Título
-        title = f"COTIZACIÓN #{quote_data.get('quote_number', 'N/A')}"
+        title = f"{self.title} #{quote_data.get(self.number_field, 'N/A')}"
         elements.append(Paragraph(title, self.styles['CustomTitle']))
         elements.append(Spacer(1, 0.3*cm))
         
@@ -220,18 +296,7 @@ class QuotePDFGenerator:
             info_data.append(['Email:', client_email])
         
         info_table = Table(info_data, colWidths=[4*cm, 12*cm])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (0, -1), TA_LEFT),
-            ('ALIGN', (1, 0), (1, -1), TA_LEFT),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
+        info_table.setStyle(self.table_styles['info'])
         
         elements.append(info_table)
         
@@ -249,45 +314,29 @@ class QuotePDFGenerator:
             elements.append(Paragraph("No hay items en esta cotización.", self.styles['CustomNormal']))
             return elements
         
-        # Encabezados de tabla
+        # Encabezados y filas de la tabla
         headers = ['#', 'Descripción', 'Cant.', 'Horas', 'Tarifa/Hora', 'Total']
         items_data = [headers]
-        
-        # Datos de items
-        for idx, item in enumerate(items, 1):
-            description = item.get('description', '')
-            quantity = str(item.get('quantity', 1))
-            hours = f"{float(item.get('hours', 0)):.2f}"
-            hourly_rate = f"${float(item.get('hourly_rate', 0)):.2f}"
-            line_total = f"${float(item.get('line_total', 0)):.2f}"
-            
-            items_data.append([
+        items_data.extend(
+            [
                 str(idx),
-                description[:50] + '...' if len(description) > 50 else description,
-                quantity,
-                hours,
-                hourly_rate,
-                line_total
-            ])
-        
-        # Crear tabla
-        items_table = Table(items_data, colWidths=[0.8*cm, 8*cm, 1*cm, 1.5*cm, 2*cm, 2*cm])
-        items_table.setStyle(TableStyle([
-            # Encabezado
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e3a8a')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), TA_CENTER),
-            ('ALIGN', (1, 0), (1, -1), TA_LEFT),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('TOPPADDING', (0, 0), (-1, 0), 8),
-            # Filas
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
-        ]))
+                _short(item.get('description', '')),
+                str(item.get('quantity', 1)),
+                f"{float(item.get('hours') or 0):.2f}",
+                f"${float(item.get('hourly_rate') or 0):.2f}",
+                f"${float(item.get('line_total') or 0):.2f}",
+            ]
+            for idx, item in enumerate(items, 1)
+        )
+        
+        # Crear tabla (el encabezado se repite en cada página)
+        items_table = Table(
+            items_data,
+            colWidths=[0.8*cm, 8*cm, 1*cm, 1.5*cm, 2*cm, 2*cm],
+            rowHeights=[ITEM_HEADER_HEIGHT] + [ITEM_ROW_HEIGHT] * len(items),
+            repeatRows=1,
+        )
+        items_table.setStyle(self.table_styles['items'])
         
         elements.append(items_table)
         
@@ -327,22 +376,7 @@ class QuotePDFGenerator:
         ])
         
         totals_table = Table(totals_data, colWidths=[10*cm, 6*cm])
-        totals_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -2), TA_LEFT),
-            ('ALIGN', (1, 0), (1, -1), TA_RIGHT),
-            ('ALIGN', (0, -1), (0, -1), TA_LEFT),
-            ('FONTNAME', (0, 0), (0, -2), 'Helvetica'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTNAME', (0, -2), (-1, -2), 'Helvetica-Bold'),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -2), 10),
-            ('FONTSIZE', (0, -2), (-1, -1), 12),
-            ('TEXTCOLOR', (0, -2), (-1, -2), colors.HexColor('#1e3a8a')),
-            ('LINEABOVE', (0, -2), (-1, -2), 1, colors.grey),
-            ('LINEABOVE', (0, -1), (-1, -1), 2, colors.HexColor('#1e3a8a')),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ]))
+        totals_table.setStyle(self.table_styles['totals'])
         
         elements.append(totals_table)
         
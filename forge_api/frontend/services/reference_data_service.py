@@ -0,0 +1,62 @@
+"""
+Reference Data Service
+ForgeDB Frontend Web Application
+
+Copia local (por proceso) del bundle de catálogos de referencia
+(/api/v1/reference-bundle/). Cada uso revalida con If-None-Match: mientras
+los catálogos no cambian la API responde 304 sin cuerpo y se reutiliza la
+copia en memoria.
+"""
+
+import logging
+import threading
+
+from .api_client import APIException
+
+logger = logging.getLogger(__name__)
+
+_bundle = {'etag': None, 'catalogs': None}
+_lock = threading.Lock()
+
+
+def get_reference_catalogs(api_client):
+    """
+    Devuelve ``{clave: [filas]}`` con todos los catálogos de referencia.
+
+    Si la API falla y ya hay una copia local, se usa esa copia; si no la
+    hay, se propaga la APIException.
+    """
+    etag, catalogs = _bundle['etag'], _bundle['catalogs']
+    try:
+        result = api_client.get_reference_bundle(etag if catalogs is not None else None)
+    except APIException as e:
+        if catalogs is None:
+            raise
+        logger.warning(f"Reference bundle revalidation failed, using local copy: {e}")
+        return catalogs
+
+    if result is None:
+        return catalogs
+
+    etag, data = result
+    catalogs = data.get('catalogs', {})
+    with _lock:
+        _bundle['etag'] = etag
+        _bundle['catalogs'] = catalogs
+    return catalogs
+
+
+def clear_reference_catalogs():
+    """Descarta la copia local (la siguiente llamada descarga el bundle)."""
+    with _lock:
+        _bundle['etag'] = None
+        _bundle['catalogs'] = None
+
+
+def code_choices(rows, code_field, empty_label, label=None):
+    """Opciones de un <select> a partir de las filas de un catálogo."""
+    choices = [('', empty_label)]
+    for row in rows:
+        text = label(row) if label else (row.get('name_es') or row.get('name_en') or row[code_field])
+        choices.append((row[code_field], text))
+    return choices
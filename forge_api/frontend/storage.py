@@ -0,0 +1,95 @@
+"""
+Static files storages that write precompressed siblings during
+``collectstatic``: ``app.css`` gets ``app.css.gz`` and, with brotli
+installed, ``app.css.br``. nginx serves them with ``gzip_static`` /
+``brotli_static`` instead of compressing on every request.
+"""
+import hashlib
+import logging
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, StaticFilesStorage
+
+from . import compression
+
+logger = logging.getLogger(__name__)
+
+
+class PrecompressedStaticFilesMixin:
+    """
+    Compress text assets after the storage's own post-processing (hashing,
+    for manifest storages), so the hashed names get siblings too.
+    """
+
+    precompress_extensions = ('.css', '.js', '.mjs', '.json', '.map', '.svg', '.html', '.txt',
+                              '.xml', '.ico', '.ttf', '.otf', '.eot')
+    # Siblings that save less than this fraction are not worth a lookup.
+    precompress_min_ratio = 0.95
+    precompress_min_size = 256
+
+    def post_process(self, paths, dry_run=False, **options):
+        names = set(paths)
+        parent = getattr(super(), 'post_process', None)
+        if parent is not None:
+            for original_name, processed_name, processed in parent(paths, dry_run, **options):
+                if processed_name and not isinstance(processed, Exception):
+                    names.add(processed_name)
+                yield original_name, processed_name, processed
+        if dry_run:
+            return
+        # A hashed copy usually has the same bytes as its original: compress once.
+        done = {}
+        for name in sorted(names):
+            if name.lower().endswith(self.precompress_extensions):
+                self.precompress(name, done)
+
+    def precompress(self, name, done=None):
+        """
+        Write the compressed siblings of ``name``; returns their names.
+        ``done`` maps content digests to already compressed output.
+        """
+        with self.open(name) as handle:
+            data = handle.read()
+        written = []
+        if len(data) < self.precompress_min_size:
+            return written
+        outputs = {} if done is None else done.setdefault(hashlib.sha256(data).digest(), {})
+        for coding, suffix in compression.STATIC_SUFFIXES.items():
+            if coding not in compression.available_encodings():
+                continue
+            if coding not in outputs:
+                outputs[coding] = compression.compress(data, coding, level=compression.STATIC_LEVEL[coding])
+            compressed = outputs[coding]
+            if len(compressed) > len(data) * self.precompress_min_ratio:
+                continue
+            with open(self.path(name + suffix), 'wb') as handle:
+                handle.write(compressed)
+            written.append(name + suffix)
+        return written
+
+
+class CompressedStaticFilesStorage(PrecompressedStaticFilesMixin, StaticFilesStorage):
+    pass
+
+
+class CompressedManifestStaticFilesStorage(PrecompressedStaticFilesMixin, ManifestStaticFilesStorage):
+    """
+    Content-hashed names (``main.3abe22895787.css``) recorded in
+    ``staticfiles.json``, plus precompressed siblings. Only hashed names are
+    cached as immutable (nginx ``location`` and StaticFilesCacheMiddleware).
+
+    A name missing from the manifest (collectstatic not run, as in the test
+    runner, or a template pointing at a file that does not exist) gets its
+    unhashed URL and a warning instead of a ValueError that would fail the
+    whole page.
+    """
+
+    _missing_warned = set()
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            if name not in self._missing_warned:
+                self._missing_warned.add(name)
+                logger.warning("Static file %s is not in the manifest; serving it unhashed", name)
+            return name
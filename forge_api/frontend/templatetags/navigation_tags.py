@@ -64,6 +64,40 @@ def render_related_pages(pages):
     return {'pages': pages}
 
 
+@register.inclusion_tag('frontend/components/cursor_pagination.html', takes_context=True)
+def render_cursor_pagination(context, pagination, label='Paginación', css_class='mt-4'):
+    """
+    Renderiza la navegación por cursor (primera / anterior / siguiente)
+    conservando los filtros de la URL actual
+
+    Args:
+        pagination: Contexto de APIClientMixin._cursor_pagination
+        label: aria-label de la navegación
+        css_class: Clases del <nav> (vacío dentro de un card-footer)
+
+    Returns:
+        Dict con contexto para el template
+    """
+    params = context['request'].GET.copy()
+    params.pop('cursor', None)
+    params.pop('page', None)
+
+    def url(cursor=None):
+        query = params.copy()
+        if cursor:
+            query['cursor'] = cursor
+        return '?' + query.urlencode() if query else '?'
+
+    return {
+        'pagination': pagination,
+        'label': label,
+        'css_class': css_class,
+        'first_url': url(),
+        'previous_url': url(pagination.get('previous_cursor')) if pagination.get('has_previous') else None,
+        'next_url': url(pagination.get('next_cursor')) if pagination.get('has_next') else None,
+    }
+
+
 @register.simple_tag
 def breadcrumb_separator():
     """
@@ -0,0 +1,209 @@
+"""
+Tests for the async API client used by the async frontend views.
+"""
+import asyncio
+import time
+
+import httpx
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from frontend.services.api_client import ForgeAPIClient, APIException
+from frontend.services.async_api_client import AsyncForgeAPIClient
+
+
+BASE_URL = 'http://backend.test/api/v1/'
+
+
+def make_client(handler, **kwargs):
+    """Build an async client whose requests are answered by ``handler``."""
+    sync_client = ForgeAPIClient(base_url=BASE_URL)
+    return AsyncForgeAPIClient(sync_client, transport=httpx.MockTransport(handler), **kwargs)
+
+
+class TestAsyncForgeAPIClient(SimpleTestCase):
+    """Behavioural parity with ForgeAPIClient plus concurrent fan-out."""
+
+    def setUp(self):
+        cache.clear()
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_get_returns_json(self):
+        def handler(request):
+            self.assertEqual(request.url.path, '/api/v1/warehouses/')
+            self.assertEqual(request.url.params['page_size'], '5')
+            return httpx.Response(200, json={'count': 1, 'results': [{'warehouse_id': 1}]})
+
+        async def scenario():
+            async with make_client(handler) as client:
+                return await client.get('warehouses/', params={'page_size': 5})
+
+        data = self.run_async(scenario())
+        self.assertEqual(data['count'], 1)
+
+    def test_client_error_raises_api_exception(self):
+        def handler(request):
+            return httpx.Response(404, json={'detail': 'No encontrado.'})
+
+        async def scenario():
+            async with make_client(handler) as client:
+                await client.get('warehouses/999/')
+
+        with self.assertRaises(APIException) as ctx:
+            self.run_async(scenario())
+        self.assertEqual(ctx.exception.status_code, 404)
+        self.assertEqual(ctx.exception.message, 'No encontrado.')
+
+    def test_server_error_is_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) < 2:
+                return httpx.Response(503, json={'detail': 'busy'})
+            return httpx.Response(200, json={'ok': True})
+
+        async def scenario():
+            async with make_client(handler) as client:
+                return await client.get('stock/summary/')
+
+        self.assertEqual(self.run_async(scenario()), {'ok': True})
+        self.assertEqual(len(calls), 2)
+
+    def test_cached_get_skips_second_request(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={'results': []})
+
+        async def scenario():
+            async with make_client(handler) as client:
+                await client.get('clients/', params={'page': 1}, use_cache=True)
+                await client.get('clients/', params={'page': 1}, use_cache=True)
+
+        self.run_async(scenario())
+        self.assertEqual(len(calls), 1)
+
+    def test_gather_runs_requests_concurrently(self):
+        async def handler(request):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={'path': request.url.path})
+
+        async def scenario():
+            async with make_client(handler) as client:
+                return await client.gather(*(client.get(f'bins/{i}/') for i in range(10)))
+
+        start = time.perf_counter()
+        results = self.run_async(scenario())
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(results), 10)
+        self.assertEqual(results[3]['path'], '/api/v1/bins/3/')
+        # Ten 50 ms requests run serially would take at least 0.5 s
+        self.assertLess(elapsed, 0.4)
+
+    def test_gather_reraises_after_all_requests_finish(self):
+        finished = []
+
+        async def handler(request):
+            if request.url.path.endswith('/bad/'):
+                return httpx.Response(400, json={'detail': 'bad'})
+            await asyncio.sleep(0.02)
+            finished.append(request.url.path)
+            return httpx.Response(200, json={})
+
+        async def scenario():
+            async with make_client(handler) as client:
+                await client.gather(client.get('bad/'), client.get('good/'))
+
+        with self.assertRaises(APIException):
+            self.run_async(scenario())
+        self.assertEqual(finished, ['/api/v1/good/'])
+
+    def test_request_outside_context_manager_fails(self):
+        client = make_client(lambda request: httpx.Response(200, json={}))
+        with self.assertRaises(RuntimeError):
+            self.run_async(client.get('clients/'))
+
+
+class TestAsyncDashboardViews(SimpleTestCase):
+    """The async pages gather their fetches and build the same context."""
+
+    def setUp(self):
+        from django.contrib.auth.models import AnonymousUser
+        from django.contrib.sessions.backends.signed_cookies import SessionStore
+        from django.test import RequestFactory
+
+        self.factory = RequestFactory()
+        self.session = SessionStore()
+        self.anonymous = AnonymousUser()
+
+    def _request(self, path, authenticated=True):
+        from unittest.mock import Mock
+
+        request = self.factory.get(path)
+        request.session = self.session
+        request.user = Mock(is_authenticated=True) if authenticated else self.anonymous
+        return request
+
+    def _patch_client(self, handler):
+        from unittest.mock import patch
+
+        async def for_request(request, **kwargs):
+            return make_client(handler)
+
+        return patch.object(AsyncForgeAPIClient, 'for_request', side_effect=for_request)
+
+    def test_stock_dashboard_fetches_panels_concurrently(self):
+        from frontend.urls import main_views
+
+        paths = []
+
+        async def handler(request):
+            paths.append(request.url.path)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={'results': [{'path': request.url.path}], 'total': 3})
+
+        with self._patch_client(handler):
+            start = time.perf_counter()
+            response = asyncio.run(main_views.StockDashboardView.as_view()(self._request('/inventory/stock/dashboard/')))
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(paths), 4)
+        self.assertLess(elapsed, 0.15)
+        self.assertEqual(response.context_data['stock_summary']['total'], 3)
+        self.assertEqual(response.context_data['warehouses'], [{'path': '/api/v1/warehouses/'}])
+
+    def test_warehouse_list_adds_row_summaries(self):
+        from frontend.views.inventory_advanced_views import WarehouseAdvancedListView
+
+        def handler(request):
+            if request.url.path.endswith('/warehouses/'):
+                return httpx.Response(200, json={'count': 2, 'results': [
+                    {'warehouse_id': 1, 'warehouse_code': 'W1', 'status': 'active'},
+                    {'warehouse_id': 2, 'warehouse_code': 'W2', 'status': 'inactive'},
+                ]})
+            if request.url.path.endswith('/bins/'):
+                return httpx.Response(200, json={'count': 10})
+            return httpx.Response(500, json={'detail': 'boom'})
+
+        with self._patch_client(handler):
+            response = asyncio.run(WarehouseAdvancedListView.as_view()(self._request('/inventory/warehouses/advanced/')))
+
+        warehouses = response.context_data['warehouses']
+        self.assertEqual([w['bin_count'] for w in warehouses], [10, 10])
+        self.assertEqual([w['stock_items'] for w in warehouses], [0, 0])
+        self.assertEqual(warehouses[0]['status_class'], 'success')
+
+    def test_anonymous_user_is_redirected_to_login(self):
+        from frontend.urls import main_views
+
+        response = asyncio.run(main_views.StockDashboardView.as_view()(
+            self._request('/inventory/stock/dashboard/', authenticated=False)
+        ))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/login/', response.url)
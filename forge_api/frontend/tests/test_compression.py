@@ -0,0 +1,192 @@
+"""
+Tests for response compression (frontend.middleware.CompressionMiddleware)
+and precompressed static files (frontend.storage).
+
+The decode matrix runs every coding this process can produce against every
+compressible content type, and checks the body the way real clients see it:
+urllib3 (requests / ForgeAPIClient) and httpx (AsyncForgeAPIClient).
+"""
+import io
+import json
+import tempfile
+from pathlib import Path
+
+import httpx
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from urllib3.response import HTTPResponse
+
+from frontend import compression
+from frontend.middleware import CompressionMiddleware, StaticFilesCacheMiddleware
+from frontend.storage import CompressedStaticFilesStorage
+
+
+PAYLOADS = {
+    'application/json': json.dumps(
+        {'results': [{'part_number': f'BN{i:09d}', 'description': 'Balata delantera ñ'} for i in range(200)]}
+    ).encode(),
+    'text/html; charset=utf-8': ('<table>' + '<tr><td>Orden de trabajo</td></tr>' * 300 + '</table>').encode(),
+    'text/css': b'.sidebar { color: #333; margin: 0 auto; }\n' * 200,
+    'application/problem+json': json.dumps({'detail': 'x' * 4000}).encode(),
+}
+
+# Codings each client library decodes.
+URLLIB3_CODINGS = {'gzip', 'br'}
+HTTPX_CODINGS = {'gzip', 'br'}
+
+
+def middleware_response(response, accept_encoding='gzip, deflate, br, zstd', path='/api/v1/products/'):
+    request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING=accept_encoding)
+    return CompressionMiddleware(lambda req: response)(request)
+
+
+class NegotiationTests(SimpleTestCase):
+    encodings = ['br', 'zstd', 'gzip']
+
+    def test_server_preference_breaks_ties(self):
+        self.assertEqual(compression.negotiate('gzip, deflate, br', self.encodings), 'br')
+        self.assertEqual(compression.negotiate('gzip, zstd', self.encodings), 'zstd')
+        self.assertEqual(compression.negotiate('gzip, deflate', self.encodings), 'gzip')
+
+    def test_quality_values(self):
+        self.assertEqual(compression.negotiate('br;q=0.5, gzip', self.encodings), 'gzip')
+        self.assertEqual(compression.negotiate('br;q=0, gzip;q=0.1', self.encodings), 'gzip')
+        self.assertIsNone(compression.negotiate('gzip;q=0', self.encodings))
+
+    def test_wildcard_identity_and_aliases(self):
+        self.assertEqual(compression.negotiate('*', self.encodings), 'br')
+        self.assertEqual(compression.negotiate('*;q=0.5, br;q=0', self.encodings), 'zstd')
+        self.assertEqual(compression.negotiate('x-gzip', self.encodings), 'gzip')
+        self.assertIsNone(compression.negotiate('identity', self.encodings))
+        self.assertIsNone(compression.negotiate('', self.encodings))
+
+    def test_only_available_codings(self):
+        self.assertEqual(compression.negotiate('br, gzip', ['gzip']), 'gzip')
+
+
+class DecodeMatrixTests(SimpleTestCase):
+    """Every coding x content type round-trips byte for byte."""
+
+    def test_round_trip(self):
+        for coding in compression.available_encodings():
+            for content_type, body in PAYLOADS.items():
+                with self.subTest(coding=coding, content_type=content_type):
+                    response = middleware_response(HttpResponse(body, content_type=content_type),
+                                                   accept_encoding=coding)
+                    self.assertEqual(response['Content-Encoding'], coding)
+                    self.assertEqual(int(response['Content-Length']), len(response.content))
+                    self.assertLess(len(response.content), len(body))
+                    self.assertEqual(compression.decompress(response.content, coding)[:len(body)], body)
+
+    def test_http_clients_decode(self):
+        for coding in compression.available_encodings():
+            for content_type, body in PAYLOADS.items():
+                response = middleware_response(HttpResponse(body, content_type=content_type),
+                                               accept_encoding=coding)
+                headers = {'Content-Encoding': coding, 'Content-Type': content_type}
+                if coding in URLLIB3_CODINGS:
+                    with self.subTest(client='urllib3', coding=coding, content_type=content_type):
+                        raw = HTTPResponse(body=io.BytesIO(response.content), headers=headers,
+                                           preload_content=False)
+                        self.assertEqual(raw.read(decode_content=True)[:len(body)], body)
+                if coding in HTTPX_CODINGS:
+                    with self.subTest(client='httpx', coding=coding, content_type=content_type):
+                        decoded = httpx.Response(200, headers=headers, content=response.content).content
+                        self.assertEqual(decoded[:len(body)], body)
+
+    def test_html_is_padded_with_every_coding(self):
+        body = PAYLOADS['text/html; charset=utf-8']
+        for coding in compression.available_encodings():
+            with self.subTest(coding=coding):
+                sizes = set()
+                for _ in range(10):
+                    response = middleware_response(HttpResponse(body), accept_encoding=coding)
+                    sizes.add(len(response.content))
+                    decoded = compression.decompress(response.content, coding)
+                    self.assertTrue(decoded.startswith(body))
+                    self.assertRegex(decoded[len(body):], rb'^<!-- [\w-]* -->$')
+                self.assertGreater(len(sizes), 1)
+
+    def test_only_html_is_padded(self):
+        body = PAYLOADS['application/json']
+        response = middleware_response(HttpResponse(body, content_type='application/json'), accept_encoding='gzip')
+        self.assertEqual(compression.decompress(response.content, 'gzip'), body)
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = PAYLOADS['application/json']
+
+    def test_identity_when_not_accepted(self):
+        response = middleware_response(HttpResponse(self.body, content_type='application/json'),
+                                       accept_encoding='')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, self.body)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_small_response_is_untouched(self):
+        response = middleware_response(HttpResponse(b'{"ok":true}', content_type='application/json'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertFalse(response.has_header('Vary'))
+
+    @override_settings(COMPRESSION_MIN_SIZE=10)
+    def test_threshold_is_configurable(self):
+        response = middleware_response(HttpResponse(b'{"ok":true,"ok2":true}' * 2, content_type='application/json'),
+                                       accept_encoding='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_streaming_and_sse_are_skipped(self):
+        sse = StreamingHttpResponse(iter([b'data: {}\n\n']), content_type='text/event-stream')
+        self.assertFalse(middleware_response(sse).has_header('Content-Encoding'))
+        download = FileResponse(io.BytesIO(self.body), content_type='application/json')
+        self.assertFalse(middleware_response(download).has_header('Content-Encoding'))
+
+    def test_binary_encoded_and_no_transform_are_skipped(self):
+        image = HttpResponse(b'\x89PNG' + bytes(4000), content_type='image/png')
+        self.assertFalse(middleware_response(image).has_header('Content-Encoding'))
+
+        encoded = HttpResponse(self.body, content_type='application/json')
+        encoded['Content-Encoding'] = 'identity'
+        self.assertEqual(middleware_response(encoded).content, self.body)
+
+        no_transform = HttpResponse(self.body, content_type='application/json')
+        no_transform['Cache-Control'] = 'private, no-transform'
+        self.assertFalse(middleware_response(no_transform).has_header('Content-Encoding'))
+
+    def test_strong_etag_becomes_weak(self):
+        response = HttpResponse(self.body, content_type='application/json')
+        response['ETag'] = '"abc123"'
+        self.assertEqual(middleware_response(response, accept_encoding='gzip')['ETag'], 'W/"abc123"')
+
+    def test_static_cache_middleware_no_longer_claims_gzip(self):
+        request = RequestFactory().get('/static/frontend/css/main.3abe22895787.css')
+        response = StaticFilesCacheMiddleware(lambda req: HttpResponse(b'body{}', content_type='text/css'))(request)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('immutable', response['Cache-Control'])
+
+
+class PrecompressedStaticFilesTests(SimpleTestCase):
+
+    def test_collectstatic_siblings(self):
+        with tempfile.TemporaryDirectory() as root:
+            storage = CompressedStaticFilesStorage(location=root, base_url='/static/')
+            css = b'.card { padding: 1rem; border: 1px solid #ddd; }\n' * 100
+            Path(root, 'app.css').write_bytes(css)
+            Path(root, 'tiny.js').write_bytes(b'x=1')
+            Path(root, 'logo.png').write_bytes(bytes(5000))
+            paths = {name: (storage, name) for name in ('app.css', 'tiny.js', 'logo.png')}
+
+            list(storage.post_process(paths))
+
+            for coding, suffix in compression.STATIC_SUFFIXES.items():
+                if coding in compression.available_encodings():
+                    sibling = Path(root, 'app.css' + suffix).read_bytes()
+                    self.assertEqual(compression.decompress(sibling, coding), css)
+            self.assertFalse(Path(root, 'tiny.js.gz').exists())
+            self.assertFalse(Path(root, 'logo.png.gz').exists())
+
+    def test_dry_run_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as root:
+            storage = CompressedStaticFilesStorage(location=root, base_url='/static/')
+            Path(root, 'app.css').write_bytes(b'a { color: red; }\n' * 100)
+            list(storage.post_process({'app.css': (storage, 'app.css')}, dry_run=True))
+            self.assertFalse(Path(root, 'app.css.gz').exists())
@@ -0,0 +1,103 @@
+"""
+Tests for the hashed static pipeline: CompressedManifestStaticFilesStorage
+(frontend.storage), cache headers for hashed names and the manifest-driven
+preload headers (frontend.middleware).
+"""
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from frontend import compression
+from frontend.middleware import PerformanceMiddleware, StaticFilesCacheMiddleware, preload_link_header
+from frontend.storage import CompressedManifestStaticFilesStorage
+
+
+def static_response(path, content_type='text/css'):
+    request = RequestFactory().get(path)
+    return StaticFilesCacheMiddleware(lambda req: HttpResponse(b'x', content_type=content_type))(request)
+
+
+class ManifestStorageTests(SimpleTestCase):
+
+    def collect(self, root, files):
+        for name, content in files.items():
+            Path(root, name).parent.mkdir(parents=True, exist_ok=True)
+            Path(root, name).write_bytes(content)
+        storage = CompressedManifestStaticFilesStorage(location=root, base_url='/static/')
+        list(storage.post_process({name: (storage, name) for name in files}))
+        return storage
+
+    def test_hashed_names_manifest_and_siblings(self):
+        css = b'.logo { background: url("../img/logo.svg"); }\n' + b'.card { padding: 1rem; }\n' * 100
+        svg = b'<svg xmlns="http://www.w3.org/2000/svg">' + b'<g/>' * 200 + b'</svg>'
+        with tempfile.TemporaryDirectory() as root:
+            self.collect(root, {'css/app.css': css, 'img/logo.svg': svg})
+
+            manifest = json.loads(Path(root, 'staticfiles.json').read_text())['paths']
+            hashed_css = manifest['css/app.css']
+            self.assertRegex(hashed_css, r'^css/app\.[0-9a-f]{12}\.css$')
+            hashed_content = Path(root, hashed_css).read_bytes()
+            self.assertIn(manifest['img/logo.svg'].split('/')[-1].encode(), hashed_content)
+
+            for coding, suffix in compression.STATIC_SUFFIXES.items():
+                if coding in compression.available_encodings():
+                    with self.subTest(coding=coding):
+                        sibling = Path(root, hashed_css + suffix).read_bytes()
+                        self.assertEqual(compression.decompress(sibling, coding), hashed_content)
+                        self.assertTrue(Path(root, 'css/app.css' + suffix).exists())
+
+            storage = CompressedManifestStaticFilesStorage(location=root, base_url='/static/')
+            with override_settings(DEBUG=False):
+                self.assertEqual(storage.url('css/app.css'), '/static/' + hashed_css)
+
+    @override_settings(DEBUG=False)
+    def test_missing_manifest_entry_falls_back_to_unhashed_url(self):
+        with tempfile.TemporaryDirectory() as root:
+            storage = CompressedManifestStaticFilesStorage(location=root, base_url='/static/')
+            with self.assertLogs('frontend.storage', 'WARNING'):
+                self.assertEqual(storage.url('frontend/css/new.css'), '/static/frontend/css/new.css')
+
+
+class StaticCacheHeaderTests(SimpleTestCase):
+
+    def test_hashed_assets_are_immutable(self):
+        response = static_response('/static/frontend/css/main.3abe22895787.css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+
+    def test_unhashed_assets_get_a_short_cache(self):
+        for path in ('/static/frontend/css/main.css', '/static/frontend/js/sw.js',
+                     '/static/frontend/manifest.json'):
+            with self.subTest(path=path):
+                response = static_response(path)
+                self.assertNotIn('immutable', response['Cache-Control'])
+                self.assertIn('max-age=3600', response['Cache-Control'])
+
+
+class PreloadHeaderTests(SimpleTestCase):
+
+    def setUp(self):
+        preload_link_header.cache_clear()
+        self.addCleanup(preload_link_header.cache_clear)
+        # No collectstatic in the test runner: every name takes the unhashed fallback.
+        storage_logger = logging.getLogger('frontend.storage')
+        self.addCleanup(storage_logger.setLevel, storage_logger.level)
+        storage_logger.setLevel(logging.ERROR)
+
+    def page(self, response):
+        return PerformanceMiddleware(lambda req: response)(RequestFactory().get('/dashboard/'))
+
+    @override_settings(STATIC_PRELOAD=['frontend/css/main.css', 'frontend/js/main.js', 'frontend/fonts/ui.woff2'])
+    def test_html_pages_preload_configured_assets(self):
+        link = self.page(HttpResponse('<html></html>'))['Link']
+        self.assertIn('</static/frontend/css/main.css>; rel=preload; as=style', link)
+        self.assertIn('</static/frontend/js/main.js>; rel=preload; as=script', link)
+        self.assertIn('</static/frontend/fonts/ui.woff2>; rel=preload; as=font; crossorigin', link)
+        self.assertIn('rel=dns-prefetch', link)
+
+    def test_api_responses_get_no_hints(self):
+        self.assertFalse(self.page(JsonResponse({'ok': True})).has_header('Link'))
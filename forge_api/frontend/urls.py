@@ -7,6 +7,7 @@ from . import views
 from . import views_notification
 from .views import diagnostic_views, catalog_views, service_advanced_views, oem_views, alert_views, equipment_type_views, taxonomy_views, reference_code_views, currency_views, currency_rate_views, product_catalog_views
 from .views import oem_equivalence_views, fitment_views, oem_import_views, unified_search_views, oem_ui_views
+from .views import lookup_views, document_views
 from .views.currency_history_views import (
     CurrencyHistoryComparisonView,
     CurrencyHistoryComparisonAPIView,
@@ -117,6 +118,7 @@ urlpatterns = [
     path('invoices/<int:pk>/', views.InvoiceDetailView.as_view(), name='invoice_detail'),
     path('invoices/<int:pk>/edit/', views.InvoiceUpdateView.as_view(), name='invoice_update'),
     path('invoices/<int:pk>/delete/', views.InvoiceDeleteView.as_view(), name='invoice_delete'),
+    path('invoices/<int:pk>/pdf/', document_views.InvoicePDFView.as_view(), name='invoice_pdf'),
 
     # Suppliers
     path('suppliers/', views.SupplierListView.as_view(), name='supplier_list'),
@@ -148,6 +150,7 @@ urlpatterns = [
     path('api/kpi/<str:kpi_type>/', main_views.KPIDetailsView.as_view(), name='kpi_details'),
     path('api/search-clients/', main_views.SearchClientsView.as_view(), name='search_clients'),
     path('api/search-equipment/', main_views.SearchEquipmentView.as_view(), name='search_equipment'),
+    path('api/lookups/<str:kind>/', lookup_views.LookupView.as_view(), name='lookup'),
     path('api/debug-auth/', main_views.DebugAuthView.as_view(), name='debug_auth'),
     path('api/oem/models/', oem_views.OEMModelListAPIView.as_view(), name='oem_model_list'),
     
@@ -313,6 +316,7 @@ urlpatterns = [
     path('quotes/<int:pk>/', QuoteDetailView.as_view(), name='quote_detail'),
     path('quotes/<int:quote_id>/pdf/', QuotePDFView.as_view(), name='quote_pdf'),
     path('quotes/<int:quote_id>/convert/', QuoteConvertToWorkOrderView.as_view(), name='quote_convert_to_wo'),
+    path('documents/<str:kind>/pdf-batch/', document_views.DocumentBatchPDFView.as_view(), name='document_pdf_batch'),
     
     # Alert and Audit System
     path('alerts/', alert_views.AlertDashboardView.as_view(), name='alert_dashboard'),
@@ -42,173 +42,118 @@ class TaxonomyValidator:
         
         return True, None
     
-    def check_circular_reference(self, node_type: str, node_id: int, 
-                                 parent_id: int) -> Tuple[bool, Optional[str]]:
+    def check_circular_reference(self, node_type: str, node_id: str, 
+                                 parent_id: str) -> Tuple[bool, Optional[str]]:
         """
         Detecta referencias circulares en la jerarquía
         
+        Una sola consulta a la tabla de cierre de la API
+        (``taxonomy/<tipo>/<código>/check-parent/``).
+        
         Args:
             node_type: Tipo del nodo (subsystem, group)
-            node_id: ID del nodo que se está editando
-            parent_id: ID del nuevo padre propuesto
+            node_id: Código del nodo que se está editando
+            parent_id: Código del nuevo padre propuesto
             
         Returns:
             Tuple[bool, Optional[str]]: (tiene_circular, mensaje_error)
         """
         try:
-            # Obtener todos los descendientes del nodo actual
-            descendants = self._get_all_descendants(node_type, node_id)
-            
-            # Si el nuevo padre está en los descendientes, hay referencia circular
-            if parent_id in descendants:
-                return True, "Referencia circular detectada: el padre propuesto es descendiente de este nodo"
-            
-            return False, None
+            result = self.api_client.check_taxonomy_parent(node_type, node_id, parent_id)
+            # Un padre inexistente no es una referencia circular
+            if result.get('valid') or not (result.get('error') or '').startswith('Circular'):
+                return False, None
+            return True, "Referencia circular detectada: el padre propuesto es descendiente de este nodo"
             
         except Exception as e:
             logger.error(f"Error checking circular reference: {e}")
             return False, "Error al verificar referencias circulares"
     
-    def _get_all_descendants(self, node_type: str, node_id: int) -> Set[int]:
+    def _get_all_descendants(self, node_type: str, node_id: str) -> Set[str]:
         """
-        Obtiene recursivamente todos los descendientes de un nodo
+        Obtiene todos los descendientes de un nodo en una sola llamada
         
         Args:
             node_type: Tipo del nodo
-            node_id: ID del nodo
+            node_id: Código del nodo
             
         Returns:
-            Set[int]: Conjunto de IDs de todos los descendientes
+            Set[str]: Conjunto de códigos de todos los descendientes
         """
-        descendants = set()
+        if node_type not in ('system', 'subsystem'):
+            return set()
         
         try:
-            # Determinar el tipo de hijos según el tipo de nodo
-            if node_type == 'system':
-                child_type = 'subsystem'
-                endpoint = '/api/v1/catalog/taxonomy-subsystems/'
-                parent_param = 'system'
-            elif node_type == 'subsystem':
-                child_type = 'group'
-                endpoint = '/api/v1/catalog/taxonomy-groups/'
-                parent_param = 'subsystem'
-            else:
-                return descendants
-            
-            # Obtener hijos directos
-            response = self.api_client.get(endpoint, params={parent_param: node_id})
-            children = response.get('results', [])
-            
-            # Agregar hijos y obtener sus descendientes recursivamente
-            for child in children:
-                child_id = child.get('id')
-                if child_id:
-                    descendants.add(child_id)
-                    # Recursión para obtener descendientes del hijo
-                    child_descendants = self._get_all_descendants(child_type, child_id)
-                    descendants.update(child_descendants)
-            
+            nodes = self.api_client.get_taxonomy_descendants(node_type, node_id)
+            return {node['code'] for node in nodes}
         except Exception as e:
             logger.error(f"Error getting descendants for {node_type} {node_id}: {e}")
-        
-        return descendants
+            return set()
+    
+    # Tipo de dependencia de la API -> (etiqueta, plantilla de advertencia)
+    DEPENDENCY_LABELS = {
+        'subsystems': ('subsistemas', "Tiene {count} subsistema(s) asociado(s)"),
+        'groups': ('grupos', "Tiene {count} grupo(s) asociado(s)"),
+        'products': ('productos', "Hay {count} producto(s) en esta taxonomía"),
+        'catalog_items': ('artículos de catálogo', "Hay {count} artículo(s) de catálogo OEM en esta taxonomía"),
+        'flat_rates': ('tarifas planas', "Hay {count} tarifa(s) plana(s) en esta taxonomía"),
+    }
     
-    def check_dependencies(self, node_type: str, node_id: int) -> Dict:
+    def check_dependencies(self, node_type: str, node_id: str) -> Dict:
         """
         Verifica todas las dependencias de un nodo antes de eliminarlo
         
+        Una sola llamada a ``taxonomy-<tipo>s/dependencies/``, que cuenta
+        nodos hijos, productos, artículos de catálogo y tarifas planas en una
+        consulta agrupada.
+        
         Args:
             node_type: Tipo del nodo (system, subsystem, group)
-            node_id: ID del nodo
+            node_id: Código del nodo
             
         Returns:
             Dict con información de dependencias
         """
-        dependencies = {
-            'has_dependencies': False,
-            'dependency_types': [],
-            'dependency_counts': {},
-            'can_delete': True,
-            'warnings': []
-        }
+        return self.check_dependencies_bulk(node_type, [node_id]).get(str(node_id), self._empty_dependencies())
+    
+    def check_dependencies_bulk(self, node_type: str, node_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Dependencias de varios nodos en una sola llamada
         
+        Returns:
+            Dict[str, Dict]: código -> información de dependencias (mismo formato que check_dependencies)
+        """
+        results = {}
         try:
-            # Verificar según el tipo de nodo
-            if node_type == 'system':
-                # Verificar subsistemas
-                subsystems = self.api_client.get(
-                    '/api/v1/catalog/taxonomy-subsystems/',
-                    params={'system': node_id}
-                )
-                subsystem_count = len(subsystems.get('results', []))
-                
-                if subsystem_count > 0:
-                    dependencies['has_dependencies'] = True
-                    dependencies['dependency_types'].append('subsistemas')
-                    dependencies['dependency_counts']['subsistemas'] = subsystem_count
-                    dependencies['can_delete'] = False
-                    dependencies['warnings'].append(
-                        f"Este sistema tiene {subsystem_count} subsistema(s) asociado(s)"
-                    )
-            
-            elif node_type == 'subsystem':
-                # Verificar grupos
-                groups = self.api_client.get(
-                    '/api/v1/catalog/taxonomy-groups/',
-                    params={'subsystem': node_id}
-                )
-                group_count = len(groups.get('results', []))
-                
-                if group_count > 0:
+            for row in self.api_client.get_taxonomy_dependencies(node_type, [str(node_id) for node_id in node_ids]):
+                dependencies = self._empty_dependencies()
+                for kind, count in row.get('dependencies', {}).items():
+                    label, warning = self.DEPENDENCY_LABELS.get(kind, (kind, "{count} " + kind))
                     dependencies['has_dependencies'] = True
-                    dependencies['dependency_types'].append('grupos')
-                    dependencies['dependency_counts']['grupos'] = group_count
                     dependencies['can_delete'] = False
-                    dependencies['warnings'].append(
-                        f"Este subsistema tiene {group_count} grupo(s) asociado(s)"
-                    )
-            
-            # Verificar equipos asociados (para cualquier nivel)
-            equipment_count = self._check_equipment_dependencies(node_type, node_id)
-            if equipment_count > 0:
-                dependencies['has_dependencies'] = True
-                dependencies['dependency_types'].append('equipos')
-                dependencies['dependency_counts']['equipos'] = equipment_count
-                dependencies['warnings'].append(
-                    f"Hay {equipment_count} equipo(s) asociado(s) a esta taxonomía"
-                )
+                    dependencies['dependency_types'].append(label)
+                    dependencies['dependency_counts'][label] = count
+                    dependencies['warnings'].append(warning.format(count=count))
+                results[row['code']] = dependencies
         
         except Exception as e:
-            logger.error(f"Error checking dependencies for {node_type} {node_id}: {e}")
-            dependencies['warnings'].append("Error al verificar dependencias")
+            logger.error(f"Error checking dependencies for {node_type} {node_ids}: {e}")
+            for node_id in node_ids:
+                dependencies = self._empty_dependencies()
+                dependencies['warnings'].append("Error al verificar dependencias")
+                results[str(node_id)] = dependencies
         
-        return dependencies
+        return results
     
-    def _check_equipment_dependencies(self, node_type: str, node_id: int) -> int:
-        """
-        Verifica si hay equipos asociados a un nodo de taxonomía
-        
-        Args:
-            node_type: Tipo del nodo
-            node_id: ID del nodo
-            
-        Returns:
-            int: Cantidad de equipos asociados
-        """
-        try:
-            # Construir parámetro de búsqueda según el tipo
-            param_name = f'taxonomy_{node_type}'
-            
-            response = self.api_client.get(
-                '/api/v1/equipment/',
-                params={param_name: node_id}
-            )
-            
-            return response.get('count', 0)
-            
-        except Exception as e:
-            logger.error(f"Error checking equipment dependencies: {e}")
-            return 0
+    @staticmethod
+    def _empty_dependencies() -> Dict:
+        return {
+            'has_dependencies': False,
+            'dependency_types': [],
+            'dependency_counts': {},
+            'can_delete': True,
+            'warnings': []
+        }
     
     def validate_code_uniqueness(self, node_type: str, code: str, 
                                  parent_id: Optional[int] = None,
@@ -6,12 +6,13 @@ import logging
 
 from .services import ForgeAPIClient
 from .services.api_client import APIException
+from .mixins import CursorPaginationMixin
 
 
 logger = logging.getLogger(__name__)
 
 
-class APIClientMixin:
+class APIClientMixin(CursorPaginationMixin):
     """Mixin to provide API client functionality to views."""
     
     def get_api_client(self):
@@ -13,12 +13,14 @@ from datetime import datetime
 import logging
 
 from .viewmixins import APIClientMixin
+from .mixins import AsyncAPIClientMixin, AsyncLoginRequiredMixin, EMPTY_CURSOR_PAGINATION
 from .views_auth import LoginView, LogoutView
 from .views_dashboard import DashboardView, DashboardDataView, KPIDetailsView
 
 from .services import ForgeAPIClient, AuthenticationService
 from .services.api_client import APIException
 from .forms import ClientForm, ClientSearchForm, EquipmentForm, MaintenanceScheduleForm, MaintenanceForm, MaintenanceSearchForm, StockMovementForm, StockSearchForm, WarehouseForm, WarehouseSearchForm, StockAlertForm, StockAdjustmentForm
+from .forms.widgets import load_remote_selection
 
 logger = logging.getLogger(__name__)
 
@@ -532,7 +534,7 @@ class WorkOrderListView(LoginRequiredMixin, APIClientMixin, TemplateView):
         date_to = self.request.GET.get('date_to', '')
         sort_by = self.request.GET.get('sort', 'created_at')
         sort_order = self.request.GET.get('order', 'desc')
-        page = self._get_page_number()
+        cursor = self._get_cursor()
         
         try:
             api_client = self.get_api_client()
@@ -557,12 +559,10 @@ class WorkOrderListView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 order_prefix = '-' if sort_order == 'desc' else ''
                 filters['ordering'] = f"{order_prefix}{sort_by}"
             
-            # Get work orders data
-            workorders_data = api_client.get_workorders(
-                page=page,
-                page_size=self.paginate_by,
-                **filters
-            )
+            # Get work orders data, paginated by cursor
+            if cursor:
+                filters['cursor'] = cursor
+            workorders_data = api_client.get_workorders(page_size=self._get_page_size(self.paginate_by), **filters)
             
             workorders = workorders_data.get('results', [])
             
@@ -603,20 +603,7 @@ class WorkOrderListView(LoginRequiredMixin, APIClientMixin, TemplateView):
             
             context['workorders'] = workorders
             
-            # Enhanced pagination
-            total_count = workorders_data.get('count', 0)
-            total_pages = (total_count + self.paginate_by - 1) // self.paginate_by
-            
-            context['pagination'] = {
-                'count': total_count,
-                'current_page': page,
-                'total_pages': total_pages,
-                'page_range': self._get_page_range(page, total_pages),
-                'has_previous': page > 1,
-                'has_next': page < total_pages,
-                'start_index': (page - 1) * self.paginate_by + 1,
-                'end_index': min(page * self.paginate_by, total_count),
-            }
+            context['pagination'] = self._cursor_pagination(workorders_data)
             
             # Filter context
             context['filters'] = {
@@ -641,7 +628,7 @@ class WorkOrderListView(LoginRequiredMixin, APIClientMixin, TemplateView):
             self.handle_api_error(e, "Error al cargar las órdenes de trabajo")
             context.update({
                 'workorders': [],
-                'pagination': self._empty_pagination(),
+                'pagination': dict(EMPTY_CURSOR_PAGINATION),
                 'filters': {
                     'search': search,
                     'status': status_filter,
@@ -785,44 +772,6 @@ class WorkOrderListView(LoginRequiredMixin, APIClientMixin, TemplateView):
             'overdue': 0,
             'completion_rate': 0,
         }
-    
-    def _empty_pagination(self):
-        """Return empty pagination."""
-        return {
-            'count': 0,
-            'current_page': 1,
-            'total_pages': 0,
-            'page_range': [],
-            'has_previous': False,
-            'has_next': False,
-            'start_index': 0,
-            'end_index': 0,
-        }
-    
-    def _get_page_number(self):
-        """Get and validate page number from request."""
-        try:
-            page = int(self.request.GET.get('page', 1))
-            return max(1, page)
-        except (ValueError, TypeError):
-            return 1
-    
-    def _get_page_range(self, current_page, total_pages, window=5):
-        """Generate a smart page range for pagination."""
-        if total_pages <= window:
-            return list(range(1, total_pages + 1))
-        
-        half_window = window // 2
-        start = max(1, current_page - half_window)
-        end = min(total_pages, current_page + half_window)
-        
-        if end - start < window - 1:
-            if start == 1:
-                end = min(total_pages, start + window - 1)
-            else:
-                start = max(1, end - window + 1)
-        
-        return list(range(start, end + 1))
 
 class WorkOrderDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
     """Enhanced work order detail view with status management."""
@@ -1207,31 +1156,30 @@ class WorkOrderCreateView(LoginRequiredMixin, APIClientMixin, TemplateView):
     
     def _get_step1_context(self, api_client, wizard_data):
         """Get context for step 1: Client and Equipment Selection."""
-        context = {}
-        
-        # Get clients for selection
-        try:
-            clients_data = api_client.get_clients(page_size=100)
-            context['clients'] = clients_data.get('results', [])
-        except APIException:
-            context['clients'] = []
+        context = {
+            'clients': [],
+            'equipment_list': [],
+            'selected_client': None,
+            'selected_equipment': None,
+        }
         
-        # Get equipment for selected client
+        # Clients and equipment are remote selects: only the selected ones
+        # are rendered, the rest is fetched page by page while typing
         selected_client_id = wizard_data.get('client_id')
         if selected_client_id:
             try:
-                equipment_data = api_client.get_equipment(client_id=selected_client_id, page_size=50)
-                context['equipment_list'] = equipment_data.get('results', [])
-                
-                # Get selected client details
-                client_data = api_client.get_client(selected_client_id)
-                context['selected_client'] = client_data
+                context['clients'] = api_client.lookup_labels('clients', [selected_client_id])
+                context['selected_client'] = api_client.get_client(selected_client_id)
             except APIException:
-                context['equipment_list'] = []
-                context['selected_client'] = None
-        else:
-            context['equipment_list'] = []
-            context['selected_client'] = None
+                pass
+        
+        selected_equipment_id = wizard_data.get('equipment_id')
+        if selected_client_id and selected_equipment_id:
+            try:
+                context['equipment_list'] = api_client.lookup_labels('equipment', [selected_equipment_id])
+                context['selected_equipment'] = api_client.get_equipment_detail(selected_equipment_id)
+            except APIException:
+                pass
         
         return context
     
@@ -1609,7 +1557,7 @@ class ProductListView(LoginRequiredMixin, APIClientMixin, TemplateView):
         
         # Get search and filter parameters
         search = self.request.GET.get('search', '').strip()
-        page = self._get_page_number()
+        cursor = self._get_cursor()
         category_filter = self.request.GET.get('category', '')
         type_filter = self.request.GET.get('type', '')
         status_filter = self.request.GET.get('status', '')
@@ -1642,12 +1590,10 @@ class ProductListView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 order_prefix = '-' if sort_order == 'desc' else ''
                 filters['ordering'] = f"{order_prefix}{sort_by}"
             
-            # Get products data with pagination
-            products_data = api_client.get_products(
-                page=page, 
-                page_size=self.paginate_by,
-                **filters
-            )
+            # Get products data, paginated by cursor
+            if cursor:
+                filters['cursor'] = cursor
+            products_data = api_client.get_products(page_size=self._get_page_size(self.paginate_by), **filters)
             
             context['products'] = products_data.get('results', [])
             
@@ -1700,22 +1646,7 @@ class ProductListView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 else:
                     product['profit_margin'] = None
             
-            # Enhanced pagination context
-            total_count = products_data.get('count', 0)
-            total_pages = (total_count + self.paginate_by - 1) // self.paginate_by
-            
-            context['pagination'] = {
-                'count': total_count,
-                'next': products_data.get('next'),
-                'previous': products_data.get('previous'),
-                'current_page': page,
-                'total_pages': total_pages,
-                'page_range': self._get_page_range(page, total_pages),
-                'has_previous': page > 1,
-                'has_next': page < total_pages,
-                'start_index': (page - 1) * self.paginate_by + 1,
-                'end_index': min(page * self.paginate_by, total_count),
-            }
+            context['pagination'] = self._cursor_pagination(products_data)
             
             # Filter and sort context
             context['filters'] = {
@@ -1775,16 +1706,7 @@ class ProductListView(LoginRequiredMixin, APIClientMixin, TemplateView):
         except APIException as e:
             self.handle_api_error(e, "Error al cargar el catálogo de productos")
             context['products'] = []
-            context['pagination'] = {
-                'count': 0,
-                'current_page': 1,
-                'total_pages': 0,
-                'page_range': [],
-                'has_previous': False,
-                'has_next': False,
-                'start_index': 0,
-                'end_index': 0,
-            }
+            context['pagination'] = dict(EMPTY_CURSOR_PAGINATION)
             context['filters'] = {
                 'search': search,
                 'category': category_filter,
@@ -1800,31 +1722,6 @@ class ProductListView(LoginRequiredMixin, APIClientMixin, TemplateView):
         
         return context
     
-    def _get_page_number(self):
-        """Get and validate page number from request."""
-        try:
-            page = int(self.request.GET.get('page', 1))
-            return max(1, page)
-        except (ValueError, TypeError):
-            return 1
-    
-    def _get_page_range(self, current_page, total_pages, window=5):
-        """Generate a smart page range for pagination."""
-        if total_pages <= window:
-            return list(range(1, total_pages + 1))
-        
-        half_window = window // 2
-        start = max(1, current_page - half_window)
-        end = min(total_pages, current_page + half_window)
-        
-        if end - start < window - 1:
-            if start == 1:
-                end = min(total_pages, start + window - 1)
-            else:
-                start = max(1, end - window + 1)
-        
-        return list(range(start, end + 1))
-    
     def _get_category_statistics(self, api_client):
         """Get product statistics by category."""
         try:
@@ -3362,9 +3259,8 @@ class MaintenanceListView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 'total_pages': (maintenance_data.get('count', 0) + 19) // 20  # Assuming 20 per page
             }
 
-            # Get equipment list for filter dropdown
-            equipment_data = api_client.get_equipment({'page_size': 1000})
-            context['equipment_list'] = equipment_data.get('results', [])
+            # Equipment filter is a remote select; only the selected one is resolved
+            context['equipment_list'] = api_client.lookup_labels('equipment', [self.request.GET.get('equipment_id')])
 
         except APIException as e:
             self.handle_api_error(e, "Error al cargar las tareas de mantenimiento")
@@ -3410,15 +3306,7 @@ class MaintenanceCreateView(LoginRequiredMixin, APIClientMixin, View):
         form = MaintenanceForm()
         api_client = self.get_api_client()
         
-        try:
-            # Get equipment list for dropdown
-            equipment_data = api_client.get_equipment({'page_size': 1000})
-            equipment_choices = [(eq['id'], f"{eq['equipment_code']} - {eq['make']} {eq['model']}") 
-                               for eq in equipment_data.get('results', [])]
-            form.fields['equipment_id'].widget.choices = [('', 'Seleccionar equipo')] + equipment_choices
-        except APIException as e:
-            self.handle_api_error(e, "Error al cargar la lista de equipos")
-            form.fields['equipment_id'].widget.choices = [('', 'Seleccionar equipo')]
+        load_remote_selection(form, 'equipment_id', api_client)
 
         return render(request, self.template_name, {
             'form': form,
@@ -3452,14 +3340,8 @@ class MaintenanceCreateView(LoginRequiredMixin, APIClientMixin, View):
             except APIException as e:
                 self.handle_api_error(e, "Error al crear la tarea de mantenimiento")
 
-        # If form is invalid or API error, reload equipment choices
-        try:
-            equipment_data = api_client.get_equipment({'page_size': 1000})
-            equipment_choices = [(eq['id'], f"{eq['equipment_code']} - {eq['make']} {eq['model']}") 
-                               for eq in equipment_data.get('results', [])]
-            form.fields['equipment_id'].widget.choices = [('', 'Seleccionar equipo')] + equipment_choices
-        except APIException:
-            form.fields['equipment_id'].widget.choices = [('', 'Seleccionar equipo')]
+        # If form is invalid or API error, resolve the selected equipment label
+        load_remote_selection(form, 'equipment_id', api_client)
 
         return render(request, self.template_name, {
             'form': form,
@@ -3487,12 +3369,7 @@ class MaintenanceUpdateView(LoginRequiredMixin, APIClientMixin, View):
                 ).replace(tzinfo=None)
 
             form = MaintenanceForm(initial=maintenance)
-            
-            # Get equipment list for dropdown
-            equipment_data = api_client.get_equipment({'page_size': 1000})
-            equipment_choices = [(eq['id'], f"{eq['equipment_code']} - {eq['make']} {eq['model']}") 
-                               for eq in equipment_data.get('results', [])]
-            form.fields['equipment_id'].widget.choices = [('', 'Seleccionar equipo')] + equipment_choices
+            load_remote_selection(form, 'equipment_id', api_client)
 
         except APIException as e:
             self.handle_api_error(e, "Error al cargar la tarea de mantenimiento")
@@ -3533,13 +3410,9 @@ class MaintenanceUpdateView(LoginRequiredMixin, APIClientMixin, View):
         # If form is invalid or API error, reload equipment choices and maintenance data
         try:
             maintenance = api_client.get_maintenance_task(maintenance_id)
-            equipment_data = api_client.get_equipment({'page_size': 1000})
-            equipment_choices = [(eq['id'], f"{eq['equipment_code']} - {eq['make']} {eq['model']}") 
-                               for eq in equipment_data.get('results', [])]
-            form.fields['equipment_id'].widget.choices = [('', 'Seleccionar equipo')] + equipment_choices
         except APIException:
             maintenance = {}
-            form.fields['equipment_id'].widget.choices = [('', 'Seleccionar equipo')]
+        load_remote_selection(form, 'equipment_id', api_client)
 
         return render(request, self.template_name, {
             'form': form,
@@ -3566,19 +3439,23 @@ class MaintenanceDeleteView(LoginRequiredMixin, APIClientMixin, View):
         return redirect('frontend:maintenance_list')
 
 
-class MaintenanceCalendarView(LoginRequiredMixin, APIClientMixin, TemplateView):
-    """View for displaying maintenance tasks in calendar format."""
+class MaintenanceCalendarView(AsyncLoginRequiredMixin, AsyncAPIClientMixin, TemplateView):
+    """View for displaying maintenance tasks in calendar format.
+
+    Async so the large calendar pull does not hold a worker thread while
+    waiting on the backend.
+    """
     template_name = 'frontend/maintenance/maintenance_calendar.html'
     login_url = reverse_lazy('frontend:login')
 
-    def get_context_data(self, **kwargs):
+    async def aget_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        api_client = self.get_api_client()
 
         try:
             # Get maintenance tasks for calendar
             params = {'page_size': 1000}  # Get all for calendar view
-            maintenance_data = api_client.get_maintenance_tasks(params)
+            async with await self.get_async_api_client() as api_client:
+                maintenance_data = await api_client.get('/api/maintenance/', params=params)
             
             # Format maintenance tasks for calendar
             calendar_events = []
@@ -3818,11 +3695,8 @@ class StockMovementCreateView(LoginRequiredMixin, APIClientMixin, View):
         api_client = self.get_api_client()
         
         try:
-            # Get products for dropdown
-            products_data = api_client.get_products({'page_size': 1000})
-            product_choices = [(p['id'], f"{p['code']} - {p['name']}") 
-                             for p in products_data.get('results', [])]
-            form.fields['product_id'].widget.choices = [('', 'Seleccionar producto')] + product_choices
+            # Product is a remote select; only the selected one is resolved
+            load_remote_selection(form, 'product_id', api_client)
             
             # Get warehouses for dropdown
             warehouses_data = api_client.get_warehouses({'page_size': 100})
@@ -3832,7 +3706,6 @@ class StockMovementCreateView(LoginRequiredMixin, APIClientMixin, View):
             
         except APIException as e:
             self.handle_api_error(e, "Error al cargar los datos del formulario")
-            form.fields['product_id'].widget.choices = [('', 'Seleccionar producto')]
             form.fields['warehouse_id'].widget.choices = [('', 'Seleccionar almacén')]
 
         return render(request, self.template_name, {
@@ -3867,17 +3740,14 @@ class StockMovementCreateView(LoginRequiredMixin, APIClientMixin, View):
 
         # If form is invalid or API error, reload choices
         try:
-            products_data = api_client.get_products({'page_size': 1000})
-            product_choices = [(p['id'], f"{p['code']} - {p['name']}") 
-                             for p in products_data.get('results', [])]
-            form.fields['product_id'].widget.choices = [('', 'Seleccionar producto')] + product_choices
+            # Product is a remote select; only the selected one is resolved
+            load_remote_selection(form, 'product_id', api_client)
             
             warehouses_data = api_client.get_warehouses({'page_size': 100})
             warehouse_choices = [(w['id'], f"{w['code']} - {w['name']}") 
                                for w in warehouses_data.get('results', [])]
             form.fields['warehouse_id'].widget.choices = [('', 'Seleccionar almacén')] + warehouse_choices
         except APIException:
-            form.fields['product_id'].widget.choices = [('', 'Seleccionar producto')]
             form.fields['warehouse_id'].widget.choices = [('', 'Seleccionar almacén')]
 
         return render(request, self.template_name, {
@@ -4114,30 +3984,26 @@ class InventoryReportsView(LoginRequiredMixin, APIClientMixin, TemplateView):
 
 # Stock Management Views
 
-class StockDashboardView(LoginRequiredMixin, APIClientMixin, TemplateView):
-    """Dashboard for stock level monitoring."""
+class StockDashboardView(AsyncLoginRequiredMixin, AsyncAPIClientMixin, TemplateView):
+    """Dashboard for stock level monitoring (async: the four panels load concurrently)."""
     template_name = 'frontend/inventory/stock_dashboard.html'
     login_url = reverse_lazy('frontend:login')
 
-    def get_context_data(self, **kwargs):
+    async def aget_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        api_client = self.get_api_client()
 
         try:
-            # Get stock summary data
-            stock_summary = api_client.get_stock_summary()
-            context['stock_summary'] = stock_summary
+            async with await self.get_async_api_client() as api_client:
+                stock_summary, low_stock_items, recent_movements, warehouses = await api_client.gather(
+                    api_client.get('stock/summary/'),
+                    api_client.get('stock/low-stock/'),
+                    api_client.get('stock/movements/', params={'page_size': 10}),
+                    api_client.get('warehouses/', params={'page_size': 100}),
+                )
 
-            # Get low stock alerts
-            low_stock_items = api_client.get_low_stock_items()
+            context['stock_summary'] = stock_summary
             context['low_stock_items'] = low_stock_items.get('results', [])
-
-            # Get recent stock movements
-            recent_movements = api_client.get_stock_movements({'page_size': 10})
             context['recent_movements'] = recent_movements.get('results', [])
-
-            # Get warehouse list for filters
-            warehouses = api_client.get_warehouses({'page_size': 100})
             context['warehouses'] = warehouses.get('results', [])
 
         except APIException as e:
@@ -4218,11 +4084,8 @@ class StockMovementCreateView(LoginRequiredMixin, APIClientMixin, View):
         api_client = self.get_api_client()
 
         try:
-            # Get products for dropdown
-            products_data = api_client.get_products({'page_size': 1000})
-            product_choices = [(p['id'], f"{p['code']} - {p['name']}") 
-                             for p in products_data.get('results', [])]
-            form.fields['product_id'].widget.choices = [('', 'Seleccionar producto')] + product_choices
+            # Product is a remote select; only the selected one is resolved
+            load_remote_selection(form, 'product_id', api_client)
 
             # Get warehouses for dropdown
             warehouses_data = api_client.get_warehouses({'page_size': 100})
@@ -4232,7 +4095,6 @@ class StockMovementCreateView(LoginRequiredMixin, APIClientMixin, View):
 
         except APIException as e:
             self.handle_api_error(e, "Error al cargar los datos del formulario")
-            form.fields['product_id'].widget.choices = [('', 'Seleccionar producto')]
             form.fields['warehouse_id'].widget.choices = [('', 'Seleccionar almacén')]
 
         return render(request, self.template_name, {
@@ -4266,10 +4128,8 @@ class StockMovementCreateView(LoginRequiredMixin, APIClientMixin, View):
 
         # Reload choices if form is invalid
         try:
-            products_data = api_client.get_products({'page_size': 1000})
-            product_choices = [(p['id'], f"{p['code']} - {p['name']}") 
-                             for p in products_data.get('results', [])]
-            form.fields['product_id'].widget.choices = [('', 'Seleccionar producto')] + product_choices
+            # Product is a remote select; only the selected one is resolved
+            load_remote_selection(form, 'product_id', api_client)
 
             warehouses_data = api_client.get_warehouses({'page_size': 100})
             warehouse_choices = [(w['id'], f"{w['code']} - {w['name']}") 
@@ -4324,9 +4184,6 @@ class StockMovementsView(LoginRequiredMixin, APIClientMixin, TemplateView):
             }
 
             # Get filter options
-            products_data = api_client.get_products({'page_size': 1000})
-            context['products'] = products_data.get('results', [])
-
             warehouses_data = api_client.get_warehouses({'page_size': 100})
             context['warehouses'] = warehouses_data.get('results', [])
 
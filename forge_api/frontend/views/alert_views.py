@@ -13,7 +13,7 @@ from datetime import datetime, timedelta
 import json
 
 from ..services.api_client import APIException
-from ..mixins import APIClientMixin
+from ..mixins import APIClientMixin, EMPTY_CURSOR_PAGINATION
 
 
 class AlertDashboardView(LoginRequiredMixin, APIClientMixin, TemplateView):
@@ -348,18 +348,19 @@ class AuditLogView(LoginRequiredMixin, APIClientMixin, TemplateView):
         changed_by = self.request.GET.get('changed_by', '')
         date_from = self.request.GET.get('date_from', '')
         date_to = self.request.GET.get('date_to', '')
-        page = self.request.GET.get('page', 1)
+        cursor = self._get_cursor()
         
         try:
             api_client = self.get_api_client()
             
             # Build filter parameters
             params = {
-                'page': page,
                 'page_size': 50,
                 'ordering': '-changed_at'
             }
             
+            if cursor:
+                params['cursor'] = cursor
             if table_name:
                 params['table_name'] = table_name
             if action:
@@ -410,13 +411,7 @@ class AuditLogView(LoginRequiredMixin, APIClientMixin, TemplateView):
             
             context.update({
                 'audit_logs': audit_logs,
-                'pagination': {
-                    'count': audit_data.get('count', 0),
-                    'next': audit_data.get('next'),
-                    'previous': audit_data.get('previous'),
-                    'current_page': int(page),
-                    'total_pages': (audit_data.get('count', 0) + 49) // 50  # Ceiling division
-                },
+                'pagination': self._cursor_pagination(audit_data),
                 'filters': {
                     'table_name': table_name,
                     'action': action,
@@ -432,7 +427,7 @@ class AuditLogView(LoginRequiredMixin, APIClientMixin, TemplateView):
             messages.error(self.request, f"Error loading audit logs: {str(e)}")
             context.update({
                 'audit_logs': [],
-                'pagination': {'count': 0, 'current_page': 1, 'total_pages': 0},
+                'pagination': dict(EMPTY_CURSOR_PAGINATION),
                 'filters': {},
                 'unique_tables': [],
                 'action_choices': []
@@ -8,43 +8,13 @@ from django.views.generic import TemplateView
 from django.views import View
 import logging
 
-from ..services import ForgeAPIClient, AuthenticationService
+from ..services import AuthenticationService
 from ..services.api_client import APIException
+from ..mixins import APIClientMixin, EMPTY_CURSOR_PAGINATION
 
 logger = logging.getLogger(__name__)
 
 
-class APIClientMixin:
-    """Mixin to provide API client functionality to views."""
-    
-    def get_api_client(self):
-        """Get an API client instance for this request."""
-        return ForgeAPIClient(request=self.request)
-    
-    def handle_api_error(self, error: APIException, default_message: str = "Error en la operación"):
-        """Handle API errors and display appropriate messages."""
-        if error.status_code == 401:
-            # Authentication errors - clear session and show message
-            messages.error(self.request, "Sesión expirada. Por favor, inicie sesión nuevamente.")
-            # Don't redirect here - let the view handle it after showing the message
-        elif error.status_code == 400 and error.response_data:
-            # Validation errors
-            error_messages = []
-            for field, errors in error.response_data.items():
-                if isinstance(errors, list):
-                    error_messages.extend(errors)
-                else:
-                    error_messages.append(str(errors))
-
-            if error_messages:
-                for msg in error_messages:
-                    messages.error(self.request, msg)
-            else:
-                messages.error(self.request, error.message)
-        else:
-            messages.error(self.request, error.message or default_message)
-
-
 class ClientListView(LoginRequiredMixin, APIClientMixin, TemplateView):
     """Client list view with enhanced pagination and search functionality."""
     template_name = 'frontend/clients/client_list.html'
@@ -56,7 +26,7 @@ class ClientListView(LoginRequiredMixin, APIClientMixin, TemplateView):
         
         # Get search and filter parameters
         search = self.request.GET.get('search', '').strip()
-        page = self._get_page_number()
+        cursor = self._get_cursor()
         status_filter = self.request.GET.get('status', '')
         sort_by = self.request.GET.get('sort', 'name')
         sort_order = self.request.GET.get('order', 'asc')
@@ -74,31 +44,13 @@ class ClientListView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 order_prefix = '-' if sort_order == 'desc' else ''
                 filters['ordering'] = f"{order_prefix}{sort_by}"
             
-            # Get clients data with pagination
-            clients_data = api_client.get_clients(
-                page=page, 
-                page_size=self.paginate_by,
-                **filters
-            )
+            # Get clients data, paginated by cursor
+            if cursor:
+                filters['cursor'] = cursor
+            clients_data = api_client.get_clients(page_size=self._get_page_size(self.paginate_by), **filters)
             
             context['clients'] = clients_data.get('results', [])
-            
-            # Enhanced pagination context
-            total_count = clients_data.get('count', 0)
-            total_pages = (total_count + self.paginate_by - 1) // self.paginate_by
-            
-            context['pagination'] = {
-                'count': total_count,
-                'next': clients_data.get('next'),
-                'previous': clients_data.get('previous'),
-                'current_page': page,
-                'total_pages': total_pages,
-                'page_range': self._get_page_range(page, total_pages),
-                'has_previous': page > 1,
-                'has_next': page < total_pages,
-                'start_index': (page - 1) * self.paginate_by + 1,
-                'end_index': min(page * self.paginate_by, total_count),
-            }
+            context['pagination'] = self._cursor_pagination(clients_data)
             
             # Filter and sort context
             context['filters'] = {
@@ -129,16 +81,7 @@ class ClientListView(LoginRequiredMixin, APIClientMixin, TemplateView):
             self.handle_api_error(e, "Error al cargar la lista de clientes")
             # Don't redirect from get_context_data, just set empty context
             context['clients'] = []
-            context['pagination'] = {
-                'count': 0,
-                'current_page': 1,
-                'total_pages': 0,
-                'page_range': [],
-                'has_previous': False,
-                'has_next': False,
-                'start_index': 0,
-                'end_index': 0,
-            }
+            context['pagination'] = dict(EMPTY_CURSOR_PAGINATION)
             context['filters'] = {
                 'search': search,
                 'status': status_filter,
@@ -148,34 +91,6 @@ class ClientListView(LoginRequiredMixin, APIClientMixin, TemplateView):
         
         return context
     
-    def _get_page_number(self):
-        """Get and validate page number from request."""
-        try:
-            page = int(self.request.GET.get('page', 1))
-            return max(1, page)  # Ensure page is at least 1
-        except (ValueError, TypeError):
-            return 1
-    
-    def _get_page_range(self, current_page, total_pages, window=5):
-        """Generate a smart page range for pagination."""
-        if total_pages <= window:
-            return list(range(1, total_pages + 1))
-        
-        # Calculate start and end of the window
-        half_window = window // 2
-        start = max(1, current_page - half_window)
-        end = min(total_pages, current_page + half_window)
-        
-        # Adjust if we're near the beginning or end
-        if end - start < window - 1:
-            if start == 1:
-                end = min(total_pages, start + window - 1)
-            else:
-                start = max(1, end - window + 1)
-        
-        return list(range(start, end + 1))
-
-
 class ClientDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
     """Enhanced client detail view with comprehensive information display."""
     template_name = 'frontend/clients/client_detail.html'
@@ -223,9 +138,9 @@ class ClientDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
             
             context['client'] = client_data
             
-            # Get client's work orders with enhanced filtering (reduced page size for speed)
+            # Most recent work orders; the counters come from the stats endpoint
             try:
-                workorders_data = api_client.get_workorders(client_id=client_id, page_size=10)  # Reduced from 50 to 10
+                workorders_data = api_client.get_workorders(client_id=client_id, page_size=10)
                 workorders = workorders_data.get('results', [])
                 
                 # Process work orders for better display
@@ -250,30 +165,11 @@ class ClientDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 
                 context['workorders'] = workorders
                 
-                # Calculate work order statistics
-                total_workorders = len(workorders)
-                completed_workorders = len([wo for wo in workorders if wo.get('status') == 'completed'])
-                pending_workorders = len([wo for wo in workorders if wo.get('status') == 'pending'])
-                in_progress_workorders = len([wo for wo in workorders if wo.get('status') == 'in_progress'])
-                
-                context['workorder_stats'] = {
-                    'total': total_workorders,
-                    'completed': completed_workorders,
-                    'pending': pending_workorders,
-                    'in_progress': in_progress_workorders,
-                    'completion_rate': (completed_workorders / total_workorders * 100) if total_workorders > 0 else 0
-                }
-                
             except APIException as wo_error:
                 logger.warning(f"Could not load work orders for client {client_id}: {wo_error}")
                 context['workorders'] = []
-                context['workorder_stats'] = {
-                    'total': 0,
-                    'completed': 0,
-                    'pending': 0,
-                    'in_progress': 0,
-                    'completion_rate': 0
-                }
+
+            context['workorder_stats'] = self.get_workorder_stats(api_client, 'client', client_id)
             
             # Get client's equipment (if available) - reduced for speed
             try:
@@ -3,7 +3,7 @@ Diagnostic views for API connectivity and system health
 """
 import json
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from django.shortcuts import render
 from django.http import JsonResponse
 from django.views.generic import TemplateView
@@ -14,6 +14,8 @@ from django.conf import settings
 import requests
 import logging
 
+from core.profiling import profiler
+
 from ..services.api_client import ForgeAPIClient, APIException
 
 logger = logging.getLogger(__name__)
@@ -324,46 +326,21 @@ class APIHealthCheckView(LoginRequiredMixin, TemplateView):
         return test_result
     
     def _measure_performance(self, api_client):
-        """Measure API performance metrics"""
-        metrics = {
-            'average_response_time': None,
-            'fastest_response': None,
-            'slowest_response': None,
-            'total_requests': 0,
-            'successful_requests': 0,
-            'failed_requests': 0
+        """Observed request metrics recorded by QueryProfilerMiddleware"""
+        report = profiler.report()
+        return {
+            key: report[key] for key in (
+                'average_response_time',
+                'p50_response_time',
+                'p95_response_time',
+                'p99_response_time',
+                'fastest_response',
+                'slowest_response',
+                'total_requests',
+                'successful_requests',
+                'failed_requests',
+            )
         }
-        
-        # Test endpoints for performance
-        test_endpoints = ['clients/?limit=5', 'products/?limit=5', 'dashboard/summary/']
-        response_times = []
-        
-        for endpoint in test_endpoints:
-            try:
-                start_time = time.time()
-                response = api_client.get(endpoint)
-                response_time = (time.time() - start_time) * 1000  # ms
-                
-                response_times.append(response_time)
-                metrics['total_requests'] += 1
-                
-                if response.status_code == 200:
-                    metrics['successful_requests'] += 1
-                else:
-                    metrics['failed_requests'] += 1
-                    
-            except Exception:
-                metrics['total_requests'] += 1
-                metrics['failed_requests'] += 1
-        
-        if response_times:
-            metrics.update({
-                'average_response_time': round(sum(response_times) / len(response_times), 2),
-                'fastest_response': round(min(response_times), 2),
-                'slowest_response': round(max(response_times), 2)
-            })
-        
-        return metrics
     
     def _determine_overall_status(self, tests):
         """Determine overall system status based on test results"""
@@ -461,60 +438,18 @@ class APIConnectionMonitorView(LoginRequiredMixin, TemplateView):
 
 class APIErrorRateTrackingView(LoginRequiredMixin, TemplateView):
     """
-    Track API error rates and response times
+    Track API error rates and response times.
+
+    Aggregated by QueryProfilerMiddleware across all workers since they
+    started (see core.profiling).
     """
     
     def get(self, request, *args, **kwargs):
         """
         Get API error rate and performance statistics
         """
-        # This would typically connect to a logging/metrics system
-        # For now, we'll simulate some data
-        
-        end_time = datetime.now()
-        start_time = end_time - timedelta(hours=24)
-        
-        # Simulate metrics (in a real implementation, this would query logs/metrics)
-        metrics = {
-            'time_range': {
-                'start': start_time.isoformat(),
-                'end': end_time.isoformat()
-            },
-            'total_requests': 1250,
-            'successful_requests': 1180,
-            'failed_requests': 70,
-            'error_rate': 5.6,  # percentage
-            'average_response_time': 245.5,  # ms
-            'p95_response_time': 890.2,  # ms
-            'p99_response_time': 1250.8,  # ms
-            'endpoints': {
-                'clients/': {
-                    'requests': 450,
-                    'errors': 12,
-                    'avg_response_time': 180.5
-                },
-                'products/': {
-                    'requests': 320,
-                    'errors': 8,
-                    'avg_response_time': 165.2
-                },
-                'workorders/': {
-                    'requests': 280,
-                    'errors': 25,
-                    'avg_response_time': 320.8
-                },
-                'dashboard/': {
-                    'requests': 200,
-                    'errors': 25,
-                    'avg_response_time': 420.1
-                }
-            },
-            'error_types': {
-                '500': 35,
-                '404': 20,
-                '401': 10,
-                '400': 5
-            }
-        }
-        
-        return JsonResponse(metrics)
\ No newline at end of file
+        try:
+            top = int(request.GET.get('top', 10))
+        except ValueError:
+            top = 10
+        return JsonResponse(profiler.report(top=top))
@@ -0,0 +1,80 @@
+"""
+Document Views
+ForgeDB Frontend Web Application
+
+Descarga de facturas en PDF y de lotes de cotizaciones o facturas en zip
+(frontend.services.document_renderer).
+"""
+
+import logging
+from datetime import datetime
+
+from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import FileResponse, HttpResponse, JsonResponse
+from django.shortcuts import redirect
+from django.views.generic import View
+
+from ..mixins import APIClientMixin
+from ..services.api_client import APIException
+from ..services.document_renderer import (
+    APIDocumentSource, DocumentRenderer, DOCUMENT_TYPES, MAX_BATCH_SIZE
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InvoicePDFView(LoginRequiredMixin, APIClientMixin, View):
+    """PDF de una factura con todos sus conceptos."""
+
+    def get(self, request, pk):
+        try:
+            source = APIDocumentSource(self.get_api_client())
+            invoice = source.get('invoice', pk)
+            renderer = DocumentRenderer()
+            pdf = renderer.render('invoice', invoice, source)
+        except ImportError as e:
+            logger.error(f"ReportLab not available: {e}")
+            messages.error(request, "La generación de PDF no está disponible. Instale ReportLab.")
+            return redirect('frontend:invoice_detail', pk=pk)
+        except APIException as e:
+            logger.error(f"Error generating PDF for invoice {pk}: {e}")
+            messages.error(request, "Error al generar el PDF de la factura.")
+            return redirect('frontend:invoice_detail', pk=pk)
+
+        response = HttpResponse(pdf, content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="{renderer.filename("invoice", invoice)}"'
+        return response
+
+
+class DocumentBatchPDFView(LoginRequiredMixin, APIClientMixin, View):
+    """
+    Zip con el PDF de varias cotizaciones o facturas.
+
+    POST ``kind`` (``quote`` o ``invoice``) e ``ids`` (repetido o separado
+    por comas), hasta ``DOCUMENT_PDF_MAX_BATCH`` documentos.
+    """
+
+    def post(self, request, kind):
+        if kind not in DOCUMENT_TYPES:
+            return JsonResponse({'error': f"Tipo de documento desconocido: {kind}"}, status=404)
+        try:
+            ids = [int(value) for raw in request.POST.getlist('ids') for value in raw.split(',') if value.strip()]
+        except ValueError:
+            return JsonResponse({'error': "Los ids deben ser números enteros."}, status=400)
+        if not ids:
+            return JsonResponse({'error': "No se seleccionó ningún documento."}, status=400)
+        if len(ids) > MAX_BATCH_SIZE:
+            return JsonResponse({'error': f"Máximo {MAX_BATCH_SIZE} documentos por lote."}, status=400)
+
+        try:
+            archive = DocumentRenderer().render_zip(kind, ids, APIDocumentSource(self.get_api_client()))
+        except ImportError as e:
+            logger.error(f"ReportLab not available: {e}")
+            return JsonResponse({'error': "La generación de PDF no está disponible."}, status=503)
+        except APIException as e:
+            logger.error(f"Error rendering {kind} batch {ids}: {e}")
+            return JsonResponse({'error': e.message}, status=e.status_code or 502)
+
+        filename = f"{DOCUMENT_TYPES[kind][3]}s_{datetime.now():%Y%m%d_%H%M%S}.zip"
+        return FileResponse(archive, as_attachment=True, filename=filename, content_type='application/zip')
@@ -12,12 +12,45 @@ from django import forms
 import logging
 
 from ..services.api_client import ForgeAPIClient, APIException
+from ..services.reference_data_service import code_choices, get_reference_catalogs
 from ..forms.equipment_forms import EquipmentForm
-from ..mixins import APIClientMixin
+from ..forms.widgets import load_remote_selection
+from ..mixins import APIClientMixin, EMPTY_CURSOR_PAGINATION
 
 logger = logging.getLogger(__name__)
 
 
+def load_reference_choices(form, api_client):
+    """
+    Llenar tipo de equipo, combustible, aspiración, transmisión, tracción y
+    color desde el bundle de catálogos de referencia (una sola petición,
+    304 mientras no cambien).
+    """
+    try:
+        catalogs = get_reference_catalogs(api_client)
+    except APIException as e:
+        logger.error(f"Error loading reference catalogs: {e}")
+        form.fields['type_id'].widget.choices = [('', 'Error al cargar tipos')]
+        return
+
+    type_choices = [('', 'Seleccione un tipo')]
+    for et in catalogs.get('equipment_types', []):
+        type_choices.append((et['type_id'], f"{et['name']} ({et.get('category_name') or 'General'})"))
+    form.fields['type_id'].widget.choices = type_choices
+
+    form.fields['fuel_code'].choices = code_choices(
+        catalogs.get('fuel_codes', []), 'fuel_code', 'Seleccionar tipo de combustible')
+    form.fields['aspiration_code'].choices = code_choices(
+        catalogs.get('aspiration_codes', []), 'aspiration_code', 'Seleccionar tipo de aspiración')
+    form.fields['transmission_code'].choices = code_choices(
+        catalogs.get('transmission_codes', []), 'transmission_code', 'Seleccionar tipo de transmisión')
+    form.fields['drivetrain_code'].choices = code_choices(
+        catalogs.get('drivetrain_codes', []), 'drivetrain_code', 'Seleccionar tipo de tracción')
+    form.fields['color'].widget.choices = code_choices(
+        catalogs.get('color_codes', []), 'color_code', 'Seleccionar color',
+        label=lambda item: f"{item.get('name_es')} ({item.get('color_code')})")
+
+
 class EquipmentListView(LoginRequiredMixin, APIClientMixin, TemplateView):
     """Vista para listar equipos con paginación y búsqueda."""
     template_name = 'frontend/equipment/equipment_list.html'
@@ -29,7 +62,7 @@ class EquipmentListView(LoginRequiredMixin, APIClientMixin, TemplateView):
 
         # Obtener parámetros de búsqueda y filtro
         search = self.request.GET.get('search', '').strip()
-        page = self._get_page_number()
+        cursor = self._get_cursor()
         status_filter = self.request.GET.get('status', '')
         client_filter = self.request.GET.get('client', '')
         sort_by = self.request.GET.get('sort', 'equipment_code')
@@ -50,31 +83,13 @@ class EquipmentListView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 order_prefix = '-' if sort_order == 'desc' else ''
                 filters['ordering'] = f"{order_prefix}{sort_by}"
 
-            # Obtener datos de equipos con paginación
-            equipment_data = api_client.get_equipment(
-                page=page,
-                page_size=self.paginate_by,
-                **filters
-            )
+            # Obtener datos de equipos, paginados por cursor
+            if cursor:
+                filters['cursor'] = cursor
+            equipment_data = api_client.get_equipment(page_size=self._get_page_size(self.paginate_by), **filters)
 
             context['equipment_list'] = equipment_data.get('results', [])
-
-            # Contexto de paginación
-            total_count = equipment_data.get('count', 0)
-            total_pages = (total_count + self.paginate_by - 1) // self.paginate_by
-
-            context['pagination'] = {
-                'count': total_count,
-                'next': equipment_data.get('next'),
-                'previous': equipment_data.get('previous'),
-                'current_page': page,
-                'total_pages': total_pages,
-                'page_range': self._get_page_range(page, total_pages),
-                'has_previous': page > 1,
-                'has_next': page < total_pages,
-                'start_index': (page - 1) * self.paginate_by + 1,
-                'end_index': min(page * self.paginate_by, total_count),
-            }
+            context['pagination'] = self._cursor_pagination(equipment_data)
 
             # Filtros y ordenación
             context['filters'] = {
@@ -94,19 +109,14 @@ class EquipmentListView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 {'value': 'scrapped', 'label': 'Desechados'},
             ]
 
-            # Opciones de clientes para filtro
-            try:
-                clients_data = api_client.get_clients(page_size=1000)  # Obtener todos los clientes
-                client_list = clients_data.get('results', [])
-                context['client_options'] = [{'value': '', 'label': 'Todos los clientes'}]
-                for client in client_list:
-                    context['client_options'].append({
-                        'value': client['client_id'],
-                        'label': f"{client['name']} ({client.get('email', 'Sin email')})"
-                    })
-            except APIException as client_error:
-                logger.warning(f"Could not load clients for filter: {client_error}")
-                context['client_options'] = [{'value': '', 'label': 'Todos los clientes'}]
+            # Filtro de cliente: select remoto, sólo se resuelve el seleccionado
+            context['client_options'] = [{'value': '', 'label': 'Todos los clientes'}]
+            if client_filter:
+                try:
+                    for client in api_client.lookup_labels('clients', [client_filter]):
+                        context['client_options'].append({'value': str(client['id']), 'label': client['label']})
+                except APIException as client_error:
+                    logger.warning(f"Could not load client filter label: {client_error}")
 
             # Opciones de tipo de combustible para filtro
             context['fuel_type_options'] = [
@@ -134,16 +144,7 @@ class EquipmentListView(LoginRequiredMixin, APIClientMixin, TemplateView):
             self.handle_api_error(e, "Error al cargar la lista de equipos")
             # Establecer contexto vacío en caso de error
             context['equipment_list'] = []
-            context['pagination'] = {
-                'count': 0,
-                'current_page': 1,
-                'total_pages': 0,
-                'page_range': [],
-                'has_previous': False,
-                'has_next': False,
-                'start_index': 0,
-                'end_index': 0,
-            }
+            context['pagination'] = dict(EMPTY_CURSOR_PAGINATION)
             context['filters'] = {
                 'search': search,
                 'status': status_filter,
@@ -154,31 +155,6 @@ class EquipmentListView(LoginRequiredMixin, APIClientMixin, TemplateView):
 
         return context
 
-    def _get_page_number(self):
-        """Obtener y validar número de página desde la solicitud."""
-        try:
-            page = int(self.request.GET.get('page', 1))
-            return max(1, page)
-        except (ValueError, TypeError):
-            return 1
-
-    def _get_page_range(self, current_page, total_pages, window=5):
-        """Generar un rango de páginas inteligente para la paginación."""
-        if total_pages <= window:
-            return list(range(1, total_pages + 1))
-
-        half_window = window // 2
-        start = max(1, current_page - half_window)
-        end = min(total_pages, current_page + half_window)
-
-        if end - start < window - 1:
-            if start == 1:
-                end = min(total_pages, start + window - 1)
-            else:
-                start = max(1, end - window + 1)
-
-        return list(range(start, end + 1))
-
 
 class EquipmentDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
     """Vista detallada de equipo."""
@@ -206,7 +182,7 @@ class EquipmentDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
 
             # Obtener órdenes de trabajo asociadas al equipo
             try:
-                workorders_data = api_client.get_workorders(equipment_id=equipment_id, page_size=50)
+                workorders_data = api_client.get_workorders(equipment_id=equipment_id, page_size=10)
                 workorders = workorders_data.get('results', [])
 
                 # Procesar órdenes de trabajo
@@ -230,30 +206,11 @@ class EquipmentDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
 
                 context['workorders'] = workorders
 
-                # Estadísticas de órdenes de trabajo
-                total_workorders = len(workorders)
-                completed = len([wo for wo in workorders if wo.get('status', '').upper() == 'COMPLETED'])
-                pending = len([wo for wo in workorders if wo.get('status', '').upper() == 'PENDING'])
-                in_progress = len([wo for wo in workorders if wo.get('status', '').upper() == 'IN_PROGRESS'])
-
-                context['workorder_stats'] = {
-                    'total': total_workorders,
-                    'completed': completed,
-                    'pending': pending,
-                    'in_progress': in_progress,
-                    'completion_rate': (completed / total_workorders * 100) if total_workorders > 0 else 0
-                }
-
             except APIException as wo_error:
                 logger.warning(f"Could not load work orders for equipment {equipment_id}: {wo_error}")
                 context['workorders'] = []
-                context['workorder_stats'] = {
-                    'total': 0,
-                    'completed': 0,
-                    'pending': 0,
-                    'in_progress': 0,
-                    'completion_rate': 0
-                }
+
+            context['workorder_stats'] = self.get_workorder_stats(api_client, 'equipment', equipment_id)
 
         except APIException as e:
             self.handle_api_error(e, "Error al cargar los datos del equipo")
@@ -287,97 +244,11 @@ class EquipmentCreateView(LoginRequiredMixin, APIClientMixin, TemplateView):
         try:
             api_client = self.get_api_client()
             
-            # Cargar TIPOS DE EQUIPO (Nuevo)
-            try:
-                types_data = api_client.get_equipment_types(page_size=100)
-                type_list = types_data.get('results', [])
-                
-                type_choices = [('', 'Seleccione un tipo')]
-                for et in type_list:
-                    type_choices.append((
-                        et['type_id'],
-                        f"{et['name']} ({et.get('category', 'General')})"
-                    ))
-                form.fields['type_id'].widget.choices = type_choices
-            except Exception as type_error:
-                logger.error(f"Error loading equipment types: {type_error}")
-                form.fields['type_id'].widget.choices = [('', 'Error al cargar tipos')]
-            
-            # --- CARGA PROGRESIVA DE CATALOGOS ---
-            
-            # 1. Combustible (Fuel Codes)
-            try:
-                fuel_data = api_client.get_fuel_codes(page_size=100)
-                fuel_list = fuel_data.get('results', [])
-                fuel_choices = [('', 'Seleccionar tipo de combustible')]
-                for item in fuel_list:
-                    label = item.get('name_es') or item.get('name_en') or item.get('fuel_code')
-                    fuel_choices.append((item['fuel_code'], label))
-                form.fields['fuel_code'].widget.choices = fuel_choices
-            except Exception as e:
-                logger.error(f"Error loading fuel codes: {e}")
-                
-            # 2. Aspiración (Aspiration Codes)
-            try:
-                asp_data = api_client.get_aspiration_codes(page_size=100)
-                asp_list = asp_data.get('results', [])
-                asp_choices = [('', 'Seleccionar tipo de aspiración')]
-                for item in asp_list:
-                    label = item.get('name_es') or item.get('name_en') or item.get('aspiration_code')
-                    asp_choices.append((item['aspiration_code'], label))
-                form.fields['aspiration_code'].widget.choices = asp_choices
-            except Exception as e:
-                logger.error(f"Error loading aspiration codes: {e}")
-
-            # 3. Transmisión (Transmission Codes)
-            try:
-                trans_data = api_client.get_transmission_codes(page_size=100)
-                trans_list = trans_data.get('results', [])
-                trans_choices = [('', 'Seleccionar tipo de transmisión')]
-                for item in trans_list:
-                    label = item.get('name_es') or item.get('name_en') or item.get('transmission_code')
-                    trans_choices.append((item['transmission_code'], label))
-                form.fields['transmission_code'].widget.choices = trans_choices
-            except Exception as e:
-                logger.error(f"Error loading transmission codes: {e}")
-
-            # 4. Tracción (Drivetrain Codes)
-            try:
-                drive_data = api_client.get_drivetrain_codes(page_size=100)
-                drive_list = drive_data.get('results', [])
-                drive_choices = [('', 'Seleccionar tipo de tracción')]
-                for item in drive_list:
-                    label = item.get('name_es') or item.get('name_en') or item.get('drivetrain_code')
-                    drive_choices.append((item['drivetrain_code'], label))
-                form.fields['drivetrain_code'].widget.choices = drive_choices
-            except Exception as e:
-                logger.error(f"Error loading drivetrain codes: {e}")
-
-            # 5. Color (Color Codes)
-            try:
-                color_data = api_client.get_color_codes(page_size=100)
-                color_list = color_data.get('results', [])
-                color_choices = [('', 'Seleccionar color')]
-                for item in color_list:
-                    label = f"{item.get('name_es')} ({item.get('color_code')})"
-                    color_choices.append((item['color_code'], label))
-                # Fallback: si no hay colores en DB, mantenemos vacío o ponemos genéricos si quisiéramos
-                form.fields['color'].widget.choices = color_choices
-            except Exception as e:
-                logger.error(f"Error loading color codes: {e}")
+            # Tipos de equipo y códigos de referencia (bundle versionado)
+            load_reference_choices(form, api_client)
 
-            
-            # Cargar opciones de clientes
-            clients_data = api_client.get_clients(page_size=1000)
-            client_list = clients_data.get('results', [])
-            
-            client_choices = [('', 'Seleccione un cliente')]
-            for client in client_list:
-                client_choices.append((
-                    client['client_id'],
-                    f"{client['name']} - {client.get('email', 'Sin email')}"
-                ))
-            form.fields['client_id'].widget.choices = client_choices
+            # Cliente: select remoto, sólo se resuelve la etiqueta del seleccionado
+            load_remote_selection(form, 'client_id', api_client)
             
         except APIException as e:
             logger.error(f"Error loading clients: {e}")
@@ -386,8 +257,8 @@ class EquipmentCreateView(LoginRequiredMixin, APIClientMixin, TemplateView):
         # Cargar marcas OEM
         try:
             api_client = self.get_api_client()
-            brands_data = api_client.get_oem_brands(page_size=1000, is_active=True)
-            brand_results = brands_data.get('results', brands_data)
+            catalogs = get_reference_catalogs(api_client)
+            brand_results = [b for b in catalogs.get('oem_brands', []) if b.get('is_active')]
 
             brand_choices = [('', 'Seleccione una marca')]
             for brand in brand_results:
@@ -537,18 +408,12 @@ class EquipmentUpdateView(LoginRequiredMixin, APIClientMixin, TemplateView):
         
         try:
             api_client = self.get_api_client()
-            
-            # Cargar opciones de clientes
-            clients_data = api_client.get_clients(page_size=1000)
-            client_list = clients_data.get('results', [])
-            
-            client_choices = [('', 'Seleccione un cliente')]
-            for client in client_list:
-                client_choices.append((
-                    client['client_id'],
-                    f"{client['name']} - {client.get('email', 'Sin email')}"
-                ))
-            form.fields['client_id'].widget.choices = client_choices
+
+            # Tipos de equipo y códigos de referencia (bundle versionado)
+            load_reference_choices(form, api_client)
+
+            # Cliente: select remoto, sólo se resuelve la etiqueta del seleccionado
+            load_remote_selection(form, 'client_id', api_client)
             
         except APIException as e:
             logger.error(f"Error loading clients: {e}")
@@ -557,8 +422,8 @@ class EquipmentUpdateView(LoginRequiredMixin, APIClientMixin, TemplateView):
         # Cargar marcas OEM
         try:
             api_client = self.get_api_client()
-            brands_data = api_client.get_oem_brands(page_size=1000, is_active=True)
-            brand_results = brands_data.get('results', brands_data)
+            catalogs = get_reference_catalogs(api_client)
+            brand_results = [b for b in catalogs.get('oem_brands', []) if b.get('is_active')]
 
             brand_choices = [('', 'Seleccione una marca')]
             for brand in brand_results:
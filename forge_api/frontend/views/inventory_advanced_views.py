@@ -2,6 +2,7 @@
 Advanced inventory management views.
 Handles Warehouse, Bin, PriceList, ProductPrice, and PurchaseOrder interfaces.
 """
+import asyncio
 import logging
 from django.shortcuts import render, redirect
 from django.contrib import messages
@@ -13,18 +14,23 @@ from django.urls import reverse_lazy
 from django.conf import settings
 
 from ..services.api_client import ForgeAPIClient, APIException
-from ..mixins import APIClientMixin
+from ..mixins import APIClientMixin, AsyncAPIClientMixin, AsyncLoginRequiredMixin
 
 logger = logging.getLogger(__name__)
 
 
-class WarehouseAdvancedListView(LoginRequiredMixin, APIClientMixin, TemplateView):
-    """Advanced warehouse management with location visualization."""
+class WarehouseAdvancedListView(AsyncLoginRequiredMixin, AsyncAPIClientMixin, TemplateView):
+    """Advanced warehouse management with location visualization.
+
+    Async view: the per-warehouse bin and stock counts are independent
+    requests, so they are fetched concurrently instead of 2 serial calls
+    per row.
+    """
     template_name = 'frontend/inventory/warehouse_advanced_list.html'
     login_url = 'frontend:login'
     paginate_by = 20
     
-    def get_context_data(self, **kwargs):
+    async def aget_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
         # Get search and filter parameters
@@ -35,64 +41,31 @@ class WarehouseAdvancedListView(LoginRequiredMixin, APIClientMixin, TemplateView
         sort_order = self.request.GET.get('order', 'asc')
         
         try:
-            api_client = self.get_api_client()
-            
-            # Build filter parameters
-            filters = {}
-            if search:
-                filters['search'] = search
-            if status_filter:
-                filters['status'] = status_filter
-            if sort_by:
-                order_prefix = '-' if sort_order == 'desc' else ''
-                filters['ordering'] = f"{order_prefix}{sort_by}"
-            
-            # Get warehouses data
-            warehouses_data = api_client.get('warehouses/', params={
-                'page': page,
-                'page_size': self.paginate_by,
-                **filters
-            })
-            
-            warehouses = warehouses_data.get('results', [])
-            
-            # Process warehouses for enhanced display
-            for warehouse in warehouses:
-                # Add status styling
-                status = warehouse.get('status', '').lower()
-                warehouse['status_class'] = self._get_status_class(status)
-                warehouse['status_icon'] = self._get_status_icon(status)
+            async with await self.get_async_api_client() as api_client:
+                # Build filter parameters
+                filters = {}
+                if search:
+                    filters['search'] = search
+                if status_filter:
+                    filters['status'] = status_filter
+                if sort_by:
+                    order_prefix = '-' if sort_order == 'desc' else ''
+                    filters['ordering'] = f"{order_prefix}{sort_by}"
                 
-                # Get bin count for each warehouse
-                try:
-                    bins_data = api_client.get('bins/', params={
-                        'warehouse_code': warehouse.get('warehouse_code'),
-                        'page_size': 1
-                    })
-                    warehouse['bin_count'] = bins_data.get('count', 0)
-                except APIException:
-                    warehouse['bin_count'] = 0
+                # Get warehouses data
+                warehouses_data = await api_client.get('warehouses/', params={
+                    'page': page,
+                    'page_size': self.paginate_by,
+                    **filters
+                })
                 
-                # Get stock summary
-                try:
-                    stock_data = api_client.get('stock/', params={
-                        'warehouse': warehouse.get('warehouse_id'),
-                        'page_size': 1
-                    })
-                    warehouse['stock_items'] = stock_data.get('count', 0)
-                    
-                    # Calculate total value (would need aggregation endpoint)
-                    warehouse['total_value'] = 0  # Placeholder
-                except APIException:
-                    warehouse['stock_items'] = 0
-                    warehouse['total_value'] = 0
+                warehouses = warehouses_data.get('results', [])
                 
-                # Calculate utilization percentage
-                if warehouse['bin_count'] > 0:
-                    # This would need actual occupancy data
-                    warehouse['utilization'] = min(85, (warehouse['stock_items'] / warehouse['bin_count']) * 100)
-                else:
-                    warehouse['utilization'] = 0
+                # Fetch bin/stock counts for every row concurrently
+                await asyncio.gather(*(
+                    self._add_warehouse_summary(api_client, warehouse)
+                    for warehouse in warehouses
+                ))
             
             context['warehouses'] = warehouses
             
@@ -142,6 +115,38 @@ class WarehouseAdvancedListView(LoginRequiredMixin, APIClientMixin, TemplateView
         
         return context
     
+    async def _add_warehouse_summary(self, api_client, warehouse):
+        """Add status styling, bin count, stock count and utilization to a row."""
+        # Add status styling
+        status = warehouse.get('status', '').lower()
+        warehouse['status_class'] = self._get_status_class(status)
+        warehouse['status_icon'] = self._get_status_icon(status)
+        
+        bins_data, stock_data = await asyncio.gather(
+            api_client.get('bins/', params={
+                'warehouse_code': warehouse.get('warehouse_code'),
+                'page_size': 1
+            }),
+            api_client.get('stock/', params={
+                'warehouse': warehouse.get('warehouse_id'),
+                'page_size': 1
+            }),
+            return_exceptions=True
+        )
+        
+        warehouse['bin_count'] = 0 if isinstance(bins_data, Exception) else bins_data.get('count', 0)
+        warehouse['stock_items'] = 0 if isinstance(stock_data, Exception) else stock_data.get('count', 0)
+        
+        # Calculate total value (would need aggregation endpoint)
+        warehouse['total_value'] = 0  # Placeholder
+        
+        # Calculate utilization percentage
+        if warehouse['bin_count'] > 0:
+            # This would need actual occupancy data
+            warehouse['utilization'] = min(85, (warehouse['stock_items'] / warehouse['bin_count']) * 100)
+        else:
+            warehouse['utilization'] = 0
+    
     def _get_status_class(self, status):
         """Get Bootstrap class for warehouse status."""
         status_classes = {
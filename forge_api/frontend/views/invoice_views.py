@@ -13,7 +13,7 @@ import logging
 
 from ..services.api_client import ForgeAPIClient, APIException
 from ..forms.invoice_forms import InvoiceForm, InvoiceSearchForm
-from ..mixins import APIClientMixin
+from ..mixins import APIClientMixin, EMPTY_CURSOR_PAGINATION
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +29,7 @@ class InvoiceListView(LoginRequiredMixin, APIClientMixin, TemplateView):
 
         # Obtener parámetros de búsqueda y filtro
         search = self.request.GET.get('search', '').strip()
-        page = self._get_page_number()
+        cursor = self._get_cursor()
         status_filter = self.request.GET.get('status', '')
         client_filter = self.request.GET.get('client', '')
         sort_by = self.request.GET.get('sort', 'invoice_date')
@@ -50,31 +50,13 @@ class InvoiceListView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 order_prefix = '-' if sort_order == 'desc' else ''
                 filters['ordering'] = f"{order_prefix}{sort_by}"
 
-            # Obtener datos de facturas con paginación
-            invoices_data = api_client.get_invoices(
-                page=page,
-                page_size=self.paginate_by,
-                **filters
-            )
+            # Obtener datos de facturas, paginados por cursor
+            if cursor:
+                filters['cursor'] = cursor
+            invoices_data = api_client.get_invoices(page_size=self._get_page_size(self.paginate_by), **filters)
 
             context['invoices'] = invoices_data.get('results', [])
-
-            # Contexto de paginación
-            total_count = invoices_data.get('count', 0)
-            total_pages = (total_count + self.paginate_by - 1) // self.paginate_by
-
-            context['pagination'] = {
-                'count': total_count,
-                'next': invoices_data.get('next'),
-                'previous': invoices_data.get('previous'),
-                'current_page': page,
-                'total_pages': total_pages,
-                'page_range': self._get_page_range(page, total_pages),
-                'has_previous': page > 1,
-                'has_next': page < total_pages,
-                'start_index': (page - 1) * self.paginate_by + 1,
-                'end_index': min(page * self.paginate_by, total_count),
-            }
+            context['pagination'] = self._cursor_pagination(invoices_data)
 
             # Filtros y ordenación
             context['filters'] = {
@@ -109,16 +91,7 @@ class InvoiceListView(LoginRequiredMixin, APIClientMixin, TemplateView):
             self.handle_api_error(e, "Error al cargar la lista de facturas")
             # Establecer contexto vacío en caso de error
             context['invoices'] = []
-            context['pagination'] = {
-                'count': 0,
-                'current_page': 1,
-                'total_pages': 0,
-                'page_range': [],
-                'has_previous': False,
-                'has_next': False,
-                'start_index': 0,
-                'end_index': 0,
-            }
+            context['pagination'] = dict(EMPTY_CURSOR_PAGINATION)
             context['filters'] = {
                 'search': search,
                 'status': status_filter,
@@ -129,33 +102,6 @@ class InvoiceListView(LoginRequiredMixin, APIClientMixin, TemplateView):
 
         return context
 
-    def _get_page_number(self):
-        """Obtener y validar número de página desde la solicitud."""
-        try:
-            page = int(self.request.GET.get('page', 1))
-            return max(1, page)  # Asegurar que la página sea al menos 1
-        except (ValueError, TypeError):
-            return 1
-
-    def _get_page_range(self, current_page, total_pages, window=5):
-        """Generar un rango de páginas inteligente para la paginación."""
-        if total_pages <= window:
-            return list(range(1, total_pages + 1))
-
-        # Calcular inicio y fin de la ventana
-        half_window = window // 2
-        start = max(1, current_page - half_window)
-        end = min(total_pages, current_page + half_window)
-
-        # Ajustar si estamos cerca del principio o final
-        if end - start < window - 1:
-            if start == 1:
-                end = min(total_pages, start + window - 1)
-            else:
-                start = max(1, end - window + 1)
-
-        return list(range(start, end + 1))
-
 
 class InvoiceDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
     """Vista detallada de factura."""
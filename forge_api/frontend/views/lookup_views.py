@@ -0,0 +1,37 @@
+"""
+Lookup Views
+ForgeDB Frontend Web Application
+
+Endpoint JSON para los selects remotos (frontend.forms.widgets.RemoteSelect):
+reenvía la búsqueda a /api/v1/lookups/<kind>/ con el token de la sesión.
+"""
+
+import logging
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.views.generic import View
+
+from ..mixins import APIClientMixin
+from ..services.api_client import APIException
+
+logger = logging.getLogger(__name__)
+
+
+class LookupView(LoginRequiredMixin, APIClientMixin, View):
+    """Pares id/etiqueta paginados por cursor para un select remoto."""
+
+    def get(self, request, kind):
+        params = request.GET.dict()
+        try:
+            data = self.get_api_client().lookup(
+                kind,
+                q=params.pop('q', ''),
+                after=params.pop('after', None),
+                limit=params.pop('limit', None),
+                **params
+            )
+        except APIException as e:
+            logger.warning(f"Lookup {kind} failed: {e}")
+            return JsonResponse({'results': [], 'next': None, 'error': e.message}, status=e.status_code or 502)
+        return JsonResponse({'results': data.get('results', []), 'next': data.get('next')})
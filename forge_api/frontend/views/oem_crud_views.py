@@ -10,7 +10,7 @@ from django.http import JsonResponse
 from django import forms
 
 from ..services.api_client import ForgeAPIClient, APIException
-from ..mixins import APIClientMixin
+from ..mixins import APIClientMixin, EMPTY_CURSOR_PAGINATION
 from ..forms.oem_forms import (
     OEMBrandForm,
     OEMCatalogItemForm,
@@ -347,6 +347,8 @@ class OEMCatalogItemListView(LoginRequiredMixin, APIClientMixin, TemplateView):
     template_name = 'frontend/oem/catalog_item_list.html'
     login_url = 'frontend:login'
     paginate_by = 20
+    # Columnas que usa la tabla; evita traer los arreglos JSON de cada item.
+    api_fields = 'catalog_id,oem_code,part_number,item_type,is_active'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -357,7 +359,7 @@ class OEMCatalogItemListView(LoginRequiredMixin, APIClientMixin, TemplateView):
         item_type = self.request.GET.get('item_type', '')
         is_active = self.request.GET.get('is_active', '')
         is_discontinued = self.request.GET.get('is_discontinued', '')
-        page = self._get_page_number()
+        cursor = self._get_cursor()
         
         try:
             api_client = self.get_api_client()
@@ -375,30 +377,16 @@ class OEMCatalogItemListView(LoginRequiredMixin, APIClientMixin, TemplateView):
             if is_discontinued:
                 filters['is_discontinued'] = is_discontinued == 'true'
             
-            # Obtener items del catálogo
-            items_data = api_client.get_oem_catalog_items(
-                page=page,
-                page_size=self.paginate_by,
-                **filters
-            )
+            # Obtener items del catálogo, paginados por cursor
+            if cursor:
+                filters['cursor'] = cursor
+            items_data = api_client.get_oem_catalog_items(page_size=self._get_page_size(self.paginate_by),
+                                                          fields=self.api_fields, **filters)
             
             items = items_data.get('results', items_data)
             context['catalog_items'] = items if isinstance(items, list) else []
             
-            # Paginación
-            total_count = items_data.get('count', len(context['catalog_items']))
-            total_pages = (total_count + self.paginate_by - 1) // self.paginate_by
-            
-            context['pagination'] = {
-                'count': total_count,
-                'current_page': page,
-                'total_pages': total_pages,
-                'page_range': self._get_page_range(page, total_pages),
-                'has_previous': page > 1,
-                'has_next': page < total_pages,
-                'start_index': (page - 1) * self.paginate_by + 1,
-                'end_index': min(page * self.paginate_by, total_count),
-            }
+            context['pagination'] = self._cursor_pagination(items_data)
             
             # Formulario de búsqueda con marcas
             search_form = OEMCatalogItemSearchForm(initial={
@@ -428,45 +416,10 @@ class OEMCatalogItemListView(LoginRequiredMixin, APIClientMixin, TemplateView):
             logger.error(f"Error loading catalog items: {e}")
             messages.error(self.request, f"Error al cargar el catálogo: {e.message}")
             context['catalog_items'] = []
-            context['pagination'] = self._get_empty_pagination()
+            context['pagination'] = dict(EMPTY_CURSOR_PAGINATION)
             context['search_form'] = OEMCatalogItemSearchForm()
         
         return context
-    
-    def _get_page_number(self):
-        try:
-            page = int(self.request.GET.get('page', 1))
-            return max(1, page)
-        except (ValueError, TypeError):
-            return 1
-    
-    def _get_page_range(self, current_page, total_pages, window=5):
-        if total_pages <= window:
-            return list(range(1, total_pages + 1))
-        
-        half_window = window // 2
-        start = max(1, current_page - half_window)
-        end = min(total_pages, current_page + half_window)
-        
-        if end - start < window - 1:
-            if start == 1:
-                end = min(total_pages, start + window - 1)
-            else:
-                start = max(1, end - window + 1)
-        
-        return list(range(start, end + 1))
-    
-    def _get_empty_pagination(self):
-        return {
-            'count': 0,
-            'current_page': 1,
-            'total_pages': 0,
-            'page_range': [],
-            'has_previous': False,
-            'has_next': False,
-            'start_index': 0,
-            'end_index': 0,
-        }
 
 
 class OEMCatalogItemCreateView(LoginRequiredMixin, APIClientMixin, TemplateView):
@@ -12,6 +12,7 @@ from django.db.models import Q
 from django.shortcuts import get_object_or_404
 
 from core.models import OEMEquivalence, OEMBrand, Technician
+from core.pagination import KeysetPagination
 from core.serializers.oem_serializers import (
     OEMEquivalenceSerializer,
     OEMEquivalenceCreateSerializer,
@@ -40,6 +41,7 @@ class OEMEquivalenceViewSet(viewsets.ModelViewSet):
         'oem_code', 'verified_by'
     ).all()
     serializer_class = OEMEquivalenceSerializer
+    pagination_class = KeysetPagination
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
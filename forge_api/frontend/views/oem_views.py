@@ -33,7 +33,7 @@ except ImportError:
     EXCEL_AVAILABLE = False
 
 from ..services.api_client import ForgeAPIClient, APIException
-from ..mixins import APIClientMixin
+from ..mixins import APIClientMixin, EMPTY_CURSOR_PAGINATION
 from ..forms.oem_forms import (
     OEMBrandForm, 
     OEMCatalogItemForm,
@@ -337,6 +337,8 @@ class OEMPartCatalogView(LoginRequiredMixin, APIClientMixin, TemplateView):
     template_name = 'frontend/oem/part_catalog.html'
     login_url = 'frontend:login'
     paginate_by = 25
+    # Columnas que usa la tabla; evita traer los arreglos JSON de cada parte.
+    api_fields = 'catalog_id,oem_code,part_number,description_es,weight_kg,dimensions'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -345,7 +347,7 @@ class OEMPartCatalogView(LoginRequiredMixin, APIClientMixin, TemplateView):
         search = self.request.GET.get('search', '').strip()
         manufacturer_filter = self.request.GET.get('manufacturer', '')
         category_filter = self.request.GET.get('category', '')
-        page = self._get_page_number()
+        cursor = self._get_cursor()
         
         # Get manufacturers from API for filter dropdown - OUTSIDE main try block for better error visibility
         manufacturers = []
@@ -403,10 +405,12 @@ class OEMPartCatalogView(LoginRequiredMixin, APIClientMixin, TemplateView):
             
             # Get real parts data from API
             # Disable cache to ensure fresh data
+            if cursor:
+                filters['cursor'] = cursor
             items_response = api_client.get_oem_catalog_items(
-                page=page,
-                page_size=self.paginate_by,
+                page_size=self._get_page_size(self.paginate_by),
                 use_cache=False,
+                fields=self.api_fields,
                 **filters
             )
             parts = items_response.get('results', [])
@@ -454,20 +458,7 @@ class OEMPartCatalogView(LoginRequiredMixin, APIClientMixin, TemplateView):
             
             context['parts'] = parts
             
-            # Pagination context - use API count, not len(parts)
-            total_count = items_response.get('count', len(parts))
-            total_pages = (total_count + self.paginate_by - 1) // self.paginate_by if total_count > 0 else 1
-            
-            context['pagination'] = {
-                'count': total_count,
-                'current_page': page,
-                'total_pages': total_pages,
-                'page_range': self._get_page_range(page, total_pages),
-                'has_previous': page > 1,
-                'has_next': page < total_pages,
-                'start_index': (page - 1) * self.paginate_by + 1,
-                'end_index': min(page * self.paginate_by, total_count),
-            }
+            context['pagination'] = self._cursor_pagination(items_response)
             
             # Filter context
             context['filters'] = {
@@ -500,7 +491,7 @@ class OEMPartCatalogView(LoginRequiredMixin, APIClientMixin, TemplateView):
         except Exception as e:
             logger.error(f"Error loading OEM parts catalog: {type(e).__name__}: {e}")
             context['parts'] = []
-            context['pagination'] = self._get_empty_pagination()
+            context['pagination'] = dict(EMPTY_CURSOR_PAGINATION)
             context['catalog_stats'] = self._get_empty_catalog_stats()
             # Note: manufacturers is already set outside this try block
         
@@ -581,44 +572,6 @@ class OEMPartCatalogView(LoginRequiredMixin, APIClientMixin, TemplateView):
             'availability_rate': (in_stock / total * 100) if total > 0 else 0,
         }
     
-    def _get_page_number(self):
-        """Get and validate page number from request."""
-        try:
-            page = int(self.request.GET.get('page', 1))
-            return max(1, page)
-        except (ValueError, TypeError):
-            return 1
-    
-    def _get_page_range(self, current_page, total_pages, window=5):
-        """Generate a smart page range for pagination."""
-        if total_pages <= window:
-            return list(range(1, total_pages + 1))
-        
-        half_window = window // 2
-        start = max(1, current_page - half_window)
-        end = min(total_pages, current_page + half_window)
-        
-        if end - start < window - 1:
-            if start == 1:
-                end = min(total_pages, start + window - 1)
-            else:
-                start = max(1, end - window + 1)
-        
-        return list(range(start, end + 1))
-    
-    def _get_empty_pagination(self):
-        """Get empty pagination context for error states."""
-        return {
-            'count': 0,
-            'current_page': 1,
-            'total_pages': 0,
-            'page_range': [],
-            'has_previous': False,
-            'has_next': False,
-            'start_index': 0,
-            'end_index': 0,
-        }
-    
     def _get_empty_catalog_stats(self):
         """Get empty catalog statistics for error states."""
         return {
@@ -18,7 +18,7 @@ from django.db import transaction
 from ..mixins import APIClientMixin
 from ..services.api_client import APIException
 from ..services.quote_calculation_engine import QuoteCalculationEngine
-from ..services.quote_pdf_generator import QuotePDFGenerator
+from ..services.document_renderer import APIDocumentSource, DocumentRenderer
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +57,9 @@ class QuoteListView(LoginRequiredMixin, APIClientMixin, TemplateView):
             # Filtro para cotizaciones cerradas/convertidas
             closed_filter = self.request.GET.get('closed_filter', '')
             
-            # Obtener cotizaciones
+            # Obtener cotizaciones con la OT y la factura relacionadas
+            # resueltas por la API en la misma consulta
+            params['expand'] = 'work_order,invoice_status'
             quotes_data = api_client.get('quotes/', params=params)
             quotes = quotes_data.get('results', [])
             
@@ -69,35 +71,6 @@ class QuoteListView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 # Solo cotizaciones activas (no convertidas ni rechazadas ni expiradas)
                 quotes = [q for q in quotes if q.get('status') in ['DRAFT', 'SENT', 'APPROVED']]
             
-            # Enriquecer cotizaciones con información de WO y factura relacionada
-            for quote in quotes:
-                if quote.get('converted_to_wo_id'):
-                    try:
-                        wo = api_client.get_workorder(quote['converted_to_wo_id'])
-                        quote['work_order'] = {
-                            'wo_id': wo.get('wo_id'),
-                            'wo_number': wo.get('wo_number', f"WO-{wo.get('wo_id')}"),
-                            'status': wo.get('status'),
-                        }
-                        
-                        # Intentar obtener factura relacionada con la WO
-                        try:
-                            invoices_data = api_client.get_invoices(wo_id=quote['converted_to_wo_id'])
-                            invoices = invoices_data.get('results', [])
-                            if invoices:
-                                invoice = invoices[0]
-                                quote['invoice'] = {
-                                    'invoice_id': invoice.get('invoice_id'),
-                                    'invoice_number': invoice.get('invoice_number'),
-                                    'status': invoice.get('status'),
-                                    'total_amount': invoice.get('total_amount'),
-                                }
-                        except APIException:
-                            quote['invoice'] = None
-                    except APIException:
-                        quote['work_order'] = None
-                        quote['invoice'] = None
-            
             context['quotes'] = quotes
             context['filters'] = {
                 'search': search,
@@ -145,40 +118,9 @@ class QuoteDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
         try:
             api_client = self.get_api_client()
             
-            # Obtener cotización
-            quote = api_client.get_quote(quote_id)
-            
-            # Obtener items de la cotización
-            quote_items_data = api_client.get_quote_items(quote_id=quote_id)
-            quote['items'] = quote_items_data.get('results', [])
-            
-            # Obtener información de orden de trabajo y factura relacionada
-            if quote.get('converted_to_wo_id'):
-                try:
-                    wo = api_client.get_workorder(quote['converted_to_wo_id'])
-                    quote['work_order'] = {
-                        'wo_id': wo.get('wo_id'),
-                        'wo_number': wo.get('wo_number', f"WO-{wo.get('wo_id')}"),
-                        'status': wo.get('status'),
-                    }
-                    
-                    # Intentar obtener factura relacionada con la WO
-                    try:
-                        invoices_data = api_client.get_invoices(wo_id=quote['converted_to_wo_id'])
-                        invoices = invoices_data.get('results', [])
-                        if invoices:
-                            invoice = invoices[0]
-                            quote['invoice'] = {
-                                'invoice_id': invoice.get('invoice_id'),
-                                'invoice_number': invoice.get('invoice_number'),
-                                'status': invoice.get('status'),
-                                'total_amount': invoice.get('total_amount'),
-                            }
-                    except APIException:
-                        quote['invoice'] = None
-                except APIException:
-                    quote['work_order'] = None
-                    quote['invoice'] = None
+            # Cotización con sus items, la OT y la factura relacionadas
+            quote = api_client.get_quote(quote_id, expand='work_order,invoice_status')
+            quote.setdefault('converted_to_wo_id', quote.get('converted_to_wo'))
             
             context['quote'] = quote
             
@@ -203,29 +145,16 @@ class QuotePDFView(LoginRequiredMixin, APIClientMixin, View):
         try:
             api_client = self.get_api_client()
             
-            # Obtener cotización
-            quote = api_client.get_quote(quote_id)
-            
-            # Obtener items de la cotización
-            quote_items_data = api_client.get_quote_items(quote_id=quote_id)
-            quote['items'] = quote_items_data.get('results', [])
-            
-            # Obtener datos del cliente
-            if quote.get('client_id'):
-                try:
-                    client = api_client.get_client(quote['client_id'])
-                    quote['client'] = client
-                except APIException:
-                    quote['client'] = {}
-            
-            # Generar PDF
-            pdf_generator = QuotePDFGenerator()
-            pdf_buffer = pdf_generator.generate_pdf(quote)
+            # La cotización trae todos sus items; el PDF se reutiliza de la
+            # caché mientras no cambie updated_at
+            source = APIDocumentSource(api_client)
+            quote = source.get('quote', quote_id)
+            renderer = DocumentRenderer()
+            pdf = renderer.render('quote', quote, source)
             
             # Preparar respuesta HTTP
-            response = HttpResponse(pdf_buffer.read(), content_type='application/pdf')
-            filename = f"cotizacion_{quote.get('quote_number', quote_id)}.pdf"
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            response = HttpResponse(pdf, content_type='application/pdf')
+            response['Content-Disposition'] = f'attachment; filename="{renderer.filename("quote", quote)}"'
             
             return response
             
@@ -286,8 +215,8 @@ class QuoteCreateView(LoginRequiredMixin, APIClientMixin, TemplateView):
             
             # Obtener datos del formulario
             quote_data = {
-                'client_id': int(client_id),
-                'equipment_id': int(request.POST.get('equipment_id')) if request.POST.get('equipment_id') else None,
+                'client': int(client_id),
+                'equipment': int(request.POST.get('equipment_id')) if request.POST.get('equipment_id') else None,
                 'quote_date': request.POST.get('quote_date', date.today().isoformat()),
                 'valid_until': request.POST.get('valid_until') or None,
                 'currency_code': request.POST.get('currency_code', 'MXN').upper(),
@@ -334,58 +263,36 @@ class QuoteCreateView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 messages.error(request, "Debe agregar al menos un item a la cotización.")
                 return self.get(request)
             
-            # Calcular totales
-            discount_percent = Decimal(request.POST.get('discount_percent', 0) or 0)
-            tax_percent = Decimal(request.POST.get('tax_percent', 16) or 16)
-            
-            totals = calculation_engine.calculate_quote_totals(
-                items=items,
-                discount_percent=discount_percent,
-                tax_percent=tax_percent
-            )
-            
-            quote_data.update(totals)
-            
-            # Validar reglas de negocio
-            validation = calculation_engine.validate_business_rules(quote_data)
+            # Validar reglas de negocio (los totales los calcula la API)
+            validation = calculation_engine.validate_business_rules({**quote_data, 'items': items})
             if not validation['valid']:
                 for error in validation['errors']:
                     messages.error(request, error)
                 return self.get(request)
-            
-            # Crear cotización en la API
+
+            quote_data['discount_percent'] = str(Decimal(request.POST.get('discount_percent', 0) or 0))
+            quote_data['tax_percent'] = str(Decimal(request.POST.get('tax_percent', 16) or 16))
+            quote_data['items'] = [
+                {
+                    'description': item_data['description'],
+                    'quantity': int(item_data.get('quantity', 1)),
+                    'hours': str(item_data.get('hours', 0)),
+                    'hourly_rate': str(item_data.get('hourly_rate', calculation_engine.DEFAULT_HOURLY_RATE)),
+                    'service_code': item_data.get('service_code', ''),
+                    'flat_rate': item_data.get('flat_rate_id'),
+                    'notes': item_data.get('notes', ''),
+                }
+                for item_data in items
+            ]
+
+            # Crear cotización con sus items en una sola petición (transaccional)
             quote = api_client.create_quote(quote_data)
             quote_id = quote.get('quote_id')
-            
+
             if not quote_id:
                 messages.error(request, "Error al crear la cotización. No se recibió un ID válido.")
                 return self.get(request)
-            
-            # Crear items de la cotización
-            for item_data in items:
-                # Calcular line_total si no está presente
-                if 'line_total' not in item_data:
-                    item_calc = calculation_engine.calculate_quote_item_total(item_data)
-                    item_data['line_total'] = float(item_calc['line_subtotal'])
-                
-                quote_item_data = {
-                    'quote_id': quote_id,
-                    'description': item_data['description'],
-                    'quantity': item_data['quantity'],
-                    'hours': float(item_data['hours']),
-                    'hourly_rate': float(item_data['hourly_rate']),
-                    'line_total': float(item_data['line_total']),
-                    'service_code': item_data.get('service_code', ''),
-                    'flat_rate_id': item_data.get('flat_rate_id'),
-                    'notes': item_data.get('notes', ''),
-                }
-                
-                try:
-                    api_client.create_quote_item(quote_item_data)
-                except APIException as e:
-                    logger.error(f"Error creating quote item: {e}")
-                    # Continuar con los demás items aunque falle uno
-            
+
             messages.success(request, f"Cotización #{quote.get('quote_number', quote_id)} creada exitosamente.")
             return redirect('frontend:quote_detail', pk=quote_id)
             
@@ -410,78 +317,12 @@ class QuoteConvertToWorkOrderView(LoginRequiredMixin, APIClientMixin, View):
         try:
             api_client = self.get_api_client()
             
-            # Obtener cotización
-            quote = api_client.get_quote(quote_id)
-            
-            if quote.get('status') == 'CONVERTED':
-                messages.warning(request, "Esta cotización ya fue convertida a orden de trabajo.")
-                return redirect('frontend:quote_detail', pk=quote_id)
-            
-            # Obtener items de la cotización
-            quote_items_data = api_client.get_quote_items(quote_id=quote_id)
-            quote_items = quote_items_data.get('results', [])
-            
-            if not quote_items:
-                messages.error(request, "La cotización no tiene items. No se puede convertir a orden de trabajo.")
-                return redirect('frontend:quote_detail', pk=quote_id)
-            
-            # Crear orden de trabajo desde la cotización
-            wo_data = {
-                'client_id': quote.get('client_id'),
-                'equipment_id': quote.get('equipment_id'),
-                'description': f"Orden de trabajo creada desde cotización #{quote.get('quote_number', quote_id)}",
-                'complaint': quote.get('notes', ''),
-                'priority': 'normal',
-                'status': 'draft',
-            }
-            
-            # Crear orden de trabajo
-            work_order = api_client.create_workorder(wo_data)
+            # Crear la orden de trabajo con un servicio por item y marcar la
+            # cotización como convertida, todo en una transacción de la API.
+            # Si ya estaba convertida o no tiene items la API responde 409.
+            work_order = api_client.convert_quote_to_work_order(quote_id)
             wo_id = work_order.get('wo_id')
             
-            if not wo_id:
-                messages.error(request, "Error al crear la orden de trabajo.")
-                return redirect('frontend:quote_detail', pk=quote_id)
-            
-            # Crear servicios en la orden de trabajo desde los items de la cotización
-            for quote_item in quote_items:
-                wo_service_data = {
-                    'wo_id': wo_id,
-                    'flat_rate_id': quote_item.get('flat_rate_id'),
-                    'service_code': quote_item.get('service_code', ''),
-                    'description': quote_item.get('description', ''),
-                    'estimated_hours': float(quote_item.get('hours', 0)),
-                    'actual_hours': float(quote_item.get('hours', 0)),
-                    'hourly_rate': float(quote_item.get('hourly_rate', 500)),
-                    'quantity': quote_item.get('quantity', 1),
-                    'status': 'PENDING',
-                    'completion_status': 'NOT_STARTED',
-                }
-                
-                try:
-                    # Crear servicio en la orden de trabajo
-                    # Nota: El endpoint puede variar según la API, ajustar si es necesario
-                    api_client.post('work-order-services/', data=wo_service_data)
-                except APIException as e:
-                    logger.warning(f"Error creating WO service from quote item: {e}")
-                    # Continuar con los demás servicios aunque falle uno
-                    # Intentar con endpoint alternativo
-                    try:
-                        api_client.post(f'work-orders/{wo_id}/services/', data=wo_service_data)
-                    except APIException:
-                        pass
-            
-            # Actualizar cotización: marcar como convertida y vincular a WO
-            update_data = {
-                'status': 'CONVERTED',
-                'converted_to_wo_id': wo_id,
-            }
-            
-            try:
-                api_client.update_quote(quote_id, update_data)
-            except APIException as e:
-                logger.warning(f"Error updating quote status to CONVERTED: {e}")
-            
             messages.success(
                 request, 
                 f"Cotización convertida a orden de trabajo #{wo_id} exitosamente."
@@ -19,9 +19,11 @@ from django.urls import reverse_lazy
 from django.views import View
 
 from ..services.api_client import ForgeAPIClient, APIException
+from ..services.reference_data_service import get_reference_catalogs
 from ..mixins import APIClientMixin
 from ..forms.reference_code_forms import ReferenceCodeForm, ReferenceCodeImportForm
 from ..utils.navigation import BreadcrumbBuilder
+from core import reference_codes
 from core.models import BrandType, ProductCategory, ProductType
 
 logger = logging.getLogger(__name__)
@@ -238,6 +240,31 @@ CATEGORY_CONFIG = {
 }
 
 
+def get_row_pk(category, row):
+    """La clave de una fila de la API, para las URLs de edición y borrado."""
+    return row.get(reference_codes.get_table(category).model._meta.pk.name, '')
+
+
+def get_code_for_pk(api_client, category, pk):
+    """
+    El código de la fila ``pk`` de una categoría. Es el mismo valor salvo en
+    color, cuya clave es ``color_id``; ahí se lee la fila.
+    """
+    table = reference_codes.get_table(category)
+    if table.model._meta.pk.name == table.code_field:
+        return pk
+    return api_client.get(f'{CATEGORY_ENDPOINT_MAP[category]}/{pk}/').get(table.code_field)
+
+
+def get_code_usage(api_client, category, codes):
+    """``{code: filas que lo usan}`` para varios códigos de una categoría, en una sola llamada."""
+    try:
+        return api_client.get_reference_code_usage(category, list(codes))
+    except Exception as e:
+        logger.error(f"Error checking code usage: {e}")
+        return {}
+
+
 class ReferenceCodeListView(LoginRequiredMixin, APIClientMixin, TemplateView):
     """Lista de códigos de referencia organizados por categorías"""
     template_name = 'frontend/catalog/reference_code_list.html'
@@ -280,6 +307,54 @@ class ReferenceCodeListView(LoginRequiredMixin, APIClientMixin, TemplateView):
             for cat_key in CATEGORY_ENDPOINT_MAP.keys():
                 cache.delete(f'ref_code_{cat_key}')
     
+    @staticmethod
+    def _filter_codes(codes, search_query, status_filter, sort_by, sort_order):
+        """Filtra por texto y estado y ordena los códigos de la categoría seleccionada"""
+        if search_query:
+            codes = [
+                code for code in codes
+                if search_query.lower() in code.get('code', '').lower() or
+                   search_query.lower() in code.get('description', '').lower()
+            ]
+
+        # Filtrar por estado
+        if status_filter == 'active':
+            codes = [code for code in codes if code.get('is_active', True)]
+        elif status_filter == 'inactive':
+            codes = [code for code in codes if not code.get('is_active', True)]
+
+        # Ordenar
+        reverse = (sort_order == 'desc')
+        if sort_by == 'code':
+            codes = sorted(codes, key=lambda x: x.get('code', ''), reverse=reverse)
+        elif sort_by == 'description':
+            codes = sorted(codes, key=lambda x: x.get('description', ''), reverse=reverse)
+        return codes
+
+    def _load_categories_from_bundle(self, api_client, selected_category, search_query, status_filter, sort_by, sort_order):
+        """Carga todas las categorías de API desde el bundle de referencia (una sola petición)"""
+        catalogs = get_reference_catalogs(api_client)
+        categories_data = {}
+        for category_key, endpoint in CATEGORY_ENDPOINT_MAP.items():
+            rows = catalogs.get(endpoint.replace('-', '_'), [])
+            codes = []
+            if category_key == selected_category:
+                field_mapping = CATEGORY_FIELD_MAP[category_key]
+                codes = [
+                    dict(row,
+                         code=row.get(field_mapping['code_field'], ''),
+                         description=row.get(field_mapping['name_field']) or row.get('name_en') or '')
+                    for row in rows
+                ]
+                codes = self._filter_codes(codes, search_query, status_filter, sort_by, sort_order)
+            categories_data[category_key] = {
+                **CATEGORY_CONFIG[category_key],
+                'count': len(rows),
+                'filtered_count': len(codes),
+                'codes': codes,
+            }
+        return categories_data
+
     def _load_single_category(self, api_client, category_key, endpoint, selected_category, search_query, status_filter, sort_by, sort_order):
         """Carga datos de una sola categoría (para uso con ThreadPoolExecutor)"""
         try:
@@ -301,25 +376,7 @@ class ReferenceCodeListView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 count = data.get('count', 0)
                 
                 # Aplicar filtros solo a la categoría seleccionada
-                if search_query:
-                    codes = [
-                        code for code in codes
-                        if search_query.lower() in code.get('code', '').lower() or
-                           search_query.lower() in code.get('description', '').lower()
-                    ]
-                
-                # Filtrar por estado
-                if status_filter == 'active':
-                    codes = [code for code in codes if code.get('is_active', True)]
-                elif status_filter == 'inactive':
-                    codes = [code for code in codes if not code.get('is_active', True)]
-                
-                # Ordenar
-                reverse = (sort_order == 'desc')
-                if sort_by == 'code':
-                    codes = sorted(codes, key=lambda x: x.get('code', ''), reverse=reverse)
-                elif sort_by == 'description':
-                    codes = sorted(codes, key=lambda x: x.get('description', ''), reverse=reverse)
+                codes = self._filter_codes(codes, search_query, status_filter, sort_by, sort_order)
             
             return {
                 'category_key': category_key,
@@ -395,28 +452,35 @@ class ReferenceCodeListView(LoginRequiredMixin, APIClientMixin, TemplateView):
             # Cargar categorías de API (códigos de referencia)
             if valid_api_categories:
                 api_client = self.get_api_client()
-                with ThreadPoolExecutor(max_workers=4) as executor:
-                    futures = {}
-                    for category_key, endpoint in CATEGORY_ENDPOINT_MAP.items():
-                        future = executor.submit(
-                            self._load_single_category,
-                            api_client, category_key, endpoint,
-                            selected_category, search_query, status_filter, sort_by, sort_order
-                        )
-                        futures[future] = category_key
-                    for future in as_completed(futures):
-                        category_key = futures[future]
-                        try:
-                            result = future.result()
-                            categories_data[result['category_key']] = result['data']
-                        except Exception as e:
-                            logger.error(f"Error loading category {category_key}: {e}")
-                            categories_data[category_key] = {
-                                **CATEGORY_CONFIG[category_key],
-                                'count': 0,
-                                'filtered_count': 0,
-                                'codes': []
-                            }
+                try:
+                    categories_data = self._load_categories_from_bundle(
+                        api_client, selected_category, search_query, status_filter, sort_by, sort_order
+                    )
+                except APIException as e:
+                    # Sin bundle: una petición por categoría
+                    logger.warning(f"Reference bundle unavailable, loading categories one by one: {e}")
+                    with ThreadPoolExecutor(max_workers=4) as executor:
+                        futures = {}
+                        for category_key, endpoint in CATEGORY_ENDPOINT_MAP.items():
+                            future = executor.submit(
+                                self._load_single_category,
+                                api_client, category_key, endpoint,
+                                selected_category, search_query, status_filter, sort_by, sort_order
+                            )
+                            futures[future] = category_key
+                        for future in as_completed(futures):
+                            category_key = futures[future]
+                            try:
+                                result = future.result()
+                                categories_data[result['category_key']] = result['data']
+                            except Exception as e:
+                                logger.error(f"Error loading category {category_key}: {e}")
+                                categories_data[category_key] = {
+                                    **CATEGORY_CONFIG[category_key],
+                                    'count': 0,
+                                    'filtered_count': 0,
+                                    'codes': []
+                                }
 
             # Agregar campos estandarizados a códigos de API
             for cat_key, cat_data in categories_data.items():
@@ -425,7 +489,7 @@ class ReferenceCodeListView(LoginRequiredMixin, APIClientMixin, TemplateView):
                     code_field = field_mapping['code_field']
                     name_field = field_mapping['name_field']
                     for code in cat_data.get('codes', []):
-                        code['pk'] = code.get(code_field, '')
+                        code['pk'] = get_row_pk(cat_key, code)
                         code['code'] = code.get(code_field, '')
                         code['description'] = code.get(name_field, '') or code.get('name_en', '')
                         code['is_active'] = True
@@ -552,7 +616,7 @@ class ReferenceCodeCreateView(LoginRequiredMixin, APIClientMixin, FormView):
             
             # Preparar datos usando campos correctos de la API
             data = {
-                code_field: form.cleaned_data['code'].upper(),
+                code_field: form.cleaned_data['code'],
                 name_field: form.cleaned_data['description'],
             }
             # Agregar campos extra
@@ -641,7 +705,7 @@ class ReferenceCodeUpdateView(LoginRequiredMixin, APIClientMixin, FormView):
                 # Agregar campos estandarizados
                 code_field = field_mapping['code_field']
                 name_field = field_mapping['name_field']
-                code_data['pk'] = code_data.get(code_field, '')
+                code_data['pk'] = get_row_pk(category, code_data)
                 code_data['code'] = code_data.get(code_field, '')
                 code_data['description'] = code_data.get(name_field, '') or code_data.get('name_en', '')
                 code_data['is_active'] = True
@@ -675,63 +739,33 @@ class ReferenceCodeUpdateView(LoginRequiredMixin, APIClientMixin, FormView):
             name_field = field_mapping['name_field']
             extra_fields = field_mapping['extra_fields']
 
-            new_code = form.cleaned_data['code'].upper()
-            original_code = self.request.POST.get('original_code', code_id).upper()
+            new_code = form.cleaned_data['code']
+            original_code = (self.request.POST.get('original_code', '').strip()
+                             or get_code_for_pk(api_client, category, code_id))
             description = form.cleaned_data['description']
 
             # Verificar si el código ha cambiado
             if new_code != original_code:
-                # El código cambió - necesitamos crear uno nuevo y migrar referencias
-                # 1. Verificar que el nuevo código no exista
-                existing_response = api_client.get(f'{endpoint}/')
-                existing_codes = {code[code_field]: code for code in existing_response.get('results', [])}
-
-                if new_code in existing_codes:
-                    # El nuevo código ya existe - error
-                    messages.error(
-                        self.request,
-                        f"Error: El código '{new_code}' ya existe en esta categoría. "
-                        f"No se puede cambiar '{original_code}' a '{new_code}' porque el código destino ya está en uso."
-                    )
-                    return self.form_invalid(form)
-
-                # 2. Crear el nuevo código
-                new_data = {
-                    code_field: new_code,
-                    name_field: description,
-                }
-                new_data.update(extra_fields)
-
-                try:
-                    api_client.post(f'{endpoint}/', data=new_data)
-                except APIException as e:
-                    messages.error(self.request, f"Error al crear el nuevo código: {e.message}")
-                    return self.form_invalid(form)
-
-                # 3. Actualizar referencias en equipos
-                updated_equipment_count = self._update_equipment_references(
-                    api_client, category, original_code, new_code
-                )
-
-                # 4. Eliminar el código viejo
+                # Renombrar el código y todas sus referencias en una sola transacción
                 try:
-                    api_client.delete(f'{endpoint}/{original_code}/')
+                    result = api_client.rename_reference_code(
+                        category, original_code, new_code, **{name_field: description}
+                    )
                 except APIException as e:
-                    # Si no se puede eliminar, al menos informar que se creó el nuevo
-                    messages.warning(
+                    messages.error(
                         self.request,
-                        f"Código '{new_code}' creado exitosamente y {updated_equipment_count} equipos actualizados. "
-                        f"No se pudo eliminar el código viejo '{original_code}': {e.message}"
+                        f"No se pudo cambiar '{original_code}' a '{new_code}': {e.message}"
                     )
-                    return super().form_valid(form)
+                    return self.form_invalid(form)
 
+                updated_count = sum(result.get('updated', {}).values())
                 messages.success(
                     self.request,
                     f"Código cambiado exitosamente de '{original_code}' a '{new_code}'. "
-                    f"{updated_equipment_count} equipos actualizados."
+                    f"{updated_count} referencias actualizadas."
                 )
                 
-                # Invalidar caché de ambas categorías (origen y destino)
+                # Invalidar caché de la categoría
                 self._invalidate_category_cache(category)
             else:
                 # El código no cambió - solo actualizar descripción
@@ -747,7 +781,7 @@ class ReferenceCodeUpdateView(LoginRequiredMixin, APIClientMixin, FormView):
 
                 messages.success(
                     self.request,
-                    f"Código '{code_id}' actualizado exitosamente"
+                    f"Código '{new_code}' actualizado exitosamente"
                 )
 
             return super().form_valid(form)
@@ -764,43 +798,6 @@ class ReferenceCodeUpdateView(LoginRequiredMixin, APIClientMixin, FormView):
         cache.delete(cache_key)
         logger.debug(f"Caché invalidado para categoría: {category_key}")
 
-    def _update_equipment_references(self, api_client, category, old_code, new_code):
-        """Actualiza las referencias de código en los equipos"""
-        # Mapear categoría a campo de equipo
-        field_map = {
-            'fuel': 'fuel_type',
-            'transmission': 'transmission_type',
-            'color': 'color',
-            'drivetrain': 'drivetrain',
-            'condition': 'condition'
-        }
-
-        field_name = field_map.get(category)
-        if not field_name:
-            return 0
-
-        updated_count = 0
-        try:
-            # Obtener equipos que usan el código viejo
-            response = api_client.get('equipment/', params={field_name: old_code, 'page_size': 1000})
-            equipment_list = response.get('results', [])
-
-            for equipment in equipment_list:
-                equipment_id = equipment.get('equipment_id')
-                if equipment_id:
-                    # Actualizar el campo correspondiente
-                    update_data = {field_name: new_code}
-                    try:
-                        api_client.patch(f'equipment/{equipment_id}/', data=update_data)
-                        updated_count += 1
-                    except APIException as e:
-                        logger.error(f"Error updating equipment {equipment_id}: {e}")
-
-        except Exception as e:
-            logger.error(f"Error updating equipment references: {e}")
-
-        return updated_count
-
 
 class ReferenceCodeDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
     """Vista detallada de un código de referencia (API o catálogo producto)"""
@@ -852,7 +849,7 @@ class ReferenceCodeDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 
                 code_field = field_mapping['code_field']
                 name_field = field_mapping['name_field']
-                code_data['pk'] = code_data.get(code_field, '')
+                code_data['pk'] = get_row_pk(category, code_data)
                 code_data['code'] = code_data.get(code_field, '')
                 code_data['description'] = code_data.get(name_field, '') or code_data.get('name_en', '')
                 code_data['is_active'] = True
@@ -878,25 +875,8 @@ class ReferenceCodeDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
         return context
     
     def _check_code_usage(self, api_client, category, code):
-        """Verifica cuántos equipos usan este código"""
-        try:
-            # Mapear categoría a campo de equipo
-            field_map = {
-                'fuel': 'fuel_type',
-                'transmission': 'transmission_type',
-                'color': 'color',
-                'drivetrain': 'drivetrain',
-                'condition': 'condition'
-            }
-            
-            field_name = field_map.get(category)
-            if field_name:
-                response = api_client.get('equipment/', params={field_name: code})
-                return response.get('count', 0)
-        except Exception as e:
-            logger.error(f"Error checking code usage: {e}")
-        
-        return 0
+        """Verifica cuántas filas (equipos, productos) usan este código"""
+        return get_code_usage(api_client, category, [code]).get(code, 0)
 
 
 class ReferenceCodeDeleteView(LoginRequiredMixin, APIClientMixin, TemplateView):
@@ -927,7 +907,7 @@ class ReferenceCodeDeleteView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 # Agregar campos estandarizados
                 code_field = field_mapping['code_field']
                 name_field = field_mapping['name_field']
-                code_data['pk'] = code_data.get(code_field, '')
+                code_data['pk'] = get_row_pk(category, code_data)
                 code_data['code'] = code_data.get(code_field, '')
                 code_data['description'] = code_data.get(name_field, '') or code_data.get('name_en', '')
                 code_data['is_active'] = True
@@ -943,7 +923,7 @@ class ReferenceCodeDeleteView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 
                 if usage_count > 0:
                     context['warning_message'] = (
-                        f"Este código está siendo usado por {usage_count} equipo(s). "
+                        f"Este código está siendo usado por {usage_count} registro(s) (equipos o productos). "
                         "No se puede eliminar hasta que se actualicen las referencias."
                     )
         
@@ -973,14 +953,14 @@ class ReferenceCodeDeleteView(LoginRequiredMixin, APIClientMixin, TemplateView):
                 messages.error(request, "Categoría inválida")
                 return redirect('frontend:reference_code_list')
             
-            # Verificar dependencias antes de eliminar
-            code_data = api_client.get(f'{endpoint}/{code_id}/')
-            usage_count = self._check_code_usage(api_client, category, code_data.get('code'))
+            # Verificar dependencias antes de eliminar (el uso se cuenta por código, no por pk)
+            code = get_code_for_pk(api_client, category, code_id)
+            usage_count = self._check_code_usage(api_client, category, code)
             
             if usage_count > 0:
                 messages.error(
                     request,
-                    f"No se puede eliminar: el código está siendo usado por {usage_count} equipo(s)"
+                    f"No se puede eliminar: el código está siendo usado por {usage_count} registro(s)"
                 )
                 return redirect('frontend:reference_code_list')
             
@@ -992,7 +972,7 @@ class ReferenceCodeDeleteView(LoginRequiredMixin, APIClientMixin, TemplateView):
             
             messages.success(
                 request,
-                f"Código '{code_data.get('code')}' eliminado exitosamente"
+                f"Código '{code}' eliminado exitosamente"
             )
             
         except APIException as e:
@@ -1002,24 +982,8 @@ class ReferenceCodeDeleteView(LoginRequiredMixin, APIClientMixin, TemplateView):
         return redirect(f"{reverse_lazy('frontend:reference_code_list')}?category={category}")
     
     def _check_code_usage(self, api_client, category, code):
-        """Verifica cuántos equipos usan este código"""
-        try:
-            field_map = {
-                'fuel': 'fuel_type',
-                'transmission': 'transmission_type',
-                'color': 'color',
-                'drivetrain': 'drivetrain',
-                'condition': 'condition'
-            }
-            
-            field_name = field_map.get(category)
-            if field_name:
-                response = api_client.get('equipment/', params={field_name: code})
-                return response.get('count', 0)
-        except Exception as e:
-            logger.error(f"Error checking code usage: {e}")
-        
-        return 0
+        """Verifica cuántas filas (equipos, productos) usan este código"""
+        return get_code_usage(api_client, category, [code]).get(code, 0)
 
 
 class ReferenceCodeAjaxSearchView(LoginRequiredMixin, APIClientMixin, View):
@@ -1447,15 +1411,16 @@ class ReferenceCodeBulkDeleteView(LoginRequiredMixin, APIClientMixin, View):
             failed_count = 0
             errors = []
             
+            # Uso de todos los códigos seleccionados en una sola llamada (por código, no por pk)
+            codes = {code_id: get_code_for_pk(api_client, category, code_id) for code_id in code_ids}
+            usage = get_code_usage(api_client, category, codes.values())
+            
             for code_id in code_ids:
                 try:
-                    # Verificar dependencias
-                    code_data = api_client.get(f'{endpoint}/{code_id}/')
-                    usage_count = self._check_code_usage(api_client, category, code_data.get('code'))
-                    
+                    usage_count = usage.get(codes[code_id], 0)
                     if usage_count > 0:
                         failed_count += 1
-                        errors.append(f"Código {code_data.get('code')}: en uso por {usage_count} equipo(s)")
+                        errors.append(f"Código {codes[code_id]}: en uso por {usage_count} registro(s)")
                         continue
                     
                     # Eliminar
@@ -1480,23 +1445,3 @@ class ReferenceCodeBulkDeleteView(LoginRequiredMixin, APIClientMixin, View):
             # Invalidar caché de la categoría
             if category:
                 self._invalidate_category_cache(category)
-    
-    def _check_code_usage(self, api_client, category, code):
-        """Verifica cuántos equipos usan este código"""
-        try:
-            field_map = {
-                'fuel': 'fuel_type',
-                'transmission': 'transmission_type',
-                'color': 'color',
-                'drivetrain': 'drivetrain',
-                'condition': 'condition'
-            }
-            
-            field_name = field_map.get(category)
-            if field_name:
-                response = api_client.get('equipment/', params={field_name: code})
-                return response.get('count', 0)
-        except Exception as e:
-            logger.error(f"Error checking code usage: {e}")
-        
-        return 0
@@ -6,11 +6,14 @@ Tarea 5.3: Notificaciones en tiempo real
 import json
 import time
 import logging
+from django.db import connections
 from django.http import StreamingHttpResponse
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils import timezone
 
+from core.metrics import track_sse_stream
+
 from ..mixins import APIClientMixin
 from ..services.service_alert_service import ServiceAlertService
 
@@ -70,6 +73,10 @@ class ServiceAlertsSSEView(LoginRequiredMixin, APIClientMixin, View):
                         # Send heartbeat to keep connection alive
                         yield f"data: {json.dumps({'type': 'heartbeat', 'timestamp': timezone.now().isoformat()})}\n\n"
                     
+                    # Release the database connection between polls instead
+                    # of pinning it for the lifetime of the stream
+                    connections.close_all()
+                    
                     # Wait before next check (poll every 5 seconds)
                     time.sleep(5)
                     
@@ -81,9 +88,15 @@ class ServiceAlertsSSEView(LoginRequiredMixin, APIClientMixin, View):
                         'timestamp': timezone.now().isoformat()
                     }
                     yield f"data: {json.dumps(error_data)}\n\n"
+                    connections.close_all()
                     time.sleep(10)  # Wait longer on error
         
-        response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+        def tracked_stream():
+            """Count the stream as open until the client disconnects."""
+            with track_sse_stream('service_alerts'):
+                yield from event_stream()
+        
+        response = StreamingHttpResponse(tracked_stream(), content_type='text/event-stream')
         response['Cache-Control'] = 'no-cache'
         response['X-Accel-Buffering'] = 'no'  # Disable buffering in nginx
         response['Connection'] = 'keep-alive'
@@ -58,70 +58,10 @@ class TaxonomyTreeView(LoginRequiredMixin, APIClientMixin, TemplateView):
         context['search_form'] = TaxonomySearchForm()
         
         try:
-            # Obtener todos los sistemas
-            systems_data = self.api_client.get('taxonomy-systems/', params={'page_size': 1000, 'is_active': True})
-            systems_list = systems_data.get('results', [])
-            
-            # Obtener todos los subsistemas
-            try:
-                subsystems_data = self.api_client.get('taxonomy-subsystems/', params={'page_size': 1000, 'is_active': True})
-                subsystems_list = subsystems_data.get('results', [])
-            except Exception as e:
-                logger.warning(f"Error loading subsystems: {e}")
-                subsystems_list = []
-            
-            # Obtener todos los grupos
-            try:
-                groups_data = self.api_client.get('taxonomy-groups/', params={'page_size': 1000, 'is_active': True})
-                groups_list = groups_data.get('results', [])
-            except Exception as e:
-                logger.warning(f"Error loading groups: {e}")
-                groups_list = []
-            
-            # Construir árbol jerárquico
-            # Crear diccionarios para acceso rápido
-            systems_dict = {s['system_code']: s for s in systems_list}
-            subsystems_dict = {s['subsystem_code']: s for s in subsystems_list}
-            
-            # Asignar grupos a subsistemas
-            for group in groups_list:
-                subsystem_code = group.get('subsystem_code')
-                if subsystem_code and subsystem_code in subsystems_dict:
-                    if 'groups' not in subsystems_dict[subsystem_code]:
-                        subsystems_dict[subsystem_code]['groups'] = []
-                    subsystems_dict[subsystem_code]['groups'].append(group)
-            
-            # Asignar subsistemas a sistemas
-            for subsystem in subsystems_list:
-                system_code = subsystem.get('system_code')
-                if system_code and system_code in systems_dict:
-                    if 'subsystems' not in systems_dict[system_code]:
-                        systems_dict[system_code]['subsystems'] = []
-                    systems_dict[system_code]['subsystems'].append(subsystem)
-            
-            # Convertir de vuelta a lista manteniendo el orden
-            taxonomy_tree = []
-            for system in systems_list:
-                if system['system_code'] in systems_dict:
-                    system_data = systems_dict[system['system_code']]
-                    # Asegurar que subsystems exista (aunque sea vacío)
-                    if 'subsystems' not in system_data:
-                        system_data['subsystems'] = []
-                    taxonomy_tree.append(system_data)
-            
-            context['taxonomy_tree'] = taxonomy_tree
-            
-            # Calcular estadísticas
-            systems_count = len(systems_list)
-            subsystems_count = len(subsystems_list)
-            groups_count = len(groups_list)
-            
-            context['taxonomy_stats'] = {
-                'systems_count': systems_count,
-                'subsystems_count': subsystems_count,
-                'groups_count': groups_count,
-                'total_nodes': systems_count + subsystems_count + groups_count
-            }
+            # Árbol completo y contadores en una sola llamada (instantánea cacheada en la API)
+            tree = self.api_client.get_taxonomy_tree(active_only=True)
+            context['taxonomy_tree'] = tree.get('systems', [])
+            context['taxonomy_stats'] = tree.get('stats', {})
             
         except Exception as e:
             logger.error(f"Error loading taxonomy tree: {e}")
@@ -523,20 +463,19 @@ class TaxonomyTreeDataView(LoginRequiredMixin, APIClientMixin, View):
     def get(self, request):
         try:
             node_id = request.GET.get('node_id')
-            expand_level = int(request.GET.get('expand_level', 1))
-            
-            if node_id:
-                # Obtener nodo específico con sus hijos
-                data = self.api_client.get(
-                    f'catalog/taxonomy/node/{node_id}/',
-                    params={'expand_level': expand_level}
-                )
+            node_type = request.GET.get('node_type')
+            
+            if node_id and node_type:
+                # Descendientes de un nodo (tabla de cierre)
+                data = {
+                    'type': node_type,
+                    'code': node_id,
+                    'descendants': self.api_client.get_taxonomy_descendants(node_type, node_id),
+                }
             else:
-                # Obtener árbol completo
-                data = self.api_client.get(
-                    'catalog/taxonomy/tree/',
-                    params={'expand_level': expand_level}
-                )
+                # Árbol completo
+                active_only = request.GET.get('active', 'true').lower() in ('1', 'true')
+                data = self.api_client.get_taxonomy_tree(active_only=active_only)
             
             return JsonResponse(data)
             
@@ -584,25 +523,30 @@ class TaxonomyNodeActionView(LoginRequiredMixin, APIClientMixin, View):
 
 @method_decorator(csrf_exempt, name='dispatch')
 class TaxonomyBulkActionView(LoginRequiredMixin, APIClientMixin, View):
-    """Vista para acciones masivas en taxonomía"""
+    """Vista para acciones masivas en taxonomía (una sola llamada a la API por acción)"""
+    
+    NODE_LABELS = {'system': 'sistemas', 'subsystem': 'subsistemas', 'group': 'grupos'}
     
     def post(self, request):
         try:
             action = request.POST.get('action')
+            node_type = request.POST.get('node_type', 'system')
             selected_ids = request.POST.get('selected_ids', '').split(',')
             selected_ids = [id.strip() for id in selected_ids if id.strip()]
             
             if not selected_ids:
                 return JsonResponse({'error': 'No se seleccionaron elementos'}, status=400)
+            if node_type not in self.NODE_LABELS:
+                return JsonResponse({'error': 'Tipo no válido'}, status=400)
             
             if action == 'bulk-activate':
-                return self._bulk_activate(selected_ids)
+                return self._bulk_activate(node_type, selected_ids)
             elif action == 'bulk-deactivate':
-                return self._bulk_deactivate(selected_ids)
+                return self._bulk_deactivate(node_type, selected_ids)
             elif action == 'bulk-export':
-                return self._bulk_export(selected_ids)
+                return self._bulk_export(node_type, selected_ids)
             elif action == 'bulk-delete':
-                return self._bulk_delete(selected_ids)
+                return self._bulk_delete(node_type, selected_ids)
             else:
                 return JsonResponse({'error': 'Acción no válida'}, status=400)
                 
@@ -610,105 +554,68 @@ class TaxonomyBulkActionView(LoginRequiredMixin, APIClientMixin, View):
             logger.error(f"Error in taxonomy bulk action: {e}")
             return JsonResponse({'error': 'Error al procesar la acción masiva'}, status=500)
     
-    def _bulk_activate(self, selected_ids):
-        """Activar sistemas seleccionados"""
+    def _bulk_set_active(self, node_type, selected_ids, api_action, verb):
+        label = self.NODE_LABELS[node_type]
         try:
-            success_count = 0
-            for system_id in selected_ids:
-                try:
-                    self.api_client.patch(f'taxonomy-systems/{system_id}/', {
-                        'is_active': True
-                    })
-                    success_count += 1
-                except Exception as e:
-                    logger.error(f"Error activating system {system_id}: {e}")
-            
+            response = self.api_client.taxonomy_bulk_action(node_type, api_action, selected_ids)
+            summary = response.get('summary', {})
+            message = f'{summary.get("updated", 0)} {label} {verb} exitosamente'
+            if summary.get('not_found'):
+                message += f'. {summary["not_found"]} no encontrados'
             return JsonResponse({
                 'success': True,
-                'message': f'{success_count} sistemas activados exitosamente'
+                'message': message,
+                'results': response.get('results', []),
             })
             
         except Exception as e:
-            logger.error(f"Error in bulk activate: {e}")
-            return JsonResponse({'error': 'Error al activar sistemas'}, status=500)
+            logger.error(f"Error in bulk {api_action}: {e}")
+            return JsonResponse({'error': f'Error al actualizar {label}'}, status=500)
     
-    def _bulk_deactivate(self, selected_ids):
-        """Desactivar sistemas seleccionados"""
-        try:
-            success_count = 0
-            for system_id in selected_ids:
-                try:
-                    self.api_client.patch(f'taxonomy-systems/{system_id}/', {
-                        'is_active': False
-                    })
-                    success_count += 1
-                except Exception as e:
-                    logger.error(f"Error deactivating system {system_id}: {e}")
-            
-            return JsonResponse({
-                'success': True,
-                'message': f'{success_count} sistemas desactivados exitosamente'
-            })
-            
-        except Exception as e:
-            logger.error(f"Error in bulk deactivate: {e}")
-            return JsonResponse({'error': 'Error al desactivar sistemas'}, status=500)
+    def _bulk_activate(self, node_type, selected_ids):
+        """Activar nodos seleccionados"""
+        return self._bulk_set_active(node_type, selected_ids, 'activate', 'activados')
+    
+    def _bulk_deactivate(self, node_type, selected_ids):
+        """Desactivar nodos seleccionados"""
+        return self._bulk_set_active(node_type, selected_ids, 'deactivate', 'desactivados')
     
-    def _bulk_export(self, selected_ids):
-        """Exportar sistemas seleccionados"""
+    def _bulk_export(self, node_type, selected_ids):
+        """Exportar nodos seleccionados"""
         try:
             # Implementar lógica de exportación
             return JsonResponse({
                 'success': True,
-                'download_url': f'/api/v1/taxonomy-systems/export/?ids={",".join(selected_ids)}',
-                'message': f'Exportando {len(selected_ids)} sistemas'
+                'download_url': f'/api/v1/taxonomy-{node_type}s/export/?ids={",".join(selected_ids)}',
+                'message': f'Exportando {len(selected_ids)} {self.NODE_LABELS[node_type]}'
             })
             
         except Exception as e:
             logger.error(f"Error in bulk export: {e}")
-            return JsonResponse({'error': 'Error al exportar sistemas'}, status=500)
+            return JsonResponse({'error': 'Error al exportar'}, status=500)
     
-    def _bulk_delete(self, selected_ids):
-        """Eliminar sistemas seleccionados (con verificación de dependencias)"""
+    def _bulk_delete(self, node_type, selected_ids):
+        """Eliminar nodos seleccionados; la API omite los que tienen dependencias"""
+        label = self.NODE_LABELS[node_type]
         try:
-            # Verificar dependencias primero
-            systems_with_dependencies = []
-            systems_to_delete = []
-            
-            for system_id in selected_ids:
-                try:
-                    dependencies = self.api_client.get(
-                        f'taxonomy-systems/{system_id}/dependencies/'
-                    )
-                    if dependencies.get('has_dependencies', False):
-                        systems_with_dependencies.append(system_id)
-                    else:
-                        systems_to_delete.append(system_id)
-                except Exception as e:
-                    logger.error(f"Error checking dependencies for system {system_id}: {e}")
-            
-            # Eliminar solo los sistemas sin dependencias
-            success_count = 0
-            for system_id in systems_to_delete:
-                try:
-                    self.api_client.delete(f'taxonomy-systems/{system_id}/')
-                    success_count += 1
-                except Exception as e:
-                    logger.error(f"Error deleting system {system_id}: {e}")
+            response = self.api_client.taxonomy_bulk_action(node_type, 'delete', selected_ids)
+            results = response.get('results', [])
+            blocked = [result['code'] for result in results if result['status'] == 'blocked']
             
-            message = f'{success_count} sistemas eliminados exitosamente'
-            if systems_with_dependencies:
-                message += f'. {len(systems_with_dependencies)} sistemas no se pudieron eliminar por tener dependencias'
+            message = f'{response.get("summary", {}).get("deleted", 0)} {label} eliminados exitosamente'
+            if blocked:
+                message += f'. {len(blocked)} {label} no se pudieron eliminar por tener dependencias'
             
             return JsonResponse({
                 'success': True,
                 'message': message,
-                'systems_with_dependencies': systems_with_dependencies
+                'results': results,
+                'systems_with_dependencies': blocked
             })
             
         except Exception as e:
             logger.error(f"Error in bulk delete: {e}")
-            return JsonResponse({'error': 'Error al eliminar sistemas'}, status=500)
+            return JsonResponse({'error': f'Error al eliminar {label}'}, status=500)
 
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -179,7 +179,7 @@ class TechnicianDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
 
             # Obtener órdenes de trabajo asignadas al técnico
             try:
-                workorders_data = api_client.get_workorders(assigned_technician=technician_id, page_size=50)
+                workorders_data = api_client.get_workorders(technician_id=technician_id, page_size=10)
                 workorders = workorders_data.get('results', [])
 
                 # Procesar órdenes de trabajo para mejor visualización
@@ -204,30 +204,11 @@ class TechnicianDetailView(LoginRequiredMixin, APIClientMixin, TemplateView):
 
                 context['workorders'] = workorders
 
-                # Calcular estadísticas de órdenes de trabajo
-                total_workorders = len(workorders)
-                completed_workorders = len([wo for wo in workorders if wo.get('status') == 'completed'])
-                pending_workorders = len([wo for wo in workorders if wo.get('status') == 'pending'])
-                in_progress_workorders = len([wo for wo in workorders if wo.get('status') == 'in_progress'])
-
-                context['workorder_stats'] = {
-                    'total': total_workorders,
-                    'completed': completed_workorders,
-                    'pending': pending_workorders,
-                    'in_progress': in_progress_workorders,
-                    'completion_rate': (completed_workorders / total_workorders * 100) if total_workorders > 0 else 0
-                }
-
             except APIException as wo_error:
                 logger.warning(f"Could not load work orders for technician {technician_id}: {wo_error}")
                 context['workorders'] = []
-                context['workorder_stats'] = {
-                    'total': 0,
-                    'completed': 0,
-                    'pending': 0,
-                    'in_progress': 0,
-                    'completion_rate': 0
-                }
+
+            context['workorder_stats'] = self.get_workorder_stats(api_client, 'technician', technician_id)
 
         except APIException as e:
             self.handle_api_error(e, "Error al cargar los datos del técnico")
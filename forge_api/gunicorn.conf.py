@@ -0,0 +1,14 @@
+"""
+Gunicorn hooks shared by every deployment.
+
+Gunicorn loads ./gunicorn.conf.py automatically, so the default WSGI command
+in the Dockerfile picks these up; gunicorn_asgi.conf.py repeats them.
+"""
+import os
+
+
+def child_exit(server, worker):
+    """Drop live gauges of dead workers from the Prometheus multiprocess dir."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,37 @@
+"""
+Gunicorn configuration for the ASGI deployment (uvicorn workers).
+
+Usage:
+    gunicorn -c gunicorn_asgi.conf.py forge_api.asgi:application
+
+Every value can be overridden through the environment so the same file
+works in docker-compose and on bare metal.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Async workers multiplex many in-flight backend calls per process, so fewer
+# workers are needed than with sync workers (cpu * 2 + 1).
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() + 1))
+worker_class = 'uvicorn.workers.UvicornWorker'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers periodically to bound memory growth
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def child_exit(server, worker):
+    """Drop live gauges of dead workers from the Prometheus multiprocess dir."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
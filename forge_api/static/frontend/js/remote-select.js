@@ -0,0 +1,150 @@
+/**
+ * Remote Select for ForgeDB Frontend
+ * Loads the options of <select data-remote-select="url"> on demand from the
+ * lookup API: (id, label) pairs, prefix search and "load more" pages.
+ */
+
+class RemoteSelect {
+    constructor(select) {
+        this.select = select;
+        this.url = select.dataset.remoteSelect;
+        this.pageSize = 20;
+        this.next = null;
+        this.query = '';
+        this.loaded = false;
+        this.requestId = 0;
+
+        this.search = document.createElement('input');
+        this.search.type = 'search';
+        this.search.className = 'form-control form-control-sm mb-1 remote-select-search';
+        this.search.placeholder = select.dataset.remotePlaceholder || 'Buscar...';
+        this.search.setAttribute('aria-label', this.search.placeholder);
+        select.parentNode.insertBefore(this.search, select);
+
+        this.dependsOn = select.dataset.remoteDependsOn
+            ? document.getElementById(select.dataset.remoteDependsOn)
+            : null;
+
+        this.bindEvents();
+    }
+
+    bindEvents() {
+        let timer = null;
+        this.search.addEventListener('input', () => {
+            clearTimeout(timer);
+            timer = setTimeout(() => this.reload(this.search.value.trim()), 250);
+        });
+        this.select.addEventListener('focus', () => {
+            if (!this.loaded) {
+                this.reload(this.query);
+            }
+        });
+        this.select.addEventListener('change', () => {
+            if (this.select.value === RemoteSelect.MORE) {
+                this.select.value = this.previousValue || '';
+                this.loadPage(this.next, true);
+            } else {
+                this.previousValue = this.select.value;
+            }
+        });
+        if (this.dependsOn) {
+            this.dependsOn.addEventListener('change', () => {
+                this.clearSelection();
+                this.reload('');
+            });
+        }
+        this.previousValue = this.select.value;
+    }
+
+    buildUrl(after) {
+        const params = new URLSearchParams({ q: this.query, limit: this.pageSize });
+        if (after) {
+            params.set('after', after);
+        }
+        if (this.dependsOn) {
+            params.set(this.select.dataset.remoteDependsParam, this.dependsOn.value || '');
+        }
+        return `${this.url}?${params.toString()}`;
+    }
+
+    reload(query) {
+        this.query = query;
+        this.loadPage(null, false);
+    }
+
+    async loadPage(after, append) {
+        if (this.dependsOn && !this.dependsOn.value) {
+            this.render([], false);
+            return;
+        }
+        const requestId = ++this.requestId;
+        try {
+            const response = await fetch(this.buildUrl(after), {
+                headers: { 'Accept': 'application/json' },
+                credentials: 'same-origin'
+            });
+            const data = await response.json();
+            if (requestId !== this.requestId) {
+                return; // A newer search replaced this one
+            }
+            this.next = data.next || null;
+            this.loaded = true;
+            this.render(data.results || [], append);
+        } catch (error) {
+            console.error('Remote select lookup failed:', error);
+        }
+    }
+
+    render(results, append) {
+        const current = this.select.value;
+        const more = this.select.querySelector(`option[value="${RemoteSelect.MORE}"]`);
+        if (more) {
+            more.remove();
+        }
+        if (!append) {
+            // Keep the empty option and the current selection
+            Array.from(this.select.options).forEach(option => {
+                if (option.value !== '' && option.value !== current) {
+                    option.remove();
+                }
+            });
+        }
+        results.forEach(item => {
+            const value = String(item.id);
+            if (value === current || this.select.querySelector(`option[value="${CSS.escape(value)}"]`)) {
+                return;
+            }
+            this.select.add(new Option(item.label, value));
+        });
+        if (this.next) {
+            this.select.add(new Option('Cargar más…', RemoteSelect.MORE));
+        }
+    }
+
+    clearSelection() {
+        Array.from(this.select.options).forEach(option => {
+            if (option.value !== '') {
+                option.remove();
+            }
+        });
+        this.select.value = '';
+        this.previousValue = '';
+        this.loaded = false;
+        this.search.value = '';
+        this.select.dispatchEvent(new Event('change', { bubbles: true }));
+    }
+}
+
+RemoteSelect.MORE = '__more__';
+
+RemoteSelect.initAll = function (root = document) {
+    root.querySelectorAll('select[data-remote-select]').forEach(select => {
+        if (!select.remoteSelect) {
+            select.remoteSelect = new RemoteSelect(select);
+        }
+    });
+};
+
+document.addEventListener('DOMContentLoaded', () => RemoteSelect.initAll());
+
+window.RemoteSelect = RemoteSelect;